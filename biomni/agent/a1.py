@@ -2,7 +2,9 @@ import glob
 import inspect
 import os
 import re
+import threading
 import time
+import uuid
 from datetime import datetime
 from typing import Literal, TypedDict
 from pathlib import Path
@@ -15,10 +17,14 @@ from langchain_core.prompts import ChatPromptTemplate
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
+from biomni.agent.answer_cache import AnswerCache, get_answer_cache, resource_fingerprint
+from biomni.agent.context_compaction import CHARS_PER_TOKEN, DEFAULT_BUDGET_TOKENS, ContextCompactor, ObservationStore
+from biomni.agent.prompt_cache import ToolDescRenderer, format_item_with_description, list_data_lake_items
+from biomni.agent.startup import StartupTask, shared_task
 from biomni.env_desc import data_lake_dict, library_content_dict
 from biomni.llm import SourceType, get_llm
 from biomni.model.retriever import ToolRetriever
-from biomni.tool.support_tools import run_python_repl
+from biomni.tool.support_tools import run_python_repl, run_python_repl_isolated
 from biomni.tool.tool_registry import ToolRegistry
 from biomni.utils import (
     check_and_download_s3_files,
@@ -54,6 +60,16 @@ class A1:
         base_url: str | None = None,
         api_key: str = "EMPTY",
         verbose: bool = False,
+        repl_mode: Literal["thread", "process"] | None = None,
+        session_id: str | None = None,
+        repl_memory_limit_mb: int | None = None,
+        repl_max_workers: int | None = None,
+        retrieval_mode: Literal["prompt", "embedding"] = "prompt",
+        retrieval_top_k: dict | int | None = None,
+        retrieval_rerank: bool = False,
+        fast_start: bool | None = None,
+        answer_cache: bool | AnswerCache | None = None,
+        context_budget_tokens: int | None = DEFAULT_BUDGET_TOKENS,
     ):
         """Initialize the biomni agent.
 
@@ -67,12 +83,52 @@ class A1:
             api_key: API key for the custom LLM
             source: Source provider: "OpenAI", "Anthropic", "Custom", etc. If None, auto-detect from model
             verbose: If True, print detailed progress logs during execution
+            repl_mode: "thread" runs Python in a shared in-process namespace; "process" gives this agent its own
+                pre-warmed worker process with hard timeouts. Defaults to $BIOMNI_REPL_MODE or "thread"
+            session_id: Identifies this agent's worker in the process REPL pool (random if None)
+            repl_memory_limit_mb: Per-worker memory limit in MB for the process REPL pool
+            repl_max_workers: Maximum number of worker processes in the process REPL pool (defaults to CPU count)
+            retrieval_mode: "prompt" selects resources with one LLM call over everything; "embedding" uses a
+                persisted local vector index (sentence-transformers or BM25 fallback)
+            retrieval_top_k: Shortlist size per category for embedding retrieval (int or dict by category)
+            retrieval_rerank: If True, embedding retrieval lets the LLM select from the shortlist
+            fast_start: If True, return immediately and provision the data lake and load tool descriptions in
+                the background (see get_startup_status). Defaults to $BIOMNI_FAST_START or False
+            answer_cache: Opt-in cross-session cache of final answers keyed on the normalized prompt, the
+                agent's resources and the model (True for the shared cache in $BIOMNI_CACHE_DIR, or an
+                AnswerCache). Defaults to $BIOMNI_ANSWER_CACHE or False
+            context_budget_tokens: Approximate token budget for the conversation sent at each step; above it,
+                old steps are compacted into digests (full observations stay available via get_observation).
+                None disables compaction
 
         """
+        init_start = time.perf_counter()
         self.verbose = verbose
         self.path = path
         self.execution_logs = []  # Store execution logs for retrieval
         self.stop_execution = False  # Flag to stop execution
+        self._tool_renderer = ToolDescRenderer()  # Per-module cache of rendered tool descriptions
+        if fast_start is None:
+            fast_start = os.getenv("BIOMNI_FAST_START", "").lower() in ("1", "true", "yes")
+        self.fast_start = fast_start
+        self.init_timings = {}  # Seconds spent in each start-up step
+        self._startup_tasks = {}
+        self._tools_lock = threading.Lock()
+        self._module2api = None
+        self._tool_registry = None
+        self._configured = False
+        self.execution_seconds = 0.0  # Cumulative time spent running generated code
+        self.execution_count = 0
+        self.model_name = llm
+        if answer_cache is None:
+            answer_cache = os.getenv("BIOMNI_ANSWER_CACHE", "").lower() in ("1", "true", "yes")
+        if answer_cache is True:
+            answer_cache = get_answer_cache()
+        self.answer_cache = answer_cache or None
+        self.last_answer_cache_hit = None  # Details of the cached answer served by the last go(), if any
+        self.context_budget_tokens = context_budget_tokens
+        self.observation_store = ObservationStore()  # Full execution outputs, by observation id
+        self._context_compactor = None
         
         # 初始化token统计
         self.token_logger = NodeLogger(model_name=llm)
@@ -90,11 +146,106 @@ class A1:
         self._log("INIT", "🌐", f"Base URL: {base_url or 'Default'}")
         self._log("INIT", "🔍", f"Tool retriever: {use_tool_retriever}")
         self._log("INIT", "⏱️", f"Timeout: {timeout_seconds}s")
+        self._log("INIT", "⚡", f"Fast start: {fast_start}")
 
-        if not os.path.exists(path):
-            os.makedirs(path)
-            self._log("INIT", "📁", f"Created directory: {path}")
+        self.path = os.path.join(path, "biomni_data")
+        self.use_tool_retriever = use_tool_retriever
+
+        if self.fast_start:
+            # Downloads run in the background and are awaited when code first touches the data lake;
+            # agents sharing a data directory share one provisioning task
+            self._startup_tasks["data_lake"] = shared_task(
+                ("data_lake", os.path.abspath(path)), "data_lake", lambda: self._provision_data(path)
+            )
+            self._startup_tasks["tool_descriptions"] = StartupTask("tool_descriptions", self._load_tools).start()
+            self._log("INIT", "🧵", "Data lake provisioning and tool descriptions are loading in the background")
+        else:
+            step_start = time.perf_counter()
+            self._provision_data(path)
+            self.init_timings["data_lake"] = time.perf_counter() - step_start
+
+            self._log("INIT", "📖", "Reading module2api configuration...")
+            step_start = time.perf_counter()
+            self._module2api, self._tool_registry = self._load_tools()
+            self.init_timings["tool_descriptions"] = time.perf_counter() - step_start
+        
+        self._log("INIT", "🤖", f"Initializing LLM: {llm}")
+        step_start = time.perf_counter()
+        
+        # Set environment variables for database.py to use
+        os.environ["BIOMNI_CURRENT_MODEL"] = llm
+        if source:
+            os.environ["BIOMNI_CURRENT_SOURCE"] = source
+        if base_url:
+            os.environ["BIOMNI_CURRENT_BASE_URL"] = base_url
+        if api_key:
+            os.environ["BIOMNI_CURRENT_API_KEY"] = api_key
+        
+        # Set global configuration for database.py
+        from biomni.tool.database import set_current_agent_config
+        set_current_agent_config(llm, source, base_url, api_key)
+            
+        if self.verbose:
+            self._log("INIT", "🤖", f"Creating LLM instance")
+            self._log("INIT", "📄", f"Model: {llm}")
+            self._log("INIT", "🔧", f"Source: {source}")
+            self._log("INIT", "🌐", f"Base URL: {base_url}")
+            self._log("INIT", "🛑", f"Stop sequences: ['</execute>', '</solution>']")
+        
+        self.llm = get_llm(
+            llm, stop_sequences=["</execute>", "</solution>"], base_url=base_url, api_key=api_key, source=source
+        )
+        
+        # 将token logger添加到LLM的回调中
+        if hasattr(self.llm, 'callbacks'):
+            if self.llm.callbacks is None:
+                self.llm.callbacks = []
+            self.llm.callbacks.append(self.token_logger)
+        else:
+            self.llm.callbacks = [self.token_logger]
+        
+        self.init_timings["llm"] = time.perf_counter() - step_start
+        self._log("INIT", "✅", "LLM initialized successfully")
+            
+        if retrieval_mode not in ("prompt", "embedding"):
+            raise ValueError(f"Invalid retrieval_mode: {retrieval_mode}. Valid options are 'prompt' or 'embedding'")
+        self.retrieval_mode = retrieval_mode
+        self.retrieval_top_k = retrieval_top_k
+        self.retrieval_rerank = retrieval_rerank
+
+        if self.use_tool_retriever:
+            self.retriever = ToolRetriever(index_dir=os.path.join(self.path, "retrieval_index"))
+        else:
+            self._log("INIT", "⚠️", "Tool retriever disabled")
+
+        # Add timeout parameter
+        self.timeout_seconds = timeout_seconds  # 10 minutes default timeout
+
+        # Python execution backend
+        self.repl_mode = repl_mode or os.getenv("BIOMNI_REPL_MODE", "thread")
+        if self.repl_mode not in ("thread", "process"):
+            raise ValueError(f"Invalid repl_mode: {self.repl_mode}. Valid options are 'thread' or 'process'")
+        self.session_id = session_id or uuid.uuid4().hex
+        if self.repl_mode == "process":
+            from biomni.tool.repl_pool import get_repl_pool
+
+            self._repl_pool = get_repl_pool(max_workers=repl_max_workers, memory_limit_mb=repl_memory_limit_mb)
+            self._log("INIT", "🧵", f"Using process REPL pool (session: {self.session_id})")
+        
+        if self.fast_start:
+            # The system prompt and workflow are built on the first go() (or add_tool/add_data/...)
+            self._log("INIT", "⚙️", "Agent configuration deferred until first use")
+        else:
+            self._log("INIT", "⚙️", "Starting agent configuration...")
+            step_start = time.perf_counter()
+            self.configure()
+            self.init_timings["configure"] = time.perf_counter() - step_start
+        
+        self.init_timings["total"] = time.perf_counter() - init_start
+        self._log("INIT", "🎉", f"Biomni Agent initialization completed in {self.init_timings['total']:.2f}s!")
 
+    def _provision_data(self, path):
+        """Make sure the data lake and benchmark files exist under ``path/biomni_data``."""
         # --- Begin custom folder/file checks ---
         self._log("INIT", "🔍", "Setting up data directories...")
             
@@ -141,7 +292,7 @@ class A1:
             print("Checking and downloading benchmark files...")
             self._log("DOWNLOAD", "🌐", "Starting benchmark file download...")
                 
-            benchmark_download_results = check_and_download_s3_files(
+            check_and_download_s3_files(
                 s3_bucket_url="https://biomni-release.s3.amazonaws.com",
                 local_data_lake_path=benchmark_dir,
                 expected_files=[],  # Empty list - will download entire folder
@@ -149,70 +300,110 @@ class A1:
             )
             
             self._log("DOWNLOAD", "✅", "Benchmark files download completed")
-     
-        self.path = os.path.join(path, "biomni_data")
-        
-        self._log("INIT", "📖", "Reading module2api configuration...")
-            
-        module2api = read_module2api()
-        
-        self._log("INIT", "🤖", f"Initializing LLM: {llm}")
-        
-        # Set environment variables for database.py to use
-        os.environ["BIOMNI_CURRENT_MODEL"] = llm
-        if source:
-            os.environ["BIOMNI_CURRENT_SOURCE"] = source
-        if base_url:
-            os.environ["BIOMNI_CURRENT_BASE_URL"] = base_url
-        if api_key:
-            os.environ["BIOMNI_CURRENT_API_KEY"] = api_key
-        
-        # Set global configuration for database.py
-        from biomni.tool.database import set_current_agent_config
-        set_current_agent_config(llm, source, base_url, api_key)
-            
-        if self.verbose:
-            self._log("INIT", "🤖", f"Creating LLM instance")
-            self._log("INIT", "📄", f"Model: {llm}")
-            self._log("INIT", "🔧", f"Source: {source}")
-            self._log("INIT", "🌐", f"Base URL: {base_url}")
-            self._log("INIT", "🛑", f"Stop sequences: ['</execute>', '</solution>']")
-        
-        self.llm = get_llm(
-            llm, stop_sequences=["</execute>", "</solution>"], base_url=base_url, api_key=api_key, source=source
-        )
-        
-        # 将token logger添加到LLM的回调中
-        if hasattr(self.llm, 'callbacks'):
-            if self.llm.callbacks is None:
-                self.llm.callbacks = []
-            self.llm.callbacks.append(self.token_logger)
-        else:
-            self.llm.callbacks = [self.token_logger]
-        
-        self._log("INIT", "✅", "LLM initialized successfully")
-            
-        self.module2api = module2api
-        self.use_tool_retriever = use_tool_retriever
+        return download_results
 
+    def _load_tools(self):
+        """Import the tool description modules and index them for retrieval."""
+        module2api = read_module2api()
+        tool_registry = None
         if self.use_tool_retriever:
             self._log("INIT", "🔧", "Setting up tool registry...")
-                
-            self.tool_registry = ToolRegistry(module2api)
-            self.retriever = ToolRetriever()
-            
+            tool_registry = ToolRegistry(module2api)
             self._log("INIT", "✅", "Tool registry initialized")
+        return module2api, tool_registry
+
+    def _resolve_tools(self):
+        """Wait for the background tool description load, if one is pending."""
+        task = self._startup_tasks.get("tool_descriptions")
+        if task is None or self._module2api is not None:
+            return
+        with self._tools_lock:
+            if self._module2api is None:
+                self._module2api, self._tool_registry = task.wait()
+
+    @property
+    def module2api(self):
+        self._resolve_tools()
+        return self._module2api
+
+    @module2api.setter
+    def module2api(self, value):
+        self._module2api = value
+        if hasattr(self, "_tool_renderer"):
+            self._tool_renderer.invalidate()
+
+    @property
+    def tool_registry(self):
+        self._resolve_tools()
+        if self._tool_registry is None:
+            raise AttributeError("'A1' object has no attribute 'tool_registry'")
+        return self._tool_registry
+
+    @tool_registry.setter
+    def tool_registry(self, value):
+        self._tool_registry = value
+
+    def is_ready(self, task: str | None = None) -> bool:
+        """Whether background start-up work has finished successfully.
+
+        Args:
+            task: "data_lake" or "tool_descriptions"; if None, all start-up tasks
+
+        """
+        if task is None:
+            tasks = list(self._startup_tasks.values())
         else:
-            self._log("INIT", "⚠️", "Tool retriever disabled")
+            tasks = [self._startup_tasks[task]] if task in self._startup_tasks else []
+        return all(t.state == "ready" for t in tasks)
 
-        # Add timeout parameter
-        self.timeout_seconds = timeout_seconds  # 10 minutes default timeout
-        
-        self._log("INIT", "⚙️", "Starting agent configuration...")
-            
-        self.configure()
-        
-        self._log("INIT", "🎉", "Biomni Agent initialization completed!")
+    def wait_until_ready(self, task: str | None = None, timeout: float | None = None) -> bool:
+        """Block until background start-up work has finished.
+
+        Args:
+            task: "data_lake" or "tool_descriptions"; if None, all start-up tasks
+            timeout: Maximum number of seconds to wait per task
+
+        Returns:
+            True if the awaited tasks finished successfully, False on failure or timeout
+
+        """
+        names = [task] if task is not None else list(self._startup_tasks)
+        for name in names:
+            if name not in self._startup_tasks:
+                continue
+            try:
+                self._startup_tasks[name].wait(timeout)
+            except TimeoutError:
+                return False
+            except Exception as e:
+                self._log("INIT", "❌", f"Start-up task '{name}' failed: {e}")
+                return False
+        return self.is_ready(task)
+
+    def get_startup_status(self) -> dict:
+        """Report the readiness of the agent and how long each start-up step took."""
+        return {
+            "fast_start": self.fast_start,
+            "ready": self.is_ready(),
+            "configured": self._configured,
+            "tasks": {name: task.status() for name, task in self._startup_tasks.items()},
+            "timings": {name: round(seconds, 3) for name, seconds in self.init_timings.items()},
+        }
+
+    def _ensure_configured(self):
+        if not self._configured:
+            step_start = time.perf_counter()
+            self.configure()
+            self.init_timings["configure"] = time.perf_counter() - step_start
+
+    def _wait_for_data_lake(self, code: str):
+        """Block until provisioning is done if the code about to run refers to the data lake."""
+        task = self._startup_tasks.get("data_lake")
+        if task is None or task.done():
+            return
+        if self.path in code or "data_lake" in code or "benchmark" in code:
+            self._log("EXEC", "⏳", "Waiting for data lake provisioning to finish...")
+            self.wait_until_ready("data_lake")
     
     def get_token_summary(self):
         """获取详细的token使用摘要"""
@@ -291,6 +482,14 @@ class A1:
         self.stop_execution = True
         self._log("EXEC", "⏹️", "Execution stop requested")
     
+    def close(self):
+        """Release resources held by this agent, such as its REPL worker process."""
+        self.stop()
+        if getattr(self, "repl_mode", "thread") == "process":
+            self._repl_pool.release(self.session_id)
+            self._log("EXEC", "🧹", f"Released REPL worker for session {self.session_id}")
+        self.observation_store.clear()
+
     def clear_execution_logs(self):
         """Clear all execution logs."""
         self.execution_logs = []
@@ -362,6 +561,8 @@ class A1:
                     existing_tool = existing
                     break
 
+            # The module's cached rendering is now stale
+            self._tool_renderer.bump(module_name)
             if existing_tool:
                 # Update existing tool
                 existing_tool.update(schema)
@@ -371,22 +572,6 @@ class A1:
                 self.module2api[module_name].append(schema)
                 print(f"Added new tool '{schema['name']}' to module '{module_name}'")
 
-            # Update the tool registry's document dataframe if it exists
-            if hasattr(self, "tool_registry") and self.tool_registry is not None:
-                try:
-                    # Rebuild the document dataframe
-                    docs = []
-                    for tool_id in range(len(self.tool_registry.tools)):
-                        docs.append(
-                            [
-                                int(tool_id),
-                                self.tool_registry.get_tool_by_id(int(tool_id)),
-                            ]
-                        )
-                    self.tool_registry.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-                except Exception as e:
-                    print(f"Warning: Failed to update tool registry document dataframe: {e}")
-
             # Store the original function for potential future use
             if not hasattr(self, "_custom_functions"):
                 self._custom_functions = {}
@@ -639,6 +824,7 @@ class A1:
                 if mcp_module_name not in self.module2api:
                     self.module2api[mcp_module_name] = []
                 self.module2api[mcp_module_name].append(tool_schema)
+                self._tool_renderer.bump(mcp_module_name)
 
                 # Add to instance registries
                 self._custom_functions[tool_name] = wrapper_function
@@ -708,28 +894,17 @@ class A1:
 
         # Remove from tool registry
         if hasattr(self, "tool_registry") and self.tool_registry is not None:
+            # The registry keeps its document dataframe in sync on removal
             if self.tool_registry.remove_tool_by_name(name):
                 removed = True
-                # Rebuild the document dataframe
-                try:
-                    docs = []
-                    for tool_id in range(len(self.tool_registry.tools)):
-                        docs.append(
-                            [
-                                int(tool_id),
-                                self.tool_registry.get_tool_by_id(int(tool_id)),
-                            ]
-                        )
-                    self.tool_registry.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-                except Exception as e:
-                    print(f"Warning: Failed to update tool registry document dataframe: {e}")
 
         # Remove from module2api
         if hasattr(self, "module2api"):
-            for tools in self.module2api.values():
+            for module_name, tools in self.module2api.items():
                 for i, tool in enumerate(tools):
                     if tool.get("name") == name:
                         del tools[i]
+                        self._tool_renderer.bump(module_name)
                         removed = True
                         break
 
@@ -967,43 +1142,39 @@ class A1:
             The generated system prompt
 
         """
+        prefix, suffix = self._generate_system_prompt_parts(
+            tool_desc,
+            data_lake_content,
+            library_content_list,
+            self_critic=self_critic,
+            is_retrieval=is_retrieval,
+            custom_tools=custom_tools,
+            custom_data=custom_data,
+            custom_software=custom_software,
+        )
+        return prefix + suffix
 
-        def format_item_with_description(name, description):
-            """Format an item with its description in a readable way."""
-            # Handle None or empty descriptions
-            if not description:
-                description = f"Data lake item: {name}"
-
-            # Check if the item is already formatted (contains a colon)
-            if isinstance(name, str) and ": " in name:
-                return name
-
-            # Wrap long descriptions to make them more readable
-            max_line_length = 80
-            if len(description) > max_line_length:
-                # Simple wrapping for long descriptions
-                wrapped_desc = []
-                words = description.split()
-                current_line = ""
-
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= max_line_length:
-                        if current_line:
-                            current_line += " " + word
-                        else:
-                            current_line = word
-                    else:
-                        wrapped_desc.append(current_line)
-                        current_line = word
+    def _generate_system_prompt_parts(
+        self,
+        tool_desc,
+        data_lake_content,
+        library_content_list,
+        self_critic=False,
+        is_retrieval=False,
+        custom_tools=None,
+        custom_data=None,
+        custom_software=None,
+    ):
+        """Generate the system prompt as a stable prefix and a volatile suffix.
 
-                if current_line:
-                    wrapped_desc.append(current_line)
+        The prefix (instructions, custom resources and, before retrieval, all environment resources)
+        is identical across go() calls so provider-side prompt caching can reuse it. After retrieval the
+        selected environment resources change per query and are returned as the suffix.
 
-                # Join with newlines and proper indentation
-                formatted_desc = f"{name}:\n  " + "\n  ".join(wrapped_desc)
-                return formatted_desc
-            else:
-                return f"{name}: {description}"
+        Returns:
+            A (prefix, suffix) tuple; prefix + suffix is the full system prompt
+
+        """
 
         # Separate custom and default resources
         default_data_lake_content = []
@@ -1220,7 +1391,7 @@ CUSTOM DATA (PRIORITIZE THESE DATASETS):
 """
 
         # Add environment resources
-        prompt_modifier += """
+        environment_resources = """
 
 Environment Resources:
 
@@ -1273,7 +1444,7 @@ Each library is listed with its description to help you understand its functiona
         # Format the prompt with the appropriate values
         format_dict = {
             "function_intro": function_intro,
-            "tool_desc": textify_api_dict(tool_desc) if isinstance(tool_desc, dict) else tool_desc,
+            "tool_desc": self._tool_renderer.render(tool_desc) if isinstance(tool_desc, dict) else tool_desc,
             "import_instruction": import_instruction,
             "data_lake_path": self.path + "/data_lake",
             "data_lake_intro": data_lake_intro,
@@ -1290,9 +1461,38 @@ Each library is listed with its description to help you understand its functiona
         if custom_software_formatted:
             format_dict["custom_software"] = "\n".join(custom_software_formatted)
 
-        formatted_prompt = prompt_modifier.format(**format_dict)
+        if is_retrieval:
+            prefix = prompt_modifier.format(**format_dict)
+            suffix = environment_resources.format(**format_dict)
+        else:
+            prefix = (prompt_modifier + environment_resources).format(**format_dict)
+            suffix = ""
+
+        return prefix, suffix
+
+    def _set_system_prompt(self, prefix, suffix):
+        self.system_prompt_prefix = prefix
+        self.system_prompt_suffix = suffix
+        self.system_prompt = prefix + suffix
+
+    def _build_system_message(self):
+        """Build the system message, marking prompt-cache breakpoints for providers that need them."""
+        prefix = getattr(self, "system_prompt_prefix", None)
+        suffix = getattr(self, "system_prompt_suffix", "")
+        if (
+            prefix is None
+            or prefix + suffix != self.system_prompt
+            or type(self.llm).__name__ != "ChatAnthropic"
+        ):
+            # OpenAI-compatible providers cache identical prompt prefixes automatically
+            return SystemMessage(content=self.system_prompt)
 
-        return formatted_prompt
+        # Anthropic caches up to explicit breakpoints: one after the stable prefix (reused across go() calls)
+        # and one after the full system prompt (reused across generate steps of the same task)
+        content = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if suffix:
+            content.append({"type": "text", "text": suffix, "cache_control": {"type": "ephemeral"}})
+        return SystemMessage(content=content)
 
     def configure(self, self_critic=False, test_time_scale_round=0):
         """Configure the agent with the initial system prompt and workflow.
@@ -1304,11 +1504,14 @@ Each library is listed with its description to help you understand its functiona
         """
         # Store self_critic for later use
         self.self_critic = self_critic
+        self._configured = True
 
-        # Get data lake content
-        data_lake_path = self.path + "/data_lake"
-        data_lake_content = glob.glob(data_lake_path + "/*")
-        data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+        # Get data lake content (the listing is cached until the directory changes). While the data lake
+        # is still being provisioned in the background, list the files it will contain.
+        if self.is_ready("data_lake"):
+            data_lake_items = list_data_lake_items(self.path + "/data_lake")
+        else:
+            data_lake_items = list(data_lake_dict.keys())
 
         # Store data_lake_dict as instance variable for use in retrieval
         self.data_lake_dict = data_lake_dict
@@ -1359,15 +1562,17 @@ Each library is listed with its description to help you understand its functiona
             for name, info in self._custom_software.items():
                 custom_software.append({"name": name, "description": info["description"]})
 
-        self.system_prompt = self._generate_system_prompt(
-            tool_desc=tool_desc,
-            data_lake_content=data_lake_with_desc,
-            library_content_list=library_content_list,
-            self_critic=self_critic,
-            is_retrieval=False,
-            custom_tools=custom_tools if custom_tools else None,
-            custom_data=custom_data if custom_data else None,
-            custom_software=custom_software if custom_software else None,
+        self._set_system_prompt(
+            *self._generate_system_prompt_parts(
+                tool_desc=tool_desc,
+                data_lake_content=data_lake_with_desc,
+                library_content_list=library_content_list,
+                self_critic=self_critic,
+                is_retrieval=False,
+                custom_tools=custom_tools if custom_tools else None,
+                custom_data=custom_data if custom_data else None,
+                custom_software=custom_software if custom_software else None,
+            )
         )
 
         # Define the nodes
@@ -1377,7 +1582,7 @@ Each library is listed with its description to help you understand its functiona
                 state["next_step"] = "end"
                 return state
                 
-            messages = [SystemMessage(content=self.system_prompt)] + state["messages"]
+            messages = [self._build_system_message()] + self._context_view(state["messages"])
             
             if self.verbose:
                 self._log("GENERATE", "🤖", f"Invoking LLM with {len(messages)} messages")
@@ -1460,6 +1665,8 @@ Each library is listed with its description to help you understand its functiona
             execute_match = re.search(r"<execute>(.*?)</execute>", last_message, re.DOTALL)
             if execute_match:
                 code = execute_match.group(1)
+                self._wait_for_data_lake(code)
+                execution_start = time.perf_counter()
 
                 # Set timeout duration (10 minutes = 600 seconds)
                 timeout = self.timeout_seconds
@@ -1494,20 +1701,28 @@ Each library is listed with its description to help you understand its functiona
                 else:
                     # Inject custom functions into the Python execution environment
                     self._inject_custom_functions_to_repl()
-                    result = run_with_timeout(run_python_repl, [code], timeout=timeout)
+                    if self.repl_mode == "process":
+                        # The worker enforces the timeout itself by killing the process
+                        result = run_python_repl_isolated(code, session_id=self.session_id, timeout=timeout)
+                    else:
+                        result = run_with_timeout(run_python_repl, [code], timeout=timeout)
+                self.execution_seconds += time.perf_counter() - execution_start
+                self.execution_count += 1
 
                 # Check for stop flag after execution
                 if self.stop_execution:
                     state["next_step"] = "end"
                     return state
 
+                # The full output stays retrievable even when the context only gets a truncated copy
+                observation_id = self.observation_store.add(result)
                 if len(result) > 10000:
                     result = (
                         "The output is too long to be added to context. Here are the first 10K characters...\n"
                         + result[:10000]
                     )
                 observation = f"\n<observation>{result}</observation>"
-                state["messages"].append(AIMessage(content=observation.strip()))
+                state["messages"].append(AIMessage(content=observation.strip(), id=observation_id))
 
             return state
 
@@ -1551,7 +1766,7 @@ Each library is listed with its description to help you understand its functiona
         
             if self.critic_count < test_time_scale_round:
                 # Generate feedback based on message history
-                messages = state["messages"]
+                messages = self._context_view(state["messages"])
                 feedback_prompt = f"""
                 Here is a reminder of what is the user requested: {self.user_task}
                 Examine the previous executions, reaosning, and solutions.
@@ -1622,11 +1837,74 @@ Each library is listed with its description to help you understand its functiona
         self.app.checkpointer = self.checkpointer
         # display(Image(self.app.get_graph().draw_mermaid_png()))
 
-    def go(self, prompt):
+    def _context_view(self, messages):
+        """Messages to send to the LLM for this step, compacted to the context budget."""
+        compactor = self._context_compactor
+        if compactor is None:
+            return messages
+        compactions = compactor.stats["compactions"]
+        view = compactor.compact(messages)
+        if compactor.stats["compactions"] != compactions:
+            self._log(
+                "CONTEXT",
+                "🗜️",
+                f"Compacted conversation to {compactor.stats['last_chars']:,} characters "
+                f"({compactor.stats['digested']} messages digested, {compactor.stats['folded']} folded)",
+            )
+        return view
+
+    def get_observation(self, observation_id: str) -> str | None:
+        """Full output of an execution step (e.g. "obs-3"), including text cut from the context."""
+        return self.observation_store.get(observation_id)
+
+    def list_observations(self) -> list[str]:
+        """Ids of the stored execution outputs, oldest first."""
+        return self.observation_store.ids()
+
+    def _answer_cache_namespace(self) -> str:
+        """Answer cache namespace for the current model and resources."""
+        custom = [
+            [f"{kind}:{name}" for name in getattr(self, attr, None) or {}]
+            for kind, attr in (("tool", "_custom_tools"), ("data", "_custom_data"), ("software", "_custom_software"))
+        ]
+        resources = resource_fingerprint(
+            [tool["name"] for tool in self.tool_registry.tools] if self.tool_registry is not None else [],
+            self.data_lake_dict,
+            self.library_content_dict,
+            [item for group in custom for item in group],
+            [f"use_tool_retriever={self.use_tool_retriever}", f"retrieval_mode={self.retrieval_mode}"],
+        )
+        return AnswerCache.namespace(self.model_name, resources)
+
+    def _serve_cached_answer(self, prompt, cached, start_time, token_usage_before):
+        """Return a cached answer from ``go`` with a "served from cache" marker in the log and trace."""
+        stored = datetime.fromtimestamp(cached["stored_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        detail = "exact match" if cached["match"] == "exact" else f"similarity {cached['similarity']:.3f}"
+        marker = f"[Served from cache] Answer originally generated {stored} for: {cached['prompt']} ({detail})"
+
+        self.log = [marker] + cached["log"]
+        self.intermediate_outputs = [
+            {
+                "step": 0,
+                "message_type": "CachedAnswer",
+                "content": marker,
+                "timestamp": datetime.now().strftime("%Y%m%d %H:%M:%S.%f")[:-3],
+            }
+        ] + [{**output, "cached": True} for output in cached["intermediate_outputs"]]
+        self.current_step = len(cached["intermediate_outputs"])
+        self.last_answer_cache_hit = {key: cached[key] for key in ("prompt", "stored_at", "match", "similarity")}
+
+        self._log_question_token_usage(prompt, token_usage_before, self.token_logger.get_token_summary())
+        self._log("EXEC", "💾", marker)
+        self._log("EXEC", "⏱️", f"Total execution time: {time.time() - start_time:.2f} seconds")
+        return self.log, cached["solution"]
+
+    def go(self, prompt, use_cache: bool = True):
         """Execute the agent with the given prompt.
 
         Args:
             prompt: The user's query
+            use_cache: Look up and store the answer in the answer cache, if the agent has one
 
         """
         # Record start time
@@ -1642,6 +1920,7 @@ Each library is listed with its description to help you understand its functiona
         self._log("EXEC", "📝", f"User prompt: {prompt[:100]}{'...' if len(prompt) > 100 else ''}")
         self._log("TOKEN", "📊", f"问题 #{self.session_token_stats['questions_asked']} 开始执行 - 累计tokens: {token_usage_before.get('total_tokens', 0):,}")
             
+        self._ensure_configured()
         self.critic_count = 0
         self.user_task = prompt
         self.stop_execution = False  # Reset stop flag at start
@@ -1649,6 +1928,19 @@ Each library is listed with its description to help you understand its functiona
         # Initialize real-time execution tracking
         self.current_step = 0
         self.intermediate_outputs = []  # Store intermediate outputs for real-time access
+        self.last_answer_cache_hit = None
+        self._context_compactor = (
+            ContextCompactor(max_chars=self.context_budget_tokens * CHARS_PER_TOKEN)
+            if self.context_budget_tokens
+            else None
+        )
+
+        answer_cache = self.answer_cache if use_cache else None
+        if answer_cache is not None:
+            cache_namespace = self._answer_cache_namespace()
+            cached = answer_cache.lookup(cache_namespace, prompt)
+            if cached is not None:
+                return self._serve_cached_answer(prompt, cached, start_time, token_usage_before)
 
         if self.use_tool_retriever:
             if self.stop_execution:
@@ -1668,10 +1960,8 @@ Each library is listed with its description to help you understand its functiona
             self._log("EXEC", "🔧", f"Available tools: {len(all_tools)}")
 
             # 2. Data lake items with descriptions
-            data_lake_path = self.path + "/data_lake"
-            data_lake_content = glob.glob(data_lake_path + "/*")
-            data_lake_items = [x.split("/")[-1] for x in data_lake_content]
-            
+            data_lake_items = list_data_lake_items(self.path + "/data_lake")
+
             self._log("EXEC", "📊", f"Data lake items: {len(data_lake_items)}")
 
             # Create data lake descriptions for retrieval
@@ -1718,11 +2008,24 @@ Each library is listed with its description to help you understand its functiona
                 self._log("EXEC", "⏱️", f"Total execution time: {total_time:.2f} seconds")
                 return [], "Execution stopped by user"
             
-            self._log("EXEC", "🔍", "Starting prompt-based resource retrieval...")
-                
-            # Use prompt-based retrieval with the agent's LLM
-            selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
-            print("Using prompt-based retrieval with the agent's LLM")
+            if self.retrieval_mode == "embedding":
+                self._log("EXEC", "🔍", "Starting embedding-based resource retrieval...")
+
+                # Use the local vector index, optionally reranking the shortlist with the agent's LLM
+                selected_resources = self.retriever.embedding_based_retrieval(
+                    prompt,
+                    resources,
+                    top_k=self.retrieval_top_k,
+                    llm=self.llm,
+                    rerank=self.retrieval_rerank,
+                )
+                print("Using embedding-based retrieval with a local vector index")
+            else:
+                self._log("EXEC", "🔍", "Starting prompt-based resource retrieval...")
+
+                # Use prompt-based retrieval with the agent's LLM
+                selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
+                print("Using prompt-based retrieval with the agent's LLM")
             
             self._log("EXEC", "✅", f"Selected {len(selected_resources['tools'])} tools, {len(selected_resources['data_lake'])} data items, {len(selected_resources['libraries'])} libraries")
 
@@ -1819,6 +2122,11 @@ Each library is listed with its description to help you understand its functiona
         self._log("TOKEN", "📊", f"问题完成后 - 累计tokens: {token_usage_after.get('total_tokens', 0):,}")
         self._log("TOKEN", "🔥", f"本问题消耗tokens: {question_record['tokens_used_for_question']:,}")
 
+        # Only runs that reached a solution are worth serving again
+        if answer_cache is not None and "<solution>" in str(message.content):
+            answer_cache.store(cache_namespace, prompt, message.content, self.log, self.intermediate_outputs)
+            self._log("EXEC", "💾", "Answer stored in the answer cache")
+
         return self.log, message.content
     
     def get_intermediate_outputs(self) -> list:
@@ -1922,15 +2230,17 @@ Each library is listed with its description to help you understand its functiona
             for name, info in self._custom_software.items():
                 custom_software.append({"name": name, "description": info["description"]})
 
-        self.system_prompt = self._generate_system_prompt(
-            tool_desc=tool_desc,
-            data_lake_content=data_lake_with_desc,
-            library_content_list=selected_resources["libraries"],
-            self_critic=getattr(self, "self_critic", False),
-            is_retrieval=True,
-            custom_tools=custom_tools if custom_tools else None,
-            custom_data=custom_data if custom_data else None,
-            custom_software=custom_software if custom_software else None,
+        self._set_system_prompt(
+            *self._generate_system_prompt_parts(
+                tool_desc=tool_desc,
+                data_lake_content=data_lake_with_desc,
+                library_content_list=selected_resources["libraries"],
+                self_critic=getattr(self, "self_critic", False),
+                is_retrieval=True,
+                custom_tools=custom_tools if custom_tools else None,
+                custom_data=custom_data if custom_data else None,
+                custom_software=custom_software if custom_software else None,
+            )
         )
 
         # Print the raw system prompt for debugging
@@ -1963,6 +2273,11 @@ Each library is listed with its description to help you understand its functiona
         This makes custom tools available during code execution.
         """
         if hasattr(self, "_custom_functions") and self._custom_functions:
+            if self.repl_mode == "process":
+                # Functions are pickled into this session's worker; unpicklable ones are skipped
+                self._repl_pool.inject(self.session_id, self._custom_functions)
+                return
+
             # Access the persistent namespace used by run_python_repl
             from biomni.tool.support_tools import _persistent_namespace
 
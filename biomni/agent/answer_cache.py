@@ -0,0 +1,270 @@
+"""Cross-session cache of final ``A1.go`` answers.
+
+Answers are stored in a SQLite file (``$BIOMNI_CACHE_DIR/answer_cache.sqlite3``) together with
+the step log and ``intermediate_outputs`` trace of the run that produced them. Entries live in
+a namespace keyed on the model and a fingerprint of the agent's resources (tools, data lake,
+libraries and custom additions), so adding a tool or switching models never serves an old answer.
+
+Lookups are exact on the normalized prompt (case, whitespace and trailing punctuation ignored)
+and, when sentence-transformers is installed, fall back to the most similar cached prompt above
+a cosine threshold. A similar prompt is only accepted when it mentions the same identifiers
+(words containing digits or capitals, e.g. ``TP53``, ``BRCA1``, ``rs1042522``) as the query,
+since "what does TP53 do" and "what does TP63 do" embed almost identically.
+
+Entries expire after a TTL and the least recently used ones are evicted beyond ``max_entries``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_SIMILARITY = 0.92
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    identifiers TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    log TEXT NOT NULL,
+    intermediate_outputs TEXT NOT NULL,
+    embedding BLOB,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_namespace ON answers (namespace);
+CREATE INDEX IF NOT EXISTS answers_last_access ON answers (last_access);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+_IDENTIFIER = re.compile(r"\b(?:\w*\d\w*|\w*[A-Z]\w*[A-Z]\w*)\b")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Casefolded prompt with collapsed whitespace and no trailing punctuation."""
+    return _WHITESPACE.sub(" ", prompt.casefold()).strip().rstrip("?.!; ").strip()
+
+
+def prompt_identifiers(prompt: str) -> list[str]:
+    """Gene, variant and accession-like words of a prompt, casefolded and sorted."""
+    return sorted({word.casefold() for word in _IDENTIFIER.findall(prompt)})
+
+
+def resource_fingerprint(*resource_groups) -> str:
+    """Hash of the names in each resource group (order-insensitive within a group)."""
+    payload = json.dumps([sorted(str(name) for name in group) for group in resource_groups])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _key(namespace: str, normalized: str) -> str:
+    return hashlib.sha256(f"{namespace}\n{normalized}".encode()).hexdigest()
+
+
+class AnswerCache:
+    """SQLite-backed answer cache with exact and embedding-similarity lookups.
+
+    Args:
+        path: SQLite file; None uses ``$BIOMNI_CACHE_DIR/answer_cache.sqlite3``
+        ttl: Seconds an answer stays valid
+        max_entries: Least recently used answers are evicted beyond this many
+        similarity_threshold: Minimum cosine similarity for a non-exact hit; None disables
+            similarity lookups
+        embedding_model: sentence-transformers model used for similarity lookups
+
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        similarity_threshold: float | None = DEFAULT_SIMILARITY,
+        embedding_model: str | None = None,
+    ):
+        if path is None:
+            cache_dir = os.getenv("BIOMNI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "biomni"))
+            path = os.path.join(cache_dir, "answer_cache.sqlite3")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._embeddings_available = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _embed(self, text: str) -> np.ndarray | None:
+        """Normalized embedding of ``text``, or None if similarity lookups are unavailable."""
+        if self.similarity_threshold is None:
+            return None
+        from biomni.model.vector_index import DEFAULT_EMBEDDING_MODEL, embedding_backend_available, get_embedding_model
+
+        if self._embeddings_available is None:
+            self._embeddings_available = embedding_backend_available()
+        if not self._embeddings_available:
+            return None
+        model = get_embedding_model(self.embedding_model or DEFAULT_EMBEDDING_MODEL)
+        vector = model.encode([text], normalize_embeddings=True, show_progress_bar=False)[0]
+        return np.asarray(vector, dtype=np.float32)
+
+    @staticmethod
+    def namespace(model: str, resources: str) -> str:
+        return hashlib.sha256(f"{model}\n{resources}".encode()).hexdigest()[:16]
+
+    def lookup(self, namespace: str, prompt: str) -> dict | None:
+        """Cached answer for ``prompt`` in ``namespace``, or None.
+
+        Returns:
+            Dict with ``solution``, ``log``, ``intermediate_outputs``, ``prompt`` (the cached
+            prompt), ``stored_at``, ``match`` (``"exact"`` or ``"similar"``) and ``similarity``
+
+        """
+        normalized = normalize_prompt(prompt)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT key, prompt, solution, log, intermediate_outputs, stored_at FROM answers "
+                "WHERE key = ? AND expires_at > ?",
+                (_key(namespace, normalized), now),
+            ).fetchone()
+        match, similarity = "exact", 1.0
+
+        if row is None:
+            vector = self._embed(normalized)
+            if vector is not None:
+                identifiers = json.dumps(prompt_identifiers(prompt))
+                with self._lock:
+                    candidates = (
+                        self._connection()
+                        .execute(
+                            "SELECT key, embedding FROM answers WHERE namespace = ? AND identifiers = ? "
+                            "AND expires_at > ? AND embedding IS NOT NULL",
+                            (namespace, identifiers, now),
+                        )
+                        .fetchall()
+                    )
+                candidates = [(key, blob) for key, blob in candidates if len(blob) == vector.nbytes]
+                if candidates:
+                    matrix = np.frombuffer(b"".join(blob for _, blob in candidates), dtype=np.float32)
+                    scores = matrix.reshape(len(candidates), -1) @ vector
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        match, similarity = "similar", float(scores[best])
+                        with self._lock:
+                            row = (
+                                self._connection()
+                                .execute(
+                                    "SELECT key, prompt, solution, log, intermediate_outputs, stored_at "
+                                    "FROM answers WHERE key = ?",
+                                    (candidates[best][0],),
+                                )
+                                .fetchone()
+                            )
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        key, cached_prompt, solution, log, intermediate_outputs, stored_at = row
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE answers SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            conn.commit()
+        self.stats[f"{match}_hits"] += 1
+        return {
+            "solution": solution,
+            "log": json.loads(log),
+            "intermediate_outputs": json.loads(intermediate_outputs),
+            "prompt": cached_prompt,
+            "stored_at": stored_at,
+            "match": match,
+            "similarity": similarity,
+        }
+
+    def store(self, namespace: str, prompt: str, solution: str, log: list, intermediate_outputs: list):
+        normalized = normalize_prompt(prompt)
+        vector = self._embed(normalized)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    _key(namespace, normalized),
+                    namespace,
+                    prompt,
+                    normalized,
+                    json.dumps(prompt_identifiers(prompt)),
+                    solution,
+                    json.dumps(log, default=str),
+                    json.dumps(intermediate_outputs, default=str),
+                    sqlite3.Binary(vector.tobytes()) if vector is not None else None,
+                    now,
+                    now + self.ttl,
+                    now,
+                ),
+            )
+            self._evict(conn, now)
+            conn.commit()
+        self.stats["stores"] += 1
+
+    def _evict(self, conn, now: float):
+        evicted = conn.execute("DELETE FROM answers WHERE expires_at <= ?", (now,)).rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        if count > self.max_entries:
+            evicted += conn.execute(
+                "DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        self.stats["evictions"] += evicted
+
+    def clear(self, namespace: str | None = None):
+        with self._lock:
+            conn = self._connection()
+            if namespace is None:
+                conn.execute("DELETE FROM answers")
+            else:
+                conn.execute("DELETE FROM answers WHERE namespace = ?", (namespace,))
+            conn.commit()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._connection().execute("SELECT COUNT(*) FROM answers").fetchone()
+        return {**self.stats, "entries": entries, "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Return the process-wide answer cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache()
+    return _cache
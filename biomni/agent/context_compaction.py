@@ -0,0 +1,185 @@
+"""Bounded conversation context for the A1 generate/execute loop.
+
+Every ``generate`` step used to send the system prompt plus the whole message history, and each
+observation can add 10,000 characters, so prompts grew with every step. ``ContextCompactor``
+builds the message list actually sent to the LLM (``state["messages"]`` itself is untouched, so
+logs and traces keep everything):
+
+- while the conversation fits the budget it is sent unchanged;
+- above the budget, the oldest steps (never the task message, never the most recent
+  ``keep_recent`` messages) are replaced with short digests (head and tail excerpts plus
+  the observation id) until the conversation is back under ``target_ratio`` of the budget;
+- if digests alone are not enough, the oldest digests are folded into a single note.
+
+Compaction works in batches down to the lower target, so the compacted prefix stays identical
+between compactions and provider prompt caching keeps working. Full observation text (before
+the 10,000 character truncation) is kept in an ``ObservationStore``, spilled to disk beyond a
+memory budget, and can be read back with ``A1.get_observation``; observation messages carry
+their store id as the message ``id``.
+
+Sizes are measured in characters; ``CHARS_PER_TOKEN`` converts token budgets.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+CHARS_PER_TOKEN = 4
+DEFAULT_BUDGET_TOKENS = 32_000
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+
+class ObservationStore:
+    """Full observation texts by id, kept in memory up to ``max_memory_bytes`` and then on disk."""
+
+    def __init__(self, max_memory_bytes: int = DEFAULT_MEMORY_BYTES):
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled = {}
+        self._directory = None
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._spilled)
+
+    def __contains__(self, observation_id: str) -> bool:
+        return observation_id in self._memory or observation_id in self._spilled
+
+    def add(self, text: str) -> str:
+        observation_id = f"obs-{self._next_id}"
+        self._next_id += 1
+        self._memory[observation_id] = text
+        self._memory_bytes += len(text)
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            self._spill(*self._memory.popitem(last=False))
+        return observation_id
+
+    def _spill(self, observation_id: str, text: str):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="biomni-observations-")
+        path = os.path.join(self._directory, f"{observation_id}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self._memory_bytes -= len(text)
+        self._spilled[observation_id] = path
+
+    def get(self, observation_id: str) -> str | None:
+        if observation_id in self._memory:
+            return self._memory[observation_id]
+        path = self._spilled.get(observation_id)
+        if path is None:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def ids(self) -> list[str]:
+        return sorted(self, key=lambda observation_id: int(observation_id.split("-")[1]))
+
+    def __iter__(self):
+        yield from self._memory
+        yield from self._spilled
+
+    def clear(self):
+        self._memory.clear()
+        self._spilled.clear()
+        self._memory_bytes = 0
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+
+def digest(message: BaseMessage, head_chars: int = 300, tail_chars: int = 150) -> BaseMessage:
+    """Short stand-in for an old message: its first and last characters and where to find the rest."""
+    text = _text(message)
+    observation_id = message.id if (message.id or "").startswith("obs-") else None
+    if len(text) <= head_chars + tail_chars + 80:
+        return message
+    omitted = len(text) - head_chars - tail_chars
+    where = f"; full text: {observation_id}" if observation_id else ""
+    body = f"{text[:head_chars]}\n[... {omitted:,} characters compacted{where} ...]\n{text[-tail_chars:]}"
+    if text.startswith("<observation>") and not body.endswith("</observation>"):
+        body += "</observation>"
+    return message.__class__(content=body, id=message.id)
+
+
+class ContextCompactor:
+    """Builds a size-bounded view of one task's message history.
+
+    Args:
+        max_chars: Budget for the conversation (the system prompt is not counted)
+        target_ratio: After compacting, the view is at most ``target_ratio * max_chars``
+        keep_recent: Number of latest messages that are always sent in full
+        head_chars: Characters kept from the start of a compacted message
+        tail_chars: Characters kept from the end of a compacted message
+
+    """
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_BUDGET_TOKENS * CHARS_PER_TOKEN,
+        target_ratio: float = 0.6,
+        keep_recent: int = 4,
+        head_chars: int = 300,
+        tail_chars: int = 150,
+    ):
+        self.max_chars = max_chars
+        self.target_ratio = target_ratio
+        self.keep_recent = keep_recent
+        self.head_chars = head_chars
+        self.tail_chars = tail_chars
+        self._digests = {}
+        self._folded_upto = 1  # messages[1:_folded_upto] are replaced by a single note
+        self.stats = {"compactions": 0, "digested": 0, "folded": 0, "last_chars": 0, "max_sent_chars": 0}
+
+    def _note(self) -> BaseMessage:
+        return AIMessage(
+            content=f"[The first {self._folded_upto - 1} messages after the task were compacted to fit the context "
+            "budget. Variables and files they created still exist; their full outputs are in the observation store.]"
+        )
+
+    def _view(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        view = messages[:1]
+        if self._folded_upto > 1:
+            view.append(self._note())
+        for i in range(self._folded_upto, len(messages)):
+            view.append(self._digests.get(i, messages[i]))
+        return view
+
+    def compact(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        """Messages to send to the LLM in place of ``messages``."""
+        view = self._view(messages)
+        total = sum(len(_text(message)) for message in view)
+        if total > self.max_chars:
+            self.stats["compactions"] += 1
+            target = self.max_chars * self.target_ratio
+            protected = len(messages) - self.keep_recent
+            for i in range(self._folded_upto, protected):
+                if total <= target:
+                    break
+                if i not in self._digests:
+                    short = digest(messages[i], self.head_chars, self.tail_chars)
+                    total -= len(_text(messages[i])) - len(_text(short))
+                    self._digests[i] = short
+                    self.stats["digested"] += 1
+            while total > target and self._folded_upto < protected:
+                total -= len(_text(self._digests.pop(self._folded_upto, messages[self._folded_upto])))
+                if self._folded_upto == 1:
+                    total += len(_text(self._note()))
+                self._folded_upto += 1
+                self.stats["folded"] += 1
+            view = self._view(messages)
+            total = sum(len(_text(message)) for message in view)
+        self.stats["last_chars"] = total
+        self.stats["max_sent_chars"] = max(self.stats["max_sent_chars"], total)
+        return view
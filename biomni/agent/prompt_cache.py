@@ -0,0 +1,111 @@
+"""Caches used when assembling the A1 system prompt.
+
+``A1.configure`` runs again after every ``add_tool``/``add_data``/``add_software``/``add_mcp``
+call and ``go`` rebuilds the prompt for every retrieval, so the expensive pieces are
+memoized here: item wrapping, per-module tool rendering and the data lake listing.
+"""
+
+import glob
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+from biomni.utils import textify_api_dict
+
+
+@lru_cache(maxsize=8192)
+def format_item_with_description(name, description):
+    """Format an item with its description in a readable way."""
+    # Handle None or empty descriptions
+    if not description:
+        description = f"Data lake item: {name}"
+
+    # Check if the item is already formatted (contains a colon)
+    if isinstance(name, str) and ": " in name:
+        return name
+
+    # Wrap long descriptions to make them more readable
+    max_line_length = 80
+    if len(description) > max_line_length:
+        # Simple wrapping for long descriptions
+        wrapped_desc = []
+        words = description.split()
+        current_line = ""
+
+        for word in words:
+            if len(current_line) + len(word) + 1 <= max_line_length:
+                if current_line:
+                    current_line += " " + word
+                else:
+                    current_line = word
+            else:
+                wrapped_desc.append(current_line)
+                current_line = word
+
+        if current_line:
+            wrapped_desc.append(current_line)
+
+        # Join with newlines and proper indentation
+        formatted_desc = f"{name}:\n  " + "\n  ".join(wrapped_desc)
+        return formatted_desc
+    else:
+        return f"{name}: {description}"
+
+
+class ToolDescRenderer:
+    """Render ``{module: [api, ...]}`` tool descriptions, re-rendering only modules that changed.
+
+    A module's text is keyed on the module's version and the names of the APIs being rendered
+    (retrieval renders subsets). Code that edits, adds or removes a module's API dicts calls
+    ``bump(module)``, as ``A1.add_tool``, ``A1.remove_tool`` and ``A1.add_mcp`` do.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self, module):
+        """Mark ``module``'s API dicts as changed."""
+        self._versions[module] = self._versions.get(module, 0) + 1
+
+    def render(self, tool_desc: dict) -> str:
+        parts = []
+        for module, apis in tool_desc.items():
+            key = (module, self._versions.get(module, 0), tuple(api.get("name") for api in apis))
+            text = self._cache.get(key)
+            if text is None:
+                self.misses += 1
+                text = textify_api_dict({module: apis})
+                self._cache[key] = text
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+            parts.append(text)
+        # Identical to textify_api_dict(tool_desc): each module's block is joined by a newline
+        return "\n".join(parts)
+
+    def invalidate(self):
+        self._cache.clear()
+
+
+_data_lake_listing = {}
+
+
+def list_data_lake_items(data_lake_path: str) -> list[str]:
+    """List file names in the data lake, re-globbing only when the directory changes."""
+    try:
+        mtime = os.stat(data_lake_path).st_mtime_ns
+    except OSError:
+        return []
+    cached = _data_lake_listing.get(data_lake_path)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+    # Skip partial downloads (see biomni.download)
+    items = [x.split("/")[-1] for x in glob.glob(data_lake_path + "/*") if not x.endswith(".part")]
+    _data_lake_listing[data_lake_path] = (mtime, items)
+    return list(items)
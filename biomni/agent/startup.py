@@ -0,0 +1,98 @@
+"""Background start-up work for ``A1(fast_start=True)``.
+
+With fast start the agent returns from ``__init__`` before the data lake is provisioned and
+before the tool description modules are imported. That work runs on daemon threads and is
+only awaited by the code that needs its result.
+"""
+
+import threading
+import time
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+_shared_tasks = {}
+_shared_tasks_lock = threading.Lock()
+
+
+class StartupTask:
+    """Run ``fn`` once on a daemon thread and keep its result, error and timing."""
+
+    def __init__(self, name: str, fn):
+        self.name = name
+        self._fn = fn
+        self._done = threading.Event()
+        self._thread = None
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self) -> "StartupTask":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"biomni-startup-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        self.started_at = time.perf_counter()
+        try:
+            self.result = self._fn()
+        except BaseException as e:  # surfaced to whoever waits on the task
+            self.error = e
+        finally:
+            self.finished_at = time.perf_counter()
+            self._done.set()
+
+    @property
+    def state(self) -> str:
+        if self._done.is_set():
+            return FAILED if self.error is not None else READY
+        return RUNNING if self.started_at is not None else PENDING
+
+    @property
+    def seconds(self) -> float | None:
+        """Run time so far (or in total once finished)."""
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None):
+        """Block until the task has finished and return its result, re-raising its error.
+
+        Raises:
+            TimeoutError: If the task is still running after ``timeout`` seconds
+
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Start-up task '{self.name}' did not finish within {timeout} seconds")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+
+def shared_task(key, name: str, fn) -> StartupTask:
+    """Start ``fn`` unless a task with the same key is already running or has succeeded.
+
+    Agents created concurrently for the same data directory share one provisioning task
+    instead of downloading the same files into the same ``.part`` paths.
+    """
+    with _shared_tasks_lock:
+        task = _shared_tasks.get(key)
+        if task is None or task.state == FAILED:
+            task = StartupTask(name, fn).start()
+            _shared_tasks[key] = task
+        return task
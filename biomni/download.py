@@ -0,0 +1,308 @@
+"""Parallel, resumable, verified file downloads for the data lake and benchmark.
+
+Files are streamed into ``<name>.part`` with large buffers, resumed with HTTP Range
+requests after an interruption, verified against the server's size/ETag (or a caller
+supplied manifest with sizes and MD5 checksums) and atomically renamed into place.
+Verified files are recorded in a local manifest so later runs can trust them with a
+single ``stat`` instead of treating any existing path as complete.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import tqdm
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".biomni_download_manifest.json"
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB streaming buffer
+DEFAULT_TIMEOUT = (10, 60)  # (connect, read) seconds
+_MD5_ETAG = re.compile(r"^[0-9a-f]{32}$")
+
+
+class DownloadError(Exception):
+    """Raised when a file cannot be downloaded or fails verification."""
+
+
+def _md5_of_file(path, chunk_size=8 * DEFAULT_CHUNK_SIZE):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clean_etag(etag):
+    if not etag:
+        return None
+    return etag.strip().removeprefix("W/").strip('"')
+
+
+class DownloadManifest:
+    """Thread-safe JSON record of files that were downloaded and verified in a directory."""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, filename):
+        with self._lock:
+            return self.entries.get(filename)
+
+    def record(self, filename, **info):
+        with self._lock:
+            self.entries[filename] = {**info, "verified_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def is_complete(self, filename, file_path):
+        """True if the file on disk still matches what was verified earlier."""
+        entry = self.get(filename)
+        if not entry or not os.path.exists(file_path):
+            return False
+        return entry.get("size") is None or os.path.getsize(file_path) == entry["size"]
+
+
+class ParallelDownloader:
+    """Download many files concurrently with resume and verification.
+
+    Args:
+        max_workers: Number of concurrent downloads
+        chunk_size: Streaming buffer size in bytes
+        max_retries: Attempts per file; each retry resumes from the bytes already on disk
+        verify_checksum: If True, verify MD5 when the manifest or a single-part S3 ETag provides one
+        timeout: requests timeout, as seconds or a (connect, read) tuple
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_retries: int = 5,
+        verify_checksum: bool = True,
+        timeout=DEFAULT_TIMEOUT,
+        show_progress: bool = True,
+    ):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.verify_checksum = verify_checksum
+        self.timeout = timeout
+        self.show_progress = show_progress
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def probe(self, url):
+        """Return ``{"size", "etag"}`` for a remote file from a HEAD request."""
+        response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+        response.raise_for_status()
+        length = response.headers.get("content-length")
+        return {
+            "size": int(length) if length is not None else None,
+            "etag": _clean_etag(response.headers.get("etag")),
+        }
+
+    def _stream_to_part(self, url, part_path, remote, pbar):
+        """Fetch the missing bytes of ``part_path``; returns once the server has sent everything."""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {}
+        if offset:
+            if remote.get("size") is not None and offset >= remote["size"]:
+                return
+            headers["Range"] = f"bytes={offset}-"
+            if remote.get("etag"):
+                # If the remote file changed since the partial download, the server sends the whole new file
+                headers["If-Range"] = f'"{remote["etag"]}"'
+
+        with self.session.get(url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch; verification decides whether the part file is usable
+                return
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # Server ignored the Range request: restart from scratch
+                if pbar is not None:
+                    pbar.update(-offset)
+                offset = 0
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        if pbar is not None:
+                            pbar.update(len(chunk))
+
+    def _verify(self, part_path, remote, expected):
+        size = os.path.getsize(part_path)
+        expected_size = (expected or {}).get("size", remote.get("size"))
+        if expected_size is not None and size != expected_size:
+            raise DownloadError(f"size mismatch: got {size} bytes, expected {expected_size}")
+
+        md5 = (expected or {}).get("md5")
+        if md5 is None and remote.get("etag") and _MD5_ETAG.match(remote["etag"]):
+            # Single-part S3 uploads use the content MD5 as ETag
+            md5 = remote["etag"]
+        if self.verify_checksum and md5:
+            actual = _md5_of_file(part_path)
+            if actual != md5:
+                raise DownloadError(f"checksum mismatch: got {actual}, expected {md5}")
+            return actual
+        return None
+
+    def download(self, url, dest_path, remote=None, expected=None, pbar=None):
+        """Download ``url`` to ``dest_path`` via ``dest_path + '.part'``, resuming and verifying.
+
+        Returns:
+            The manifest entry for the verified file
+
+        """
+        part_path = dest_path + ".part"
+        last_error = None
+        for attempt in range(self.max_retries):
+            try:
+                if remote is None:
+                    remote = self.probe(url)
+                self._stream_to_part(url, part_path, remote, pbar)
+                md5 = self._verify(part_path, remote, expected)
+                os.replace(part_path, dest_path)
+                return {"size": os.path.getsize(dest_path), "etag": remote.get("etag"), "md5": md5, "url": url}
+            except DownloadError as e:
+                # Corrupt or stale partial data: discard it and start over
+                last_error = e
+                if pbar is not None and os.path.exists(part_path):
+                    pbar.update(-os.path.getsize(part_path))
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                remote = None
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and 400 <= status < 500 and status not in (408, 429):
+                    raise DownloadError(f"failed to download {url}: {e}") from e
+                last_error = e
+            except (requests.RequestException, OSError) as e:
+                # Network failure: keep the partial file and resume on the next attempt
+                last_error = e
+            time.sleep(min(2**attempt, 30))
+        raise DownloadError(f"failed to download {url} after {self.max_retries} attempts: {last_error}")
+
+    def download_many(self, tasks, manifest: DownloadManifest | None = None, desc: str = "Downloading") -> dict:
+        """Download ``[(filename, url, dest_path, expected_or_None), ...]`` concurrently.
+
+        Returns:
+            Dictionary mapping file names to download success status
+
+        """
+        results = {}
+        if not tasks:
+            return results
+
+        # Probe all files first so the progress bar knows the total amount of work
+        remotes = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.probe, url): filename for filename, url, _, _ in tasks}
+            for future in as_completed(futures):
+                try:
+                    remotes[futures[future]] = future.result()
+                except requests.RequestException as e:
+                    logger.debug(f"HEAD failed for {futures[future]}: {e}")
+                    remotes[futures[future]] = None
+
+        total = sum((remotes.get(t[0]) or {}).get("size") or 0 for t in tasks)
+        already = sum(os.path.getsize(t[2] + ".part") for t in tasks if os.path.exists(t[2] + ".part"))
+        pbar = None
+        if self.show_progress:
+            pbar = tqdm.tqdm(total=total, initial=min(already, total), unit="B", unit_scale=True, desc=desc, ncols=80)
+
+        def _run(task):
+            filename, url, dest_path, expected = task
+            entry = self.download(url, dest_path, remote=remotes.get(filename), expected=expected, pbar=pbar)
+            if manifest is not None:
+                manifest.record(filename, **entry)
+            return filename
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(_run, task): task[0] for task in tasks}
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    try:
+                        future.result()
+                        results[filename] = True
+                    except DownloadError as e:
+                        print(f"✗ Failed to download {filename}: {e}")
+                        results[filename] = False
+        finally:
+            if pbar is not None:
+                pbar.close()
+        return results
+
+    def find_incomplete(self, tasks, manifest: DownloadManifest) -> list:
+        """Return the tasks whose destination is missing or does not match the remote file.
+
+        Files verified in an earlier run are trusted from the manifest. Files without a manifest
+        entry (e.g. from older versions) are compared against the server's size and recorded
+        if they match. If the server is unreachable they are kept as-is; if it answers with an
+        HTTP error or without a size, they are downloaded again.
+        """
+        pending = []
+        unknown = []
+        for task in tasks:
+            filename, _, dest_path, expected = task
+            if manifest.is_complete(filename, dest_path):
+                entry = manifest.get(filename) or {}
+                if not expected or expected.get("md5") in (None, entry.get("md5")):
+                    continue
+            if os.path.exists(dest_path):
+                unknown.append(task)
+            else:
+                pending.append(task)
+
+        def _check(task):
+            filename, url, dest_path, expected = task
+            try:
+                return task, self.probe(url), None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                return task, None, e
+            except requests.RequestException as e:
+                # The server answered, so the file cannot be trusted without verification
+                return task, {}, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for task, remote, error in pool.map(_check, unknown):
+                filename, url, dest_path, expected = task
+                if remote is None:
+                    logger.debug(f"Keeping {filename}: server unreachable ({error})")
+                    continue
+                expected_size = (expected or {}).get("size", remote.get("size"))
+                if expected_size is None:
+                    # Nothing to compare against: download again, replacing the file only once verified
+                    print(f"Cannot verify {filename}, downloading again...")
+                    pending.append(task)
+                elif os.path.getsize(dest_path) == expected_size:
+                    manifest.record(filename, size=os.path.getsize(dest_path), etag=remote.get("etag"), url=url)
+                else:
+                    print(f"Found incomplete file {filename}, downloading again...")
+                    # Resume from the bytes that were already written
+                    if not os.path.exists(dest_path + ".part"):
+                        os.replace(dest_path, dest_path + ".part")
+                    else:
+                        os.remove(dest_path)
+                    pending.append(task)
+        return pending
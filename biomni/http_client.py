@@ -0,0 +1,224 @@
+"""Shared HTTP client for the database, literature and molecular biology tools.
+
+All requests go through one connection-pooled ``requests.Session`` (keep-alive, no new
+TCP/TLS handshake per call) with default connect/read timeouts, jittered exponential
+backoff on retryable status codes and connection errors, and per-host concurrency and
+rate limits (e.g. NCBI E-utilities: 3 requests/s, or 10 requests/s with ``NCBI_API_KEY``).
+
+Use ``http_get``/``http_post`` as drop-in replacements for ``requests.get``/``requests.post``.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (10, 60)  # (connect, read) seconds
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def ncbi_api_key() -> str | None:
+    """NCBI E-utilities API key from the environment, if configured."""
+    return os.getenv("NCBI_API_KEY") or None
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Limits applied to every request to one host.
+
+    Args:
+        rate: Maximum requests per second (None for unlimited)
+        burst: Number of requests that may be sent back-to-back before ``rate`` applies
+        max_concurrency: Maximum number of requests in flight at once
+
+    """
+
+    rate: float | None = None
+    burst: int = 1
+    max_concurrency: int = 8
+
+
+def default_host_policies() -> dict:
+    """Published rate limits of the APIs the tools query most."""
+    ncbi_rate = 10 if ncbi_api_key() else 3
+    return {
+        "eutils.ncbi.nlm.nih.gov": HostPolicy(rate=ncbi_rate, burst=1, max_concurrency=ncbi_rate),
+        "blast.ncbi.nlm.nih.gov": HostPolicy(rate=1 / 10, burst=1, max_concurrency=1),
+        "rest.ensembl.org": HostPolicy(rate=15, burst=5, max_concurrency=8),
+        "www.ebi.ac.uk": HostPolicy(rate=20, burst=5, max_concurrency=8),
+        "rest.uniprot.org": HostPolicy(rate=20, burst=5, max_concurrency=8),
+        "api.crossref.org": HostPolicy(rate=10, burst=5, max_concurrency=4),
+    }
+
+
+class _HostLimiter:
+    """Token bucket plus concurrency semaphore for one host."""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self._semaphore = threading.BoundedSemaphore(policy.max_concurrency)
+        self._lock = threading.Lock()
+        self._tokens = float(policy.burst)
+        self._updated = time.monotonic()
+
+    def _take_token(self):
+        if self.policy.rate is None:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.policy.burst, self._tokens + (now - self._updated) * self.policy.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.policy.rate
+            time.sleep(wait)
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        try:
+            self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+
+
+def _retry_after_seconds(response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """Connection-pooled HTTP client with retries, timeouts and per-host limits.
+
+    Args:
+        max_retries: Retries after the first attempt for retryable status codes and connection errors
+        backoff_factor: Base delay in seconds; attempt ``n`` waits up to ``backoff_factor * 2**n`` (full jitter)
+        max_backoff: Upper bound for a single backoff delay in seconds
+        timeout: Default requests timeout, as seconds or a (connect, read) tuple
+        pool_maxsize: Connections kept alive per host
+        host_policies: Overrides for ``default_host_policies()``, keyed by host name
+        default_policy: Policy for hosts without an explicit entry
+
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout=DEFAULT_TIMEOUT,
+        pool_maxsize: int = 16,
+        host_policies: dict | None = None,
+        default_policy: HostPolicy | None = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.host_policies = {**default_host_policies(), **(host_policies or {})}
+        self.default_policy = default_policy or HostPolicy()
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _limiter(self, url: str) -> _HostLimiter:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = _HostLimiter(self.host_policies.get(host, self.default_policy))
+                self._limiters[host] = limiter
+            return limiter
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+        if response is not None:
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request like ``requests.request``, retrying transient failures.
+
+        The last response is returned even if its status is still retryable, so callers can
+        keep using ``raise_for_status``/``response.ok`` as before.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        limiter = self._limiter(url)
+        attempt = 0
+        while True:
+            try:
+                with limiter:
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.debug(f"{method} {url} failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                logger.debug(f"{method} {url} returned {response.status_code}; retrying in {delay:.1f}s")
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide shared client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """``requests.get`` through the shared client."""
+    return get_http_client().get(url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """``requests.post`` through the shared client."""
+    return get_http_client().post(url, **kwargs)
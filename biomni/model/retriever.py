@@ -4,12 +4,63 @@ import re
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 
+# Default shortlist sizes per category for embedding-based retrieval
+DEFAULT_TOP_K = {"tools": 30, "data_lake": 10, "libraries": 15}
+
 
 class ToolRetriever:
-    """Retrieve tools from the tool registry."""
+    """Retrieve tools from the tool registry.
+
+    Args:
+        index_dir: Directory used to persist the vector index for embedding-based retrieval
+        backend: Vector index backend for embedding-based retrieval: "embedding", "bm25" or "auto"
+
+    """
+
+    def __init__(self, index_dir: str | None = None, backend: str = "auto"):
+        self.index_dir = index_dir
+        self.backend = backend
+        self._vector_index = None
+
+    def embedding_based_retrieval(
+        self, query: str, resources: dict, top_k: dict | int | None = None, llm=None, rerank: bool = False
+    ) -> dict:
+        """Retrieve the most relevant resources with a local vector index instead of a full LLM call.
+
+        The index is built once per corpus and persisted to ``index_dir``; later calls only embed the query.
+
+        Args:
+            query: The user's query
+            resources: A dictionary with keys 'tools', 'data_lake', and 'libraries',
+                      each containing a list of available resources
+            top_k: Number of items to keep per category (an int applies to all categories)
+            llm: LLM instance used for reranking when rerank is True
+            rerank: If True, let the LLM select from the shortlist with the prompt-based approach
+
+        Returns:
+            A dictionary with the same keys, but containing only the most relevant resources
+
+        """
+        from biomni.model.vector_index import ResourceVectorIndex
+
+        if isinstance(top_k, int):
+            top_k = dict.fromkeys(DEFAULT_TOP_K, top_k)
+        top_k = {**DEFAULT_TOP_K, **(top_k or {})}
+
+        if self._vector_index is None:
+            self._vector_index = ResourceVectorIndex(index_dir=self.index_dir, backend=self.backend)
+        self._vector_index.update(resources)
+        selected_indices = self._vector_index.search(query, top_k)
+
+        shortlist = {
+            category: [resources.get(category, [])[i] for i in selected_indices[category]]
+            for category in ("tools", "data_lake", "libraries")
+        }
 
-    def __init__(self):
-        pass
+        if rerank and llm is not None:
+            # The LLM only sees the shortlist, which keeps the rerank prompt small
+            return self.prompt_based_retrieval(query, shortlist, llm=llm)
+        return shortlist
 
     def prompt_based_retrieval(self, query: str, resources: dict, llm=None) -> dict:
         """Use a prompt-based approach to retrieve the most relevant resources for a query.
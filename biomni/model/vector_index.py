@@ -0,0 +1,292 @@
+"""Local, persistent vector indexes for resource retrieval.
+
+Two backends are available:
+
+- ``"embedding"``: dense vectors from a local CPU sentence-transformers model
+  (optional dependency), searched with a single matrix-vector product.
+- ``"bm25"``: a sparse BM25 inverted index in CSR layout that needs nothing beyond numpy.
+
+``ResourceVectorIndex`` keeps one index per resource category (tools, data lake,
+libraries) and persists them under a directory keyed by a fingerprint of the corpus,
+so the corpus is only encoded again when it actually changes. Indexes of an earlier corpus
+are deleted when a category is rebuilt.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+CATEGORIES = ("tools", "data_lake", "libraries")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_INDEX_FILE_PATTERN = re.compile(r"^(?P<category>[a-z_]+)-(?P<fingerprint>[0-9a-f]{16})(?P<suffix>\..+)$")
+_INDEX_SUFFIXES = {"embedding": (".emb.npy",), "bm25": (".bm25.npz", ".vocab.json")}
+_embedding_models = {}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens; underscores and punctuation split words (e.g. query_uniprot)."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def resource_to_text(resource) -> str:
+    """Flatten a tool schema or a name/description resource into one searchable string."""
+    if isinstance(resource, str):
+        return resource
+    if not isinstance(resource, dict):
+        return f"{getattr(resource, 'name', str(resource))}: {getattr(resource, 'description', '')}"
+
+    parts = [str(resource.get("name", "") or ""), str(resource.get("description", "") or "")]
+    for key in ("required_parameters", "optional_parameters"):
+        for param in resource.get(key, []) or []:
+            if isinstance(param, dict):
+                parts.append(f"{param.get('name', '')} {param.get('description', '')}")
+            else:
+                parts.append(str(param))
+    return ", ".join(p for p in parts if p)
+
+
+def _top_k(scores: np.ndarray, k: int) -> list[int]:
+    """Indices of the k highest scores in descending order, using argpartition instead of a full sort."""
+    if k <= 0 or scores.size == 0:
+        return []
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable").tolist()
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
+
+
+def get_embedding_model(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """Load a sentence-transformers model on CPU once per process."""
+    if model_name not in _embedding_models:
+        from sentence_transformers import SentenceTransformer
+
+        _embedding_models[model_name] = SentenceTransformer(model_name, device="cpu")
+    return _embedding_models[model_name]
+
+
+def embedding_backend_available() -> bool:
+    try:
+        import sentence_transformers
+    except ImportError:
+        return False
+    return True
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index stored as CSR arrays."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.term_freqs = np.zeros(0, dtype=np.float32)
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def build(self, texts: list[str]) -> "BM25Index":
+        postings = {}
+        doc_lengths = []
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((doc_id, count))
+
+        self.vocab = {term: i for i, term in enumerate(sorted(postings))}
+        lengths = [len(postings[term]) for term in self.vocab]
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(lengths)
+        self.doc_ids = np.fromiter(
+            (doc_id for term in self.vocab for doc_id, _ in postings[term]), dtype=np.int32, count=int(self.indptr[-1])
+        )
+        self.term_freqs = np.fromiter(
+            (count for term in self.vocab for _, count in postings[term]), dtype=np.float32, count=int(self.indptr[-1])
+        )
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        n_docs = max(len(texts), 1)
+        doc_freq = np.asarray(lengths, dtype=np.float32)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        return self
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.doc_lengths), dtype=np.float32)
+        if not len(self.doc_lengths):
+            return scores
+        avg_len = float(self.doc_lengths.mean()) or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / avg_len)
+        for token in set(tokenize(query)):
+            term = self.vocab.get(token)
+            if term is None:
+                continue
+            start, end = self.indptr[term], self.indptr[term + 1]
+            ids = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            scores[ids] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[ids])
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[int]:
+        # Resources sharing no term with the query still fill the shortlist, in corpus order
+        return _top_k(self.scores(query), top_k)
+
+    def save(self, prefix: str):
+        np.savez(
+            prefix + ".bm25.npz",
+            indptr=self.indptr,
+            doc_ids=self.doc_ids,
+            term_freqs=self.term_freqs,
+            idf=self.idf,
+            doc_lengths=self.doc_lengths,
+        )
+        with open(prefix + ".vocab.json", "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "terms": list(self.vocab)}, f)
+
+    @classmethod
+    def load(cls, prefix: str) -> "BM25Index":
+        with open(prefix + ".vocab.json") as f:
+            meta = json.load(f)
+        index = cls(k1=meta["k1"], b=meta["b"])
+        index.vocab = {term: i for i, term in enumerate(meta["terms"])}
+        with np.load(prefix + ".bm25.npz") as arrays:
+            index.indptr = arrays["indptr"]
+            index.doc_ids = arrays["doc_ids"]
+            index.term_freqs = arrays["term_freqs"]
+            index.idf = arrays["idf"]
+            index.doc_lengths = arrays["doc_lengths"]
+        return index
+
+
+class DenseIndex:
+    """Normalized sentence embeddings searched by cosine similarity."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL):
+        self.model_name = model_name
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        model = get_embedding_model(self.model_name)
+        vectors = model.encode(texts, batch_size=64, normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def build(self, texts: list[str]) -> "DenseIndex":
+        self.embeddings = self._encode(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+        return self
+
+    def scores(self, query: str) -> np.ndarray:
+        if not len(self.embeddings):
+            return np.zeros(0, dtype=np.float32)
+        return self.embeddings @ self._encode([query])[0]
+
+    def search(self, query: str, top_k: int) -> list[int]:
+        return _top_k(self.scores(query), top_k)
+
+    def save(self, prefix: str):
+        np.save(prefix + ".emb.npy", self.embeddings)
+
+    @classmethod
+    def load(cls, prefix: str, model_name: str = DEFAULT_EMBEDDING_MODEL) -> "DenseIndex":
+        index = cls(model_name)
+        index.embeddings = np.load(prefix + ".emb.npy", mmap_mode="r")
+        return index
+
+
+class ResourceVectorIndex:
+    """Per-category vector indexes over tools, data lake items and libraries.
+
+    Args:
+        index_dir: Directory where built indexes are persisted. If None, indexes live in memory only.
+        backend: ``"embedding"``, ``"bm25"`` or ``"auto"`` (embedding when sentence-transformers is installed).
+        model_name: sentence-transformers model used by the embedding backend.
+
+    """
+
+    def __init__(self, index_dir: str | None = None, backend: str = "auto", model_name: str = DEFAULT_EMBEDDING_MODEL):
+        if backend == "auto":
+            backend = "embedding" if embedding_backend_available() else "bm25"
+        if backend not in ("embedding", "bm25"):
+            raise ValueError(f"Invalid backend: {backend}. Valid options are 'embedding', 'bm25' or 'auto'")
+        self.index_dir = index_dir
+        self.backend = backend
+        self.model_name = model_name
+        self._indexes = {}
+        self._fingerprints = {}
+
+    def _fingerprint(self, texts: list[str]) -> str:
+        digest = hashlib.sha1(f"{self.backend}|{self.model_name}".encode())
+        for text in texts:
+            digest.update(text.encode("utf-8", "ignore"))
+            digest.update(b"\0")
+        return digest.hexdigest()[:16]
+
+    def _build_or_load(self, category: str, texts: list[str]):
+        fingerprint = self._fingerprint(texts)
+        if self._fingerprints.get(category) == fingerprint:
+            return self._indexes[category]
+
+        index_cls = DenseIndex if self.backend == "embedding" else BM25Index
+        prefix = None
+        index = None
+        if self.index_dir:
+            os.makedirs(self.index_dir, exist_ok=True)
+            prefix = os.path.join(self.index_dir, f"{category}-{fingerprint}")
+            try:
+                if self.backend == "embedding":
+                    index = DenseIndex.load(prefix, self.model_name)
+                else:
+                    index = BM25Index.load(prefix)
+            except (OSError, ValueError, KeyError):
+                index = None
+
+        if index is None:
+            index = index_cls(self.model_name) if self.backend == "embedding" else index_cls()
+            index.build(texts)
+            if prefix:
+                index.save(prefix)
+                self._prune(category, fingerprint)
+
+        self._indexes[category] = index
+        self._fingerprints[category] = fingerprint
+        return index
+
+    def _prune(self, category: str, fingerprint: str):
+        """Delete this backend's persisted indexes of ``category`` built from another corpus."""
+        for name in os.listdir(self.index_dir):
+            match = _INDEX_FILE_PATTERN.match(name)
+            if (
+                match
+                and match["category"] == category
+                and match["fingerprint"] != fingerprint
+                and match["suffix"] in _INDEX_SUFFIXES[self.backend]
+            ):
+                try:
+                    os.remove(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+
+    def update(self, resources: dict):
+        """Make the indexes match ``resources``; unchanged categories are reused as-is."""
+        for category in CATEGORIES:
+            texts = [resource_to_text(r) for r in resources.get(category, [])]
+            self._build_or_load(category, texts)
+
+    def search(self, query: str, top_k: dict) -> dict:
+        """Return the indices of the top-k resources per category, best first."""
+        return {
+            category: self._indexes[category].search(query, top_k.get(category, 0)) if category in self._indexes else []
+            for category in CATEGORIES
+        }
@@ -0,0 +1,423 @@
+"""Persistent response cache for database and literature API calls.
+
+Responses are stored in a SQLite file keyed by a hash of the request, with a TTL per source
+(UniProt, Ensembl, NCBI, arXiv, ...), LRU eviction once the cache exceeds its size budget and
+ETag/Last-Modified revalidation of expired entries. In offline mode only cached content is
+served (expired entries included) and nothing is sent over the network.
+
+Two entry points:
+
+- ``cached_request``: an HTTP-level cache used by ``_query_rest_api``.
+- ``cached_call``: a decorator caching the return value of functions that talk to the
+  network through other libraries (pymed, arxiv) or make several dependent requests.
+
+Configuration: ``BIOMNI_CACHE_DIR`` (default ``~/.cache/biomni``), ``BIOMNI_HTTP_CACHE=0`` to
+disable, ``BIOMNI_OFFLINE=1`` for offline mode, ``BIOMNI_CACHE_MAX_MB`` for the size budget.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from biomni.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+DEFAULT_TTL = DAY
+DEFAULT_TTLS = {
+    "uniprot": 7 * DAY,
+    "ensembl": 7 * DAY,
+    "kegg": 7 * DAY,
+    "pdb": 7 * DAY,
+    "reactome": 7 * DAY,
+    "ebi": 3 * DAY,
+    "ncbi": DAY,
+    "pubmed": DAY,
+    "arxiv": DAY,
+}
+
+# Host fragment -> source name used for TTLs and statistics
+_HOST_SOURCES = (
+    ("uniprot", "uniprot"),
+    ("ensembl", "ensembl"),
+    ("kegg", "kegg"),
+    ("rcsb", "pdb"),
+    ("reactome", "reactome"),
+    ("ncbi.nlm.nih.gov", "ncbi"),
+    ("ebi.ac.uk", "ebi"),
+    ("arxiv", "arxiv"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    url TEXT,
+    status INTEGER,
+    headers TEXT,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a request is not in the cache."""
+
+
+def source_for_url(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    for fragment, source in _HOST_SOURCES:
+        if fragment in host:
+            return source
+    return host or "other"
+
+
+def _key_default(obj):
+    # Callables (e.g. result formatters) are identified by name, not by their per-process repr
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{getattr(obj, '__module__', '')}.{obj.__qualname__}"
+    return str(obj)
+
+
+def _hash_key(*parts) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=_key_default, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache with per-source TTLs and a size-bounded LRU.
+
+    Args:
+        path: SQLite file; None uses ``$BIOMNI_CACHE_DIR/http_cache.sqlite3``
+        max_bytes: Size budget for stored bodies; least recently used entries are evicted beyond it
+        ttls: Overrides for ``DEFAULT_TTLS`` in seconds, keyed by source
+        offline: Serve only from cache; defaults to ``$BIOMNI_OFFLINE``
+        enabled: If False, nothing is stored or served (offline mode still blocks the network)
+
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_bytes: int | None = None,
+        ttls: dict | None = None,
+        offline: bool | None = None,
+        enabled: bool | None = None,
+    ):
+        if path is None:
+            cache_dir = os.getenv("BIOMNI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "biomni"))
+            path = os.path.join(cache_dir, "http_cache.sqlite3")
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("BIOMNI_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        if offline is None:
+            offline = os.getenv("BIOMNI_OFFLINE", "").lower() in ("1", "true", "yes")
+        if enabled is None:
+            enabled = os.getenv("BIOMNI_HTTP_CACHE", "1").lower() not in ("0", "false", "no")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.offline = offline
+        self.enabled = enabled
+        self.stats = Counter()
+        self.source_stats = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total_bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def _count(self, event: str, source: str):
+        self.stats[event] += 1
+        self.source_stats.setdefault(source, Counter())[event] += 1
+
+    # -- storage -------------------------------------------------------------------------------
+
+    def lookup(self, key: str) -> dict | None:
+        """Return the stored entry for ``key`` (fresh or not) and mark it as recently used."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT source, url, status, headers, body, etag, last_modified, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        source, url, status, headers, body, etag, last_modified, expires_at = row
+        return {
+            "source": source,
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers) if headers else {},
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": expires_at > time.time(),
+        }
+
+    def store(self, key, source, body: bytes, url=None, status=None, headers=None, etag=None, last_modified=None):
+        if not self.enabled:
+            return
+        now = time.time()
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    source,
+                    url,
+                    status,
+                    json.dumps(dict(headers or {})),
+                    sqlite3.Binary(body),
+                    etag,
+                    last_modified,
+                    now,
+                    now + self.ttl_for(source),
+                    now,
+                    size,
+                ),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+        self._count("stores", source)
+
+    def refresh(self, key: str, source: str):
+        """Extend the lifetime of an entry the server confirmed as unchanged (HTTP 304)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + self.ttl_for(source), now, key),
+            )
+            conn.commit()
+
+    def _evict(self, conn):
+        # Drop least recently used entries until the cache is back under 90% of its budget
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self.stats["evictions"] += len(evicted)
+
+    def clear(self, source: str | None = None):
+        with self._lock:
+            conn = self._connection()
+            if source is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE source = ?", (source,))
+            conn.commit()
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters for this process plus the current size of the cache."""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        return {
+            **{k: self.stats[k] for k in ("hits", "revalidated", "stale_served", "misses", "stores", "evictions")},
+            "offline_misses": self.stats["offline_misses"],
+            "hit_rate": round((self.stats["hits"] + self.stats["revalidated"]) / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "offline": self.offline,
+            "by_source": {source: dict(counts) for source, counts in self.source_stats.items()},
+        }
+
+    # -- HTTP ----------------------------------------------------------------------------------
+
+    @staticmethod
+    def _to_response(entry: dict, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"] or 200
+        response._content = entry["body"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"] or url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.reason = "OK (cached)"
+        return response
+
+    def request(
+        self, method: str, url: str, params=None, headers=None, json_data=None, use_cache: bool = True, **kwargs
+    ) -> requests.Response:
+        """Send a request through the shared HTTP client, answering from the cache when possible."""
+        source = source_for_url(url)
+        client = get_http_client()
+        if not (use_cache and self.enabled):
+            if self.offline:
+                self._count("offline_misses", source)
+                raise OfflineCacheMiss(f"Offline mode: {method} {url} is not cached")
+            return client.request(method, url, params=params, headers=headers, json=json_data, **kwargs)
+
+        key = _hash_key(method.upper(), url, params or {}, json_data, (headers or {}).get("Accept"))
+        entry = self.lookup(key)
+        if entry is not None and entry["fresh"]:
+            self._count("hits", source)
+            return self._to_response(entry, url)
+        if self.offline:
+            if entry is not None:
+                self._count("stale_served", source)
+                return self._to_response(entry, url)
+            self._count("offline_misses", source)
+            raise OfflineCacheMiss(f"Offline mode: {method} {url} is not cached")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        response = client.request(method, url, params=params, headers=request_headers, json=json_data, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.refresh(key, source)
+            self._count("revalidated", source)
+            return self._to_response(entry, url)
+
+        self._count("misses", source)
+        if response.status_code == 200:
+            self.store(
+                key,
+                source,
+                response.content,
+                url=response.url,
+                status=response.status_code,
+                headers={
+                    k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")
+                },
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response
+
+    # -- function results ----------------------------------------------------------------------
+
+    def get_value(self, source: str, key_parts):
+        """Return ``(found, value)`` for a cached function result."""
+        entry = self.lookup(_hash_key("call", source, key_parts))
+        if entry is None or not (entry["fresh"] or self.offline):
+            return False, None
+        self._count("hits" if entry["fresh"] else "stale_served", source)
+        return True, pickle.loads(entry["body"])
+
+    def put_value(self, source: str, key_parts, value):
+        self.store(_hash_key("call", source, key_parts), source, pickle.dumps(value))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def configure_response_cache(**kwargs) -> ResponseCache:
+    """Replace the process-wide cache, e.g. ``configure_response_cache(offline=True)``."""
+    global _cache
+    with _cache_lock:
+        _cache = ResponseCache(**kwargs)
+    return _cache
+
+
+def set_offline_mode(offline: bool = True):
+    get_response_cache().offline = offline
+
+
+def get_cache_stats() -> dict:
+    return get_response_cache().get_stats()
+
+
+def cached_request(method: str, url: str, **kwargs) -> requests.Response:
+    """``ResponseCache.request`` on the process-wide cache."""
+    return get_response_cache().request(method, url, **kwargs)
+
+
+def cached_call(source: str, should_cache=None, offline_result=None):
+    """Cache a function's return value by its arguments.
+
+    Args:
+        source: Source name used for the TTL and statistics
+        should_cache: Predicate on the return value; failures (error strings/dicts) should not be cached
+        offline_result: Called with an ``OfflineCacheMiss`` to produce the return value for an offline miss.
+            If None, the function runs anyway and its own HTTP requests enforce offline mode.
+
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            key_parts = (func.__module__, func.__qualname__, args, sorted(kwargs.items()))
+            found, value = cache.get_value(source, key_parts)
+            if found:
+                return value
+            if cache.offline and offline_result is not None:
+                cache._count("offline_misses", source)
+                return offline_result(OfflineCacheMiss(f"Offline mode: no cached {source} result"))
+            cache._count("misses", source)
+            value = func(*args, **kwargs)
+            if should_cache is None or should_cache(value):
+                cache.put_value(source, key_parts, value)
+            return value
+
+        return wrapper
+
+    return decorator
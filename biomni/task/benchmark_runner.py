@@ -0,0 +1,463 @@
+"""Concurrent, resumable benchmark runner for ``biomni.task`` benchmarks.
+
+Runs the items of a task (e.g. ``lab_bench`` DbQA/SeqQA or ``humanity_last_exam``) over a bounded
+pool of agent workers, each with its own agent, appends every finished item to a JSONL checkpoint
+so an interrupted run resumes where it stopped, and reports the task's ``evaluate()`` metrics
+together with per-item latency, LLM calls, tokens and code execution time.
+
+``mock=True`` replaces the agent with a deterministic offline mock LLM so the harness itself can
+be exercised and timed without network access or API keys.
+
+Example:
+    runner = BenchmarkRunner(lab_bench(path, "DbQA"), agent_kwargs={"path": "./data"}, max_workers=4,
+                             checkpoint_path="dbqa_run.jsonl")
+    report = runner.run()
+
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+_ANSWER_PATTERN = re.compile(r"\[ANSWER\]\s*\(?([A-Za-z])\)?\.?\s*\[/ANSWER\]")
+_OPTION_PATTERN = re.compile(r"^\s*([A-Z])\.", re.MULTILINE)
+# "The answer is (B)", "Final answer: C", "**Answer:** D."
+_STATED_PATTERN = re.compile(
+    r"\b(?:[Aa]nswer|[Cc]hoice|[Oo]ption)(?:\s+is|\s*:)?\s*[*_]*\s*(?:option\s+)?\(?([A-Z])\)?(?![\w'])"
+)
+# A choice letter standing on its own: "(C)", "**C**", or closing a line ("... so C." / "C) Lysine")
+_STANDALONE_PATTERN = re.compile(r"(?<![\w'])(?:\(([A-Z])\)|\*\*([A-Z])\*\*|([A-Z])(?=[.)]?[ \t]*$|\)))", re.MULTILINE)
+
+
+def parse_choice(text: str, choices=None) -> str | None:
+    """Extract the chosen letter from an agent's output.
+
+    Tries, in order, the last ``[ANSWER]X[/ANSWER]`` tag, the last stated answer ("the answer is
+    (X)", "Answer: X"), a bare letter, and finally the last standalone choice letter. ``choices``
+    restricts the last two forms to the option letters of the question, so free-text answers such
+    as HLE's are not scored on an incidental capital.
+    """
+    text = text or ""
+    matches = _ANSWER_PATTERN.findall(text)
+    if matches:
+        return matches[-1].upper()
+    choices = set(choices) if choices else None
+    stated = [letter for letter in _STATED_PATTERN.findall(text) if choices is None or letter in choices]
+    if stated:
+        return stated[-1]
+    bare = re.fullmatch(r"\s*(?:<solution>)?\s*\(?([A-Za-z])\)?\.?\s*(?:</solution>)?\s*", text)
+    if bare:
+        return bare.group(1).upper()
+    if choices is None:
+        return None
+    standalone = ["".join(groups) for groups in _STANDALONE_PATTERN.findall(text)]
+    standalone = [letter for letter in standalone if letter in choices]
+    return standalone[-1] if standalone else None
+
+
+def prompt_choices(prompt: str) -> list[str]:
+    """Option letters (``A.``, ``B.``, ...) listed at the start of lines in a question prompt."""
+    return _OPTION_PATTERN.findall(prompt or "")
+
+
+class MockChatModel(BaseChatModel):
+    """Deterministic offline chat model that answers multiple-choice prompts.
+
+    The chosen letter is derived from a hash of the prompt and ``seed``, so repeated runs give
+    identical answers. ``latency`` seconds are slept per call to simulate a remote model.
+    """
+
+    seed: int = 0
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "biomni-mock"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        options = _OPTION_PATTERN.findall(prompt) or ["A", "B", "C", "D"]
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode()).digest()
+        letter = options[digest[0] % len(options)]
+        if self.latency:
+            time.sleep(self.latency)
+        content = f"<solution>[ANSWER]{letter}[/ANSWER]</solution>"
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class _TokenCounter:
+    """Subset of ``NodeLogger.get_token_summary`` for the mock agent."""
+
+    def __init__(self):
+        self.request_count = 0
+        self.total_prompt_tokens = 0
+        self.total_completion_tokens = 0
+
+    def get_token_summary(self) -> dict:
+        return {
+            "total_requests": self.request_count,
+            "total_prompt_tokens": self.total_prompt_tokens,
+            "total_completion_tokens": self.total_completion_tokens,
+            "total_tokens": self.total_prompt_tokens + self.total_completion_tokens,
+        }
+
+
+class MockAgent:
+    """Stand-in for ``A1`` with the same ``go()`` contract, backed by ``MockChatModel``."""
+
+    def __init__(self, seed: int = 0, latency: float = 0.0):
+        self.llm = MockChatModel(seed=seed, latency=latency)
+        self.token_logger = _TokenCounter()
+        self.execution_seconds = 0.0
+        self.execution_count = 0
+
+    def go(self, prompt):
+        message = self.llm.invoke([HumanMessage(content=prompt)])
+        usage = message.usage_metadata or {}
+        self.token_logger.request_count += 1
+        self.token_logger.total_prompt_tokens += usage.get("input_tokens", 0)
+        self.token_logger.total_completion_tokens += usage.get("output_tokens", 0)
+        return [prompt, message.content], message.content
+
+
+def _make_agent(agent_factory, agent_kwargs, mock, mock_latency):
+    if mock:
+        return MockAgent(latency=mock_latency)
+    if agent_factory is not None:
+        return agent_factory()
+    from biomni.agent import A1
+
+    return A1(**(agent_kwargs or {}))
+
+
+def _agent_counters(agent) -> dict:
+    summary = agent.token_logger.get_token_summary() if hasattr(agent, "token_logger") else {}
+    return {
+        "llm_calls": summary.get("total_requests", 0),
+        "prompt_tokens": summary.get("total_prompt_tokens", 0),
+        "completion_tokens": summary.get("total_completion_tokens", 0),
+        "total_tokens": summary.get("total_tokens", 0),
+        "execution_s": getattr(agent, "execution_seconds", 0.0),
+        "executions": getattr(agent, "execution_count", 0),
+    }
+
+
+def _structured_choice(agent, output_class, example: dict, choices) -> str | None:
+    """Ask the agent to format its history into the task's ``output_class`` and read the choice."""
+    if output_class is None or not hasattr(agent, "result_formatting"):
+        return None
+    result = agent.result_formatting(output_class, example["prompt"])
+    return parse_choice(str(result.get("choice") or ""), choices)
+
+
+def _run_item(agent, index: int, example: dict, output_class=None) -> dict:
+    before = _agent_counters(agent)
+    start = time.perf_counter()
+    record = {"index": index, "answer": str(example["answer"]), "prediction": None, "error": None}
+    choices = prompt_choices(example["prompt"]) or None
+    try:
+        log, output = agent.go(example["prompt"])
+        record["prediction"] = parse_choice(output, choices)
+        if record["prediction"] is None and log:
+            # Skip the echoed question so its option list is not mistaken for an answer
+            steps = [str(step) for step in log if example["prompt"] not in str(step)]
+            record["prediction"] = parse_choice("\n".join(steps), choices)
+        if record["prediction"] is None:
+            record["prediction"] = _structured_choice(agent, output_class, example, choices)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["latency_s"] = round(time.perf_counter() - start, 4)
+    after = _agent_counters(agent)
+    for key in before:
+        record[key] = round(after[key] - before[key], 4) if key == "execution_s" else after[key] - before[key]
+    record["correct"] = record["prediction"] == record["answer"]
+    return record
+
+
+class WorkerInitError(RuntimeError):
+    """Raised when a benchmark worker cannot create its agent."""
+
+
+# Per-process agent for the process pool
+_process_agent = None
+_process_output_class = None
+_process_init_error = None
+
+
+def _init_process_worker(agent_factory, agent_kwargs, mock, mock_latency, output_class_factory=None):
+    # An exception escaping a pool initializer only surfaces as an opaque BrokenProcessPool in the
+    # parent, so keep it and re-raise it with the first item this worker receives
+    global _process_agent, _process_output_class, _process_init_error
+    try:
+        _process_agent = _make_agent(agent_factory, agent_kwargs, mock, mock_latency)
+        _process_output_class = output_class_factory() if output_class_factory is not None else None
+    except Exception as e:
+        _process_init_error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+
+def _run_item_in_process(index, example):
+    if _process_init_error is not None:
+        raise WorkerInitError(f"Benchmark worker failed to start its agent: {_process_init_error}")
+    return _run_item(_process_agent, index, example, _process_output_class)
+
+
+class BenchmarkRunner:
+    """Run a benchmark task over a pool of isolated agent workers with checkpointing.
+
+    Args:
+        task: A ``biomni.task`` benchmark (needs ``query``, ``answer``, ``get_example`` and ``evaluate``)
+        agent_kwargs: Keyword arguments for ``A1`` in each worker
+        agent_factory: Picklable zero-argument callable returning an agent; overrides ``agent_kwargs``
+        max_workers: Number of concurrent agent workers
+        isolation: "process" gives every worker its own process (and Python REPL namespace);
+            "thread" runs workers as threads, which only isolates agents that use ``repl_mode="process"``
+        checkpoint_path: JSONL file receiving one record per finished item; existing records are resumed
+        retry_failed: If True, items whose checkpointed record has an error are run again on resume
+        mock: Use the deterministic offline ``MockAgent`` instead of a real agent
+        mock_latency: Seconds each mock LLM call sleeps
+
+    """
+
+    def __init__(
+        self,
+        task,
+        agent_kwargs: dict | None = None,
+        agent_factory=None,
+        max_workers: int = 4,
+        isolation: str = "process",
+        checkpoint_path: str | None = None,
+        retry_failed: bool = True,
+        mock: bool = False,
+        mock_latency: float = 0.0,
+        show_progress: bool = True,
+    ):
+        if isolation not in ("process", "thread"):
+            raise ValueError(f"Invalid isolation: {isolation}. Valid options are 'process' or 'thread'")
+        self.task = task
+        self.agent_kwargs = agent_kwargs
+        self.agent_factory = agent_factory
+        self.max_workers = max_workers
+        self.isolation = isolation
+        self.checkpoint_path = checkpoint_path
+        self.retry_failed = retry_failed
+        self.mock = mock
+        self.mock_latency = mock_latency
+        self.show_progress = show_progress
+        self._checkpoint_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.task.query)
+
+    def load_checkpoint(self) -> dict:
+        """Records from the checkpoint file by item index (later lines win)."""
+        records = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return records
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+                records[record["index"]] = record
+        return records
+
+    def _checkpoint(self, record: dict):
+        if not self.checkpoint_path:
+            return
+        with self._checkpoint_lock:
+            with open(self.checkpoint_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _executor(self):
+        if self.isolation == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(
+                    self.agent_factory,
+                    self.agent_kwargs,
+                    self.mock,
+                    self.mock_latency,
+                    getattr(self.task, "output_class", None),
+                ),
+            )
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="biomni-bench")
+
+    def _submit(self, executor, local, index, example, output_class):
+        if self.isolation == "process":
+            return executor.submit(_run_item_in_process, index, example)
+
+        def run():
+            if not hasattr(local, "agent"):
+                local.agent = _make_agent(self.agent_factory, self.agent_kwargs, self.mock, self.mock_latency)
+            return _run_item(local.agent, index, example, output_class)
+
+        return executor.submit(run)
+
+    def run(self, indices=None, limit: int | None = None) -> dict:
+        """Run the benchmark (or the given item indices) and return the report.
+
+        Args:
+            indices: Item indices to run; defaults to every item
+            limit: Only run the first ``limit`` of those items
+
+        """
+        indices = list(range(len(self))) if indices is None else list(indices)
+        if limit is not None:
+            indices = indices[:limit]
+
+        records = self.load_checkpoint()
+        resumed = [i for i in indices if i in records and not (self.retry_failed and records[i].get("error"))]
+        pending = [i for i in indices if i not in set(resumed)]
+        if resumed:
+            print(f"Resuming: {len(resumed)} item(s) already in {self.checkpoint_path}, {len(pending)} to run")
+
+        start = time.perf_counter()
+        pbar = None
+        if self.show_progress and pending:
+            import tqdm
+
+            pbar = tqdm.tqdm(total=len(pending), desc="Benchmark", ncols=80)
+        if pending:
+            local = threading.local()
+            output_class = (
+                self.task.output_class() if self.isolation == "thread" and hasattr(self.task, "output_class") else None
+            )
+            with self._executor() as executor:
+                futures = [self._submit(executor, local, i, self.task.get_example(i), output_class) for i in pending]
+                try:
+                    for future in as_completed(futures):
+                        record = future.result()
+                        records[record["index"]] = record
+                        self._checkpoint(record)
+                        if pbar is not None:
+                            pbar.update(1)
+                except (WorkerInitError, BrokenProcessPool) as e:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    if pbar is not None:
+                        pbar.close()
+                    if isinstance(e, BrokenProcessPool):
+                        raise RuntimeError(
+                            "A benchmark worker process died (e.g. killed for running out of memory); "
+                            f"finished items are kept in {self.checkpoint_path}"
+                        ) from e
+                    raise
+        if pbar is not None:
+            pbar.close()
+        wall_time = time.perf_counter() - start
+
+        return self.report([records[i] for i in indices], wall_time=wall_time, resumed=len(resumed))
+
+    def _evaluate(self, records: list) -> dict:
+        indices = np.array([r["index"] for r in records], dtype=int)
+        predictions = [r["prediction"] or "" for r in records]
+        task = self.task
+        if len(indices) != len(task.answer) or not np.array_equal(indices, np.arange(len(task.answer))):
+            # Evaluate a subset with the task's own metric definitions
+            task = copy.copy(self.task)
+            task.answer = np.asarray(self.task.answer)[indices]
+            if hasattr(self.task, "refrain_label"):
+                task.refrain_label = np.asarray(self.task.refrain_label)[indices]
+        return {key: float(value) for key, value in task.evaluate(predictions).items()}
+
+    def report(self, records: list, wall_time: float = 0.0, resumed: int = 0) -> dict[str, Any]:
+        if not records:
+            return {"items": 0}
+        latencies = np.array([r["latency_s"] for r in records])
+        totals = {
+            key: sum(r.get(key, 0) for r in records)
+            for key in ("llm_calls", "prompt_tokens", "completion_tokens", "total_tokens", "executions")
+        }
+        report = {
+            "items": len(records),
+            "resumed": resumed,
+            "errors": sum(1 for r in records if r.get("error")),
+            "unparsed": sum(1 for r in records if not r.get("error") and r.get("prediction") is None),
+            "metrics": self._evaluate(records),
+            "wall_time_s": round(wall_time, 3),
+            "throughput_items_per_s": round((len(records) - resumed) / wall_time, 3) if wall_time else None,
+            "latency_s": {
+                "mean": round(float(latencies.mean()), 4),
+                "p50": round(float(np.percentile(latencies, 50)), 4),
+                "p95": round(float(np.percentile(latencies, 95)), 4),
+                "max": round(float(latencies.max()), 4),
+            },
+            "execution_s": round(sum(r.get("execution_s", 0.0) for r in records), 3),
+            **totals,
+        }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Biomni benchmark concurrently with checkpointing")
+    parser.add_argument("--task", choices=["lab_bench", "hle"], default="lab_bench")
+    parser.add_argument("--dataset", default="DbQA", help="lab_bench dataset (DbQA or SeqQA)")
+    parser.add_argument("--benchmark-path", default="./data/biomni_data/benchmark")
+    parser.add_argument("--data-path", default="./data", help="A1 data path")
+    parser.add_argument("--llm", default=None)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--isolation", choices=["process", "thread"], default="process")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--mock", action="store_true", help="Use the deterministic offline mock LLM")
+    parser.add_argument("--mock-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.task == "lab_bench":
+        from biomni.task.lab_bench import lab_bench
+
+        task = lab_bench(path=args.benchmark_path, dataset=args.dataset)
+    else:
+        from biomni.task.hle import humanity_last_exam
+
+        task = humanity_last_exam(path=args.benchmark_path)
+
+    agent_kwargs = {"path": args.data_path, "fast_start": True}
+    if args.llm:
+        agent_kwargs["llm"] = args.llm
+    runner = BenchmarkRunner(
+        task,
+        agent_kwargs=agent_kwargs,
+        max_workers=args.workers,
+        isolation=args.isolation,
+        checkpoint_path=args.checkpoint,
+        mock=args.mock,
+        mock_latency=args.mock_latency,
+    )
+    print(json.dumps(runner.run(limit=args.limit), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -97,6 +97,8 @@ class humanity_last_exam(base_task):
         self.query = df.question_text.values
         # self.options = df.options_letters.values
         self.answer = df.letter_answer.values
+        # No "insufficient information" option is offered, so nothing counts as refraining
+        self.refrain_label = np.full(len(self.answer), "")
 
         self.prompt = """Question: {question}"""
 
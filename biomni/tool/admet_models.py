@@ -0,0 +1,151 @@
+"""Batched ADMET predictions with the pretrained DeepPurpose property models.
+
+``predict_admet_properties`` used to load all 16 models on every call and then featurize each
+SMILES 16 times and run 16 single-row forward passes per molecule. Here:
+
+- models are loaded once per process and kept by ``get_admet_models``;
+- each chunk of SMILES is featurized once (``utils.data_process``) and the same features are
+  fed to every model;
+- every model scores the chunk in mini-batches under ``torch.inference_mode`` (MPNN models
+  keep one molecule per forward pass, see ``predict_chunk``).
+
+``iter_admet_predictions`` yields one table per chunk, so libraries of any size can be streamed
+to disk; ``predict_admet_table`` collects them into one DataFrame.
+"""
+
+import contextlib
+import io
+import threading
+
+import pandas as pd
+
+ADMET_MODEL_TYPES = ("MPNN", "CNN", "Morgan")
+
+# (task, label in the research log, unit); "%" predictions are probabilities scaled by 100
+ADMET_PROPERTIES = (
+    ("AqSolDB", "Solubility", "log mol/L"),
+    ("Lipo_AZ", "Lipophilicity", "(log-ratio)"),
+    ("Caco2", "Absorption (Caco-2 permeability)", "cm/s"),
+    ("HIA", "Absorption (HIA)", "%"),
+    ("Pgp_inhibitor", "Absorption (Pgp Inhibitor)", "%"),
+    ("Bioavailability", "Absorption (Bioavailability)", "%"),
+    ("BBB_MolNet", "Distribution (BBB permeation)", "%"),
+    ("PPBR", "Distribution (PPBR)", "%"),
+    ("CYP2C19", "Metabolism (CYP2C19)", "%"),
+    ("CYP2D6", "Metabolism (CYP2D6)", "%"),
+    ("CYP3A4", "Metabolism (CYP3A4)", "%"),
+    ("CYP1A2", "Metabolism (CYP1A2)", "%"),
+    ("CYP2C9", "Metabolism (CYP2C9)", "%"),
+    ("Half_life_eDrug3D", "Excretion (Half-life)", "h"),
+    ("Clearance_eDrug3D", "Excretion (Clearance)", "mL/min/kg"),
+    ("ClinTox", "Clinical Toxicity", "%"),
+)
+ADMET_TASKS = tuple(task for task, _, _ in ADMET_PROPERTIES)
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_CHUNK_SIZE = 2048
+
+_models = {}
+_models_lock = threading.Lock()
+_inference_lock = threading.Lock()
+
+
+def get_admet_models(model_type: str = "MPNN") -> dict:
+    """``{task: model}`` for every ADMET task, loading (and downloading) each model only once.
+
+    Raises:
+        ValueError: If ``model_type`` is not one of ``ADMET_MODEL_TYPES``
+        RuntimeError: If a model cannot be downloaded or loaded
+
+    """
+    if model_type not in ADMET_MODEL_TYPES:
+        raise ValueError(
+            f"Invalid ADMET model type '{model_type}'. Available options are: {', '.join(ADMET_MODEL_TYPES)}."
+        )
+    from DeepPurpose import CompoundPred
+
+    with _models_lock:
+        for task in ADMET_TASKS:
+            if (task, model_type) not in _models:
+                name = f"{task.lower()}_{model_type.lower()}_model"
+                try:
+                    _models[task, model_type] = CompoundPred.model_pretrained(model=name)
+                except Exception as e:
+                    raise RuntimeError(f"Error downloading model {task}_{model_type}_model: {e}") from e
+        return {task: _models[task, model_type] for task in ADMET_TASKS}
+
+
+def featurize(smiles: list[str], model_type: str) -> pd.DataFrame:
+    """DeepPurpose input table for ``smiles``, shared by all models of ``model_type``."""
+    from DeepPurpose import utils
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return utils.data_process(
+            X_drug=list(smiles), y=[0] * len(smiles), drug_encoding=model_type, split_method="no_split"
+        )
+
+
+def _predict(model, features: pd.DataFrame, batch_size: int) -> list[float]:
+    import torch
+
+    with _inference_lock, torch.inference_mode():
+        previous = model.config["batch_size"]
+        model.config["batch_size"] = batch_size
+        try:
+            return model.predict(features, verbose=False)
+        finally:
+            model.config["batch_size"] = previous
+
+
+def predict_chunk(smiles: list[str], models: dict, model_type: str, batch_size: int = DEFAULT_BATCH_SIZE):
+    """ADMET table (one row per SMILES, one column per task) for one chunk of compounds."""
+    features = featurize(smiles, model_type)
+    if model_type == "MPNN":
+        # DeepPurpose's MPNN encoder mixes padded bonds between molecules of a batch, so batched
+        # scores differ from single-molecule ones; keep one molecule per forward pass
+        batch_size = 1
+    table = pd.DataFrame({"SMILES": list(smiles)})
+    for task, _, unit in ADMET_PROPERTIES:
+        values = pd.Series(_predict(models[task], features, batch_size), dtype=float)
+        table[task] = values * 100 if unit == "%" else values
+    return table
+
+
+def iter_admet_predictions(
+    smiles,
+    model_type: str = "MPNN",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    models: dict | None = None,
+):
+    """Yield ADMET tables for consecutive chunks of ``smiles`` (any iterable)."""
+    models = models or get_admet_models(model_type)
+    chunk = []
+    for s in smiles:
+        chunk.append(s)
+        if len(chunk) == chunk_size:
+            yield predict_chunk(chunk, models, model_type, batch_size)
+            chunk = []
+    if chunk:
+        yield predict_chunk(chunk, models, model_type, batch_size)
+
+
+def predict_admet_table(smiles, model_type: str = "MPNN", batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """ADMET predictions for all ``smiles`` as one DataFrame (columns ``SMILES`` and ``ADMET_TASKS``)."""
+    tables = list(iter_admet_predictions(smiles, model_type, batch_size))
+    if not tables:
+        return pd.DataFrame(columns=["SMILES", *ADMET_TASKS])
+    return pd.concat(tables, ignore_index=True)
+
+
+def format_admet_log(table: pd.DataFrame) -> str:
+    """Per-compound research log entries for an ADMET table."""
+    lines = []
+    for row in table.itertuples(index=False):
+        values = row._asdict()
+        lines.append(f"\nCompound SMILES: {values['SMILES']}\n")
+        lines.append("Predicted ADMET properties:\n")
+        for task, label, unit in ADMET_PROPERTIES:
+            lines.append(f"- {label}: {values[task]:.2f} {unit}\n")
+        lines.append("-------------------------------------\n")
+    return "".join(lines)
@@ -121,7 +121,185 @@ Disordered Regions:
     return log
 
 
-def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results", threshold_method="otsu"):
+_CELL_PROPERTIES = (
+    "area",
+    "perimeter",
+    "major_axis_length",
+    "minor_axis_length",
+    "eccentricity",
+    "orientation",
+    "solidity",
+)
+
+
+def _equalize_hist_values(values, gray, bin_centers, cdf, dtype):
+    import numpy as np
+
+    values = values if gray is None else gray(values)
+    return np.interp(values, bin_centers, cdf).astype(dtype, copy=False)
+
+
+def _adaptive_threshold_mask(values):
+    from skimage import filters
+
+    return values > filters.threshold_local(values, block_size=35, offset=0.05)
+
+
+def _canny_mask(values, threshold):
+    from skimage import feature
+
+    return feature.canny(values, sigma=2, low_threshold=threshold, high_threshold=threshold)
+
+
+def _cell_shape_measure(labels, cell_labels, origin):
+    import numpy as np
+    from skimage import measure
+
+    cells = np.where(np.isin(labels, cell_labels), labels, 0)
+    table = measure.regionprops_table(cells, properties=_CELL_PROPERTIES)
+    return list(zip(*table.values(), strict=True))
+
+
+def _hough_lines_tile(tile, edges):
+    """Probabilistic Hough lines of one tile region whose midpoint lies in the core, in image coordinates."""
+    import cv2
+    import numpy as np
+
+    lines = cv2.HoughLinesP(
+        edges[tile.region].astype(np.uint8),
+        1,
+        np.pi / 180,
+        threshold=10,
+        minLineLength=10,
+        maxLineGap=5,
+    )
+    if lines is None:
+        return np.zeros((0, 1, 4), dtype=np.int32)
+    # OpenCV 5 returns lines as (n, 4), earlier versions as (n, 1, 4)
+    lines = lines.reshape(-1, 1, 4)
+    row0, col0 = tile.origin
+    lines = lines + np.array([col0, row0, col0, row0], dtype=lines.dtype)
+    middle_cols = (lines[:, 0, 0] + lines[:, 0, 2]) / 2
+    middle_rows = (lines[:, 0, 1] + lines[:, 0, 3]) / 2
+    rows, cols = tile.core
+    inside = (middle_rows >= rows.start) & (middle_rows < rows.stop)
+    inside &= (middle_cols >= cols.start) & (middle_cols < cols.stop)
+    return lines[inside]
+
+
+def _segmentation_image(labels):
+    import numpy as np
+
+    return labels.astype(np.uint8) * 50
+
+
+def _equalize_hist_tiled(image, workspace, n_workers=None):
+    """``exposure.equalize_hist`` of the grayscale image, tile by tile, written to the workspace.
+
+    Returns:
+        The equalized image and the tiles to process it with
+
+    """
+    import functools
+
+    import numpy as np
+    from skimage.color import rgb2gray
+
+    from biomni.tool import tiled_image
+
+    shape = image.shape[:2]
+    gray = rgb2gray if len(image.shape) > 2 else None
+    # Channel values plus the float copies made by equalization, Canny and the measurements
+    tiles = tiled_image.plan_tiles(
+        shape, 128 + np.prod(image.shape[2:], dtype=int) * image.dtype.itemsize, n_workers=n_workers
+    )
+    counts, bin_centers = tiled_image.tiled_histogram(image, tiles, gray, n_workers=n_workers)
+    cdf = counts.cumsum()
+    cdf = cdf / float(cdf[-1])
+    probe = image[:1, :1]
+    dtype = tiled_image.float_dtype((probe if gray is None else gray(probe)).dtype)
+    equalized = workspace.create("equalized", shape, dtype)
+    equalize = functools.partial(_equalize_hist_values, gray=gray, bin_centers=bin_centers, cdf=cdf, dtype=dtype)
+    tiled_image.apply_tiled(equalize, image, equalized, tiles, n_workers)
+    return equalized, tiles
+
+
+def _analyze_cells_tiled(gray_image, tiles, threshold_method, segmentation_path, workspace, n_workers=None):
+    """Segmentation, cell measurements and fiber detection of ``analyze_cell_morphology_and_cytoskeleton``,
+    tile by tile.
+
+    Segmentation, labels, cell measurements and Canny edges are the same as on the whole image.
+    Fibers are detected in each tile with a 32-pixel halo and kept by the tile holding their
+    midpoint, so fibers crossing tile borders can be found in pieces. The label image is saved to
+    ``segmentation_path`` if any cell is found.
+
+    Returns:
+        The threshold (None for adaptive thresholding), the number of cells, the cell properties
+        by column, whether edges were found and the detected lines (None if there are none)
+
+    """
+    import functools
+
+    import numpy as np
+    from skimage import morphology
+
+    from biomni.tool import tiled_image
+
+    shape = gray_image.shape
+
+    # Segment cells
+    binary = workspace.create("binary", shape, bool)
+    if threshold_method == "otsu":
+        thresh = tiled_image.tiled_threshold_otsu(gray_image, tiles, n_workers=n_workers)
+        tiled_image.threshold_tiled(gray_image, binary, tiles, thresh, n_workers=n_workers)
+    elif threshold_method == "adaptive":
+        thresh = None
+        # The Gaussian weights of a 35-pixel block reach 23 pixels
+        adaptive_tiles = [tile.with_halo(24, shape) for tile in tiles]
+        tiled_image.apply_tiled(_adaptive_threshold_mask, gray_image, binary, adaptive_tiles, n_workers)
+    else:  # manual
+        thresh = 0.5
+        tiled_image.threshold_tiled(gray_image, binary, tiles, thresh, n_workers=n_workers)
+
+    # Clean up binary image
+    cleaned = workspace.create("cleaned", shape, bool)
+    tiled_image.remove_small_objects_tiled(binary, cleaned, tiles, 100, n_workers=n_workers)
+    tiled_image.remove_small_holes_tiled(cleaned, binary, tiles, 100, n_workers=n_workers)
+    closing = functools.partial(morphology.binary_closing, footprint=morphology.disk(3))
+    tiled_image.apply_tiled(closing, binary, cleaned, [tile.with_halo(6, shape) for tile in tiles], n_workers)
+
+    # Label and measure cells
+    cells = tiled_image.label_tiled(cleaned, tiles, n_workers=n_workers)
+    labeled_cells = workspace.create("labels", shape, np.int64)
+    tiled_image.write_labels(cells, cleaned, labeled_cells, n_workers=n_workers)
+    rows = tiled_image.measure_regions_tiled(
+        labeled_cells, cells, [tile.with_halo(64, shape) for tile in tiles], _cell_shape_measure, n_workers=n_workers
+    )
+    cell_props = {name: np.array([row[i] for row in rows], dtype=np.float64) for i, name in enumerate(_CELL_PROPERTIES)}
+    if cells.count > 0:
+        segmentation = tiled_image.create_image(segmentation_path, shape, np.uint8)
+        tiled_image.apply_tiled(_segmentation_image, labeled_cells, segmentation, tiles, n_workers)
+
+    # Canny edges: edge pixels above each threshold, then edge tracing across tiles
+    edge_tiles = [tile.with_halo(16, shape) for tile in tiles]
+    weak, strong, edges = (workspace.create(name, shape, bool) for name in ("weak", "strong", "edges"))
+    for mask, threshold in ((weak, 0.1), (strong, 0.2)):
+        canny = functools.partial(_canny_mask, threshold=threshold)
+        tiled_image.apply_tiled(canny, gray_image, mask, edge_tiles, n_workers)
+    tiled_image.hysteresis_tiled(weak, strong, edges, tiles, n_workers=n_workers)
+    edges_found = tiled_image.count_nonzero_tiled(edges, tiles, n_workers=n_workers) > 0
+
+    lines = None
+    if edges_found:
+        line_tiles = [tile.with_halo(32, shape) for tile in tiles]
+        lines = np.concatenate(list(tiled_image.map_tiles(_hough_lines_tile, line_tiles, edges, n_workers=n_workers)))
+        lines = lines if len(lines) else None
+    return thresh, cells.count, cell_props, edges_found, lines
+
+
+def analyze_cell_morphology_and_cytoskeleton(
+    image_path, output_dir="./results", threshold_method="otsu", tiled=None, n_workers=None
+):
     """Quantifies cell morphology and cytoskeletal organization from fluorescence microscopy images.
 
     Parameters
@@ -132,6 +310,12 @@ def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results",
         Directory to save output files (default: './results')
     threshold_method : str, optional
         Method for cell segmentation ('otsu', 'adaptive', or 'manual') (default: 'otsu')
+    tiled : bool, optional
+        Process the image tile by tile within ``BIOMNI_TILE_MEMORY_MB``, with the same cells (the
+        segmentation image is then saved as a TIFF); fibers crossing tile borders may be detected
+        in pieces. None (default) does so for images larger than ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
 
     Returns
     -------
@@ -148,6 +332,8 @@ def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results",
     from skimage import exposure, feature, filters, io, measure, morphology
     from skimage.color import rgb2gray
 
+    from biomni.tool.tiled_image import Workspace, use_tiles
+
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
@@ -157,61 +343,95 @@ def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results",
 
     # Load image
     log += "Step 1: Loading and preprocessing image\n"
+    workspace = Workspace() if use_tiles(image_path, tiled) else None
     try:
-        image = io.imread(image_path)
-        # Convert to grayscale if RGB
-        if len(image.shape) > 2:
-            gray_image = rgb2gray(image)
-            log += "- Converted RGB image to grayscale\n"
+        if workspace is not None:
+            image = workspace.open(image_path)
+            gray_image, tiles = _equalize_hist_tiled(image, workspace, n_workers)
+            if len(image.shape) > 2:
+                log += "- Converted RGB image to grayscale\n"
         else:
-            gray_image = image
+            image = io.imread(image_path)
+            # Convert to grayscale if RGB
+            if len(image.shape) > 2:
+                gray_image = rgb2gray(image)
+                log += "- Converted RGB image to grayscale\n"
+            else:
+                gray_image = image
 
-        # Enhance contrast
-        gray_image = exposure.equalize_hist(gray_image)
+            # Enhance contrast
+            gray_image = exposure.equalize_hist(gray_image)
         log += "- Enhanced image contrast\n"
     except Exception as e:
+        if workspace is not None:
+            workspace.close()
         return f"Error loading image: {str(e)}"
 
+    if workspace is not None:
+        segmentation_path = os.path.join(output_dir, "cell_segmentation.tif")
+        with workspace:
+            thresh, num_cells, cell_props, edges_found, lines = _analyze_cells_tiled(
+                gray_image, tiles, threshold_method, segmentation_path, workspace, n_workers
+            )
+    else:
+        # Segment cells
+        if threshold_method == "otsu":
+            thresh = filters.threshold_otsu(gray_image)
+            binary = gray_image > thresh
+        elif threshold_method == "adaptive":
+            thresh = None
+            binary = filters.threshold_local(gray_image, block_size=35, offset=0.05)
+            binary = gray_image > binary
+        else:  # manual
+            thresh = 0.5  # Default value, can be parameterized
+            binary = gray_image > thresh
+
+        # Clean up binary image
+        binary = morphology.remove_small_objects(binary, min_size=100)
+        binary = morphology.remove_small_holes(binary, area_threshold=100)
+        binary = morphology.binary_closing(binary, morphology.disk(3))
+
+        # Label cells
+        labeled_cells, num_cells = measure.label(binary, return_num=True)
+
+        # Analyze cell properties
+        cell_props = measure.regionprops_table(labeled_cells, gray_image, properties=_CELL_PROPERTIES)
+
+        # Edge detection to highlight cytoskeletal fibers
+        edges = feature.canny(gray_image, sigma=2)
+        edges_found = np.any(edges)
+
+        # Use Hough transform to detect lines (cytoskeletal fibers)
+        lines = None
+        if edges_found:
+            lines = cv2.HoughLinesP(
+                edges.astype(np.uint8),
+                1,
+                np.pi / 180,
+                threshold=10,
+                minLineLength=10,
+                maxLineGap=5,
+            )
+            if lines is not None:
+                lines = lines.reshape(-1, 1, 4)
+
+        segmentation_path = os.path.join(output_dir, "cell_segmentation.png")
+        if num_cells > 0:
+            io.imsave(segmentation_path, labeled_cells.astype(np.uint8) * 50)
+
     # Segment cells
     log += "\nStep 2: Segmenting cells from background\n"
     if threshold_method == "otsu":
-        thresh = filters.threshold_otsu(gray_image)
-        binary = gray_image > thresh
         log += f"- Applied Otsu thresholding (threshold value: {thresh:.4f})\n"
     elif threshold_method == "adaptive":
-        binary = filters.threshold_local(gray_image, block_size=35, offset=0.05)
-        binary = gray_image > binary
         log += "- Applied adaptive thresholding\n"
     else:  # manual
-        thresh = 0.5  # Default value, can be parameterized
-        binary = gray_image > thresh
         log += f"- Applied manual thresholding (threshold value: {thresh:.4f})\n"
-
-    # Clean up binary image
-    binary = morphology.remove_small_objects(binary, min_size=100)
-    binary = morphology.remove_small_holes(binary, area_threshold=100)
-    binary = morphology.binary_closing(binary, morphology.disk(3))
     log += "- Applied morphological operations to clean segmentation\n"
-
-    # Label cells
-    labeled_cells, num_cells = measure.label(binary, return_num=True)
     log += f"- Identified {num_cells} cell regions\n"
 
     # Analyze cell properties
     log += "\nStep 3: Analyzing cell morphology\n"
-    cell_props = measure.regionprops_table(
-        labeled_cells,
-        gray_image,
-        properties=(
-            "area",
-            "perimeter",
-            "major_axis_length",
-            "minor_axis_length",
-            "eccentricity",
-            "orientation",
-            "solidity",
-        ),
-    )
 
     # Convert to DataFrame for easier manipulation
     cell_df = pd.DataFrame(cell_props)
@@ -232,20 +452,7 @@ def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results",
     # Analyze cytoskeletal organization
     log += "\nStep 4: Analyzing cytoskeletal organization\n"
 
-    # Edge detection to highlight cytoskeletal fibers
-    edges = feature.canny(gray_image, sigma=2)
-
-    # Use Hough transform to detect lines (cytoskeletal fibers)
-    if np.any(edges):
-        lines = cv2.HoughLinesP(
-            edges.astype(np.uint8),
-            1,
-            np.pi / 180,
-            threshold=10,
-            minLineLength=10,
-            maxLineGap=5,
-        )
-
+    if edges_found:
         if lines is not None:
             # Calculate line orientations
             orientations = []
@@ -304,8 +511,6 @@ def analyze_cell_morphology_and_cytoskeleton(image_path, output_dir="./results",
 
     # Save segmentation image
     if num_cells > 0:
-        segmentation_path = os.path.join(output_dir, "cell_segmentation.png")
-        io.imsave(segmentation_path, labeled_cells.astype(np.uint8) * 50)
         log += f"- Cell segmentation image saved to: {segmentation_path}\n"
 
     # Summary
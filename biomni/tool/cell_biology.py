@@ -184,6 +184,8 @@ def quantify_and_cluster_cell_motility(image_sequence_path, output_dir="./result
     import pandas as pd
     from sklearn.cluster import KMeans
 
+    from biomni.tool.cell_tracking import link_greedy, map_frames, read_images
+
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
@@ -195,111 +197,78 @@ def quantify_and_cluster_cell_motility(image_sequence_path, output_dir="./result
     if len(image_files) < 2:
         return "Error: Insufficient images found. At least 2 time points are required."
 
-    # Step 2: Initialize cell tracking
-    first_image = cv2.imread(os.path.join(image_sequence_path, image_files[0]), cv2.IMREAD_GRAYSCALE)
-
-    # Simple cell detection using thresholding and contour detection
-    _, binary = cv2.threshold(first_image, 127, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    # Extract cell centroids from first frame
-    cells = []
-    for i, contour in enumerate(contours):
-        if cv2.contourArea(contour) > 50:  # Filter small noise
-            M = cv2.moments(contour)
-            if M["m00"] != 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                cells.append({"id": i, "positions": [(cx, cy)], "frame_indices": [0]})
-
-    # Step 3: Track cells across frames
-    for frame_idx, img_file in enumerate(image_files[1:], 1):
-        img = cv2.imread(os.path.join(image_sequence_path, img_file), cv2.IMREAD_GRAYSCALE)
+    # Step 2: Detect cells in every frame; frames are read ahead and segmented in parallel
+    def detect_cells(img):
+        # Simple cell detection using thresholding and contour detection
         _, binary = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        # Get current frame centroids
-        current_centroids = []
-        for contour in contours:
-            if cv2.contourArea(contour) > 50:
+        detections = []  # (contour index, cx, cy)
+        for i, contour in enumerate(contours):
+            if cv2.contourArea(contour) > 50:  # Filter small noise
                 M = cv2.moments(contour)
                 if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    current_centroids.append((cx, cy))
-
-        # Match cells with nearest centroids in current frame
-        for cell in cells:
-            if len(cell["positions"]) == frame_idx:  # Only track cells found in previous frame
-                prev_pos = cell["positions"][-1]
-
-                if current_centroids:
-                    # Calculate distances to all current centroids
-                    distances = [
-                        np.sqrt((prev_pos[0] - c[0]) ** 2 + (prev_pos[1] - c[1]) ** 2) for c in current_centroids
-                    ]
-                    min_idx = np.argmin(distances)
-
-                    # Only match if distance is below threshold (prevents incorrect matching)
-                    if distances[min_idx] < 50:  # Threshold distance in pixels
-                        cell["positions"].append(current_centroids[min_idx])
-                        cell["frame_indices"].append(frame_idx)
-                        current_centroids.pop(min_idx)  # Remove matched centroid
-
-    # Step 4: Calculate motility features for each cell
-    cell_features = []
+                    detections.append((i, int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])))
+        return np.array(detections, dtype=np.int64).reshape(-1, 3)
 
-    for cell in cells:
-        # Only analyze cells tracked for at least 3 frames
-        if len(cell["positions"]) < 3:
-            continue
-
-        # Calculate displacements between consecutive positions
-        displacements = []
-        for i in range(1, len(cell["positions"])):
-            prev_pos = cell["positions"][i - 1]
-            curr_pos = cell["positions"][i]
-            displacement = np.sqrt((curr_pos[0] - prev_pos[0]) ** 2 + (curr_pos[1] - prev_pos[1]) ** 2)
-            displacements.append(displacement)
-
-        # Calculate speed (pixels per frame)
-        avg_speed = np.mean(displacements)
-
-        # Calculate directionality (displacement from start to end / total path length)
-        start_pos = cell["positions"][0]
-        end_pos = cell["positions"][-1]
-        net_displacement = np.sqrt((end_pos[0] - start_pos[0]) ** 2 + (end_pos[1] - start_pos[1]) ** 2)
-        total_path_length = np.sum(displacements)
-        directionality = net_displacement / total_path_length if total_path_length > 0 else 0
-
-        # Calculate mean squared displacement
-        msd = np.mean(
-            [
-                np.sqrt((cell["positions"][i][0] - start_pos[0]) ** 2 + (cell["positions"][i][1] - start_pos[1]) ** 2)
-                for i in range(1, len(cell["positions"]))
-            ]
-        )
+    frames = read_images([os.path.join(image_sequence_path, f) for f in image_files])
+    detections = map_frames(detect_cells, frames)
 
-        # Calculate track duration
-        duration = cell["frame_indices"][-1] - cell["frame_indices"][0]
-
-        cell_features.append(
-            {
-                "cell_id": cell["id"],
-                "avg_speed": avg_speed,
-                "directionality": directionality,
-                "msd": msd,
-                "track_duration": duration,
-                "track_length": len(cell["positions"]),
-            }
+    # Extract cell centroids from first frame
+    first = next(detections)
+    cell_ids = first[:, 0]
+    positions = np.zeros((len(image_files), len(cell_ids), 2), dtype=np.int64)
+    positions[0] = first[:, 1:]
+    track_lengths = np.ones(len(cell_ids), dtype=np.int64)
+
+    # Step 3: Track cells across frames. Each cell still tracked in the previous frame takes,
+    # in order, its nearest remaining centroid closer than the threshold
+    for frame_idx, current in enumerate(detections, 1):
+        active = np.flatnonzero(track_lengths == frame_idx)  # Only track cells found in previous frame
+        links = link_greedy(positions[frame_idx - 1, active], current[:, 1:], 50)  # Threshold distance in pixels
+        matched = links >= 0
+        positions[frame_idx, active[matched]] = current[links[matched], 1:]
+        track_lengths[active[matched]] += 1
+
+    # Step 4: Calculate motility features for each cell tracked for at least 3 frames
+    tracked = np.flatnonzero(track_lengths >= 3)
+    avg_speed = np.zeros(len(tracked))
+    directionality = np.zeros(len(tracked))
+    msd = np.zeros(len(tracked))
+    for length in np.unique(track_lengths[tracked]):
+        rows = np.flatnonzero(track_lengths[tracked] == length)
+        track = positions[:length, tracked[rows]].transpose(1, 0, 2)
+
+        # Displacements between consecutive positions and speed (pixels per frame)
+        displacements = np.sqrt(((track[:, 1:] - track[:, :-1]) ** 2).sum(axis=2))
+        avg_speed[rows] = np.mean(displacements, axis=1)
+
+        # Directionality (displacement from start to end / total path length)
+        net_displacement = np.sqrt(((track[:, -1] - track[:, 0]) ** 2).sum(axis=1))
+        total_path_length = np.sum(displacements, axis=1)
+        directionality[rows] = np.divide(
+            net_displacement, total_path_length, out=np.zeros(len(rows)), where=total_path_length > 0
         )
 
+        # Mean squared displacement
+        msd[rows] = np.mean(np.sqrt(((track[:, 1:] - track[:, :1]) ** 2).sum(axis=2)), axis=1)
+
+    cell_features = pd.DataFrame(
+        {
+            "cell_id": cell_ids[tracked],
+            "avg_speed": avg_speed,
+            "directionality": directionality,
+            "msd": msd,
+            "track_duration": track_lengths[tracked] - 1,
+            "track_length": track_lengths[tracked],
+        }
+    )
+
     # Step 5: Cluster cells based on motility features
     if len(cell_features) < num_clusters:
         return f"Error: Not enough cells ({len(cell_features)}) to form {num_clusters} clusters. Try reducing num_clusters."
 
     # Create feature matrix for clustering
-    feature_df = pd.DataFrame(cell_features)
+    feature_df = cell_features
     feature_matrix = feature_df[["avg_speed", "directionality", "msd"]].values
 
     # Normalize features
@@ -337,12 +306,12 @@ Cell Motility Quantification and Clustering Analysis
 
 Analysis Steps:
 1. Loaded {len(image_files)} time-lapse microscopy images
-2. Detected and tracked {len(cells)} initial cells across time frames
+2. Detected and tracked {len(cell_ids)} initial cells across time frames
 3. Calculated motility features for {len(cell_features)} cells with sufficient tracking data
 4. Performed k-means clustering to identify {num_clusters} distinct motility patterns
 
 Results Summary:
-- Detected {len(cells)} cells in the first frame
+- Detected {len(cell_ids)} cells in the first frame
 - Successfully tracked {len(cell_features)} cells across multiple frames
 - Clustered cells into {num_clusters} motility pattern groups
 
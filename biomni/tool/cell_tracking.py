@@ -0,0 +1,286 @@
+"""Shared engine for tracking cells through time-lapse image stacks.
+
+The motility tools used to read frames one ``cv2.imread`` at a time, segment them serially and
+link cells by computing, in Python, the distance from every tracked cell to every centroid of
+the next frame. Here:
+
+- ``read_images`` / ``read_video`` load frames on a background thread that stays ``prefetch``
+  frames ahead of the consumer;
+- ``map_frames`` segments frames on a thread pool (OpenCV releases the GIL) and yields the
+  results in frame order, with a bounded number of frames in flight;
+- linking works on centroid arrays. Candidate pairs within the search radius come from a
+  KD-tree, so each frame costs O(cells log cells):
+
+  * ``link_greedy`` reproduces the sequential rule "each cell, in order, takes its nearest
+    unclaimed centroid below the threshold" exactly (ties go to the earlier centroid);
+  * ``link_optimal`` minimizes the summed squared displacement with a null-link cost of
+    ``search_range**2`` per unlinked cell, the Crocker-Grier objective used by trackpy. Each
+    connected subnet is solved with the Hungarian algorithm; isolated one-to-one pairs, the
+    vast majority, are linked without it. Subnets with more than ``max_subnet_size`` sources
+    (dense clusters, or a search range too large for the cell density) are linked with
+    ``link_greedy`` instead, which bounds the dense cost matrix and the cubic solve;
+  * ``link_trajectories`` links a whole stack with ``link_optimal``, keeping lost cells
+    as candidates for up to ``memory`` frames.
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_PREFETCH = 8
+DEFAULT_MAX_SUBNET_SIZE = 500
+_DONE = object()
+
+
+def available_threads() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def prefetch(iterable, size: int = DEFAULT_PREFETCH):
+    """Iterate over ``iterable`` while a background thread produces up to ``size`` items ahead."""
+    items = queue.Queue(maxsize=max(1, size))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        # Gives up once the consumer has stopped, so an abandoned reader never blocks on a full queue
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+            put((True, _DONE))
+        except BaseException as e:  # re-raised in the consumer
+            put((False, e))
+
+    thread = threading.Thread(target=produce, name="biomni-frame-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, item = items.get()
+            if not ok:
+                raise item
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def read_images(paths, flags=None, prefetch_frames: int = DEFAULT_PREFETCH):
+    """Yield ``cv2.imread(path, flags)`` for each path (None for unreadable files), read ahead."""
+    import cv2
+
+    flags = cv2.IMREAD_GRAYSCALE if flags is None else flags
+    return prefetch((cv2.imread(str(path), flags) for path in paths), prefetch_frames)
+
+
+def read_video(path, prefetch_frames: int = DEFAULT_PREFETCH):
+    """Yield the frames of a video as grayscale arrays, decoded ahead on a background thread.
+
+    Raises:
+        OSError: If the video cannot be opened
+
+    """
+    import cv2
+
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        raise OSError(f"Could not open video file {path}")
+
+    def frames():
+        try:
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    return
+                yield cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        finally:
+            capture.release()
+
+    return prefetch(frames(), prefetch_frames)
+
+
+def map_frames(function, frames, n_workers: int | None = None):
+    """Yield ``function(frame)`` for every frame, in order, computed on a thread pool."""
+    n_workers = n_workers or available_threads()
+    if n_workers == 1:
+        yield from map(function, frames)
+        return
+    with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="biomni-segment") as executor:
+        pending = deque()
+        for frame in frames:
+            pending.append(executor.submit(function, frame))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _candidate_pairs(sources: np.ndarray, dests: np.ndarray, radius: float):
+    """``(source, dest, squared distance)`` arrays of all pairs at most ``radius`` apart."""
+    from scipy.spatial import cKDTree
+
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(sources) or not len(dests):
+        return empty, empty, np.zeros(0, dtype=np.float64)
+    pairs = cKDTree(sources).sparse_distance_matrix(cKDTree(dests), radius, output_type="ndarray")
+    i, j = pairs["i"].astype(np.int64), pairs["j"].astype(np.int64)
+    # Exact squared distances (integer centroids stay exact), so ties compare equal
+    delta = sources[i].astype(np.float64) - dests[j].astype(np.float64)
+    return i, j, (delta**2).sum(axis=1)
+
+
+def link_greedy(sources, dests, max_distance: float) -> np.ndarray:
+    """Sequential nearest-neighbour linking.
+
+    Sources are visited in order; each takes the nearest destination not yet taken (the lowest
+    index among equally near ones) if it is closer than ``max_distance``.
+
+    Returns:
+        Destination index for every source, -1 where it is not linked
+
+    """
+    sources = np.asarray(sources).reshape(-1, 2)
+    dests = np.asarray(dests).reshape(-1, 2)
+    i, j, d2 = _candidate_pairs(sources, dests, max_distance)
+    keep = d2 < max_distance**2
+    return _link_pairs_greedy(len(sources), len(dests), i[keep], j[keep], d2[keep])
+
+
+def _link_pairs_greedy(n_sources: int, n_dests: int, i, j, d2) -> np.ndarray:
+    """``link_greedy`` over the candidate pairs ``(i, j, d2)``."""
+    links = np.full(n_sources, -1, dtype=np.int64)
+    if not len(i):
+        return links
+
+    order = np.lexsort((j, d2, i))
+    i, j = i[order], j[order]
+    starts = np.searchsorted(i, np.arange(n_sources + 1))
+    taken = np.zeros(n_dests, dtype=bool)
+    first = j[starts[:-1].clip(max=len(j) - 1)].tolist()
+    for source in np.unique(i).tolist():
+        dest = first[source]
+        if taken[dest]:
+            # Crowded destinations: scan the rest of this source's candidates in one step
+            rest = j[starts[source] + 1 : starts[source + 1]]
+            free = rest[~taken[rest]]
+            if not len(free):
+                continue
+            dest = free[0]
+        taken[dest] = True
+        links[source] = dest
+    return links
+
+
+def link_optimal(sources, dests, search_range: float, max_subnet_size: int = DEFAULT_MAX_SUBNET_SIZE) -> np.ndarray:
+    """Links minimizing summed squared displacement, ``search_range**2`` per unlinked source.
+
+    Only pairs at most ``search_range`` apart can be linked. Destinations left over start new
+    tracks at no cost. Subnets with more than ``max_subnet_size`` sources are linked greedily.
+
+    Returns:
+        Destination index for every source, -1 where it is not linked
+
+    """
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    sources = np.asarray(sources, dtype=np.float64).reshape(-1, 2)
+    dests = np.asarray(dests, dtype=np.float64).reshape(-1, 2)
+    links = np.full(len(sources), -1, dtype=np.int64)
+    i, j, d2 = _candidate_pairs(sources, dests, search_range)
+    if not len(i):
+        return links
+
+    # Bipartite graph on sources (0..S-1) and destinations (S..S+D-1)
+    n_sources = len(sources)
+    graph = coo_matrix((np.ones(len(i)), (i, j + n_sources)), shape=(n_sources + len(dests),) * 2)
+    _, component = connected_components(graph, directed=False)
+    pair_component = component[i]
+    pairs_per_component = np.bincount(pair_component, minlength=component.max() + 1)
+
+    # A component with a single pair is one source and one destination
+    simple = pairs_per_component[pair_component] == 1
+    links[i[simple]] = j[simple]
+
+    null_cost = float(search_range) ** 2
+    complex_pairs = np.flatnonzero(~simple)
+    order = complex_pairs[np.argsort(pair_component[complex_pairs], kind="stable")]
+    boundaries = np.flatnonzero(np.diff(pair_component[order])) + 1
+    for group in np.split(order, boundaries) if len(order) else []:
+        sub_sources, source_index = np.unique(i[group], return_inverse=True)
+        sub_dests, dest_index = np.unique(j[group], return_inverse=True)
+        n, m = len(sub_sources), len(sub_dests)
+        if n > max_subnet_size:
+            sub_links = _link_pairs_greedy(n, m, source_index, dest_index, d2[group])
+            linked = sub_links >= 0
+            links[sub_sources[linked]] = sub_dests[sub_links[linked]]
+            continue
+        # Columns: destinations, then one private null link per source
+        cost = np.full((n, m + n), np.inf)
+        cost[source_index, dest_index] = d2[group]
+        cost[np.arange(n), m + np.arange(n)] = null_cost
+        rows, columns = linear_sum_assignment(cost)
+        linked = columns < m
+        links[sub_sources[rows[linked]]] = sub_dests[columns[linked]]
+    return links
+
+
+def link_trajectories(
+    positions_by_frame, search_range: float, memory: int = 0, max_subnet_size: int = DEFAULT_MAX_SUBNET_SIZE
+) -> list[np.ndarray]:
+    """Link per-frame detections into trajectories.
+
+    Args:
+        positions_by_frame: One ``(n, 2)`` array of positions per frame
+        search_range: Largest displacement between linked detections
+        memory: Frames a lost cell is kept as a candidate, at its last position
+        max_subnet_size: Largest subnet (in sources) solved optimally; see ``link_optimal``
+
+    Returns:
+        Trajectory id of every detection, one array per frame; ids are numbered in order of
+        first appearance
+
+    """
+    track_positions = np.zeros((0, 2), dtype=np.float64)
+    track_frames = np.zeros(0, dtype=np.int64)
+    track_ids = np.zeros(0, dtype=np.int64)
+    next_id = 0
+    labels = []
+    for frame, positions in enumerate(positions_by_frame):
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        alive = frame - track_frames <= memory + 1
+        track_positions, track_frames, track_ids = track_positions[alive], track_frames[alive], track_ids[alive]
+
+        links = link_optimal(track_positions, positions, search_range, max_subnet_size)
+        frame_labels = np.full(len(positions), -1, dtype=np.int64)
+        linked = links >= 0
+        frame_labels[links[linked]] = track_ids[linked]
+        new = frame_labels < 0
+        frame_labels[new] = np.arange(next_id, next_id + new.sum())
+        next_id += int(new.sum())
+        labels.append(frame_labels)
+
+        # Linked tracks move to their new position; new tracks are appended
+        track_positions[linked] = positions[links[linked]]
+        track_frames[linked] = frame
+        track_positions = np.concatenate([track_positions, positions[new]])
+        track_frames = np.concatenate([track_frames, np.full(new.sum(), frame, dtype=np.int64)])
+        track_ids = np.concatenate([track_ids, frame_labels[new]])
+    return labels
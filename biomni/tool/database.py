@@ -1,8 +1,12 @@
+import copy
 import json
 import logging
 import os
-import pickle
+import re
+import threading
 import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from typing import Any
 
 import requests
@@ -10,7 +14,10 @@ from Bio.Blast import NCBIWWW, NCBIXML
 from Bio.Seq import Seq
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from biomni.http_client import http_get, http_post, ncbi_api_key
 from biomni.llm import get_llm
+from biomni.response_cache import cached_call, cached_request, get_response_cache
+from biomni.tool.schema_registry import get_schema_registry, load_schema
 from biomni.utils import parse_hpo_obo
 
 # Configure logger
@@ -128,10 +135,99 @@ def get_hpo_names(hpo_terms: list[str], data_lake_path: str) -> list[str]:
     return hpo_names
 
 
+# Translations of natural-language prompts into API calls, keyed on
+# (system prompt fingerprint, normalized prompt, model config). Successful results are kept in
+# memory and in the persistent response cache, so a repeated lookup skips the LLM entirely.
+_API_TRANSLATION_SOURCE = "nl2api"
+_api_translations = OrderedDict()
+# Gene, variant and accession-like words of the original prompt of each cached translation
+_api_translation_identifiers = {}
+_API_TRANSLATION_MEMORY_SIZE = 1024
+_api_translation_stats = Counter()
+_api_translation_lock = threading.Lock()
+# Jaccard similarity over prompt tokens above which a cached translation is reused for a
+# near-duplicate prompt (identifiers and numbers must still match exactly). Disabled if unset.
+_API_TRANSLATION_SIMILARITY = float(os.environ.get("BIOMNI_NL2API_SIMILARITY", "0") or 0)
+_PROMPT_TOKEN_PATTERN = re.compile(r"[a-z0-9_:.\-]+")
+# Words with a digit or two capitals (KRAS, rs123, P04637), as in biomni.agent.answer_cache
+_IDENTIFIER_PATTERN = re.compile(r"\b(?:\w*\d\w*|\w*[A-Z]\w*[A-Z]\w*)\b")
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Lowercase and collapse whitespace/trailing punctuation so trivially different prompts share a key."""
+    return " ".join(prompt.lower().split()).rstrip(" ?.!")
+
+
+@lru_cache(maxsize=16)
+def _get_api_llm(model, source, base_url, api_key):
+    """One LLM client per model configuration, reused across API translations."""
+    _api_translation_stats["clients_created"] += 1
+    return get_llm(
+        model=model,
+        temperature=0.1,  # Lower temperature for more consistent API generation
+        source=source,
+        base_url=base_url,
+        api_key=api_key,
+    )
+
+
+def _prompt_tokens(normalized_prompt):
+    tokens = set(_PROMPT_TOKEN_PATTERN.findall(normalized_prompt))
+    return tokens, {t for t in tokens if any(c.isdigit() for c in t)}
+
+
+def _prompt_identifiers(prompt):
+    """Gene, variant and accession-like words of the original (not lowercased) prompt, casefolded."""
+    return frozenset(word.casefold() for word in _IDENTIFIER_PATTERN.findall(prompt))
+
+
+def _similar_api_translation(namespace, config, normalized_prompt, identifiers):
+    """Best cached translation of a near-duplicate prompt for the same database and model, if any.
+
+    Prompts naming different genes, variants or accessions never share a translation.
+    """
+    tokens, numbers = _prompt_tokens(normalized_prompt)
+    with _api_translation_lock:
+        candidates = [
+            (key[1], value, _api_translation_identifiers.get(key))
+            for key, value in _api_translations.items()
+            if key[0] == namespace and key[2] == config
+        ]
+    best, best_score = None, _API_TRANSLATION_SIMILARITY
+    for cached_prompt, value, cached_identifiers in candidates:
+        cached_tokens, cached_numbers = _prompt_tokens(cached_prompt)
+        if cached_numbers != numbers or cached_identifiers != identifiers:
+            continue
+        union = tokens | cached_tokens
+        score = len(tokens & cached_tokens) / len(union) if union else 0.0
+        if score >= best_score:
+            best, best_score = value, score
+    return best
+
+
+def get_api_translation_stats() -> dict:
+    """Counters for the natural-language to API translation cache."""
+    with _api_translation_lock:
+        stats = dict(_api_translation_stats)
+        stats["cached_in_memory"] = len(_api_translations)
+    lookups = stats.get("hits", 0) + stats.get("semantic_hits", 0) + stats.get("misses", 0)
+    stats["hit_rate"] = round((stats.get("hits", 0) + stats.get("semantic_hits", 0)) / lookups, 3) if lookups else 0.0
+    return stats
+
+
+def clear_api_translation_cache():
+    with _api_translation_lock:
+        _api_translations.clear()
+        _api_translation_identifiers.clear()
+    get_response_cache().clear(_API_TRANSLATION_SOURCE)
+
+
 def _query_llm_for_api(prompt, schema, system_template, model=None, api_key=None, base_url=None, source=None):
     """Helper function to query any LLM for generating API calls based on natural language prompts.
 
     Supports multiple model providers including Claude, Gemini, GPT, and others via the unified get_llm interface.
+    Successful translations are cached per (schema/template, normalized prompt, model), so repeating a
+    prompt does not call the LLM again.
 
     Parameters
     ----------
@@ -157,28 +253,42 @@ def _query_llm_for_api(prompt, schema, system_template, model=None, api_key=None
             base_url = base_url or session_config.get("base_url")
             source = source or session_config.get("source")
 
-        # Get the LLM instance using the existing get_llm function
+        # Format the system prompt with the schema (pre-rendered and cached for schema_db schemas).
+        # Its fingerprint identifies the database (template + schema); the API key does not affect the answer.
+        system_prompt, namespace = get_schema_registry().system_prompt(system_template, schema)
+        normalized_prompt = _normalize_prompt(prompt)
+        config = (model, source, base_url)
+        memory_key = (namespace, normalized_prompt, config)
+        with _api_translation_lock:
+            cached = _api_translations.get(memory_key)
+            if cached is not None:
+                _api_translations.move_to_end(memory_key)
+        if cached is None:
+            found, cached = get_response_cache().get_value(_API_TRANSLATION_SOURCE, memory_key)
+            if not found:
+                cached = None
+        if cached is not None:
+            _api_translation_stats["hits"] += 1
+            if DEBUG_MODE:
+                logger.debug(f"Reusing cached API translation for prompt: {prompt[:200]}")
+            _remember_api_translation(memory_key, cached, _prompt_identifiers(prompt))
+            return copy.deepcopy(cached)
+        if _API_TRANSLATION_SIMILARITY > 0:
+            similar = _similar_api_translation(namespace, config, normalized_prompt, _prompt_identifiers(prompt))
+            if similar is not None:
+                _api_translation_stats["semantic_hits"] += 1
+                return copy.deepcopy(similar)
+        _api_translation_stats["misses"] += 1
+
+        # Get the LLM instance (one client per configuration)
         if DEBUG_MODE:
-            logger.debug(f"Creating LLM instance for API generation")
+            logger.debug(f"Getting LLM instance for API generation")
             logger.debug(f"Model: {model}")
             logger.debug(f"Source: {source}")
             logger.debug(f"Base URL: {base_url}")
             logger.debug(f"Temperature: 0.1")
             
-        llm = get_llm(
-            model=model,
-            temperature=0.1,  # Lower temperature for more consistent API generation
-            source=source,
-            base_url=base_url,
-            api_key=api_key
-        )
-
-        # Format the system prompt with the schema
-        if schema is not None:
-            schema_json = json.dumps(schema, indent=2)
-            system_prompt = system_template.format(schema=schema_json)
-        else:
-            system_prompt = system_template
+        llm = _get_api_llm(model, source, base_url, api_key)
 
         # Use LangChain's standard interface
         messages = [
@@ -192,6 +302,7 @@ def _query_llm_for_api(prompt, schema, system_template, model=None, api_key=None
             logger.debug(f"User prompt: {prompt[:200]}...")
             logger.debug(f"Total messages: {len(messages)}")
         
+        _api_translation_stats["llm_calls"] += 1
         response = llm.invoke(messages)
         
         if DEBUG_MODE:
@@ -213,7 +324,10 @@ def _query_llm_for_api(prompt, schema, system_template, model=None, api_key=None
             # If no JSON found, try the whole response
             result = json.loads(llm_text)
 
-        return {"success": True, "data": result, "raw_response": llm_text}
+        translation = {"success": True, "data": result, "raw_response": llm_text}
+        _remember_api_translation(memory_key, translation, _prompt_identifiers(prompt))
+        get_response_cache().put_value(_API_TRANSLATION_SOURCE, memory_key, translation)
+        return copy.deepcopy(translation)
 
     except (json.JSONDecodeError, KeyError, IndexError) as e:
         return {
@@ -225,7 +339,17 @@ def _query_llm_for_api(prompt, schema, system_template, model=None, api_key=None
         return {"success": False, "error": f"Error querying LLM: {str(e)}"}
 
 
-def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None):
+def _remember_api_translation(memory_key, translation, identifiers):
+    with _api_translation_lock:
+        _api_translations[memory_key] = translation
+        _api_translation_identifiers[memory_key] = identifiers
+        _api_translations.move_to_end(memory_key)
+        while len(_api_translations) > _API_TRANSLATION_MEMORY_SIZE:
+            evicted, _ = _api_translations.popitem(last=False)
+            _api_translation_identifiers.pop(evicted, None)
+
+
+def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None, use_cache=True):
     """General helper function to query REST APIs with consistent error handling.
 
     Parameters
@@ -236,6 +360,7 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     headers (dict, optional): HTTP headers for the request
     json_data (dict, optional): JSON data for POST requests
     description (str, optional): Description of this query for error messages
+    use_cache (bool): Serve and store the response through the persistent response cache
 
     Returns
     -------
@@ -265,9 +390,11 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     try:
         # Make the API request
         if method.upper() == "GET":
-            response = requests.get(endpoint, params=params, headers=headers)
+            response = cached_request("GET", endpoint, params=params, headers=headers, use_cache=use_cache)
         elif method.upper() == "POST":
-            response = requests.post(endpoint, params=params, headers=headers, json=json_data)
+            response = cached_request(
+                "POST", endpoint, params=params, headers=headers, json_data=json_data, use_cache=use_cache
+            )
         else:
             return {"error": f"Unsupported HTTP method: {method}"}
 
@@ -352,6 +479,13 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
         }
 
 
+def _ncbi_params(params: dict) -> dict:
+    """Add the NCBI API key (raises the E-utilities rate limit to 10 requests/s) when one is configured."""
+    api_key = ncbi_api_key()
+    return {**params, "api_key": api_key} if api_key else params
+
+
+@cached_call("ncbi", should_cache=lambda result: isinstance(result, dict) and "error" not in result)
 def _query_ncbi_database(
     database: str,
     search_term: str,
@@ -388,8 +522,9 @@ def _query_ncbi_database(
     search_response = _query_rest_api(
         endpoint=esearch_url,
         method="GET",
-        params=esearch_params,
+        params=_ncbi_params(esearch_params),
         description="NCBI ESearch API query",
+        use_cache=False,  # the whole NCBI query is cached by @cached_call; WebEnv handles are short-lived
     )
 
     if not search_response["success"]:
@@ -418,8 +553,9 @@ def _query_ncbi_database(
             details_response = _query_rest_api(
                 endpoint=esummary_url,
                 method="GET",
-                params=esummary_params,
+                params=_ncbi_params(esummary_params),
                 description="NCBI ESummary API query",
+                use_cache=False,
             )
 
             if not details_response["success"]:
@@ -442,8 +578,9 @@ def _query_ncbi_database(
             details_response = _query_rest_api(
                 endpoint=esummary_url,
                 method="GET",
-                params=esummary_params,
+                params=_ncbi_params(esummary_params),
                 description="NCBI ESummary API query",
+                use_cache=False,
             )
 
             if not details_response["success"]:
@@ -640,9 +777,7 @@ def query_uniprot(
     # If using prompt, parse with Claude
     if prompt:
         # Load UniProt schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "uniprot.pkl")
-        with open(schema_path, "rb") as f:
-            uniprot_schema = pickle.load(f)
+        uniprot_schema = load_schema("uniprot")
 
         # Create system prompt template
         system_template = """
@@ -765,7 +900,7 @@ def query_alphafold(
 
     try:
         # Make the API request
-        response = requests.get(url)
+        response = http_get(url)
         response.raise_for_status()
 
         # Parse the response as JSON
@@ -788,7 +923,7 @@ def query_alphafold(
             download_url = f"https://alphafold.ebi.ac.uk/files/{filename}"
 
             # Download the file
-            download_response = requests.get(download_url)
+            download_response = http_get(download_url)
             if download_response.status_code == 200:
                 with open(file_path, "wb") as f:
                     f.write(download_response.content)
@@ -895,9 +1030,7 @@ def query_interpro(
     # If using prompt, parse with Claude
     if prompt:
         # Load InterPro schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "interpro.pkl")
-        with open(schema_path, "rb") as f:
-            interpro_schema = pickle.load(f)
+        interpro_schema = load_schema("interpro")
 
         # Create system prompt template
         system_template = """
@@ -1001,11 +1134,8 @@ def query_pdb(
 
     # Generate search query from natural language if prompt is provided and query is not
     if prompt and not query:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pdb.pkl")
-
-        with open(schema_path, "rb") as f:
-            schema = pickle.load(f)
+        # Load schema from the schema registry
+        schema = load_schema("pdb")
 
         # Create system prompt template
         system_template = """
@@ -1137,7 +1267,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                     data_url = f"https://data.rcsb.org/rest/v1/core/chem_comp/{identifier}"
 
                 # Fetch data
-                data_response = requests.get(data_url)
+                data_response = http_get(data_url)
                 data_response.raise_for_status()
                 entity_data = data_response.json()
 
@@ -1176,7 +1306,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                 try:
                     # Download PDB file
                     pdb_url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
-                    pdb_response = requests.get(pdb_url)
+                    pdb_response = http_get(pdb_url)
 
                     if pdb_response.status_code == 200:
                         # Create data directory if it doesn't exist
@@ -1230,10 +1360,8 @@ def query_kegg(
         return {"error": "Either a prompt or an endpoint must be provided"}
 
     if prompt:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "kegg.pkl")
-        with open(schema_path, "rb") as f:
-            kegg_schema = pickle.load(f)
+        # Load schema from the schema registry
+        kegg_schema = load_schema("kegg")
 
         # Create system prompt template
         system_template = """
@@ -1341,9 +1469,7 @@ def query_stringdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load STRING schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "stringdb.pkl")
-        with open(schema_path, "rb") as f:
-            stringdb_schema = pickle.load(f)
+        stringdb_schema = load_schema("stringdb")
 
         # Create system prompt template
         system_template = """
@@ -1411,7 +1537,7 @@ def query_stringdb(
         if download_image:
             # For images, we need to handle the download manually
             try:
-                response = requests.get(endpoint, stream=True)
+                response = http_get(endpoint, stream=True)
                 response.raise_for_status()
 
                 # Create output directory if needed
@@ -1516,9 +1642,7 @@ def query_iucn(
     # If using prompt, parse with Claude
     if prompt:
         # Load IUCN schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "iucn.pkl")
-        with open(schema_path, "rb") as f:
-            iucn_schema = pickle.load(f)
+        iucn_schema = load_schema("iucn")
 
         # Create system prompt template
         system_template = """
@@ -1622,9 +1746,7 @@ def query_paleobiology(
     # If using prompt, parse with Claude
     if prompt:
         # Load PBDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pbdb.pkl")
-        with open(schema_path, "rb") as f:
-            pbdb_schema = pickle.load(f)
+        pbdb_schema = load_schema("pbdb")
 
         # Create system prompt template
         system_template = """
@@ -1686,7 +1808,7 @@ def query_paleobiology(
     if is_image:
         # For image queries, we need special handling
         try:
-            response = requests.get(endpoint)
+            response = http_get(endpoint)
             response.raise_for_status()
 
             # Return image metadata without the binary data
@@ -1755,9 +1877,7 @@ def query_jaspar(
     # If using prompt, parse with Claude
     if prompt:
         # Load JASPAR schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "jaspar.pkl")
-        with open(schema_path, "rb") as f:
-            jaspar_schema = pickle.load(f)
+        jaspar_schema = load_schema("jaspar")
 
         # Create system prompt template
         system_template = """
@@ -1864,9 +1984,7 @@ def query_worms(
     # If using prompt, parse with Claude
     if prompt:
         # Load WoRMS schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "worms.pkl")
-        with open(schema_path, "rb") as f:
-            worms_schema = pickle.load(f)
+        worms_schema = load_schema("worms")
 
         # Create system prompt template
         system_template = """
@@ -1966,9 +2084,7 @@ def query_cbioportal(
     # If using prompt, parse with Claude
     if prompt:
         # Load cBioPortal schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "cbioportal.pkl")
-        with open(schema_path, "rb") as f:
-            cbioportal_schema = pickle.load(f)
+        cbioportal_schema = load_schema("cbioportal")
 
         # Create system prompt template
         system_template = """
@@ -2064,9 +2180,7 @@ def query_clinvar(
 
     if prompt:
         # Load ClinVar schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "clinvar.pkl")
-        with open(schema_path, "rb") as f:
-            clinvar_schema = pickle.load(f)
+        clinvar_schema = load_schema("clinvar")
 
         # ClinVar system prompt template
         system_prompt_template = """
@@ -2161,9 +2275,7 @@ def query_geo(
 
     if prompt:
         # Load GEO schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "geo.pkl")
-        with open(schema_path, "rb") as f:
-            geo_schema = pickle.load(f)
+        geo_schema = load_schema("geo")
 
         # Create system prompt template
         system_template = """
@@ -2264,9 +2376,7 @@ def query_dbsnp(
 
     if prompt:
         # Load dbSNP schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "dbsnp.pkl")
-        with open(schema_path, "rb") as f:
-            dbsnp_schema = pickle.load(f)
+        dbsnp_schema = load_schema("dbsnp")
 
         # Create system prompt template
         system_template = """
@@ -2364,9 +2474,7 @@ def query_ucsc(
     # If using prompt, parse with Claude
     if prompt:
         # Load UCSC schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ucsc.pkl")
-        with open(schema_path, "rb") as f:
-            ucsc_schema = pickle.load(f)
+        ucsc_schema = load_schema("ucsc")
 
         # Create system prompt template
         system_template = """
@@ -2473,9 +2581,7 @@ def query_ensembl(
     # If using prompt, parse with Claude
     if prompt:
         # Load Ensembl schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ensembl.pkl")
-        with open(schema_path, "rb") as f:
-            ensembl_schema = pickle.load(f)
+        ensembl_schema = load_schema("ensembl")
 
         # Create system prompt template
         system_template = """
@@ -2600,9 +2706,7 @@ def query_opentarget_genetics(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget_genetics.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = load_schema("opentarget_genetics")
 
         # Create system prompt template
         system_template = """
@@ -2707,9 +2811,7 @@ def query_opentarget(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = load_schema("opentarget")
 
         # Create system prompt template
         system_template = """
@@ -2810,12 +2912,7 @@ def query_monarch(
 
     # If using prompt, use Claude to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "monarch.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                monarch_schema = pickle.load(f)
-        else:
-            monarch_schema = None
+        monarch_schema = load_schema("monarch", required=False)
 
         system_template = """
         You are an expert in translating natural language requests into REST API calls for the Monarch Initiative Platform API.
@@ -2928,12 +3025,7 @@ def query_openfda(
 
     # If using prompt, use Claude or Gemini to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "openfda.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                openfda_schema = pickle.load(f)
-        else:
-            openfda_schema = None
+        openfda_schema = load_schema("openfda", required=False)
 
         system_template = """
         You are a biomedical informatics expert specialized in using the OpenFDA API.\n\nBased on the user's natural language request, determine the appropriate OpenFDA API endpoint and parameters.\n\nOPENFDA API SCHEMA:\n{schema}\n\nYour response should be a JSON object with the following fields:\n1. \"full_url\": The complete URL to query (including the base URL \"https://api.fda.gov\" and any parameters)\n2. \"description\": A brief description of what the query is doing\n\nSPECIAL NOTES:\n- For drug event queries, use /drug/event.json?search=...\n- For drug label queries, use /drug/label.json?search=...\n- For recall queries, use /drug/enforcement.json?search=...\n- Use max_results to limit the number of returned items if supported (limit=)\n- Always URL-encode search terms\n- Return ONLY the JSON object with no additional text.\n        """
@@ -3016,9 +3108,7 @@ def query_gwas_catalog(
     # If using prompt, parse with Claude
     if prompt:
         # Load GWAS Catalog schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gwas_catalog.pkl")
-        with open(schema_path, "rb") as f:
-            gwas_schema = pickle.load(f)
+        gwas_schema = load_schema("gwas_catalog")
 
         # Create system prompt template
         system_template = """
@@ -3122,9 +3212,7 @@ def query_gnomad(
     # If using prompt, parse with Claude
     if prompt and not gene_symbol:
         # Load gnomAD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gnomad.pkl")
-        with open(schema_path, "rb") as f:
-            gnomad_schema = pickle.load(f)
+        gnomad_schema = load_schema("gnomad")
 
         # Create system prompt template
         system_template = """
@@ -3338,9 +3426,7 @@ def query_reactome(
     # If using prompt, parse with Claude
     if prompt:
         # Load Reactome schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "reactome.pkl")
-        with open(schema_path, "rb") as f:
-            reactome_schema = pickle.load(f)
+        reactome_schema = load_schema("reactome")
 
         # Create system prompt template
         system_template = """
@@ -3439,7 +3525,7 @@ def query_reactome(
         if pathway_id and output_dir:
             diagram_url = f"{content_base_url}/data/pathway/{pathway_id}/diagram"
             try:
-                diagram_response = requests.get(diagram_url)
+                diagram_response = http_get(diagram_url)
                 diagram_response.raise_for_status()
 
                 # Save diagram file
@@ -3590,9 +3676,7 @@ def query_pride(
     # If using prompt, parse with Claude
     if prompt:
         # Load PRIDE schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pride.pkl")
-        with open(schema_path, "rb") as f:
-            pride_schema = pickle.load(f)
+        pride_schema = load_schema("pride")
 
         # Create system prompt template
         system_template = """
@@ -3695,9 +3779,7 @@ def query_gtopdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load GtoPdb schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gtopdb.pkl")
-        with open(schema_path, "rb") as f:
-            gtopdb_schema = pickle.load(f)
+        gtopdb_schema = load_schema("gtopdb")
 
         # Create system prompt template
         system_template = r"""
@@ -3798,7 +3880,7 @@ def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, as
         steps.append(str(data))
 
         # Make the request
-        response = requests.post(url, json=data)
+        response = http_post(url, json=data)
 
         # Check if the response is successful
         if not response.ok:
@@ -3897,7 +3979,7 @@ def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int =
     data = {"accession": accession, "assembly": assembly, "coord_chrom": chromosome}
 
     steps_log += "Sending POST request to API with given data.\n"
-    response = requests.post(url, json=data)
+    response = http_post(url, json=data)
 
     if not response.ok:
         steps_log += f"API request failed with response: {response.text}\n"
@@ -3969,9 +4051,7 @@ def query_remap(
     # If using prompt, parse with Claude
     if prompt:
         # Load ReMap schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "remap.pkl")
-        with open(schema_path, "rb") as f:
-            remap_schema = pickle.load(f)
+        remap_schema = load_schema("remap")
 
         # Create system prompt template
         system_template = """
@@ -4076,9 +4156,7 @@ def query_mpd(
     # If using prompt, parse with Claude
     if prompt:
         # Load MPD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "mpd.pkl")
-        with open(schema_path, "rb") as f:
-            mpd_schema = pickle.load(f)
+        mpd_schema = load_schema("mpd")
 
         # Create system prompt template
         system_template = """
@@ -4183,9 +4261,7 @@ def query_emdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load EMDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "emdb.pkl")
-        with open(schema_path, "rb") as f:
-            emdb_schema = pickle.load(f)
+        emdb_schema = load_schema("emdb")
 
         # Create system prompt template
         system_template = """
@@ -0,0 +1,505 @@
+"""Precompiled, memory-mapped index of the DDInter 2.0 drug-drug interactions.
+
+The eight ``ddinter_*.csv`` files of the data lake are compiled once, with vectorized pandas
+operations, into a columnar index under ``$BIOMNI_CACHE_DIR/ddinter/<signature>/``:
+
+- one row per interaction: integer drug ids of both drugs, severity level and category as
+  small integer codes;
+- a CSR adjacency over standardized drug names whose entries point at interaction rows, so
+  the interactions of a pair are a slice plus a binary search;
+- a CSR adjacency between drugs and a category bitmask per drug for the registry.
+
+The arrays are ``.npy`` files opened with ``mmap_mode="r"`` and the vocabularies live in
+``meta.json``. The signature covers the size and mtime of every CSV, so editing the data lake
+triggers a rebuild. ``get_ddinter_index`` keeps one index per data lake per process.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+INDEX_VERSION = 1
+
+DDINTER_CSV_FILES = [
+    "ddinter_alimentary_tract_metabolism.csv",
+    "ddinter_antineoplastic.csv",
+    "ddinter_antiparasitic.csv",
+    "ddinter_blood_organs.csv",
+    "ddinter_dermatological.csv",
+    "ddinter_hormonal.csv",
+    "ddinter_respiratory.csv",
+    "ddinter_various.csv",
+]
+
+_SALT_SUFFIXES = (" hydrochloride", " sulfate", " sodium", " potassium", " calcium", " magnesium")
+
+_ARRAYS = (
+    "row_drug_a",
+    "row_drug_b",
+    "row_level",
+    "row_category",
+    "pair_indptr",
+    "pair_indices",
+    "pair_rows",
+    "drug_name_id",
+    "drug_categories",
+    "drug_indptr",
+    "drug_indices",
+)
+
+
+def standardize_drug_name(drug_name) -> str:
+    """Lowercase a drug name and strip common salt suffixes."""
+    if pd.isna(drug_name):
+        return ""
+    standardized = str(drug_name).strip().lower()
+    for suffix in _SALT_SUFFIXES:
+        standardized = standardized.replace(suffix, "")
+    return standardized
+
+
+def _standardize_series(names: pd.Series) -> pd.Series:
+    standardized = names.fillna("").astype(str).str.strip().str.lower()
+    for suffix in _SALT_SUFFIXES:
+        standardized = standardized.str.replace(suffix, "", regex=False)
+    return standardized
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, n: int, payload: np.ndarray | None = None):
+    """CSR arrays for edges ``sources -> targets`` sorted by (source, target, payload)."""
+    keys = (targets, sources) if payload is None else (payload, targets, sources)
+    order = np.lexsort(keys)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    indices = targets[order].astype(np.int32)
+    return indptr, indices, (payload[order].astype(np.int32) if payload is not None else None)
+
+
+def _cache_root() -> str:
+    cache_dir = os.getenv("BIOMNI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "biomni"))
+    return os.path.join(cache_dir, "ddinter")
+
+
+def source_signature(data_lake_path: str) -> str | None:
+    """Hash of the names, sizes and mtimes of the DDInter CSVs present; None if there are none."""
+    parts = []
+    for csv_file in DDINTER_CSV_FILES:
+        try:
+            stat = os.stat(os.path.join(data_lake_path, csv_file))
+        except FileNotFoundError:
+            continue
+        parts.append(f"{csv_file}:{stat.st_size}:{stat.st_mtime_ns}")
+    if not parts:
+        return None
+    payload = f"v{INDEX_VERSION}|{os.path.abspath(data_lake_path)}|" + "|".join(parts)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_ddinter_index(data_lake_path: str, output_dir: str) -> str:
+    """Compile the DDInter CSVs in ``data_lake_path`` into an index directory.
+
+    Args:
+        data_lake_path: Directory containing the raw ``ddinter_*.csv`` files
+        output_dir: Directory receiving the ``.npy`` arrays and ``meta.json``
+
+    Returns:
+        ``output_dir``
+
+    Raises:
+        FileNotFoundError: If none of the DDInter CSV files exist
+
+    """
+    dataframes = []
+    categories = []
+    for csv_file in DDINTER_CSV_FILES:
+        file_path = os.path.join(data_lake_path, csv_file)
+        if os.path.exists(file_path):
+            df = pd.read_csv(file_path, usecols=["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level"])
+            df["category"] = len(categories)
+            categories.append(csv_file.replace("ddinter_", "").replace(".csv", ""))
+            dataframes.append(df)
+    if not dataframes:
+        raise FileNotFoundError("No DDInter CSV files found in data lake")
+
+    interactions = pd.concat(dataframes, ignore_index=True)
+    n_rows = len(interactions)
+
+    # Both sides of every row, interleaved (A0, B0, A1, B1, ...) so first appearance follows row order
+    side_ids = np.empty(2 * n_rows, dtype=object)
+    side_ids[0::2] = interactions["DDInterID_A"].astype(str).to_numpy()
+    side_ids[1::2] = interactions["DDInterID_B"].astype(str).to_numpy()
+    side_names = np.empty(2 * n_rows, dtype=object)
+    side_names[0::2] = interactions["Drug_A"].to_numpy()
+    side_names[1::2] = interactions["Drug_B"].to_numpy()
+
+    side_drugs, drug_ids = pd.factorize(side_ids)
+    side_drugs = side_drugs.astype(np.int32)
+    n_drugs = len(drug_ids)
+    first_seen = np.full(n_drugs, -1, dtype=np.int64)
+    first_seen[side_drugs[::-1]] = np.arange(2 * n_rows - 1, -1, -1)
+    drug_names = pd.Series(side_names[first_seen]).fillna("").astype(str)
+    drug_std_names = _standardize_series(pd.Series(side_names[first_seen]))
+
+    # Standardized names of each row's own drug names key the pair adjacency
+    side_std = _standardize_series(pd.Series(side_names))
+    side_name_ids, std_names = pd.factorize(side_std)
+    side_name_ids = side_name_ids.astype(np.int32)
+    n_names = len(std_names)
+    drug_name_id = pd.Index(std_names).get_indexer(drug_std_names).astype(np.int32)
+
+    level_codes, levels = pd.factorize(interactions["Level"].fillna("Unknown").astype(str))
+
+    row_ids = np.arange(n_rows, dtype=np.int32)
+    name_a, name_b = side_name_ids[0::2], side_name_ids[1::2]
+    pair_indptr, pair_indices, pair_rows = _csr(
+        np.concatenate([name_a, name_b]), np.concatenate([name_b, name_a]), n_names, np.concatenate([row_ids, row_ids])
+    )
+
+    drug_a, drug_b = side_drugs[0::2], side_drugs[1::2]
+    drug_edges = np.unique(np.stack([np.concatenate([drug_a, drug_b]), np.concatenate([drug_b, drug_a])]), axis=1)
+    drug_indptr, drug_indices, _ = _csr(drug_edges[0], drug_edges[1], n_drugs)
+
+    row_category = interactions["category"].to_numpy(dtype=np.int8)
+    drug_categories = np.zeros(n_drugs, dtype=np.uint32)
+    np.bitwise_or.at(drug_categories, side_drugs, np.repeat(np.uint32(1) << row_category.astype(np.uint32), 2))
+
+    # Name lookup: lowercased original and standardized name of each drug, later drugs win
+    keys = np.empty(2 * n_drugs, dtype=object)
+    keys[0::2] = drug_names.str.lower().to_numpy()
+    keys[1::2] = drug_std_names.to_numpy()
+    lookup = pd.Series(np.repeat(np.arange(n_drugs), 2), index=keys)
+    lookup = lookup[~lookup.index.duplicated(keep="last")]
+
+    arrays = {
+        "row_drug_a": drug_a,
+        "row_drug_b": drug_b,
+        "row_level": level_codes.astype(np.int8),
+        "row_category": row_category,
+        "pair_indptr": pair_indptr,
+        "pair_indices": pair_indices,
+        "pair_rows": pair_rows,
+        "drug_name_id": drug_name_id,
+        "drug_categories": drug_categories,
+        "drug_indptr": drug_indptr,
+        "drug_indices": drug_indices,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+    meta = {
+        "version": INDEX_VERSION,
+        "rows": n_rows,
+        "categories": categories,
+        "levels": [str(level) for level in levels],
+        "drug_ids": [str(drug_id) for drug_id in drug_ids],
+        "drug_names": drug_names.tolist(),
+        "std_names": [str(name) for name in std_names],
+        "name_keys": [str(key) for key in lookup.index],
+        "name_drugs": lookup.to_numpy().tolist(),
+    }
+    # meta.json is written last and marks the index as complete
+    with open(os.path.join(output_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return output_dir
+
+
+class DDInterIndex:
+    """Read-only view over a compiled DDInter index directory.
+
+    Drugs are addressed by integer ids (``0..num_drugs-1``) and standardized names by name ids;
+    both map back to strings through the vocabularies in ``meta.json``.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r"))
+        self.categories = meta["categories"]
+        self.levels = meta["levels"]
+        self.drug_ids = meta["drug_ids"]
+        self.drug_names = meta["drug_names"]
+        self.std_names = meta["std_names"]
+        self.num_rows = meta["rows"]
+        self.name_mapping = dict(zip(meta["name_keys"], (self.drug_ids[i] for i in meta["name_drugs"]), strict=True))
+        self._name_to_drug = dict(zip(meta["name_keys"], meta["name_drugs"], strict=True))
+        self._drug_index = {drug_id: i for i, drug_id in enumerate(self.drug_ids)}
+        self._std_name_ids = {name: i for i, name in enumerate(self.std_names)}
+
+    @property
+    def num_drugs(self) -> int:
+        return len(self.drug_ids)
+
+    # -- lookups -------------------------------------------------------------------------------
+
+    def name_id(self, name: str) -> int | None:
+        """Name id for a ``name_mapping`` key or standardized name, None if unknown."""
+        name_id = self._std_name_ids.get(name)
+        if name_id is None and name in self._name_to_drug:
+            name_id = int(self.drug_name_id[self._name_to_drug[name]])
+        return name_id
+
+    def drug_index(self, drug_id: str) -> int | None:
+        return self._drug_index.get(drug_id)
+
+    def _level_codes(self, levels) -> np.ndarray:
+        return np.array([i for i, level in enumerate(self.levels) if level in set(levels)], dtype=np.int8)
+
+    def _category_codes(self, categories) -> np.ndarray:
+        return np.array([i for i, c in enumerate(self.categories) if c in set(categories)], dtype=np.int8)
+
+    def pair_rows_for(self, name_a: int, name_b: int) -> np.ndarray:
+        """Interaction row ids between two name ids."""
+        start, end = self.pair_indptr[name_a], self.pair_indptr[name_a + 1]
+        neighbors = self.pair_indices[start:end]
+        lo, hi = np.searchsorted(neighbors, [name_b, name_b + 1])
+        return np.asarray(self.pair_rows[start + lo : start + hi])
+
+    def rows_to_dicts(self, rows: np.ndarray) -> list[dict]:
+        """Interaction records in the format of the former pickled interaction matrix."""
+        drug_a, drug_b = self.row_drug_a[rows], self.row_drug_b[rows]
+        level, category = self.row_level[rows], self.row_category[rows]
+        return [
+            {
+                "level": self.levels[level[i]],
+                "category": self.categories[category[i]],
+                "drug_a_id": self.drug_ids[drug_a[i]],
+                "drug_b_id": self.drug_ids[drug_b[i]],
+                "drug_a_name": self.drug_names[drug_a[i]],
+                "drug_b_name": self.drug_names[drug_b[i]],
+            }
+            for i in range(len(rows))
+        ]
+
+    def interactions(self, name_a: str, name_b: str) -> list[dict]:
+        a, b = self.name_id(name_a), self.name_id(name_b)
+        if a is None or b is None:
+            return []
+        return self.rows_to_dicts(self.pair_rows_for(a, b))
+
+    def drug_categories_of(self, drug: int) -> list[str]:
+        mask = int(self.drug_categories[drug])
+        return [c for i, c in enumerate(self.categories) if mask >> i & 1]
+
+    def drug_neighbors(self, drug: int) -> np.ndarray:
+        return np.asarray(self.drug_indices[self.drug_indptr[drug] : self.drug_indptr[drug + 1]])
+
+    def drug_record(self, drug: int) -> dict:
+        """Registry entry of a drug in the format of the former ``ddinter_drugs.pkl``."""
+        return {
+            "name": self.drug_names[drug],
+            "standardized_name": self.std_names[self.drug_name_id[drug]],
+            "categories": self.drug_categories_of(drug),
+            "interactions": [self.drug_ids[i] for i in self.drug_neighbors(drug)],
+        }
+
+    def interaction_degrees(self) -> np.ndarray:
+        """Number of distinct interacting drugs per drug."""
+        return np.diff(self.drug_indptr)
+
+    # -- batched queries -----------------------------------------------------------------------
+
+    def query_pairs(self, names, severity_levels=None, categories=None) -> list[dict]:
+        """All pairwise interactions within a medication list in one call.
+
+        Args:
+            names: Resolved drug names (``name_mapping`` keys or standardized names); every pair
+                ``i < j`` of list positions is checked
+            severity_levels: Keep only these levels (e.g. ["Major", "Moderate"])
+            categories: Keep only these DDInter categories (e.g. ["antineoplastic"])
+
+        Returns:
+            List of ``{"drug_a", "drug_b", "interactions"}`` for pairs with at least one
+            interaction left after filtering, in list order
+
+        """
+        name_ids = np.array([self.name_id(name) for name in names], dtype=object)
+        known = np.array([name_id is not None for name_id in name_ids], dtype=bool)
+        ids = np.where(known, name_ids, -1).astype(np.int64)
+        level_codes = self._level_codes(severity_levels) if severity_levels else None
+        category_codes = self._category_codes(categories) if categories else None
+
+        pairs = []
+        for i in range(len(names) - 1):
+            if not known[i]:
+                continue
+            start, end = self.pair_indptr[ids[i]], self.pair_indptr[ids[i] + 1]
+            neighbors = self.pair_indices[start:end]
+            others = ids[i + 1 :]
+            lo = np.searchsorted(neighbors, others, side="left")
+            hi = np.searchsorted(neighbors, others, side="right")
+            for offset in np.flatnonzero((hi > lo) & known[i + 1 :]):
+                rows = np.asarray(self.pair_rows[start + lo[offset] : start + hi[offset]])
+                if level_codes is not None:
+                    rows = rows[np.isin(self.row_level[rows], level_codes)]
+                if category_codes is not None:
+                    rows = rows[np.isin(self.row_category[rows], category_codes)]
+                if len(rows):
+                    pairs.append(
+                        {"drug_a": names[i], "drug_b": names[i + 1 + offset], "interactions": self.rows_to_dicts(rows)}
+                    )
+        return pairs
+
+    def contraindication_counts(self, names, level: str = "Major") -> tuple[np.ndarray, np.ndarray]:
+        """Per drug: interactions with the given drugs, and whether any of them has ``level``.
+
+        Args:
+            names: Resolved names of the drugs to avoid; duplicates count repeatedly
+            level: Severity level that flags a drug
+
+        Returns:
+            ``(counts, flagged)`` arrays indexed by drug id
+
+        """
+        counts_by_name = np.zeros(len(self.std_names), dtype=np.int64)
+        flagged_by_name = np.zeros(len(self.std_names), dtype=bool)
+        level_code = self.levels.index(level) if level in self.levels else -1
+        for name in names:
+            name_id = self.name_id(name)
+            if name_id is None:
+                continue
+            start, end = self.pair_indptr[name_id], self.pair_indptr[name_id + 1]
+            neighbors = np.asarray(self.pair_indices[start:end])
+            counts_by_name += np.bincount(neighbors, minlength=len(self.std_names))
+            rows = np.asarray(self.pair_rows[start:end])
+            flagged_by_name[neighbors[self.row_level[rows] == level_code]] = True
+        return counts_by_name[self.drug_name_id], flagged_by_name[self.drug_name_id]
+
+    def statistics(self) -> dict:
+        """Summary statistics (formerly ``ddinter_statistics.pkl``)."""
+        level_counts = np.bincount(self.row_level, minlength=len(self.levels)) * 2
+        category_counts = [
+            int(np.count_nonzero(np.asarray(self.drug_categories) >> np.uint32(i) & np.uint32(1)))
+            for i in range(len(self.categories))
+        ]
+        degrees = self.interaction_degrees()
+        top = np.argsort(-degrees, kind="stable")[:10]
+        return {
+            "total_drugs": self.num_drugs,
+            "total_interactions": 2 * self.num_rows,
+            "interaction_levels": dict(zip(self.levels, level_counts.tolist(), strict=True)),
+            "drug_categories": dict(zip(self.categories, category_counts, strict=True)),
+            "most_connected_drugs": [
+                {"drug_id": self.drug_ids[i], "name": self.drug_names[i], "connections": int(degrees[i])} for i in top
+            ],
+        }
+
+
+class DrugInfoView(Mapping):
+    """``drug_id -> registry entry`` mapping backed by the index."""
+
+    def __init__(self, index: DDInterIndex):
+        self._index = index
+
+    def __getitem__(self, drug_id):
+        drug = self._index.drug_index(drug_id)
+        if drug is None:
+            raise KeyError(drug_id)
+        return self._index.drug_record(drug)
+
+    def __iter__(self):
+        return iter(self._index.drug_ids)
+
+    def __len__(self):
+        return self._index.num_drugs
+
+
+class InteractionMatrixView(Mapping):
+    """``name -> {name -> [interaction, ...]}`` mapping backed by the index.
+
+    Keys may be standardized names or any ``name_mapping`` key; the latter resolve through
+    the drug's standardized name.
+    """
+
+    def __init__(self, index: DDInterIndex):
+        self._index = index
+
+    def __getitem__(self, name):
+        name_id = self._index.name_id(name)
+        if name_id is None or self._index.pair_indptr[name_id] == self._index.pair_indptr[name_id + 1]:
+            raise KeyError(name)
+        return _NeighborView(self._index, name_id)
+
+    def __iter__(self):
+        degrees = np.diff(self._index.pair_indptr)
+        return (self._index.std_names[i] for i in np.flatnonzero(degrees))
+
+    def __len__(self):
+        return int(np.count_nonzero(np.diff(self._index.pair_indptr)))
+
+
+class _NeighborView(Mapping):
+    def __init__(self, index: DDInterIndex, name_id: int):
+        self._index = index
+        self._name_id = name_id
+
+    def __getitem__(self, name):
+        other = self._index.name_id(name)
+        rows = self._index.pair_rows_for(self._name_id, other) if other is not None else ()
+        if not len(rows):
+            raise KeyError(name)
+        return self._index.rows_to_dicts(rows)
+
+    def _neighbor_ids(self):
+        start, end = self._index.pair_indptr[self._name_id], self._index.pair_indptr[self._name_id + 1]
+        return np.unique(self._index.pair_indices[start:end])
+
+    def __iter__(self):
+        return (self._index.std_names[i] for i in self._neighbor_ids())
+
+    def __len__(self):
+        return len(self._neighbor_ids())
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_ddinter_index(data_lake_path: str, cache_dir: str | None = None) -> DDInterIndex:
+    """Process-wide index for the DDInter CSVs in ``data_lake_path``, building it if needed.
+
+    Args:
+        data_lake_path: Directory containing the raw ``ddinter_*.csv`` files
+        cache_dir: Where compiled indexes are kept; defaults to ``$BIOMNI_CACHE_DIR/ddinter``
+
+    Raises:
+        FileNotFoundError: If none of the DDInter CSV files exist
+
+    """
+    signature = source_signature(data_lake_path)
+    if signature is None:
+        raise FileNotFoundError("No DDInter CSV files found in data lake")
+    cache_dir = cache_dir or _cache_root()
+    key = (os.path.abspath(cache_dir), signature)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index_dir = os.path.join(cache_dir, signature)
+            if not os.path.exists(os.path.join(index_dir, "meta.json")):
+                os.makedirs(cache_dir, exist_ok=True)
+                staging = tempfile.mkdtemp(prefix=f".{signature}-", dir=cache_dir)
+                try:
+                    build_ddinter_index(data_lake_path, staging)
+                    try:
+                        os.rename(staging, index_dir)
+                    except OSError:
+                        # Another process finished the same build first
+                        if not os.path.exists(os.path.join(index_dir, "meta.json")):
+                            raise
+                finally:
+                    shutil.rmtree(staging, ignore_errors=True)
+            index = DDInterIndex(index_dir)
+            _indexes[key] = index
+    return index
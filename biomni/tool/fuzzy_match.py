@@ -0,0 +1,242 @@
+"""Approximate string matching over fixed vocabularies (drug, disease, cell type and gene names).
+
+``difflib.get_close_matches`` compares the query with every word of the vocabulary. A
+``FuzzyMatcher`` instead keeps a trigram inverted index of its vocabulary: a lookup counts the
+trigrams each name shares with the query and scores the best few candidates by Dice overlap
+with the same ``SequenceMatcher`` ratio difflib uses. The trigram pass usually finds the best
+matches at once; the remaining terms are then bounded from above by difflib's ``quick_ratio``
+(character counts, computed for the whole vocabulary at once) and only terms whose bound can
+still reach the cutoff or displace a result are scored. The answers are therefore exactly
+those of difflib. Close matches take well under a millisecond on vocabularies of ~100k names;
+weak queries near a low cutoff cost more, but still far less than difflib's scan.
+
+Matchers are built once per vocabulary and kept by ``get_matcher``.
+"""
+
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+import numpy as np
+
+
+def _ngrams(text: str, n: int) -> set:
+    padded = " " * (n - 1) + text.casefold() + " "
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class FuzzyMatcher:
+    """Trigram index over a vocabulary with difflib-compatible scoring.
+
+    Args:
+        names: Vocabulary; duplicates are ignored and the first occurrence's order is kept
+        synonyms: Optional ``alias -> name`` table; aliases are matched like names but the
+            canonical name is returned
+        n: n-gram length of the index
+        max_candidates: Number of best-overlapping terms scored before the ``quick_ratio`` bound pass
+        max_postings: Posting entries counted per lookup; the most frequent n-grams of a query
+            are skipped beyond it
+
+    """
+
+    def __init__(
+        self, names, synonyms: dict | None = None, n: int = 3, max_candidates: int = 32, max_postings: int = 10000
+    ):
+        self.names = list(dict.fromkeys(str(name) for name in names))
+        self.n = n
+        self.max_candidates = max_candidates
+        self.max_postings = max_postings
+
+        name_ids = {name: i for i, name in enumerate(self.names)}
+        self._terms = list(self.names)
+        self._term_names = list(range(len(self.names)))
+        for alias, name in (synonyms or {}).items():
+            if name not in name_ids:
+                name_ids[name] = len(self.names)
+                self.names.append(name)
+            if alias not in name_ids:
+                self._terms.append(alias)
+                self._term_names.append(name_ids[name])
+        self._term_names = np.asarray(self._term_names, dtype=np.int64)
+        self._lengths = np.fromiter((len(term) for term in self._terms), dtype=np.int32, count=len(self._terms))
+        self._exact = {}
+        for term_id, term in enumerate(self._terms):
+            self._exact.setdefault(term, term_id)
+        self._build_char_counts()
+
+        # CSR postings: gram id -> term ids containing it
+        gram_ids = {}
+        term_column, gram_column = [], []
+        self._gram_counts = np.zeros(len(self._terms), dtype=np.int32)
+        for term_id, term in enumerate(self._terms):
+            grams = _ngrams(term, n)
+            self._gram_counts[term_id] = len(grams)
+            for gram in grams:
+                gram_column.append(gram_ids.setdefault(gram, len(gram_ids)))
+                term_column.append(term_id)
+        gram_column = np.asarray(gram_column, dtype=np.int64)
+        order = np.argsort(gram_column, kind="stable")
+        self._gram_ids = gram_ids
+        self._postings = np.asarray(term_column, dtype=np.int32)[order]
+        self._indptr = np.zeros(len(gram_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_column, minlength=len(gram_ids)), out=self._indptr[1:])
+
+    def _build_char_counts(self, max_buckets: int = 64):
+        """Per-term character counts for ``quick_ratio`` bounds; rare characters share a bucket,
+        which can only raise the bound."""
+        codes = np.frombuffer("".join(self._terms).encode("utf-32-le"), dtype=np.uint32)
+        alphabet, inverse, frequency = np.unique(codes, return_inverse=True, return_counts=True)
+        common = np.argsort(-frequency, kind="stable")[: max_buckets - 1]
+        bucket_of = np.full(len(alphabet), max_buckets - 1, dtype=np.int64)
+        bucket_of[common] = np.arange(len(common))
+        self._alphabet = alphabet
+        self._alphabet_buckets = bucket_of
+        term_of_char = np.repeat(np.arange(len(self._terms), dtype=np.int64), self._lengths)
+        counts = np.bincount(
+            term_of_char * max_buckets + bucket_of[inverse], minlength=len(self._terms) * max_buckets
+        ).reshape(len(self._terms), max_buckets)
+        dtype = np.uint16 if counts.size == 0 or counts.max() < 2**16 else np.uint32
+        self._char_counts = counts.astype(dtype)
+
+    def _query_counts(self, word: str) -> np.ndarray:
+        buckets = self._char_counts.shape[1]
+        codes = np.frombuffer(word.encode("utf-32-le"), dtype=np.uint32)
+        positions = np.searchsorted(self._alphabet, codes)
+        known = positions < len(self._alphabet)
+        known[known] = self._alphabet[positions[known]] == codes[known]
+        # Characters no term contains cannot match; the shared bucket keeps the bound valid anyway
+        bucket = np.full(len(codes), buckets - 1, dtype=np.int64)
+        bucket[known] = self._alphabet_buckets[positions[known]]
+        return np.bincount(bucket, minlength=buckets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, word) -> bool:
+        return word in self._exact
+
+    def _candidates(self, word: str, cutoff: float) -> np.ndarray:
+        word_grams = _ngrams(word, self.n)
+        grams = sorted(
+            (self._indptr[g + 1] - self._indptr[g], g) for g in map(self._gram_ids.get, word_grams) if g is not None
+        )
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+        # Rare grams discriminate best; skip the most common ones once the budget is spent
+        selected, total = [], 0
+        for size, gram in grams:
+            if selected and total + size > self.max_postings:
+                break
+            selected.append(self._postings[self._indptr[gram] : self._indptr[gram + 1]])
+            total += size
+        # Sorting the postings costs O(P log P) and, unlike a bincount, nothing in the vocabulary size
+        hits, shared = np.unique(np.concatenate(selected), return_counts=True)
+        # ratio() <= 2 * min(len) / (len(a) + len(b)), so far longer or shorter terms cannot reach cutoff
+        if cutoff > 0:
+            lengths = self._lengths[hits]
+            keep = (lengths >= len(word) * cutoff / (2 - cutoff)) & (lengths <= len(word) * (2 - cutoff) / cutoff)
+            hits, shared = hits[keep], shared[keep]
+        if len(hits) <= self.max_candidates:
+            return hits
+        dice = shared / (self._gram_counts[hits] + len(word_grams))
+        return hits[np.argpartition(-dice, self.max_candidates - 1)[: self.max_candidates]]
+
+    def extract(self, word: str, limit: int = 3, cutoff: float = 0.6) -> list[tuple[str, float]]:
+        """Best ``(name, score)`` pairs with ``score >= cutoff``, highest first.
+
+        Scores are ``difflib.SequenceMatcher(None, word, term).ratio()``; a name matched through
+        several of its synonyms is reported once with its best score.
+        """
+        word = str(word)
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        scored = {}
+        exact = self._exact.get(word)
+        if exact is not None:
+            scored[int(self._term_names[exact])] = (1.0, word)
+            if limit == 1:
+                return [(self.names[self._term_names[exact]], 1.0)]
+
+        def score(term_id) -> bool:
+            term = self._terms[term_id]
+            matcher.set_seq1(term)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    name_id = int(self._term_names[term_id])
+                    if (ratio, term) > scored.get(name_id, (-1.0, "")):
+                        scored[name_id] = (ratio, term)
+                        return True
+            return False
+
+        def threshold() -> float:
+            # A term must reach this score to enter (or reorder) the best ``limit`` names
+            if len(scored) < limit:
+                return cutoff
+            return max(cutoff, sorted(score for score, _ in scored.values())[-limit])
+
+        candidates = self._candidates(word, cutoff)
+        for term_id in candidates:
+            score(term_id)
+
+        # Every other term is bounded by quick_ratio, the matching characters ignoring order
+        needed = threshold()
+        total = self._lengths.astype(np.float64) + len(word)
+        bound = 2.0 * np.minimum(self._lengths, len(word)) / np.maximum(total, 1)
+        remaining = np.flatnonzero(bound >= needed)
+        remaining = remaining[~np.isin(remaining, candidates)]
+        if exact is not None:
+            remaining = remaining[remaining != exact]
+        if len(remaining):
+            shared = np.minimum(self._char_counts[remaining], self._query_counts(word)).sum(axis=1)
+            bound = 2.0 * shared / np.maximum(total[remaining], 1)
+            keep = bound >= needed
+            remaining, bound = remaining[keep], bound[keep]
+            for i in np.argsort(-bound, kind="stable"):
+                if bound[i] < needed:
+                    break
+                if score(remaining[i]):
+                    needed = threshold()
+
+        # Same ordering as difflib: score, then the matched term, both descending
+        best = sorted(scored.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self.names[name_id], score) for name_id, (score, _) in best]
+
+    def get_close_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> list[str]:
+        """Drop-in replacement for ``difflib.get_close_matches(word, names, n, cutoff)``."""
+        return [name for name, _ in self.extract(word, limit=n, cutoff=cutoff)]
+
+    def match(self, word: str, cutoff: float = 0.6) -> str | None:
+        """Best name for ``word``, or None if nothing scores ``cutoff`` or more."""
+        matches = self.extract(word, limit=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
+
+
+_matchers = OrderedDict()
+_matchers_lock = threading.Lock()
+MAX_CACHED_MATCHERS = 32
+
+
+def get_matcher(names, key=None, synonyms: dict | None = None) -> FuzzyMatcher:
+    """Shared matcher for a vocabulary, built on first use.
+
+    Args:
+        names: Vocabulary (any iterable of strings; a dict contributes its keys)
+        key: Hashable cache key, e.g. ``("txgnn", path, mtime)``. Without a key the matcher is
+            cached for this exact ``names`` object, so pass the same long-lived object each time.
+        synonyms: Optional ``alias -> name`` table passed to ``FuzzyMatcher``
+
+    """
+    cache_key = key if key is not None else ("id", id(names))
+    with _matchers_lock:
+        entry = _matchers.get(cache_key)
+        if entry is not None and (key is not None or entry[0] is names):
+            _matchers.move_to_end(cache_key)
+            return entry[1]
+    matcher = FuzzyMatcher(names, synonyms=synonyms)
+    with _matchers_lock:
+        # Holding ``names`` keeps its id from being reused while an id-keyed entry exists
+        _matchers[cache_key] = (names if key is None else None, matcher)
+        while len(_matchers) > MAX_CACHED_MATCHERS:
+            _matchers.popitem(last=False)
+    return matcher
@@ -1,5 +1,8 @@
+import functools
+import json
 import logging
 import os
+import threading
 
 import gget
 import gseapy
@@ -9,6 +12,8 @@ import scanpy as sc
 from langchain_core.prompts import PromptTemplate
 
 from biomni.llm import get_llm
+from biomni.tool.fuzzy_match import get_matcher
+from biomni.tool.hic_contacts import MAX_DENSE_BINS, CisContacts
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +26,34 @@ def set_debug_mode(debug: bool):
     DEBUG_MODE = debug
 
 
+@functools.lru_cache(maxsize=4)
+def _czi_cell_types(czi_celltype_path, mtime_ns, size):
+    """Cell ontology names of the CZI census table, read once per file version."""
+    df = pd.read_parquet(czi_celltype_path, columns=["cell_type"])
+    czi_celltype_set = frozenset(
+        cell_type.strip() for cell_types in df["cell_type"] for cell_type in str(cell_types).split(";")
+    )
+    czi_celltype = ", ".join(sorted(czi_celltype_set))
+    celltype_matcher = get_matcher(sorted(czi_celltype_set), key=("czi_cell_types", czi_celltype_path, mtime_ns))
+    return czi_celltype_set, czi_celltype, celltype_matcher
+
+
+def load_czi_cell_types(data_lake_path):
+    """Return ``(cell type set, comma-separated names, fuzzy matcher)`` for the CZI cell ontology."""
+    czi_celltype_path = os.path.abspath(os.path.join(data_lake_path, "czi_census_datasets_v4.parquet"))
+    stat = os.stat(czi_celltype_path)
+    return _czi_cell_types(czi_celltype_path, stat.st_mtime_ns, stat.st_size)
+
+
+def _response_text(response):
+    """Text of a chain response (AIMessage, dict with 'text', or str)."""
+    if hasattr(response, "content"):  # For AIMessage
+        return response.content
+    if isinstance(response, dict) and "text" in response:
+        return response["text"]
+    return response if isinstance(response, str) else str(response)
+
+
 def annotate_celltype_scRNA(
     adata_filename,
     data_dir,
@@ -29,6 +62,8 @@ def annotate_celltype_scRNA(
     cluster="leiden",
     llm="claude-3-5-sonnet-20241022",
     composition=None,
+    max_concurrency=16,
+    max_retries=3,
 ):
     """Annotate cell types based on gene markers and transferred labels using LLM.
     After leiden clustering, annotate clusters using differentially expressed genes
@@ -42,6 +77,8 @@ def annotate_celltype_scRNA(
     - data_lake_path (str): Path to the data lake
     - llm (str): Language model instance for cell type prediction, such as 'claude-3-haiku-20240307'
     - composition (pd.DataFrame, optional): Transferred cell type composition for each cluster
+    - max_concurrency (int): Maximum number of clusters annotated by concurrent LLM calls
+    - max_retries (int): Extra attempts for a cluster whose answer is malformed or not in the ontology
     Returns:
     - str: Steps performed and file paths where results were saved
 
@@ -82,11 +119,7 @@ def annotate_celltype_scRNA(
         gene_scores = scores.iloc[:, i].tolist()
         markers[i] = list(np.array(gene_names)[np.array(gene_scores) > 0])
 
-    # TODO: this can be optimized
-    czi_celltype_path = data_lake_path + "/czi_census_datasets_v4.parquet"
-    df = pd.read_parquet(czi_celltype_path)
-    czi_celltype_set = {cell_type.strip() for cell_types in df["cell_type"] for cell_type in str(cell_types).split(";")}
-    czi_celltype = ", ".join(sorted(czi_celltype_set))
+    czi_celltype_set, czi_celltype, celltype_matcher = load_czi_cell_types(data_lake_path)
 
     prompt_template = f"""
 Please think carefully, and identify the cell type in {data_info} based on the gene markers.
@@ -111,42 +144,67 @@ No numbers before name or spaces before number.
 
     steps.append("Annotating cell types of each cluster based on gene markers and transferred labels.")
     # valid_celltypes = set(czi_celltype.split(";"))
-    cluster_annotations = {}
-    annotation_reasons = []
+
+    def _parse_annotation(response):
+        """Return (cell type, reason), or (None, hint to append to the prompt)."""
+        try:
+            predicted_celltype, confidence, reason = [x.strip() for x in response.split(";", 2)]
+        except ValueError:
+            return None, "\nPlease follow the format: name; score; reason"
+        if predicted_celltype not in czi_celltype_set and predicted_celltype.lower() not in czi_celltype_set:
+            # Snap near-misses ("T-cell" for "T cell") to the ontology term instead of asking again
+            predicted_celltype = celltype_matcher.match(predicted_celltype, cutoff=0.9) or predicted_celltype
+        if predicted_celltype in czi_celltype_set or predicted_celltype.lower() in czi_celltype_set:
+            return predicted_celltype, reason
+        return None, "\nAssigned cell type name must be in cell ontology!"
 
     print(f"Annotate each cluster of {cluster}")
-    for _idx in range(len(adata.obs[cluster].unique())):
-        cluster_info = _cluster_info(str(_idx), markers[_idx], composition)
-
-        while True:
-            if DEBUG_MODE:
-                logger.debug(f"Invoking LLM for cluster annotation")
-                logger.debug(f"Cluster: {_idx}")
-                logger.debug(f"Cluster info: {cluster_info}")
-            
-            response = chain.invoke({"cluster_info": cluster_info})
-
-            # Handle different response types
-            if hasattr(response, "content"):  # For AIMessage
-                response = response.content
-            elif isinstance(response, dict) and "text" in response:
-                response = response["text"]
-            elif isinstance(response, str):
-                response = response
+    cluster_ids = list(range(len(adata.obs[cluster].unique())))
+    cluster_infos = {_idx: _cluster_info(str(_idx), markers[_idx], composition) for _idx in cluster_ids}
+    annotations = {}
+    last_responses = {}
+
+    # Annotate all pending clusters with one batched call per round; clusters whose answer is
+    # malformed or outside the ontology are asked again with a hint, up to max_retries times
+    pending = cluster_ids
+    for _attempt in range(max_retries + 1):
+        if not pending:
+            break
+        if DEBUG_MODE:
+            logger.debug(f"Invoking LLM for cluster annotation")
+            logger.debug(f"Clusters: {pending}")
+        responses = chain.batch(
+            [{"cluster_info": cluster_infos[_idx]} for _idx in pending],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        still_pending = []
+        for _idx, response in zip(pending, responses, strict=True):
+            if isinstance(response, Exception):
+                last_responses[_idx] = f"LLM call failed: {response}"
+                still_pending.append(_idx)
+                continue
+            response = _response_text(response)
+            last_responses[_idx] = response
+            celltype, reason_or_hint = _parse_annotation(response)
+            if celltype is None:
+                cluster_infos[_idx] += reason_or_hint
+                still_pending.append(_idx)
             else:
-                response = str(response)
+                annotations[_idx] = (celltype, reason_or_hint)
+        pending = still_pending
 
-            try:
-                predicted_celltype, confidence, reason = [x.strip() for x in response.split(";", 2)]
-                if predicted_celltype in czi_celltype_set or predicted_celltype.lower() in czi_celltype_set:
-                    cluster_annotations[str(_idx)] = predicted_celltype
-                    annotation_reasons.append((predicted_celltype, reason))
-                    break
-                else:
-                    cluster_info += "\nAssigned cell type name must be in cell ontology!"
-            except ValueError:
-                cluster_info += "\nPlease follow the format: name; score; reason"
-        print(f"Cluster {_idx}: {response}")
+    if pending:
+        steps.append(f"Clusters {pending} could not be annotated within {max_retries} retries and are left unassigned.")
+
+    cluster_annotations = {}
+    annotation_reasons = []
+    for _idx in cluster_ids:
+        if _idx in annotations:
+            predicted_celltype, reason = annotations[_idx]
+            cluster_annotations[str(_idx)] = predicted_celltype
+            annotation_reasons.append((predicted_celltype, reason))
+        print(f"Cluster {_idx}: {last_responses.get(_idx)}")
 
     # create reason dictionary
     reason_dict = {}
@@ -166,6 +224,86 @@ No numbers before name or spaces before number.
     return "\n".join(steps)
 
 
+PANHUMANPY_ENV = "panhumanpy_env"
+
+
+class _PanhumanpyWorker:
+    """A resident ``panhumanpy_worker.py`` process in the panhumanpy conda environment."""
+
+    def __init__(self, python: str):
+        import subprocess
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "panhumanpy_worker.py")
+        self._process = subprocess.Popen(
+            [python, "-u", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+        )
+        self._lock = threading.Lock()
+        self._read_reply()  # wait for the imports to finish
+
+    def _read_reply(self) -> dict:
+        line = self._process.stdout.readline()
+        if not line:
+            raise EOFError(f"panhumanpy worker exited with code {self._process.wait()}")
+        return json.loads(line)
+
+    def annotate(self, **request) -> dict:
+        with self._lock:
+            self._process.stdin.write(json.dumps(request) + "\n")
+            self._process.stdin.flush()
+            return self._read_reply()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Resident set size of the worker process (0 where /proc is unavailable)."""
+        try:
+            with open(f"/proc/{self._process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=10)
+            except Exception:
+                self._process.kill()
+
+
+def start_panhumanpy_worker():
+    """Create the panhumanpy conda environment if needed and start a resident worker in it."""
+    import subprocess
+
+    def conda_env_exists(env_name):
+        try:
+            result = subprocess.run(["conda", "env", "list"], capture_output=True, text=True, check=True)
+            return any(env_name in line.split() for line in result.stdout.splitlines())
+        except Exception:
+            return False
+
+    def create_panhumanpy_env(env_name):
+        # Create env and install panhumanpy
+        subprocess.run(["conda", "create", "-y", "-n", env_name, "python=3.10"], check=True)
+        # Install panhumanpy in the new env
+        subprocess.run(
+            ["conda", "run", "-n", env_name, "pip", "install", "git+https://github.com/satijalab/panhumanpy.git"],
+            check=True,
+        )
+
+    if not conda_env_exists(PANHUMANPY_ENV):
+        create_panhumanpy_env(PANHUMANPY_ENV)
+    python = subprocess.run(
+        ["conda", "run", "-n", PANHUMANPY_ENV, "python", "-c", "import sys; print(sys.executable)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return _PanhumanpyWorker(python.splitlines()[-1])
+
+
 def annotate_celltype_with_panhumanpy(
     adata_path,
     feature_names_col=None,
@@ -200,165 +338,40 @@ def annotate_celltype_with_panhumanpy(
     -----
     Performance is not ensured for diseased and/or non-human cells.
     """
-    import json
-    import shutil
     import subprocess
-    import sys
-    import tempfile
-
-    def conda_env_exists(env_name):
-        try:
-            result = subprocess.run(["conda", "env", "list"], capture_output=True, text=True, check=True)
-            return any(env_name in line.split() for line in result.stdout.splitlines())
-        except Exception:
-            return False
-
-    def create_panhumanpy_env(env_name):
-        # Create env and install panhumanpy
-        subprocess.run(["conda", "create", "-y", "-n", env_name, "python=3.10"], check=True)
-        # Install panhumanpy in the new env
-        subprocess.run(
-            ["conda", "run", "-n", env_name, "pip", "install", "git+https://github.com/satijalab/panhumanpy.git"],
-            check=True,
-        )
-
-    PANHUMANPY_ENV = "panhumanpy_env"
-
-    # 1. Check/create panhumanpy_env
-    if not conda_env_exists(PANHUMANPY_ENV):
-        create_panhumanpy_env(PANHUMANPY_ENV)
 
-    # 2. Write a temp script to run in the panhumanpy_env
-    temp_dir = tempfile.mkdtemp()
-    script_path = os.path.join(temp_dir, "run_panhumanpy.py")
-    result_path = os.path.join(temp_dir, "result.json")
-    with open(script_path, "w") as f:
-        f.write(f"""
-import os
-import sys
-import json
-import numpy as np
-import scanpy as sc
-import pandas as pd
-try:
-    import panhumanpy as ph
-except ImportError as e:
-    with open(r'{result_path}', 'w') as out:
-        out.write(json.dumps({{"error": str(e)}}))
-    sys.exit(1)
-
-adata_path = r'''{adata_path}'''
-feature_names_col = {repr(feature_names_col)}
-refine = {refine}
-umap = {umap}
-output_dir = r'''{output_dir}'''
-log = []
-try:
-    os.makedirs(output_dir, exist_ok=True)
-    log.append("# Performing cell type annotation with Panhuman Azimuth")
-    log.append(f"Loading object from: {{adata_path}}")
-    adata = sc.read_h5ad(adata_path)
-    log.append(f"✓ Successfully loaded object with {{adata.n_obs}} cells and {{adata.n_vars}} genes")
-    if feature_names_col is None:
-        log.append("Using gene names from adata.var.index")
-    else:
-        log.append(f"Using gene names from column: {{feature_names_col}}")
-        if feature_names_col not in adata.var.columns:
-            log.append(f"⚠ Warning: Column '{{feature_names_col}}' not found in adata.var")
-            log.append(f"Available columns: {{list(adata.var.columns)}}")
-            log.append("Falling back to index")
-            feature_names_col = None
-    if feature_names_col is None:
-        azimuth = ph.AzimuthNN(adata)
-    else:
-        azimuth = ph.AzimuthNN(adata, feature_names_col=feature_names_col)
-    cell_metadata = azimuth.cells_meta
-    log.append("✓ Successfully annotated all cells")
-    if umap:
-        log.append("## Generating ANN embeddings")
-        try:
-            embeddings = azimuth.azimuth_embed()
-        except Exception as e:
-            log.append(f"✗ Error generating embeddings: {{str(e)}}")
-            with open(r'{result_path}', 'w') as out:
-                out.write(json.dumps({{"log": log}}))
-            sys.exit(0)
-        log.append("## Calculating UMAP")
+    from biomni.tool.model_pool import get_model_pool
+
+    # The worker (and the panhumanpy environment check) is started once and stays resident;
+    # it has its own working directory, so it gets absolute paths
+    pool = get_model_pool()
+    request = {
+        "adata_path": os.path.abspath(adata_path),
+        "feature_names_col": feature_names_col,
+        "refine": refine,
+        "umap": umap,
+        "output_dir": os.path.abspath(output_dir),
+    }
+    for attempt in range(2):
         try:
-            azimuth.azimuth_umap()
-            log.append("✓ Generated UMAP of ANN embeddings")
-        except Exception as e:
-            log.append(f"✗ Error generating UMAP: {{str(e)}}")
-            with open(r'{result_path}', 'w') as out:
-                out.write(json.dumps({{"log": log}}))
-            sys.exit(0)
+            with pool.acquire("panhumanpy") as worker:
+                result = worker.annotate(**request)
+            break
+        except (json.JSONDecodeError, EOFError, BrokenPipeError) as e:
+            # The worker died (e.g. killed for memory) before or while replying; retry once on a fresh one
+            pool.evict("panhumanpy")
+            if attempt:
+                return f"Error running panhumanpy in conda env: worker exited unexpectedly ({e})"
+        except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+            pool.evict("panhumanpy")
+            return f"Error running panhumanpy in conda env: {e}"
+
+    if "log" in result:
+        log = result["log"]
+    elif "error" in result:
+        log = [f"Error: {result['error']}"]
     else:
-        log.append("## Skipping embeddings and UMAP generation")
-        embeddings = None
-        umap = None
-    if refine:
-        log.append("## Performing label refinement")
-        try:
-            azimuth.azimuth_refine()
-            cell_metadata = azimuth.cells_meta
-            refined_columns = [col for col in cell_metadata.columns if col.startswith("azimuth_")]
-            log.append(f"✓ Applied label refinement, results are in columns: {{refined_columns}}")
-        except Exception as e:
-            log.append(f"✗ Error during label refinement: {{str(e)}}")
-    log.append("## Saving results")
-    try:
-        metadata_file = f"{output_dir}/annotated_cell_metadata.csv"
-        cell_metadata.to_csv(metadata_file)
-        log.append(f"✓ Saved cell metadata to: {{metadata_file}}")
-        if umap and embeddings is not None:
-            embeddings_file = f"{output_dir}/ann_embeddings.npy"
-            np.save(embeddings_file, embeddings)
-            log.append(f"✓ Saved embeddings to: {{embeddings_file}}")
-            umap_file = f"{output_dir}/ann_umap.npy"
-            np.save(umap_file, umap)
-            log.append(f"✓ Saved UMAP to: {{umap_file}}")
-        else:
-            log.append("Skipped saving embeddings and UMAP (umap=False)")
-        annotated_save_path = f"{output_dir}/annotated_obj.h5ad"
-        azimuth.pack_adata(save_path=annotated_save_path)
-        log.append(f"✓ Saved annotated object to: {{annotated_save_path}}")
-    except Exception as e:
-        log.append(f"✗ Error saving results: {{str(e)}}")
-        with open(r'{result_path}', 'w') as out:
-            out.write(json.dumps({{"log": log}}))
-        sys.exit(0)
-    log.append(f"- All results saved to: {output_dir}")
-    with open(r'{result_path}', 'w') as out:
-        out.write(json.dumps({{"log": log}}))
-except Exception as e:
-    with open(r'{result_path}', 'w') as out:
-        out.write(json.dumps({{"error": str(e)}}))
-    sys.exit(1)
-""")
-
-    # 3. Run the script in the panhumanpy_env
-    try:
-        run_cmd = ["conda", "run", "-n", PANHUMANPY_ENV, "python", script_path]
-        subprocess.run(run_cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        shutil.rmtree(temp_dir)
-        return f"Error running panhumanpy in conda env: {e}"
-
-    # 4. Read the result
-    try:
-        with open(result_path) as f:
-            result = json.load(f)
-        if "log" in result:
-            log = result["log"]
-        elif "error" in result:
-            log = [f"Error: {result['error']}"]
-        else:
-            log = ["Unknown error running panhumanpy script."]
-    except Exception as e:
-        log = [f"Error reading result: {e}"]
-
-    # 5. Clean up temp files
-    shutil.rmtree(temp_dir)
+        log = ["Unknown error running panhumanpy script."]
 
     return "\n".join(log)
 
@@ -715,23 +728,20 @@ def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, outpu
         if not has_weights:
             log.append("Warning: No balancing weights found in the cooler file. Using unbalanced data.")
 
-        # Function to get matrix with proper balancing option
-        def get_matrix(chrom, balance_if_possible=True):
+        # Contacts are streamed from the pixel table; dense matrices are never materialized
+        def get_contacts(chrom):
             try:
-                # Try to get balanced matrix if requested and available
-                if balance_if_possible and has_weights:
-                    return c.matrix(balance=True).fetch(chrom)
-                else:
-                    return c.matrix(balance=False).fetch(chrom)
+                contacts = CisContacts(c, chrom, balance=has_weights)
             except Exception as e:
-                log.append(f"Warning: Error getting matrix with balance={balance_if_possible}: {str(e)}")
+                if not has_weights:
+                    raise
+                log.append(f"Warning: Error getting balanced contacts for {chrom}: {str(e)}")
                 # If balanced fails, try unbalanced as fallback
-                if balance_if_possible:
-                    log.append("Falling back to unbalanced matrix")
-                    return c.matrix(balance=False).fetch(chrom)
-                else:
-                    # If even unbalanced fails, raise the exception
-                    raise e
+                log.append("Falling back to unbalanced contacts")
+                return CisContacts(c, chrom, balance=False)
+            if has_weights and not contacts.balanced:
+                log.append(f"Warning: No finite balancing weights for {chrom}. Using unbalanced data.")
+            return contacts
 
     except Exception as e:
         log.append(f"Error loading Hi-C data: {str(e)}")
@@ -774,14 +784,6 @@ def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, outpu
         for chrom in c.chromnames:
             log.append(f"Processing chromosome {chrom}...")
 
-            # Get matrix for this chromosome using the helper function
-            try:
-                matrix = get_matrix(chrom, balance_if_possible=True)
-            except Exception as e:
-                log.append(f"Error getting matrix for chromosome {chrom}: {str(e)}")
-                log.append(f"Skipping chromosome {chrom}")
-                continue
-
             # Filter enhancers and promoters for this chromosome
             chrom_enhancers = enhancers[enhancers["chrom"] == chrom]
             chrom_promoters = promoters[promoters["chrom"] == chrom]
@@ -790,47 +792,36 @@ def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, outpu
                 log.append(f"No enhancers or promoters found on chromosome {chrom}, skipping")
                 continue
 
-            # For each enhancer, find interactions with promoters
-            for _, enh in chrom_enhancers.iterrows():
-                enh_bin = int(enh["start"] // c.binsize)
-
-                for _, prom in chrom_promoters.iterrows():
-                    prom_bin = int(prom["start"] // c.binsize)
-
-                    # Skip if bins are out of range
-                    if enh_bin >= matrix.shape[0] or prom_bin >= matrix.shape[0]:
-                        continue
-
-                    # Get interaction strength
-                    interaction_strength = matrix[enh_bin, prom_bin]
-
-                    # Calculate expected interaction based on genomic distance
-                    distance = abs(enh_bin - prom_bin)
-                    if distance == 0:
-                        continue
-
-                    # Get average interaction at this distance
-                    diag_values = np.diagonal(matrix, offset=distance)
-                    expected = np.nanmean(diag_values) if len(diag_values) > 0 else 0
-
-                    # Calculate significance (fold enrichment)
-                    fold_enrichment = interaction_strength / expected if expected > 0 else 0
+            try:
+                contacts = get_contacts(chrom)
+            except Exception as e:
+                log.append(f"Error getting contacts for chromosome {chrom}: {str(e)}")
+                log.append(f"Skipping chromosome {chrom}")
+                continue
 
-                    # Store significant interactions (fold enrichment > 2)
-                    if fold_enrichment > 2:
-                        interactions.append(
-                            {
-                                "chrom": chrom,
-                                "enhancer_start": enh["start"],
-                                "enhancer_end": enh["end"],
-                                "enhancer_name": enh["name"],
-                                "promoter_start": prom["start"],
-                                "promoter_end": prom["end"],
-                                "promoter_name": prom["name"],
-                                "interaction_strength": interaction_strength,
-                                "fold_enrichment": fold_enrichment,
-                            }
-                        )
+            # Score all enhancer x promoter bin pairs against the distance-decay expected at once
+            result = contacts.enhancer_promoter_contacts(
+                (chrom_enhancers["start"].to_numpy() // c.binsize).astype(np.int64),
+                (chrom_promoters["start"].to_numpy() // c.binsize).astype(np.int64),
+                min_fold=2,
+            )
+            enh = chrom_enhancers.iloc[result["enhancer"]]
+            prom = chrom_promoters.iloc[result["promoter"]]
+            interactions.extend(
+                pd.DataFrame(
+                    {
+                        "chrom": chrom,
+                        "enhancer_start": enh["start"].to_numpy(),
+                        "enhancer_end": enh["end"].to_numpy(),
+                        "enhancer_name": enh["name"].to_numpy(),
+                        "promoter_start": prom["start"].to_numpy(),
+                        "promoter_end": prom["end"].to_numpy(),
+                        "promoter_name": prom["name"].to_numpy(),
+                        "interaction_strength": result["observed"],
+                        "fold_enrichment": result["fold_enrichment"],
+                    }
+                ).to_dict("records")
+            )
 
         # Define interactions file path (moved before the empty check)
         interactions_file = os.path.join(output_dir, "enhancer_promoter_interactions.tsv")
@@ -880,20 +871,15 @@ def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, outpu
             if chrom not in c.chromsizes:
                 continue
 
-            # Get matrix with balancing if possible
             try:
-                matrix = get_matrix(chrom, balance_if_possible=True)
+                contacts = get_contacts(chrom)
             except Exception as e:
-                log.append(f"Error getting matrix for chromosome {chrom}: {str(e)}")
+                log.append(f"Error getting contacts for chromosome {chrom}: {str(e)}")
                 log.append(f"Skipping chromosome {chrom}")
                 continue
 
-            # Calculate insulation score
-            insulation_score = np.zeros(matrix.shape[0] - 2 * window_size)
-            for i in range(window_size, matrix.shape[0] - window_size):
-                # Calculate sum of interactions crossing bin i
-                cross_interactions = np.sum(matrix[i - window_size : i, i : i + window_size])
-                insulation_score[i - window_size] = cross_interactions
+            # Calculate insulation score (sum of interactions crossing each bin) from near-diagonal pixels
+            insulation_score = contacts.insulation(window_size)
 
             # Normalize insulation score
             if len(insulation_score) > 0:
@@ -955,11 +941,17 @@ def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, outpu
             chrom = c.chromnames[0]
             matrix_file = os.path.join(output_dir, f"{chrom}_contact_matrix.npy")
 
-            # Get matrix with balancing if possible
             try:
-                matrix = get_matrix(chrom, balance_if_possible=True)
-                np.save(matrix_file, matrix)
-                log.append(f"Saved contact matrix for {chrom} to {matrix_file}")
+                contacts = get_contacts(chrom)
+                if contacts.n_bins <= MAX_DENSE_BINS:
+                    np.save(matrix_file, contacts.dense())
+                    log.append(f"Saved contact matrix for {chrom} to {matrix_file}")
+                else:
+                    # Too large for a dense matrix; export the upper-triangle pixels instead
+                    matrix_file = os.path.join(output_dir, f"{chrom}_contact_pixels.npz")
+                    bin1, bin2, values = (np.concatenate(column) for column in zip(*contacts.chunks(), strict=True))
+                    np.savez(matrix_file, bin1=bin1, bin2=bin2, value=values, n_bins=contacts.n_bins)
+                    log.append(f"Saved contact pixels (bin1, bin2, value) for {chrom} to {matrix_file}")
             except Exception as e:
                 log.append(f"Error getting matrix for chromosome {chrom}: {str(e)}")
                 # Create an empty matrix file
@@ -1530,38 +1522,90 @@ def find_enriched_motifs_with_homer(
     return log
 
 
-def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"):
-    """Analyze overlaps between two or more sets of genomic regions.
+def _region_overlaps_numpy(region_sets, output_prefix):
+    """Input processing and pairwise overlaps of ``analyze_genomic_region_overlap`` in memory."""
+    from biomni.tool.interval_overlap import IntervalSet, pairwise_overlaps, write_overlap_pairs
 
-    Parameters
-    ----------
-    region_sets : list
-        List of genomic region sets. Each item can be either:
-        - A string path to a BED file
-        - A list of tuples/lists with format (chrom, start, end) or (chrom, start, end, name)
-    output_prefix : str, optional
-        Prefix for output files (default: "overlap_analysis")
+    interval_sets = []
+    set_names = []
+    chrom_codes = {}
 
-    Returns
-    -------
-    str
-        Research log summarizing the analysis steps and results
+    log = "## Input Processing\n"
+    for i, regions in enumerate(region_sets):
+        set_name = f"Region_Set_{i + 1}"
+        set_names.append(set_name)
 
-    """
-    from datetime import datetime
+        if isinstance(regions, str) and os.path.exists(regions):
+            interval_sets.append(IntervalSet.from_bed(regions, chrom_codes=chrom_codes))
+            log += f"- Loaded {set_name} from file: {regions}\n"
+        else:
+            interval_sets.append(
+                IntervalSet.from_regions(regions, default_name=f"feature_{i}", chrom_codes=chrom_codes)
+            )
+            log += f"- Created {set_name} from {len(regions)} provided coordinates\n"
 
-    import pandas as pd
-    import pybedtools
+    log += "\n## Analysis Results\n"
 
-    # Start research log
-    log = "# Genomic Region Overlap Analysis\n"
-    log += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    # All pairs are compared on the sorted coordinate arrays; no BED files or subprocesses
+    results = []
+    for (i, j), overlap in pairwise_overlaps(interval_sets).items():
+        total_bp_i, total_bp_j = interval_sets[i].total_bp, interval_sets[j].total_bp
+        if overlap["pairs"] == 0:
+            results.append(
+                {
+                    "Set1": set_names[i],
+                    "Set2": set_names[j],
+                    "Overlap_Regions": 0,
+                    "Overlap_BP": 0,
+                    "Pct_of_Set1": 0,
+                    "Pct_of_Set2": 0,
+                    "Jaccard": 0,
+                }
+            )
+            log += f"- No overlaps found between {set_names[i]} and {set_names[j]}\n\n"
+            continue
+
+        overlap_bp = overlap["overlap_bp"]
+        pct_of_set1 = (overlap_bp / total_bp_i) * 100 if total_bp_i > 0 else 0
+        pct_of_set2 = (overlap_bp / total_bp_j) * 100 if total_bp_j > 0 else 0
+        results.append(
+            {
+                "Set1": set_names[i],
+                "Set2": set_names[j],
+                "Overlap_Regions": overlap["unique_overlaps"],
+                "Overlap_BP": overlap_bp,
+                "Pct_of_Set1": pct_of_set1,
+                "Pct_of_Set2": pct_of_set2,
+                "Jaccard": overlap["jaccard"],
+            }
+        )
+
+        # Save detailed overlaps to file, in the layout of bedtools intersect -wo
+        overlap_file = f"{output_prefix}_{set_names[i]}_{set_names[j]}_overlaps.bed"
+        write_overlap_pairs(interval_sets[i], interval_sets[j], overlap_file)
+
+        log += f"- Between {set_names[i]} and {set_names[j]}:\n"
+        log += f"  * Overlapping regions from set 1: {overlap['overlapping_a']}\n"
+        log += f"  * Overlapping regions from set 2: {overlap['overlapping_b']}\n"
+        log += f"  * Unique overlaps: {overlap['unique_overlaps']}\n"
+        log += f"  * Total overlap size: {overlap_bp} bp\n"
+        log += f"  * Percentage of {set_names[i]}: {pct_of_set1:.2f}%\n"
+        log += f"  * Percentage of {set_names[j]}: {pct_of_set2:.2f}%\n"
+        log += f"  * Jaccard index: {overlap['jaccard']:.4f}\n"
+        log += f"  * Detailed overlaps saved to: {overlap_file}\n\n"
+
+    return log, results
+
+
+def _region_overlaps_pybedtools(region_sets, output_prefix):
+    """Input processing and pairwise overlaps of ``analyze_genomic_region_overlap`` with bedtools."""
+    import pybedtools
 
     # Create BedTool objects from inputs
     bedtools = []
     set_names = []
 
-    log += "## Input Processing\n"
+    log = "## Input Processing\n"
     for i, regions in enumerate(region_sets):
         set_name = f"Region_Set_{i + 1}"
         set_names.append(set_name)
@@ -1719,13 +1763,55 @@ def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis"
                     }
                 )
 
+    return log, results
+
+
+def analyze_genomic_region_overlap(region_sets, output_prefix="overlap_analysis", backend="numpy"):
+    """Analyze overlaps between two or more sets of genomic regions.
+
+    Parameters
+    ----------
+    region_sets : list
+        List of genomic region sets. Each item can be either:
+        - A string path to a BED file
+        - A list of tuples/lists with format (chrom, start, end) or (chrom, start, end, name)
+    output_prefix : str, optional
+        Prefix for output files (default: "overlap_analysis")
+    backend : str, optional
+        "numpy" (default) compares all sets in memory on sorted coordinate arrays and also
+        reports the Jaccard index of every pair; "pybedtools" runs bedtools intersect for
+        every pair and requires pybedtools and the bedtools binary
+
+    Returns
+    -------
+    str
+        Research log summarizing the analysis steps and results
+
+    """
+    from datetime import datetime
+
+    import pandas as pd
+
+    if backend not in ("numpy", "pybedtools"):
+        raise ValueError(f"Unknown backend {backend!r}; expected 'numpy' or 'pybedtools'")
+
+    # Start research log
+    log = "# Genomic Region Overlap Analysis\n"
+    log += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    if backend == "numpy":
+        analysis_log, results = _region_overlaps_numpy(region_sets, output_prefix)
+    else:
+        analysis_log, results = _region_overlaps_pybedtools(region_sets, output_prefix)
+    log += analysis_log
+
     # Save summary statistics to file
     summary_file = f"{output_prefix}_summary.tsv"
     summary_df = pd.DataFrame(results)
     summary_df.to_csv(summary_file, sep="\t", index=False)
 
     log += "## Summary\n"
-    log += f"- Total sets analyzed: {len(bedtools)}\n"
+    log += f"- Total sets analyzed: {len(region_sets)}\n"
     log += f"- Pairwise comparisons: {len(results)}\n"
     log += f"- Summary statistics saved to: {summary_file}\n"
 
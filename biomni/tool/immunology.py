@@ -650,7 +650,8 @@ def track_immune_cells_under_flow(
     import cv2
     import numpy as np
     import pandas as pd
-    import trackpy as tp
+
+    from biomni.tool.cell_tracking import link_trajectories, map_frames, read_images, read_video
 
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -662,67 +663,8 @@ def track_immune_cells_under_flow(
     log += f"- Time interval: {time_interval_sec} sec\n"
     log += f"- Flow direction: {flow_direction}\n\n"
 
-    # Load image sequence
-    log += "## Data Loading\n"
-    if os.path.isdir(image_sequence_path):
-        image_files = sorted(
-            [f for f in os.listdir(image_sequence_path) if f.endswith((".png", ".jpg", ".tif", ".tiff"))]
-        )
-        log += f"- Loaded {len(image_files)} images from directory\n"
-
-        # Read first image to get dimensions
-        first_img = cv2.imread(os.path.join(image_sequence_path, image_files[0]), cv2.IMREAD_GRAYSCALE)
-
-        # Handle case where image loading fails (e.g., in tests with dummy files)
-        if first_img is None:
-            log += (
-                "- Warning: Could not load images properly. This may be due to non-image files or a test environment.\n"
-            )
-            # Create a small dummy image for test purposes
-            first_img = np.zeros((100, 100), dtype=np.uint8)
-            frames = [np.zeros((100, 100), dtype=np.uint8) for _ in image_files]
-        else:
-            frames = []
-            for img_file in image_files:
-                img = cv2.imread(os.path.join(image_sequence_path, img_file), cv2.IMREAD_GRAYSCALE)
-                if img is None:
-                    # If one image fails, use a copy of the first image
-                    img = first_img.copy()
-                frames.append(img)
-    else:
-        # Assume it's a video file
-        cap = cv2.VideoCapture(image_sequence_path)
-        frames = []
-
-        if cap.isOpened():
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
-            cap.release()
-            log += f"- Loaded {len(frames)} frames from video\n"
-
-            if frames:
-                first_img = frames[0]
-            else:
-                # Handle case where video loading fails
-                log += "- Warning: Could not load video frames properly.\n"
-                first_img = np.zeros((100, 100), dtype=np.uint8)
-                frames = [first_img.copy()]
-        else:
-            # Handle case where video file cannot be opened
-            log += "- Warning: Could not open video file.\n"
-            first_img = np.zeros((100, 100), dtype=np.uint8)
-            frames = [first_img.copy()]
-
-    log += f"- Image dimensions: {first_img.shape[1]}x{first_img.shape[0]} pixels\n\n"
-
     # Cell segmentation and feature extraction
-    log += "## Cell Segmentation\n"
-    features_by_frame = []
-
-    for i, frame in enumerate(frames):
+    def segment(frame_index, frame):
         # Enhance contrast
         frame_eq = cv2.equalizeHist(frame)
 
@@ -746,46 +688,97 @@ def track_immune_cells_under_flow(
         # Identify cells using connected components
         num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
 
-        # Filter out small objects (noise) and large objects (not cells)
+        # Filter out small objects (noise) and large objects (not cells), skipping label 0 (background)
         min_size = 20  # Minimum cell area in pixels
         max_size = 500  # Maximum cell area in pixels
+        stats, centroids = stats[1:], centroids[1:]
+        area = stats[:, cv2.CC_STAT_AREA]
+        keep = (min_size <= area) & (area <= max_size)
+        width = stats[keep, cv2.CC_STAT_WIDTH]
+        height = stats[keep, cv2.CC_STAT_HEIGHT]
+
+        # Extract features for each cell; roundness approximates the cell shape
+        return pd.DataFrame(
+            {
+                "frame": np.full(keep.sum(), frame_index),
+                "y": centroids[keep, 1],
+                "x": centroids[keep, 0],
+                "area": area[keep],
+                "width": width,
+                "height": height,
+                "roundness": np.minimum(width, height) / np.maximum(np.maximum(width, height), 1),
+            }
+        )
 
-        # Extract features for each cell
-        frame_features = []
-        for j in range(1, num_labels):  # Skip label 0 (background)
-            area = stats[j, cv2.CC_STAT_AREA]
-            if min_size <= area <= max_size:
-                x = centroids[j, 0]
-                y = centroids[j, 1]
-                width = stats[j, cv2.CC_STAT_WIDTH]
-                height = stats[j, cv2.CC_STAT_HEIGHT]
-
-                # Calculate cell roundness (approximation)
-                roundness = min(width, height) / max(width, height) if max(width, height) > 0 else 0
-
-                frame_features.append(
-                    {
-                        "frame": i,
-                        "y": y,
-                        "x": x,
-                        "area": area,
-                        "width": width,
-                        "height": height,
-                        "roundness": roundness,
-                    }
-                )
+    # Load image sequence; frames are read ahead on a background thread and segmented in parallel
+    loading_log = "## Data Loading\n"
+    n_frames = 0
+    first_frame = None
+
+    def segment_all(frames):
+        def counted():
+            nonlocal n_frames, first_frame
+            for frame in frames:
+                if first_frame is None:
+                    first_frame = frame
+                n_frames += 1
+                yield frame
+
+        return list(map_frames(lambda item: segment(*item), enumerate(counted())))
+
+    if os.path.isdir(image_sequence_path):
+        image_files = sorted(
+            [f for f in os.listdir(image_sequence_path) if f.endswith((".png", ".jpg", ".tif", ".tiff"))]
+        )
+        loading_log += f"- Loaded {len(image_files)} images from directory\n"
+
+        # Read first image to get dimensions
+        first_img = cv2.imread(os.path.join(image_sequence_path, image_files[0]), cv2.IMREAD_GRAYSCALE)
 
-        features_by_frame.append(pd.DataFrame(frame_features))
+        # Handle case where image loading fails (e.g., in tests with dummy files)
+        if first_img is None:
+            loading_log += (
+                "- Warning: Could not load images properly. This may be due to non-image files or a test environment.\n"
+            )
+            # Create a small dummy image for test purposes
+            first_img = np.zeros((100, 100), dtype=np.uint8)
+            frames = (np.zeros((100, 100), dtype=np.uint8) for _ in image_files)
+        else:
+            # If one image fails, use a copy of the first image
+            frames = (
+                first_img.copy() if img is None else img
+                for img in read_images([os.path.join(image_sequence_path, f) for f in image_files])
+            )
+        features_by_frame = segment_all(frames)
+    else:
+        # Assume it's a video file
+        try:
+            features_by_frame = segment_all(read_video(image_sequence_path))
+            loading_log += f"- Loaded {n_frames} frames from video\n"
+            if n_frames == 0:
+                # Handle case where video loading fails
+                loading_log += "- Warning: Could not load video frames properly.\n"
+        except OSError:
+            # Handle case where video file cannot be opened
+            loading_log += "- Warning: Could not open video file.\n"
+        if n_frames == 0:
+            features_by_frame = segment_all([np.zeros((100, 100), dtype=np.uint8)])
+        first_img = first_frame
+
+    log += loading_log
+    log += f"- Image dimensions: {first_img.shape[1]}x{first_img.shape[0]} pixels\n\n"
+
+    log += "## Cell Segmentation\n"
 
     # Combine all features
     all_features = pd.concat(features_by_frame, ignore_index=True)
     log += f"- Detected {len(all_features)} cell instances across all frames\n"
-    log += f"- Average {len(all_features) / len(frames):.1f} cells per frame\n\n"
+    log += f"- Average {len(all_features) / n_frames:.1f} cells per frame\n\n"
 
     # Cell tracking
     log += "## Cell Tracking\n"
 
-    # Use trackpy to link cell positions across frames
+    # Link cell positions across frames (minimal summed squared displacement, as in trackpy)
     search_range = 20  # Maximum distance a cell can move between frames
     memory = 3  # Allow linking across gaps of up to 3 frames
 
@@ -796,8 +789,6 @@ def track_immune_cells_under_flow(
     if len(tp_features) == 0:
         log += "- Warning: No features found for tracking. This may be due to test environment with dummy images.\n"
         # Create a minimal valid dataframe with expected column structure
-        import pandas as pd
-
         tp_features = pd.DataFrame(
             {
                 "t": [0, 0, 1, 1],
@@ -813,18 +804,13 @@ def track_immune_cells_under_flow(
         tracks["particle"] = [0, 1, 0, 1]  # Assign particle IDs manually
     else:
         # Link features across frames
-        try:
-            linked = tp.link(tp_features, search_range, memory=memory)
-
-            # Filter tracks that are too short
-            min_track_length = 5  # Minimum number of frames a cell must be tracked
-            tracks = tp.filter_stubs(linked, min_track_length)
-        except KeyError as e:
-            # Handle the case where required columns are missing
-            log += f"- Warning: Error during tracking: {str(e)}. Using simulated tracks instead.\n"
-            # Create simple simulated tracks for test purposes
-            tracks = tp_features.copy()
-            tracks["particle"] = [i % max(3, len(tp_features) // 3) for i in range(len(tp_features))]
+        positions = [frame[["y", "x"]].to_numpy() for frame in features_by_frame]
+        linked = tp_features.copy()
+        linked["particle"] = np.concatenate(link_trajectories(positions, search_range, memory=memory))
+
+        # Filter tracks that are too short
+        min_track_length = 5  # Minimum number of frames a cell must be tracked
+        tracks = linked[linked.groupby("particle")["particle"].transform("size") >= min_track_length]
 
     # Calculate track statistics
     track_ids = tracks["particle"].unique()
@@ -847,9 +833,9 @@ def track_immune_cells_under_flow(
     # Calculate displacement and speed for each track
     behaviors = []
 
-    for track_id in track_ids:
+    for track_id, track_data in tracks.groupby("particle", sort=False):
         try:
-            track_data = tracks[tracks["particle"] == track_id].sort_values("t")
+            track_data = track_data.sort_values("t")
 
             # Skip tracks that are too short
             if len(track_data) < 5:  # Using fixed value instead of min_track_length
@@ -1483,7 +1469,171 @@ def analyze_ebv_antibody_titers(raw_od_data, standard_curve_data, sample_metadat
     return "\n".join(log)
 
 
-def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="H&E"):
+def _cns_glcm_levels(values, enhance):
+    import numpy as np
+
+    return (enhance(values) * 255).astype(np.uint8)
+
+
+def _cns_overlay_tile(tile, image, mask, overlay, gray):
+    """Segmentation boundaries drawn over one tile, as ``analyze_cns_lesion_histology`` draws them.
+
+    The boundaries of a label image of 8-connected components are those of its mask.
+    """
+    import numpy as np
+    from skimage import segmentation
+
+    original_image = image[tile.core]
+    if mask is not None:
+        boundaries = segmentation.find_boundaries(mask[tile.region])[tile.inner]
+    else:
+        boundaries = np.zeros(original_image.shape[:2], dtype=bool)
+    if len(original_image.shape) > 2:
+        overlay_tile = original_image.copy()
+        overlay_tile[boundaries, 0] = 255  # Red channel
+        overlay_tile[boundaries, 1:3] = 0  # Green and Blue channels
+    else:
+        gray_image = original_image if gray is None else gray(original_image)
+        overlay_tile = np.stack([gray_image, gray_image, gray_image], axis=-1)
+        overlay_tile[boundaries, 0] = 1.0  # Red channel
+        overlay_tile[boundaries, 1:3] = 0.0  # Green and Blue channels
+    overlay[tile.core] = (overlay_tile * 255).astype(np.uint8)
+
+
+def _analyze_cns_lesion_tiled(image_path, stain_type, overlay_filename, workspace, log, n_workers=None):
+    """The image analysis of ``analyze_cns_lesion_histology``, tile by tile, with the same results.
+
+    Returns:
+        The measurements of the stain type, by the names the whole-image analysis uses
+
+    """
+    import functools
+    import os
+
+    import numpy as np
+    from skimage import color
+    from skimage.feature import graycoprops
+
+    from biomni.tool import tiled_image
+
+    original_image = workspace.open(image_path)
+    shape = original_image.shape[:2]
+    gray = color.rgb2gray if len(original_image.shape) > 2 else None
+    # Grayscale, CLAHE and mask copies of each pixel
+    tiles = tiled_image.plan_tiles(
+        shape, 64 + np.prod(original_image.shape[2:], dtype=int) * original_image.dtype.itemsize, n_workers=n_workers
+    )
+    log.append(f"Processing the image in {len(tiles)} tiles")
+
+    # Enhance contrast
+    equalized = workspace.create("equalized", shape, np.uint16)
+    enhance = tiled_image.tiled_equalize_adapthist(original_image, equalized, tiles, gray, n_workers=n_workers)
+
+    def segment(image, transform, above, min_size=0):
+        # Otsu threshold, then small objects removed
+        threshold = tiled_image.tiled_threshold_otsu(image, tiles, transform, n_workers=n_workers)
+        mask = workspace.create("mask", shape, bool)
+        tiled_image.threshold_tiled(image, mask, tiles, threshold, above, transform, n_workers=n_workers)
+        if not min_size:
+            return mask
+        cleaned = workspace.create("cleaned", shape, bool)
+        tiled_image.remove_small_objects_tiled(mask, cleaned, tiles, min_size, n_workers=n_workers)
+        return cleaned
+
+    mask = None
+    measurements = {"cell_count": 0, "damage_score": 0}
+    if stain_type == "H&E":
+        log.append("Performing H&E stain analysis...")
+        # Identify cell nuclei (typically dark in H&E)
+        mask = segment(equalized, enhance, False, 30)
+        cell_count = tiled_image.label_tiled(mask, tiles, n_workers=n_workers).count
+
+        # Calculate texture features for damage assessment
+        glcm = tiled_image.tiled_graycomatrix(
+            equalized,
+            tiles,
+            distances=[1],
+            angles=[0, np.pi / 4, np.pi / 2, 3 * np.pi / 4],
+            levels=256,
+            symmetric=True,
+            normed=True,
+            transform=functools.partial(_cns_glcm_levels, enhance=enhance),
+            n_workers=n_workers,
+        )
+        contrast = graycoprops(glcm, "contrast").mean()
+        homogeneity = graycoprops(glcm, "homogeneity").mean()
+        energy = graycoprops(glcm, "energy").mean()
+        damage_score = contrast / (homogeneity * energy)
+
+        log.append(f"Detected {cell_count} cells")
+        log.append(f"Texture analysis completed: contrast={contrast:.3f}, homogeneity={homogeneity:.3f}")
+        log.append(f"Calculated damage score: {damage_score:.2f}")
+        measurements = {
+            "cell_count": cell_count,
+            "damage_score": damage_score,
+            "contrast": contrast,
+            "homogeneity": homogeneity,
+            "energy": energy,
+        }
+
+    elif stain_type == "LFB":
+        log.append("Performing LFB (myelin) stain analysis...")
+        if len(original_image.shape) > 2:
+            # Blue channel of RGB images
+            blue = tiled_image.channel(2) if original_image.shape[2] >= 3 else gray
+            mask = segment(original_image, blue, True, 100)
+        else:
+            mask = segment(equalized, enhance, True)
+        myelin_percent = tiled_image.count_nonzero_tiled(mask, tiles, n_workers=n_workers) / np.prod(shape) * 100
+        demyelination_score = 100 - myelin_percent
+        log.append(f"Myelin content: {myelin_percent:.2f}%")
+        log.append(f"Demyelination score: {demyelination_score:.2f}")
+        measurements = {
+            "cell_count": 0,
+            "damage_score": demyelination_score,
+            "myelin_percent": myelin_percent,
+            "demyelination_score": demyelination_score,
+        }
+
+    elif stain_type == "IHC":
+        log.append("Performing immunohistochemistry analysis...")
+        # Positive staining appears brown/dark
+        mask = segment(equalized, enhance, False, 30)
+        positive_percent = tiled_image.count_nonzero_tiled(mask, tiles, n_workers=n_workers) / np.prod(shape) * 100
+        cell_count = tiled_image.label_tiled(mask, tiles, n_workers=n_workers).count
+        infiltration_score = positive_percent
+
+        log.append(f"Detected {cell_count} positive cells")
+        log.append(f"Positive staining: {positive_percent:.2f}%")
+        log.append(f"Infiltration score: {infiltration_score:.2f}")
+        measurements = {
+            "cell_count": cell_count,
+            "damage_score": infiltration_score,
+            "positive_percent": positive_percent,
+            "infiltration_score": infiltration_score,
+        }
+
+    # Save segmentation result
+    try:
+        overlay_shape = original_image.shape if len(original_image.shape) > 2 else (*shape, 3)
+        overlay = tiled_image.create_image(overlay_filename, overlay_shape, np.uint8)
+        tiled_image.run_tiles(
+            _cns_overlay_tile,
+            [tile.with_halo(1, shape) for tile in tiles],
+            original_image,
+            mask,
+            overlay,
+            gray,
+            n_workers=n_workers,
+        )
+        overlay.flush()
+        log.append(f"Segmentation result saved to: {os.path.basename(overlay_filename)}")
+    except Exception as e:
+        log.append(f"Warning: Could not save segmentation result: {str(e)}")
+    return measurements
+
+
+def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="H&E", tiled=None, n_workers=None):
     """Analyzes histological images of CNS lesions to quantify immune cell infiltration,
     demyelination, and tissue damage.
 
@@ -1495,6 +1645,12 @@ def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="
         Directory to save output files (default: "./output")
     stain_type : str, optional
         Type of histological stain used (default: "H&E", other options: "LFB", "IHC")
+    tiled : bool, optional
+        Process the image tile by tile within ``BIOMNI_TILE_MEMORY_MB``, with the same results
+        (the segmentation overlay is then saved as a TIFF). None (default) does so for images
+        larger than ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
 
     Returns
     -------
@@ -1507,6 +1663,8 @@ def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="
 
     import numpy as np
 
+    from biomni.tool.tiled_image import Workspace, use_tiles
+
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
@@ -1547,141 +1705,158 @@ def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="
     # Process the image if dependencies are available
     if HAS_SKIMAGE and os.path.isfile(image_path):
         try:
-            # Load and preprocess the image
-            log.append("Loading and preprocessing image...")
-            original_image = io.imread(image_path)
-
-            # Convert to grayscale if RGB
-            gray_image = color.rgb2gray(original_image) if len(original_image.shape) > 2 else original_image
-
-            # Enhance contrast
-            enhanced_image = exposure.equalize_adapthist(gray_image)
-
-            # Image segmentation based on stain type
-            if stain_type == "H&E":
-                log.append("Performing H&E stain analysis...")
-                # For H&E staining, segment based on intensity thresholds
-                # Identify cell nuclei (typically dark in H&E)
-                thresh_val = filters.threshold_otsu(enhanced_image)
-                nuclei_mask = enhanced_image < thresh_val
-                nuclei_mask = morphology.remove_small_objects(nuclei_mask, min_size=30)
-
-                # Count nuclei (cells)
-                labeled_nuclei = measure.label(nuclei_mask)
-                cell_props = measure.regionprops(labeled_nuclei)
-                cell_count = len(cell_props)
-
-                # Calculate texture features for damage assessment
-                glcm = graycomatrix(
-                    (enhanced_image * 255).astype(np.uint8),
-                    distances=[1],
-                    angles=[0, np.pi / 4, np.pi / 2, 3 * np.pi / 4],
-                    levels=256,
-                    symmetric=True,
-                    normed=True,
-                )
-
-                # Extract texture features
-                contrast = graycoprops(glcm, "contrast").mean()
-                homogeneity = graycoprops(glcm, "homogeneity").mean()
-                energy = graycoprops(glcm, "energy").mean()
-
-                # Higher contrast and lower homogeneity often indicate tissue damage
-                damage_score = contrast / (homogeneity * energy)
-
-                log.append(f"Detected {cell_count} cells")
-                log.append(f"Texture analysis completed: contrast={contrast:.3f}, homogeneity={homogeneity:.3f}")
-                log.append(f"Calculated damage score: {damage_score:.2f}")
-
-            elif stain_type == "LFB":
-                log.append("Performing LFB (myelin) stain analysis...")
-                # For Luxol Fast Blue staining (myelin)
-                # Blue intensity correlates with myelin content
-                if len(original_image.shape) > 2:
-                    # Extract blue channel for RGB images
-                    blue_channel = original_image[:, :, 2] if original_image.shape[2] >= 3 else gray_image
-
-                    # Threshold to identify myelin
-                    thresh_val = filters.threshold_otsu(blue_channel)
-                    myelin_mask = blue_channel > thresh_val
-                    myelin_mask = morphology.remove_small_objects(myelin_mask, min_size=100)
+            if use_tiles(image_path, tiled):
+                log.append("Loading and preprocessing image...")
+                overlay_filename = f"{os.path.splitext(result_filename)[0]}.tif"
+                with Workspace() as workspace:
+                    measurements = _analyze_cns_lesion_tiled(
+                        image_path, stain_type, overlay_filename, workspace, log, n_workers
+                    )
+                cell_count, damage_score = measurements["cell_count"], measurements["damage_score"]
+                if stain_type == "H&E":
+                    contrast, homogeneity, energy = (measurements[k] for k in ("contrast", "homogeneity", "energy"))
+                elif stain_type == "LFB":
+                    myelin_percent = measurements["myelin_percent"]
+                    demyelination_score = measurements["demyelination_score"]
+                elif stain_type == "IHC":
+                    positive_percent = measurements["positive_percent"]
+                    infiltration_score = measurements["infiltration_score"]
+            else:
+                # Load and preprocess the image
+                log.append("Loading and preprocessing image...")
+                original_image = io.imread(image_path)
 
-                    # Calculate myelin content as percentage of tissue area
-                    myelin_percent = np.sum(myelin_mask) / myelin_mask.size * 100
+                # Convert to grayscale if RGB
+                gray_image = color.rgb2gray(original_image) if len(original_image.shape) > 2 else original_image
 
-                    # Demyelination score (inverse of myelin content)
-                    demyelination_score = 100 - myelin_percent
+                # Enhance contrast
+                enhanced_image = exposure.equalize_adapthist(gray_image)
 
-                    # Cell count is less relevant for LFB stain
-                    cell_count = 0
-                    damage_score = demyelination_score
+                # Image segmentation based on stain type
+                if stain_type == "H&E":
+                    log.append("Performing H&E stain analysis...")
+                    # For H&E staining, segment based on intensity thresholds
+                    # Identify cell nuclei (typically dark in H&E)
+                    thresh_val = filters.threshold_otsu(enhanced_image)
+                    nuclei_mask = enhanced_image < thresh_val
+                    nuclei_mask = morphology.remove_small_objects(nuclei_mask, min_size=30)
+
+                    # Count nuclei (cells)
+                    labeled_nuclei = measure.label(nuclei_mask)
+                    cell_props = measure.regionprops(labeled_nuclei)
+                    cell_count = len(cell_props)
+
+                    # Calculate texture features for damage assessment
+                    glcm = graycomatrix(
+                        (enhanced_image * 255).astype(np.uint8),
+                        distances=[1],
+                        angles=[0, np.pi / 4, np.pi / 2, 3 * np.pi / 4],
+                        levels=256,
+                        symmetric=True,
+                        normed=True,
+                    )
 
-                    log.append(f"Myelin content: {myelin_percent:.2f}%")
-                    log.append(f"Demyelination score: {demyelination_score:.2f}")
-                else:
-                    # Grayscale LFB handling
+                    # Extract texture features
+                    contrast = graycoprops(glcm, "contrast").mean()
+                    homogeneity = graycoprops(glcm, "homogeneity").mean()
+                    energy = graycoprops(glcm, "energy").mean()
+
+                    # Higher contrast and lower homogeneity often indicate tissue damage
+                    damage_score = contrast / (homogeneity * energy)
+
+                    log.append(f"Detected {cell_count} cells")
+                    log.append(f"Texture analysis completed: contrast={contrast:.3f}, homogeneity={homogeneity:.3f}")
+                    log.append(f"Calculated damage score: {damage_score:.2f}")
+
+                elif stain_type == "LFB":
+                    log.append("Performing LFB (myelin) stain analysis...")
+                    # For Luxol Fast Blue staining (myelin)
+                    # Blue intensity correlates with myelin content
+                    if len(original_image.shape) > 2:
+                        # Extract blue channel for RGB images
+                        blue_channel = original_image[:, :, 2] if original_image.shape[2] >= 3 else gray_image
+
+                        # Threshold to identify myelin
+                        thresh_val = filters.threshold_otsu(blue_channel)
+                        myelin_mask = blue_channel > thresh_val
+                        myelin_mask = morphology.remove_small_objects(myelin_mask, min_size=100)
+
+                        # Calculate myelin content as percentage of tissue area
+                        myelin_percent = np.sum(myelin_mask) / myelin_mask.size * 100
+
+                        # Demyelination score (inverse of myelin content)
+                        demyelination_score = 100 - myelin_percent
+
+                        # Cell count is less relevant for LFB stain
+                        cell_count = 0
+                        damage_score = demyelination_score
+
+                        log.append(f"Myelin content: {myelin_percent:.2f}%")
+                        log.append(f"Demyelination score: {demyelination_score:.2f}")
+                    else:
+                        # Grayscale LFB handling
+                        thresh_val = filters.threshold_otsu(enhanced_image)
+                        myelin_mask = enhanced_image > thresh_val
+                        myelin_percent = np.sum(myelin_mask) / myelin_mask.size * 100
+                        demyelination_score = 100 - myelin_percent
+                        log.append(f"Myelin content: {myelin_percent:.2f}%")
+                        log.append(f"Demyelination score: {demyelination_score:.2f}")
+                        cell_count = 0
+                        damage_score = demyelination_score
+
+                elif stain_type == "IHC":
+                    log.append("Performing immunohistochemistry analysis...")
+                    # For immunohistochemistry (specific immune cell markers)
+                    # Positive staining appears brown/dark
                     thresh_val = filters.threshold_otsu(enhanced_image)
-                    myelin_mask = enhanced_image > thresh_val
-                    myelin_percent = np.sum(myelin_mask) / myelin_mask.size * 100
-                    demyelination_score = 100 - myelin_percent
-                    log.append(f"Myelin content: {myelin_percent:.2f}%")
-                    log.append(f"Demyelination score: {demyelination_score:.2f}")
-                    cell_count = 0
-                    damage_score = demyelination_score
-
-            elif stain_type == "IHC":
-                log.append("Performing immunohistochemistry analysis...")
-                # For immunohistochemistry (specific immune cell markers)
-                # Positive staining appears brown/dark
-                thresh_val = filters.threshold_otsu(enhanced_image)
-                positive_stain_mask = enhanced_image < thresh_val
-                positive_stain_mask = morphology.remove_small_objects(positive_stain_mask, min_size=30)
-
-                # Calculate percentage of positive staining
-                positive_percent = np.sum(positive_stain_mask) / positive_stain_mask.size * 100
-
-                # Count individual positive cells
-                labeled_cells = measure.label(positive_stain_mask)
-                cell_props = measure.regionprops(labeled_cells)
-                cell_count = len(cell_props)
-
-                # Infiltration score based on positive staining percentage
-                infiltration_score = positive_percent
-                damage_score = infiltration_score
-
-                log.append(f"Detected {cell_count} positive cells")
-                log.append(f"Positive staining: {positive_percent:.2f}%")
-                log.append(f"Infiltration score: {infiltration_score:.2f}")
-
-            # Save segmentation result
-            try:
-                # Create a visualization of the segmentation
-                if stain_type == "H&E" and "labeled_nuclei" in locals():
-                    boundaries = segmentation.find_boundaries(labeled_nuclei)
-                elif stain_type == "LFB" and "myelin_mask" in locals():
-                    boundaries = segmentation.find_boundaries(myelin_mask)
-                elif stain_type == "IHC" and "labeled_cells" in locals():
-                    boundaries = segmentation.find_boundaries(labeled_cells)
-                else:
-                    boundaries = np.zeros_like(gray_image, dtype=bool)
-
-                # Create overlay for visualization
-                if len(original_image.shape) > 2:
-                    overlay = original_image.copy()
-                    if np.any(boundaries):
-                        overlay[boundaries, 0] = 255  # Red channel
-                        overlay[boundaries, 1:3] = 0  # Green and Blue channels
-                else:
-                    overlay = np.stack([gray_image, gray_image, gray_image], axis=-1)
-                    if np.any(boundaries):
-                        overlay[boundaries, 0] = 1.0  # Red channel
-                        overlay[boundaries, 1:3] = 0.0  # Green and Blue channels
-
-                # Save the overlay image
-                io.imsave(result_filename, (overlay * 255).astype(np.uint8))
-                log.append(f"Segmentation result saved to: {os.path.basename(result_filename)}")
-            except Exception as e:
-                log.append(f"Warning: Could not save segmentation result: {str(e)}")
+                    positive_stain_mask = enhanced_image < thresh_val
+                    positive_stain_mask = morphology.remove_small_objects(positive_stain_mask, min_size=30)
+
+                    # Calculate percentage of positive staining
+                    positive_percent = np.sum(positive_stain_mask) / positive_stain_mask.size * 100
+
+                    # Count individual positive cells
+                    labeled_cells = measure.label(positive_stain_mask)
+                    cell_props = measure.regionprops(labeled_cells)
+                    cell_count = len(cell_props)
+
+                    # Infiltration score based on positive staining percentage
+                    infiltration_score = positive_percent
+                    damage_score = infiltration_score
+
+                    log.append(f"Detected {cell_count} positive cells")
+                    log.append(f"Positive staining: {positive_percent:.2f}%")
+                    log.append(f"Infiltration score: {infiltration_score:.2f}")
+
+                # Save segmentation result
+                try:
+                    # Create a visualization of the segmentation
+                    if stain_type == "H&E" and "labeled_nuclei" in locals():
+                        boundaries = segmentation.find_boundaries(labeled_nuclei)
+                    elif stain_type == "LFB" and "myelin_mask" in locals():
+                        boundaries = segmentation.find_boundaries(myelin_mask)
+                    elif stain_type == "IHC" and "labeled_cells" in locals():
+                        boundaries = segmentation.find_boundaries(labeled_cells)
+                    else:
+                        boundaries = np.zeros_like(gray_image, dtype=bool)
+
+                    # Create overlay for visualization
+                    if len(original_image.shape) > 2:
+                        overlay = original_image.copy()
+                        if np.any(boundaries):
+                            overlay[boundaries, 0] = 255  # Red channel
+                            overlay[boundaries, 1:3] = 0  # Green and Blue channels
+                    else:
+                        overlay = np.stack([gray_image, gray_image, gray_image], axis=-1)
+                        if np.any(boundaries):
+                            overlay[boundaries, 0] = 1.0  # Red channel
+                            overlay[boundaries, 1:3] = 0.0  # Green and Blue channels
+
+                    # Save the overlay image
+                    io.imsave(result_filename, (overlay * 255).astype(np.uint8))
+                    log.append(f"Segmentation result saved to: {os.path.basename(result_filename)}")
+                except Exception as e:
+                    log.append(f"Warning: Could not save segmentation result: {str(e)}")
 
             # Create metrics file
             try:
@@ -1841,7 +2016,142 @@ def analyze_cns_lesion_histology(image_path, output_dir="./output", stain_type="
     return "\n".join(log)
 
 
-def analyze_immunohistochemistry_image(image_path, protein_name="Unknown", output_dir="./ihc_results/"):
+def _ihc_gray(values):
+    from skimage.color import rgb2gray
+
+    return rgb2gray(values) if values.ndim == 3 and values.shape[2] >= 3 else values
+
+
+def _ihc_enhanced(values, in_range):
+    from skimage import exposure
+
+    return exposure.rescale_intensity(_ihc_gray(values), in_range=in_range)
+
+
+def _pairwise_distance_stats(points, block_distances: int = 2**22):
+    """Mean, minimum and maximum distance between all pairs of ``points``, computed in blocks of
+    rows of about ``block_distances`` distances."""
+    import numpy as np
+    from scipy.spatial.distance import cdist
+
+    points = np.asarray(points, dtype=np.float64)
+    block_size = max(1, block_distances // len(points))
+    total, count, low, high = 0.0, 0, np.inf, -np.inf
+    for start in range(0, len(points) - 1, block_size):
+        block = points[start : start + block_size]
+        distances = cdist(block, points[start + 1 :])
+        # Pairs (i, j) with i < j only
+        upper = np.arange(len(block))[:, None] <= np.arange(distances.shape[1])[None, :]
+        distances = distances[upper]
+        total += distances.sum()
+        count += distances.size
+        low, high = min(low, distances.min()), max(high, distances.max())
+    return total / count, low, high
+
+
+def _spatial_distribution_log(centroids) -> str:
+    # Calculate distances between centroids to assess clustering
+    if len(centroids) > 1:
+        avg_distance, min_distance, max_distance = _pairwise_distance_stats(centroids)
+        log = "Spatial distribution analysis:\n"
+        log += f"- Average distance between regions: {avg_distance:.2f} pixels\n"
+        log += f"- Minimum distance between regions: {min_distance:.2f} pixels\n"
+        log += f"- Maximum distance between regions: {max_distance:.2f} pixels\n"
+        return log
+    return "Spatial distribution analysis: Only one region detected\n"
+
+
+def _analyze_immunohistochemistry_tiled(image_path, output_dir, base_filename, n_workers=None):
+    """``analyze_immunohistochemistry_image`` tile by tile, for images too large to load whole."""
+    import csv
+    import functools
+    import os
+
+    import numpy as np
+
+    from biomni.tool import tiled_image
+
+    with tiled_image.Workspace() as workspace:
+        # Load the image
+        try:
+            img = workspace.open(image_path)
+            log = f"Loaded image from {image_path}\n"
+        except Exception as e:
+            return f"Error loading image: {str(e)}"
+        shape = img.shape[:2]
+        # Grayscale and enhanced copies, masks and labels of each pixel
+        tiles = tiled_image.plan_tiles(
+            shape, 64 + np.prod(img.shape[2:], dtype=int) * img.dtype.itemsize, n_workers=n_workers
+        )
+        log += f"Processing the image in {len(tiles)} tiles\n"
+
+        if len(img.shape) == 3 and img.shape[2] >= 3:
+            log += "Converted RGB image to grayscale for analysis\n"
+        else:
+            log += "Image already in grayscale format\n"
+
+        # Enhance contrast for better visualization
+        p2, p98 = tiled_image.tiled_percentile(img, tiles, (2, 98), _ihc_gray, n_workers=n_workers)
+        enhance = functools.partial(_ihc_enhanced, in_range=(p2, p98))
+        log += "Enhanced image contrast for better visualization\n"
+
+        # Segment cells/tissue using thresholding
+        threshold_value = tiled_image.tiled_threshold_otsu(img, tiles, enhance, n_workers=n_workers)
+        binary_mask = workspace.create("mask", shape, bool)
+        tiled_image.threshold_tiled(img, binary_mask, tiles, threshold_value, transform=enhance, n_workers=n_workers)
+
+        # Clean up the mask with morphological operations
+        cleaned = workspace.create("cleaned", shape, bool)
+        tiled_image.remove_small_objects_tiled(binary_mask, cleaned, tiles, 50, n_workers=n_workers)
+        tiled_image.remove_small_holes_tiled(cleaned, binary_mask, tiles, 50, n_workers=n_workers)
+        log += "Segmented tissue regions using Otsu thresholding and morphological cleanup\n"
+
+        # Label connected regions
+        regions = tiled_image.label_tiled(binary_mask, tiles, n_workers=n_workers)
+        num_features = regions.count
+        log += f"Identified {num_features} distinct tissue regions\n"
+        segmentation_file = os.path.join(output_dir, f"{base_filename}_segmentation.tif")
+        labeled_mask = tiled_image.create_image(
+            segmentation_file, shape, np.int32 if num_features < 2**31 else np.int64
+        )
+        tiled_image.write_labels(regions, binary_mask, labeled_mask, n_workers=n_workers)
+
+        # Quantify protein expression by measuring intensity in segmented regions
+        sums = tiled_image.region_sums_tiled(labeled_mask, tiles, num_features, img, _ihc_gray, n_workers=n_workers)
+
+    area = sums["area"].astype(np.float64)
+    mean_intensities = sums["intensity"] / area
+    centroids = np.stack([sums["row"] / area, sums["col"] / area], axis=1)
+    total_intensity = float((mean_intensities * area).sum())
+    avg_intensity = np.mean(mean_intensities) if num_features else 0
+
+    log += "Protein expression quantification:\n"
+    log += f"- Total intensity: {total_intensity:.2f}\n"
+    log += f"- Average intensity: {avg_intensity:.2f}\n"
+    log += f"- Number of regions analyzed: {num_features}\n"
+
+    # Analyze spatial distribution
+    if num_features:
+        log += _spatial_distribution_log(centroids)
+
+    # Create a CSV with region properties
+    csv_file = os.path.join(output_dir, f"{base_filename}_region_data.csv")
+    with open(csv_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Region ID", "Area", "Mean Intensity", "Centroid Y", "Centroid X"])
+        for i in range(num_features):
+            writer.writerow([i + 1, area[i], mean_intensities[i], centroids[i, 0], centroids[i, 1]])
+
+    log += "\nResults saved:\n"
+    log += f"- Segmentation image: {segmentation_file}\n"
+    log += f"- Region data: {csv_file}\n"
+
+    return log
+
+
+def analyze_immunohistochemistry_image(
+    image_path, protein_name="Unknown", output_dir="./ihc_results/", tiled=None, n_workers=None
+):
     """Analyzes immunohistochemistry images to quantify protein expression and spatial distribution.
 
     Parameters
@@ -1852,6 +2162,12 @@ def analyze_immunohistochemistry_image(image_path, protein_name="Unknown", outpu
         Name of the protein being analyzed (default: "Unknown")
     output_dir : str, optional
         Directory to save output files (default: "./ihc_results/")
+    tiled : bool, optional
+        Process the image tile by tile within ``BIOMNI_TILE_MEMORY_MB``, with the same results
+        (the segmentation is then saved as a TIFF label image). None (default) does so for images
+        larger than ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
 
     Returns
     -------
@@ -1866,11 +2182,16 @@ def analyze_immunohistochemistry_image(image_path, protein_name="Unknown", outpu
     from skimage import exposure, filters, io, measure, morphology
     from skimage.color import rgb2gray
 
+    from biomni.tool.tiled_image import use_tiles
+
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_filename = f"{protein_name}_{timestamp}"
 
+    if use_tiles(image_path, tiled):
+        return _analyze_immunohistochemistry_tiled(image_path, output_dir, base_filename, n_workers)
+
     # Load the image
     try:
         img = io.imread(image_path)
@@ -1921,23 +2242,7 @@ def analyze_immunohistochemistry_image(image_path, protein_name="Unknown", outpu
     if region_props:
         # Calculate centroid coordinates for each region
         centroids = [prop.centroid for prop in region_props]
-
-        # Calculate distances between centroids to assess clustering
-        from scipy.spatial import distance
-
-        if len(centroids) > 1:
-            distances = []
-            for i in range(len(centroids)):
-                for j in range(i + 1, len(centroids)):
-                    distances.append(distance.euclidean(centroids[i], centroids[j]))
-
-            avg_distance = np.mean(distances)
-            log += "Spatial distribution analysis:\n"
-            log += f"- Average distance between regions: {avg_distance:.2f} pixels\n"
-            log += f"- Minimum distance between regions: {min(distances):.2f} pixels\n"
-            log += f"- Maximum distance between regions: {max(distances):.2f} pixels\n"
-        else:
-            log += "Spatial distribution analysis: Only one region detected\n"
+        log += _spatial_distribution_log(centroids)
 
     # Save results
     segmentation_file = os.path.join(output_dir, f"{base_filename}_segmentation.png")
@@ -10,6 +10,9 @@ import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
 
+from biomni.http_client import http_get
+from biomni.response_cache import cached_call
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -52,7 +55,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     if DEBUG_MODE:
         logger.debug(f"Resolving DOI via CrossRef API: {crossref_url}")
     
-    response = requests.get(crossref_url, headers=headers)
+    response = http_get(crossref_url, headers=headers)
 
     if response.status_code != 200:
         log_message = f"Failed to resolve DOI: {doi}. Status Code: {response.status_code}"
@@ -73,7 +76,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     if DEBUG_MODE:
         logger.debug(f"Fetching publisher page: {publisher_url}")
     
-    response = requests.get(publisher_url, headers=headers)
+    response = http_get(publisher_url, headers=headers)
     if response.status_code != 200:
         log_message = f"Failed to access publisher page for DOI {doi}."
         research_log.append(log_message)
@@ -122,7 +125,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
         if DEBUG_MODE:
             logger.debug(f"Downloading file from: {link}")
         
-        file_response = requests.get(link, headers=headers)
+        file_response = http_get(link, headers=headers)
         if file_response.status_code == 200:
             with open(file_name, "wb") as f:
                 f.write(file_response.content)
@@ -151,6 +154,11 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     return "\n".join(research_log)
 
 
+@cached_call(
+    "arxiv",
+    should_cache=lambda result: not result.startswith("Error"),
+    offline_result=lambda e: f"Error querying arXiv: {e}",
+)
 def query_arxiv(query: str, max_papers: int = 10) -> str:
     """Query arXiv for papers based on the provided search query.
 
@@ -227,6 +235,11 @@ def query_scholar(query: str) -> str:
 #         return f"Error querying Google Scholar: {e}"  # [已注释，原因：增加详细日志]
 
 
+@cached_call(
+    "pubmed",
+    should_cache=lambda result: not result.startswith("Error"),
+    offline_result=lambda e: f"Error querying PubMed: {e}",
+)
 def query_pubmed(query: str, max_papers: int = 10, max_retries: int = 3) -> str:
     """Query PubMed for papers based on the provided search query.
 
@@ -342,7 +355,7 @@ def extract_url_content(url: str) -> str:
         Text content of the webpage
 
     """
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = http_get(url, headers={"User-Agent": "Mozilla/5.0"})
 
     # Check if the response is in text format
     if "text/plain" in response.headers.get("Content-Type", "") or "application/json" in response.headers.get(
@@ -386,7 +399,7 @@ def extract_pdf_content(url: str) -> str:
         # Check if the URL ends with .pdf
         if not url.lower().endswith(".pdf"):
             # If not, try to find a PDF link on the page
-            response = requests.get(url, timeout=30)
+            response = http_get(url, timeout=30)
             if response.status_code == 200:
                 # Look for PDF links in the HTML content
                 pdf_links = re.findall(r'href=[\'"]([^\'"]+\.pdf)[\'"]', response.text)
@@ -402,7 +415,7 @@ def extract_pdf_content(url: str) -> str:
                     return f"No PDF file found at {url}. Please provide a direct link to a PDF file."
 
         # Download the PDF
-        response = requests.get(url, timeout=30)
+        response = http_get(url, timeout=30)
 
         # Check if we actually got a PDF file (by checking content type or magic bytes)
         content_type = response.headers.get("Content-Type", "").lower()
@@ -0,0 +1,300 @@
+"""Process-wide pool of resident models for the heavyweight ML tools.
+
+Tools such as ``query_chatnt`` used to load their model on every call, so loading dominated
+every agent step. ``ModelPool`` keeps loaded models between calls:
+
+- models are loaded lazily on first ``acquire`` (by a loader registered under the model's name)
+  and each name is loaded by one thread while others wait for it;
+- ``acquire`` is a context manager that holds a reference, so a model in use is never evicted;
+- resident models are kept within a memory budget; when it is exceeded, the least recently used
+  idle models are evicted (closed if they have ``close()``, e.g. a resident worker process);
+- ``preload`` loads models ahead of the first call, e.g. from ``BIOMNI_PRELOAD_MODELS`` when a
+  REPL worker starts;
+- models that depend on a device are named ``name/device`` (``chatnt/0`` is ChatNT on GPU 0);
+  a bare name is the default device, so ``chatnt`` and ``chatnt/-1`` are the same model;
+- ``get_stats`` reports loads, hits, evictions, load time and resident bytes per model, for
+  sizing worker memory.
+
+Sizes of torch models (or objects wrapping one, like ``transformers`` pipelines) are the bytes of
+their parameters and buffers; objects may instead report a ``memory_bytes`` attribute. Sizes are
+re-measured when a model is released. The budget defaults to half of physical memory and can be
+set with ``BIOMNI_MODEL_POOL_MB``.
+"""
+
+import gc
+import importlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Loaders of the models that can be preloaded by name, resolved lazily as "module:function"
+BUILTIN_LOADERS = {
+    "chatnt": "biomni.tool.systems_biology:load_chatnt",
+    "panhumanpy": "biomni.tool.genomics:start_panhumanpy_worker",
+}
+
+# Default device of the builtin models that are loaded per device, which a bare name refers to
+DEFAULT_DEVICES = {
+    "chatnt": -1,
+}
+
+
+def default_memory_budget() -> int | None:
+    """``BIOMNI_MODEL_POOL_MB`` in bytes, else half of physical memory (None if unknown)."""
+    configured = os.getenv("BIOMNI_MODEL_POOL_MB")
+    if configured:
+        return int(float(configured) * 1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def estimate_size(model) -> int:
+    """Approximate resident bytes of a loaded model."""
+    reported = getattr(model, "memory_bytes", None)
+    if reported is not None:
+        return int(reported)
+    module = getattr(model, "model", model)
+    if hasattr(module, "parameters") and hasattr(module, "buffers"):
+        try:
+            tensors = [*module.parameters(), *module.buffers()]
+            return sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            return 0
+    return 0
+
+
+class _Entry:
+    def __init__(self, loader, size_bytes):
+        self.loader = loader
+        self.fixed_size = size_bytes
+        self.model = None
+        self.size = 0
+        self.refs = 0
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self.last_used = 0.0
+        self.load_lock = threading.Lock()
+
+
+class ModelPool:
+    """Lazily loaded, reference-counted models kept within a memory budget.
+
+    Args:
+        memory_budget_bytes: Resident bytes above which idle models are evicted (LRU first);
+            None disables eviction
+
+    """
+
+    def __init__(self, memory_budget_bytes: int | None = None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "hits": 0, "evictions": 0, "load_seconds": 0.0, "over_budget": 0}
+
+    def register(self, name: str, loader, size_bytes: int | None = None):
+        """Register ``loader()`` as the way to load ``name``; a resident model is kept."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self._entries[name] = _Entry(loader, size_bytes)
+            else:
+                entry.loader, entry.fixed_size = loader, size_bytes
+
+    def _entry(self, name: str, loader=None) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                if loader is None:
+                    loader = _builtin_loader(name)
+                entry = self._entries[name] = _Entry(loader, None)
+            entry.refs += 1
+            return entry
+
+    def _measure(self, entry: _Entry) -> int:
+        return entry.fixed_size if entry.fixed_size is not None else estimate_size(entry.model)
+
+    @contextmanager
+    def acquire(self, name: str, loader=None):
+        """Yield the model ``name``, loading it first if needed.
+
+        Args:
+            name: Model name; include anything that changes the loaded object (e.g. the device)
+            loader: Zero-argument function that loads the model, if ``name`` is not registered
+                and not one of ``BUILTIN_LOADERS``
+
+        """
+        name = canonical_name(name)
+        entry = self._entry(name, loader)
+        try:
+            with entry.load_lock:
+                if entry.model is None:
+                    start = time.perf_counter()
+                    model = entry.loader()
+                    elapsed = time.perf_counter() - start
+                    with self._lock:
+                        entry.model = model
+                        entry.size = self._measure(entry)
+                        entry.loads += 1
+                        entry.load_seconds += elapsed
+                        self.stats["loads"] += 1
+                        self.stats["load_seconds"] += elapsed
+                else:
+                    with self._lock:
+                        entry.hits += 1
+                        self.stats["hits"] += 1
+            with self._lock:
+                entry.last_used = time.time()
+                self._entries.move_to_end(name)
+            evicted = self._enforce_budget()
+            _release_memory(evicted)
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                if entry.model is not None:
+                    entry.size = self._measure(entry)
+            _release_memory(self._enforce_budget())
+
+    def _enforce_budget(self) -> list:
+        """Detach the least recently used idle models until the pool fits the budget."""
+        evicted = []
+        if self.memory_budget_bytes is None:
+            return evicted
+        with self._lock:
+            total = sum(entry.size for entry in self._entries.values() if entry.model is not None)
+            for entry in list(self._entries.values()):
+                if total <= self.memory_budget_bytes:
+                    break
+                if entry.model is None or entry.refs > 0 or entry.load_lock.locked():
+                    continue
+                evicted.append(entry.model)
+                total -= entry.size
+                entry.model, entry.size = None, 0
+                entry.evictions += 1
+                self.stats["evictions"] += 1
+            if total > self.memory_budget_bytes:
+                self.stats["over_budget"] += 1
+        return evicted
+
+    def get(self, name: str, loader=None):
+        """The model ``name`` without holding a reference (it may be evicted later)."""
+        with self.acquire(name, loader) as model:
+            return model
+
+    def preload(self, names) -> list[str]:
+        """Load each of ``names`` (a list or comma-separated string); returns the loaded names."""
+        if isinstance(names, str):
+            names = names.split(",")
+        loaded = []
+        for name in (name.strip() for name in names):
+            if name:
+                self.get(name)
+                loaded.append(canonical_name(name))
+        return loaded
+
+    def evict(self, name: str) -> bool:
+        """Unload an idle model now; returns False if it is not resident or still in use."""
+        name = canonical_name(name)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.model is None or entry.refs > 0:
+                return False
+            model = entry.model
+            entry.model, entry.size = None, 0
+            entry.evictions += 1
+            self.stats["evictions"] += 1
+        _release_memory([model])
+        return True
+
+    def clear(self):
+        """Unload every idle model."""
+        for name in list(self._entries):
+            self.evict(name)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            models = {
+                name: {
+                    "resident": entry.model is not None,
+                    "size_bytes": entry.size,
+                    "refs": entry.refs,
+                    "loads": entry.loads,
+                    "hits": entry.hits,
+                    "evictions": entry.evictions,
+                    "load_seconds": round(entry.load_seconds, 3),
+                }
+                for name, entry in self._entries.items()
+            }
+            resident = sum(model["size_bytes"] for model in models.values())
+        return {
+            **self.stats,
+            "load_seconds": round(self.stats["load_seconds"], 3),
+            "resident_bytes": resident,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "models": models,
+        }
+
+
+def canonical_name(name: str) -> str:
+    """The pool key of ``name``: builtin per-device models get their default device spelled out."""
+    if name in DEFAULT_DEVICES:
+        return f"{name}/{DEFAULT_DEVICES[name]}"
+    return name
+
+
+def _builtin_loader(name: str):
+    base = name.split("/", 1)[0]
+    if base not in BUILTIN_LOADERS:
+        raise KeyError(f"No loader registered for model '{name}'")
+    module_name, function_name = BUILTIN_LOADERS[base].split(":")
+    loader = getattr(importlib.import_module(module_name), function_name)
+    # "chatnt/0" loads ChatNT on device 0
+    return (lambda: loader(name.split("/", 1)[1])) if "/" in name else loader
+
+
+def _release_memory(models: list):
+    if not models:
+        return
+    for model in models:
+        close = getattr(model, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+    del models[:]
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """Return the process-wide model pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool(default_memory_budget())
+    return _pool
+
+
+def preload_from_env() -> list[str]:
+    """Preload the models named in ``BIOMNI_PRELOAD_MODELS`` (comma-separated), if any.
+
+    Per-device models are named ``name/device`` (e.g. ``chatnt/0``); a bare ``chatnt`` is the
+    CPU pipeline (``chatnt/-1``) that ``query_chatnt`` uses by default.
+    """
+    names = os.getenv("BIOMNI_PRELOAD_MODELS", "")
+    return get_model_pool().preload(names) if names.strip() else []
@@ -5,12 +5,18 @@ from collections import namedtuple
 from typing import Any
 
 import pandas as pd
-import requests
 from Bio import Entrez, Restriction, SeqIO
 from Bio.Seq import Seq
 from Bio.SeqUtils import MeltingTemp as mt
 from bs4 import BeautifulSoup
 
+from biomni.http_client import http_get, ncbi_api_key
+from biomni.tool.fuzzy_match import get_matcher
+
+# Entrez throttles itself to NCBI's limit: 3 requests/s, or 10 requests/s with an API key
+if ncbi_api_key():
+    Entrez.api_key = ncbi_api_key()
+
 
 def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False):
     """Find all Open Reading Frames (ORFs) in a DNA sequence using Biopython.
@@ -348,7 +354,7 @@ def get_plasmid_sequence(identifier: str, is_addgene: bool = None) -> dict[str,
         ADDGENE_PLASMID_SEQUENCES_PATH = "/{plasmid_id}/sequences/"
 
         url = f"{ADDGENE_BASE_URL}{ADDGENE_PLASMID_SEQUENCES_PATH.format(plasmid_id=plasmid_id)}"
-        response = requests.get(url)
+        response = http_get(url)
 
         if response.status_code != 200:
             print(f"Failed to retrieve Addgene plasmid {plasmid_id}")
@@ -419,13 +425,17 @@ def get_plasmid_sequence(identifier: str, is_addgene: bool = None) -> dict[str,
         return _get_sequence_from_ncbi(identifier)
 
 
-def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
-    """Align short sequences (primers) to a longer sequence, allowing for one mismatch.
+def align_sequences(
+    long_seq: str, short_seqs: str | list[str], max_mismatches: int = 1, circular: bool = False
+) -> list[dict]:
+    """Align short sequences (primers) to a longer sequence, allowing for one mismatch by default.
     Checks both forward and reverse complement strands.
 
     Args:
         long_seq (str): Target DNA sequence
         short_seqs (Union[str, List[str]]): Single primer or list of primers
+        max_mismatches (int): Maximum number of mismatching bases per alignment (default: 1)
+        circular (bool): Also report alignments spanning the end of a circular target (default: False)
 
     Returns:
         List[Dict]: List of alignment results for each short sequence, including:
@@ -438,43 +448,10 @@ def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
                   for any mismatches
 
     """
-    # Standardize input
-    long_seq = long_seq.upper()
-    short_seqs = [short_seqs.upper()] if isinstance(short_seqs, str) else [seq.upper() for seq in short_seqs]
-
-    def reverse_complement(seq):
-        """Helper function to get reverse complement of a sequence."""
-        complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
-        return "".join(complement.get(base, base) for base in reversed(seq))
+    from biomni.tool.primer_search import search_primers
 
-    results = []
-
-    for short_seq in short_seqs:
-        alignments = []
-        seq_len = len(short_seq)
-
-        # Check both forward and reverse complement orientations
-        sequences_to_check = [
-            (short_seq, "+"),  # Forward strand
-            (reverse_complement(short_seq), "-"),  # Reverse complement
-        ]
-
-        for seq_to_align, strand in sequences_to_check:
-            # Check each possible position in the long sequence
-            for i in range(len(long_seq) - seq_len + 1):
-                window = long_seq[i : i + seq_len]
-                mismatches = []
-
-                # Compare sequences base by base
-                for j in range(seq_len):
-                    if window[j] != seq_to_align[j]:
-                        mismatches.append((j, seq_to_align[j], window[j]))
-
-                # If we have 0 or 1 mismatches, record the alignment
-                if len(mismatches) <= 1:
-                    alignments.append({"position": i, "strand": strand, "mismatches": mismatches})
-
-        results.append({"sequence": short_seq, "alignments": alignments})
+    # All primers and both strands are searched on the encoded target at once
+    results = search_primers(long_seq, short_seqs, max_mismatches=max_mismatches, circular=circular)[0]
 
     return {
         "explanation": (
@@ -507,8 +484,8 @@ def pcr_simple(sequence: str, forward_primer: str, reverse_primer: str, circular
 
     """
     # First check if primers are valid using existing function
-    fwd_result = align_sequences(sequence, forward_primer)["sequences"][0]["alignments"]
-    rev_result = align_sequences(sequence, str(Seq(reverse_primer).reverse_complement()))["sequences"][0]["alignments"]
+    alignments = align_sequences(sequence, [forward_primer, str(Seq(reverse_primer).reverse_complement())])
+    fwd_result, rev_result = (result["alignments"] for result in alignments["sequences"])
 
     if not fwd_result or not rev_result:
         return {
@@ -922,11 +899,18 @@ def design_knockout_sgrna(
         gene_df = df[df["Target Gene Symbol"].str.upper().str.contains(gene_name)]
 
     if gene_df.empty:
+        # Offer close gene symbols (e.g. "EGRF" -> "EGFR") from a matcher built once per library
+        symbols = df["Target Gene Symbol"].dropna().astype(str).str.upper().unique()
+        gene_matcher = get_matcher(symbols, key=("sgrna_gene_symbols", library_path, os.path.getmtime(library_path)))
         return {
-            "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
+            "explanation": (
+                "Output contains target gene name, species, list of sgRNA sequences (empty because the gene "
+                "is not in the library) and similar gene symbols that are"
+            ),
             "gene_name": gene_name,
             "species": species,
             "guides": [],
+            "suggestions": gene_matcher.get_close_matches(gene_name, n=3, cutoff=0.6),
         }
 
     # Sort by combined rank (default priority)
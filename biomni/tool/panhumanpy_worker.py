@@ -0,0 +1,124 @@
+"""Resident panhumanpy annotation worker, run as a script by the ``panhumanpy_env`` interpreter.
+
+``annotate_celltype_with_panhumanpy`` used to write a one-off script and start it with ``conda run``
+for every call, paying the interpreter start, the TensorFlow/panhumanpy imports and the conda
+environment check each time. This worker is started once (see ``genomics.start_panhumanpy_worker``)
+and kept in the model pool. It reads one JSON request per line on stdin and writes one JSON reply
+per line, ``{"log": [...]}`` or ``{"error": "..."}``. Anything the libraries print goes to stderr.
+
+This file must not import biomni: the panhumanpy environment does not have it installed.
+"""
+
+import json
+import os
+import sys
+
+
+def annotate(adata_path, feature_names_col=None, refine=True, umap=True, output_dir="./output"):
+    import numpy as np
+    import scanpy as sc
+
+    try:
+        import panhumanpy as ph
+    except ImportError as e:
+        return {"error": str(e)}
+
+    log = []
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        log.append("# Performing cell type annotation with Panhuman Azimuth")
+        log.append(f"Loading object from: {adata_path}")
+        adata = sc.read_h5ad(adata_path)
+        log.append(f"✓ Successfully loaded object with {adata.n_obs} cells and {adata.n_vars} genes")
+        if feature_names_col is None:
+            log.append("Using gene names from adata.var.index")
+        else:
+            log.append(f"Using gene names from column: {feature_names_col}")
+            if feature_names_col not in adata.var.columns:
+                log.append(f"⚠ Warning: Column '{feature_names_col}' not found in adata.var")
+                log.append(f"Available columns: {list(adata.var.columns)}")
+                log.append("Falling back to index")
+                feature_names_col = None
+        if feature_names_col is None:
+            azimuth = ph.AzimuthNN(adata)
+        else:
+            azimuth = ph.AzimuthNN(adata, feature_names_col=feature_names_col)
+        cell_metadata = azimuth.cells_meta
+        log.append("✓ Successfully annotated all cells")
+        if umap:
+            log.append("## Generating ANN embeddings")
+            try:
+                embeddings = azimuth.azimuth_embed()
+            except Exception as e:
+                log.append(f"✗ Error generating embeddings: {str(e)}")
+                return {"log": log}
+            log.append("## Calculating UMAP")
+            try:
+                azimuth.azimuth_umap()
+                log.append("✓ Generated UMAP of ANN embeddings")
+            except Exception as e:
+                log.append(f"✗ Error generating UMAP: {str(e)}")
+                return {"log": log}
+        else:
+            log.append("## Skipping embeddings and UMAP generation")
+            embeddings = None
+            umap = None
+        if refine:
+            log.append("## Performing label refinement")
+            try:
+                azimuth.azimuth_refine()
+                cell_metadata = azimuth.cells_meta
+                refined_columns = [col for col in cell_metadata.columns if col.startswith("azimuth_")]
+                log.append(f"✓ Applied label refinement, results are in columns: {refined_columns}")
+            except Exception as e:
+                log.append(f"✗ Error during label refinement: {str(e)}")
+        log.append("## Saving results")
+        try:
+            metadata_file = f"{output_dir}/annotated_cell_metadata.csv"
+            cell_metadata.to_csv(metadata_file)
+            log.append(f"✓ Saved cell metadata to: {metadata_file}")
+            if umap and embeddings is not None:
+                embeddings_file = f"{output_dir}/ann_embeddings.npy"
+                np.save(embeddings_file, embeddings)
+                log.append(f"✓ Saved embeddings to: {embeddings_file}")
+                umap_file = f"{output_dir}/ann_umap.npy"
+                np.save(umap_file, umap)
+                log.append(f"✓ Saved UMAP to: {umap_file}")
+            else:
+                log.append("Skipped saving embeddings and UMAP (umap=False)")
+            annotated_save_path = f"{output_dir}/annotated_obj.h5ad"
+            azimuth.pack_adata(save_path=annotated_save_path)
+            log.append(f"✓ Saved annotated object to: {annotated_save_path}")
+        except Exception as e:
+            log.append(f"✗ Error saving results: {str(e)}")
+            return {"log": log}
+        log.append(f"- All results saved to: {output_dir}")
+        return {"log": log}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def main():
+    replies = sys.stdout
+    # Library output must not interleave with the replies
+    sys.stdout = sys.stderr
+    try:
+        # Pay the heavy imports before the first request
+        import panhumanpy
+    except ImportError:
+        pass
+    replies.write(json.dumps({"ready": True}) + "\n")
+    replies.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            reply = annotate(**json.loads(line))
+        except Exception as e:
+            reply = {"error": str(e)}
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
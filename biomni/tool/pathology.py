@@ -349,54 +349,13 @@ def analyze_atp_luminescence_assay(
     return "\n".join(log)
 
 
-def analyze_thrombus_histology(image_path, output_dir="./output"):
-    """Analyze histological images of thrombus samples stained with H&E to identify and quantify
-    different thrombus components (fresh, cellular lysis, endothelialization, fibroblastic reaction).
-
-    Parameters
-    ----------
-    image_path : str
-        Path to the histological image of thrombus sample stained with H&E
-    output_dir : str, optional
-        Directory to save output files (default: "./output")
-
-    Returns
-    -------
-    str
-        Research log summarizing the analysis steps and results
-
-    """
-    import os
-    from datetime import datetime
-
-    import cv2
-    import numpy as np
+def _thrombus_masks(rgb_image):
+    """Fresh thrombus, cellular lysis, endothelialization and fibroblastic reaction masks of an
+    RGB image."""
     from skimage import color
 
-    # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    # Initialize research log
-    log = f"# Thrombus Component Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    log += f"Analyzing image: {image_path}\n\n"
-
-    # Step 1: Load and preprocess the image
-    log += "## Step 1: Image Loading and Preprocessing\n"
-    original_image = cv2.imread(image_path)
-    if original_image is None:
-        return f"Error: Could not load image from {image_path}"
-
-    # Convert to RGB (from BGR)
-    rgb_image = cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB)
-    log += f"- Loaded image with dimensions: {rgb_image.shape[1]}x{rgb_image.shape[0]} pixels\n"
-
     # Convert to LAB color space for better color segmentation
     lab_image = color.rgb2lab(rgb_image)
-    log += "- Converted image to LAB color space for improved color-based segmentation\n\n"
-
-    # Step 2: Segment thrombus components based on color characteristics
-    log += "## Step 2: Thrombus Component Segmentation\n"
 
     # Create masks for different components based on color thresholds
     # These thresholds are approximate and may need adjustment for specific staining protocols
@@ -431,20 +390,125 @@ def analyze_thrombus_histology(image_path, output_dir="./output"):
         & (lab_image[:, :, 2] > 0)  # Less blue
     )
 
+    return fresh_mask, lysis_mask, endothel_mask, fibro_mask
+
+
+def _thrombus_visualization(masks, shape):
+    import numpy as np
+
+    visualization = np.zeros((*shape[:2], 3), dtype=np.uint8)
+
+    # Assign colors to different components
+    fresh_mask, lysis_mask, endothel_mask, fibro_mask = masks
+    visualization[fresh_mask] = [255, 0, 0]  # Red for fresh thrombus
+    visualization[lysis_mask] = [0, 255, 0]  # Green for cellular lysis
+    visualization[endothel_mask] = [0, 0, 255]  # Blue for endothelialization
+    visualization[fibro_mask] = [255, 255, 0]  # Yellow for fibroblastic reaction
+    return visualization
+
+
+def _thrombus_tile(tile, image, visualization):
+    """Component pixel counts of one tile; its visualization is written to ``visualization``."""
+    import numpy as np
+
+    rgb_image = image[tile.core]
+    if rgb_image.ndim == 2:
+        rgb_image = np.repeat(rgb_image[..., None], 3, axis=-1)
+    rgb_image = rgb_image[..., :3]
+    masks = _thrombus_masks(rgb_image)
+    visualization[tile.core] = _thrombus_visualization(masks, rgb_image.shape)
+    return np.array([mask.sum() for mask in masks], dtype=np.int64)
+
+
+def analyze_thrombus_histology(image_path, output_dir="./output", tiled=None, n_workers=None):
+    """Analyze histological images of thrombus samples stained with H&E to identify and quantify
+    different thrombus components (fresh, cellular lysis, endothelialization, fibroblastic reaction).
+
+    Parameters
+    ----------
+    image_path : str
+        Path to the histological image of thrombus sample stained with H&E
+    output_dir : str, optional
+        Directory to save output files (default: "./output")
+    tiled : bool, optional
+        Process the image tile by tile within ``BIOMNI_TILE_MEMORY_MB`` (the visualization is
+        then written as a TIFF). None (default) does so for images larger than
+        ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
+
+    Returns
+    -------
+    str
+        Research log summarizing the analysis steps and results
+
+    """
+    import os
+    from datetime import datetime
+
+    import cv2
+    import numpy as np
+
+    from biomni.tool.tiled_image import Workspace, create_image, map_tiles, plan_tiles, use_tiles
+
+    # Create output directory if it doesn't exist
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Initialize research log
+    log = f"# Thrombus Component Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    log += f"Analyzing image: {image_path}\n\n"
+
+    # Step 1: Load and preprocess the image
+    log += "## Step 1: Image Loading and Preprocessing\n"
+    if use_tiles(image_path, tiled):
+        with Workspace() as workspace:
+            try:
+                image = workspace.open(image_path)
+            except (OSError, ValueError):
+                return f"Error: Could not load image from {image_path}"
+            # LAB conversion and masks take about 32 bytes per channel value
+            tiles = plan_tiles(image.shape, 32, n_workers=n_workers)
+            log += f"- Loaded image with dimensions: {image.shape[1]}x{image.shape[0]} pixels\n"
+            log += f"- Processing the image in {len(tiles)} tiles\n"
+            output_filename = os.path.join(
+                output_dir, f"thrombus_components_{os.path.splitext(os.path.basename(image_path))[0]}.tif"
+            )
+            visualization = create_image(output_filename, (*image.shape[:2], 3), np.uint8)
+            counts = sum(map_tiles(_thrombus_tile, tiles, image, visualization, n_workers=n_workers))
+            visualization.flush()
+    else:
+        original_image = cv2.imread(image_path)
+        if original_image is None:
+            return f"Error: Could not load image from {image_path}"
+
+        # Convert to RGB (from BGR)
+        rgb_image = cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB)
+        log += f"- Loaded image with dimensions: {rgb_image.shape[1]}x{rgb_image.shape[0]} pixels\n"
+        masks = _thrombus_masks(rgb_image)
+        counts = np.array([mask.sum() for mask in masks])
+        output_filename = os.path.join(output_dir, f"thrombus_components_{os.path.basename(image_path)}")
+        visualization = _thrombus_visualization(masks, rgb_image.shape)
+        cv2.imwrite(output_filename, cv2.cvtColor(visualization, cv2.COLOR_RGB2BGR))
+    log += "- Converted image to LAB color space for improved color-based segmentation\n\n"
+
+    # Step 2: Segment thrombus components based on color characteristics
+    log += "## Step 2: Thrombus Component Segmentation\n"
     log += "- Created masks for each thrombus component based on color characteristics\n"
 
     # Step 3: Quantify the components
     log += "\n## Step 3: Component Quantification\n"
 
     # Calculate total pixel count (excluding background)
-    total_pixels = fresh_mask.sum() + lysis_mask.sum() + endothel_mask.sum() + fibro_mask.sum()
+    fresh_count, lysis_count, endothel_count, fibro_count = counts
+    total_pixels = counts.sum()
 
     # Calculate percentages
     if total_pixels > 0:
-        fresh_percent = (fresh_mask.sum() / total_pixels) * 100
-        lysis_percent = (lysis_mask.sum() / total_pixels) * 100
-        endothel_percent = (endothel_mask.sum() / total_pixels) * 100
-        fibro_percent = (fibro_mask.sum() / total_pixels) * 100
+        fresh_percent = (fresh_count / total_pixels) * 100
+        lysis_percent = (lysis_count / total_pixels) * 100
+        endothel_percent = (endothel_count / total_pixels) * 100
+        fibro_percent = (fibro_count / total_pixels) * 100
     else:
         fresh_percent = lysis_percent = endothel_percent = fibro_percent = 0
 
@@ -455,20 +519,6 @@ def analyze_thrombus_histology(image_path, output_dir="./output"):
 
     # Step 4: Visualize the results
     log += "## Step 4: Visualization\n"
-
-    # Create a visualization image
-    visualization = np.zeros_like(rgb_image)
-
-    # Assign colors to different components
-    visualization[fresh_mask] = [255, 0, 0]  # Red for fresh thrombus
-    visualization[lysis_mask] = [0, 255, 0]  # Green for cellular lysis
-    visualization[endothel_mask] = [0, 0, 255]  # Blue for endothelialization
-    visualization[fibro_mask] = [255, 255, 0]  # Yellow for fibroblastic reaction
-
-    # Save the visualization
-    output_filename = os.path.join(output_dir, f"thrombus_components_{os.path.basename(image_path)}")
-    cv2.imwrite(output_filename, cv2.cvtColor(visualization, cv2.COLOR_RGB2BGR))
-
     log += f"- Visualization saved as: {output_filename}\n"
     log += "- Color legend:\n"
     log += "  - Red: Fresh thrombus\n"
@@ -742,8 +792,77 @@ Output Files:
     return log
 
 
+def _expand_nuclei_tile(tile, binary_nuclei, labeled_nuclei, cell_masks):
+    """Watershed expansion of the nuclei in one tile region; the core is written to ``cell_masks``."""
+    from scipy import ndimage
+    from skimage import morphology, segmentation
+
+    binary = binary_nuclei[tile.region]
+    expanded = segmentation.watershed(
+        -ndimage.distance_transform_edt(~binary),
+        labeled_nuclei[tile.region],
+        mask=morphology.binary_dilation(binary, morphology.disk(10)),
+    )
+    cell_masks[tile.core] = expanded[tile.inner]
+
+
+def _segment_multiplexed_tiled(image, nuclear_channel_index, workspace, mask_file, log, n_workers=None):
+    """Nuclear segmentation and cell expansion of a channels-last image, tile by tile.
+
+    Thresholding, small-object removal, closing and labelling give the same nuclei as on the
+    whole image, and the watershed of each tile sees a 32-pixel halo. Cells can still differ from
+    the whole-image ones where a pixel is equally far from two nuclei: the watershed breaks such
+    ties in queue order, which depends on the region it floods. The cell mask is written to
+    ``mask_file``.
+
+    Returns:
+        The cell mask, the number of labels in it and the tiles
+
+    """
+    import functools
+
+    import numpy as np
+    from skimage import morphology
+
+    from biomni.tool import tiled_image
+
+    nuclear = tiled_image.channel(nuclear_channel_index)
+    # Channel values plus the distance map, dilation, labels and watershed queue of each pixel
+    tiles = tiled_image.plan_tiles(
+        image.shape[:2], 96 + image.shape[-1] * image.dtype.itemsize, halo=32, n_workers=n_workers
+    )
+    log.append(f"Processing the image in {len(tiles)} tiles")
+    shape = image.shape[:2]
+
+    # Segment nuclei
+    log.append("Performing nuclear segmentation")
+    # Apply threshold to nuclear channel
+    threshold = tiled_image.tiled_threshold_otsu(image, tiles, nuclear, n_workers=n_workers)
+    binary_nuclei = workspace.create("nuclei", shape, bool)
+    tiled_image.threshold_tiled(image, binary_nuclei, tiles, threshold, transform=nuclear, n_workers=n_workers)
+
+    # Clean up binary image
+    cleaned = workspace.create("cleaned", shape, bool)
+    tiled_image.remove_small_objects_tiled(binary_nuclei, cleaned, tiles, 50, n_workers=n_workers)
+    closing = functools.partial(morphology.binary_closing, footprint=morphology.disk(2))
+    tiled_image.apply_tiled(closing, cleaned, binary_nuclei, [t.with_halo(4, shape) for t in tiles], n_workers)
+
+    # Label nuclei
+    nuclei = tiled_image.label_tiled(binary_nuclei, tiles, n_workers=n_workers)
+    labeled_nuclei = workspace.create("labels", shape, np.int64)
+    tiled_image.write_labels(nuclei, binary_nuclei, labeled_nuclei, n_workers=n_workers)
+    log.append(f"Identified {nuclei.count} potential nuclei")
+
+    # Create cell masks by expanding nuclei
+    log.append("Expanding nuclear masks to approximate cell boundaries")
+    cell_masks = tiled_image.create_image(mask_file, shape, np.uint16 if nuclei.count < 2**16 else np.uint32)
+    tiled_image.run_tiles(_expand_nuclei_tile, tiles, binary_nuclei, labeled_nuclei, cell_masks, n_workers=n_workers)
+    cell_masks.flush()
+    return cell_masks, nuclei.count, tiles
+
+
 def segment_and_quantify_cells_in_multiplexed_images(
-    image_path, markers_list, nuclear_channel_index=0, output_dir="./output"
+    image_path, markers_list, nuclear_channel_index=0, output_dir="./output", tiled=None, n_workers=None
 ):
     """Segment cells and quantify protein expression levels from multichannel tissue images.
 
@@ -757,6 +876,12 @@ def segment_and_quantify_cells_in_multiplexed_images(
         Index of the nuclear marker channel (default: 0, typically DAPI)
     output_dir : str, optional
         Directory to save output files (default: "./output")
+    tiled : bool, optional
+        Process the image tile by tile within ``BIOMNI_TILE_MEMORY_MB``; cells may then differ
+        slightly at tile borders. None (default) does so for images larger than
+        ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
 
     Returns
     -------
@@ -772,6 +897,8 @@ def segment_and_quantify_cells_in_multiplexed_images(
     from scipy import ndimage  # Import ndimage for distance transform
     from skimage import filters, io, measure, morphology, segmentation
 
+    from biomni.tool.tiled_image import ChannelsLast, Workspace, region_sums_tiled, tile_grid, use_tiles
+
     # Initialize research log
     log = []
     log.append(
@@ -783,117 +910,176 @@ def segment_and_quantify_cells_in_multiplexed_images(
         os.makedirs(output_dir)
         log.append(f"Created output directory: {output_dir}")
 
-    # Load the multichannel image
+    tiled = use_tiles(image_path, tiled)
+    workspace = Workspace() if tiled else None
     try:
-        log.append(f"Loading multichannel image from {image_path}")
-        image = io.imread(image_path)
-        log.append(f"Image loaded successfully. Shape: {image.shape}")
+        # Load the multichannel image
+        try:
+            log.append(f"Loading multichannel image from {image_path}")
+            image = workspace.open(image_path) if tiled else io.imread(image_path)
+            log.append(f"Image loaded successfully. Shape: {image.shape}")
 
-        # Validate image dimensions
-        if len(image.shape) < 3:
-            return (
-                "Error: Image should be multichannel with shape (channels, height, width) or (height, width, channels)"
-            )
+            # Validate image dimensions
+            if len(image.shape) < 3:
+                return "Error: Image should be multichannel with shape (channels, height, width) or (height, width, channels)"
 
-        # Determine image format
-        if image.shape[0] == len(markers_list):
-            # Format is (channels, height, width)
-            num_channels, height, width = image.shape
-            # Extract nuclear channel
-            nuclear_channel = image[nuclear_channel_index]
-        elif image.shape[-1] == len(markers_list):
-            # Format is (height, width, channels)
-            height, width, num_channels = image.shape
-            # Extract nuclear channel
-            nuclear_channel = image[:, :, nuclear_channel_index]
+            # Determine image format
+            if image.shape[0] == len(markers_list):
+                # Format is (channels, height, width)
+                num_channels, height, width = image.shape
+                image = ChannelsLast(image) if tiled else np.moveaxis(image, 0, -1)
+            elif image.shape[-1] == len(markers_list):
+                # Format is (height, width, channels)
+                height, width, num_channels = image.shape
+            else:
+                return f"Error: Number of channels in image ({image.shape}) doesn't match markers list length ({len(markers_list)})"
+
+            log.append(f"Processing image with {num_channels} channels, dimensions: {height}x{width}")
+
+        except Exception as e:
+            return f"Error loading image: {str(e)}"
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        mask_file = os.path.join(output_dir, f"cell_segmentation_mask_{timestamp}.tiff")
+        if tiled:
+            cell_masks, count, tiles = _segment_multiplexed_tiled(
+                image, nuclear_channel_index, workspace, mask_file, log, n_workers
+            )
         else:
-            return f"Error: Number of channels in image ({image.shape}) doesn't match markers list length ({len(markers_list)})"
+            nuclear_channel = image[:, :, nuclear_channel_index]
 
-        log.append(f"Processing image with {num_channels} channels, dimensions: {height}x{width}")
+            # Segment nuclei
+            log.append("Performing nuclear segmentation")
+            # Apply threshold to nuclear channel
+            threshold = filters.threshold_otsu(nuclear_channel)
+            binary_nuclei = nuclear_channel > threshold
+
+            # Clean up binary image
+            binary_nuclei = morphology.remove_small_objects(binary_nuclei, min_size=50)
+            binary_nuclei = morphology.binary_closing(binary_nuclei, morphology.disk(2))
+
+            # Label nuclei
+            labeled_nuclei = measure.label(binary_nuclei)
+            count = int(np.max(labeled_nuclei))
+            log.append(f"Identified {count} potential nuclei")
+
+            # Create cell masks by expanding nuclei
+            log.append("Expanding nuclear masks to approximate cell boundaries")
+            cell_masks = segmentation.watershed(
+                -ndimage.distance_transform_edt(~binary_nuclei),  # Use ndimage for distance transform
+                labeled_nuclei,
+                mask=morphology.binary_dilation(binary_nuclei, morphology.disk(10)),
+            )
+            tiles = tile_grid(cell_masks.shape, cell_masks.shape)
+
+        # Area, centroid and marker intensity sums of every label, in one pass over the image
+        sums = region_sums_tiled(cell_masks, tiles, count, image, n_workers=n_workers if tiled else 1)
+        labels = np.flatnonzero(sums["area"])
+        area = sums["area"][labels].astype(np.float64)
+        log.append(f"Segmented {len(labels)} cells")
+
+        # Create a dataframe to store cell features
+        log.append("Extracting features and quantifying marker intensities")
+        cell_df = pd.DataFrame(
+            {
+                "cell_id": np.arange(1, len(labels) + 1),
+                "centroid_y": sums["row"][labels] / area,
+                "centroid_x": sums["col"][labels] / area,
+                "area": area,
+            }
+        )
+        for channel_idx, marker_name in enumerate(markers_list):
+            # Mean intensity within each cell mask
+            cell_df[f"{marker_name}_mean_intensity"] = sums["intensity"][labels, channel_idx] / area
+
+        # Save results
+        results_file = os.path.join(output_dir, f"cell_features_{timestamp}.csv")
+        cell_df.to_csv(results_file, index=False)
+        log.append(f"Saved spatial feature table to {results_file}")
+
+        # Save segmentation mask for visualization
+        if not tiled:
+            io.imsave(mask_file, cell_masks.astype(np.uint16))
+        log.append(f"Saved cell segmentation mask to {mask_file}")
+    finally:
+        if workspace is not None:
+            workspace.close()
 
-    except Exception as e:
-        return f"Error loading image: {str(e)}"
+    # Summarize results
+    log.append(f"Analysis complete. Processed {num_channels} markers across {len(labels)} cells.")
+    log.append("Output files:")
+    log.append(f"  - Spatial feature table: {results_file}")
+    log.append(f"  - Cell segmentation mask: {mask_file}")
 
-    # Segment nuclei
-    log.append("Performing nuclear segmentation")
-    # Apply threshold to nuclear channel
-    threshold = filters.threshold_otsu(nuclear_channel)
-    binary_nuclei = nuclear_channel > threshold
+    return "\n".join(log)
 
-    # Clean up binary image
-    binary_nuclei = morphology.remove_small_objects(binary_nuclei, min_size=50)
-    binary_nuclei = morphology.binary_closing(binary_nuclei, morphology.disk(2))
 
-    # Label nuclei
-    labeled_nuclei = measure.label(binary_nuclei)
-    log.append(f"Identified {np.max(labeled_nuclei)} potential nuclei")
+def _bone_sums_tile(tile, image, binary_image):
+    """Sum of the intensities in bone and the bone voxel count of one slab."""
+    import numpy as np
 
-    # Create cell masks by expanding nuclei
-    log.append("Expanding nuclear masks to approximate cell boundaries")
-    cell_masks = segmentation.watershed(
-        -ndimage.distance_transform_edt(~binary_nuclei),  # Use ndimage for distance transform
-        labeled_nuclei,
-        mask=morphology.binary_dilation(binary_nuclei, morphology.disk(10)),
-    )
+    bone = binary_image[tile.core]
+    return np.array([image[tile.core][bone].sum(dtype=np.float64), bone.sum()])
 
-    # Get region properties for nuclei
-    regions = measure.regionprops(cell_masks)
-    log.append(f"Segmented {len(regions)} cells")
 
-    # Create a dataframe to store cell features
-    log.append("Extracting features and quantifying marker intensities")
-    cell_data = []
+def _bone_morphometry_tiled(image_data, threshold_value, workspace, log, n_workers=None):
+    """Median filtering, segmentation and morphometry sums of a 3D volume, in z-slabs.
 
-    for i, region in enumerate(regions):
-        cell_features = {
-            "cell_id": i + 1,
-            "centroid_y": region.centroid[0],
-            "centroid_x": region.centroid[1],
-            "area": region.area,
-        }
+    Every step gives the same result as on the whole volume: the median filter reads one slice
+    around each slab and distance maps widen their halo until they are exact.
 
-        # Extract intensity for each marker
-        for channel_idx, marker_name in enumerate(markers_list):
-            if image.shape[0] == len(markers_list):
-                # Format is (channels, height, width)
-                marker_image = image[channel_idx]
-            else:
-                # Format is (height, width, channels)
-                marker_image = image[:, :, channel_idx]
+    Returns:
+        Threshold, middle slice of the segmentation, BMD, bone volume, and the mean distance
+        inside and outside bone
 
-            # Create mask for current cell
-            cell_mask = cell_masks == region.label
+    """
+    import functools
 
-            # Calculate mean intensity within the cell mask
-            mean_intensity = np.mean(marker_image[cell_mask])
-            cell_features[f"{marker_name}_mean_intensity"] = mean_intensity
+    import numpy as np
+    from scipy import ndimage
 
-        cell_data.append(cell_features)
+    from biomni.tool import tiled_image
 
-    # Create dataframe
-    cell_df = pd.DataFrame(cell_data)
+    # Input, median-filtered copy, mask and the distance map of a slab
+    slabs = tiled_image.plan_tiles(image_data.shape, 2 * image_data.dtype.itemsize + 17, axes=1, n_workers=n_workers)
+    log.append(f"Processing the volume in {len(slabs)} slabs")
 
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results_file = os.path.join(output_dir, f"cell_features_{timestamp}.csv")
-    cell_df.to_csv(results_file, index=False)
-    log.append(f"Saved spatial feature table to {results_file}")
+    # Step 2: Preprocess the data
+    log.append("\n## 2. Preprocessing")
+    log.append("Applying median filter to reduce noise")
+    filtered_data = workspace.create("filtered", image_data.shape, image_data.dtype)
+    median = functools.partial(ndimage.median_filter, size=2)
+    tiled_image.apply_tiled(
+        median, image_data, filtered_data, [slab.with_halo(1, image_data.shape) for slab in slabs], n_workers
+    )
 
-    # Save segmentation mask for visualization
-    mask_file = os.path.join(output_dir, f"cell_segmentation_mask_{timestamp}.tiff")
-    io.imsave(mask_file, cell_masks.astype(np.uint16))
-    log.append(f"Saved cell segmentation mask to {mask_file}")
+    # Step 3: Segmentation of bone tissue
+    log.append("\n## 3. Bone Segmentation")
+    if threshold_value is None:
+        log.append("Calculating optimal threshold using Otsu's method")
+        threshold_value = tiled_image.tiled_threshold_otsu(filtered_data, slabs, n_workers=n_workers)
 
-    # Summarize results
-    log.append(f"Analysis complete. Processed {num_channels} markers across {len(regions)} cells.")
-    log.append("Output files:")
-    log.append(f"  - Spatial feature table: {results_file}")
-    log.append(f"  - Cell segmentation mask: {mask_file}")
+    log.append(f"Segmenting bone using threshold value: {threshold_value}")
+    binary_image = workspace.create("bone", image_data.shape, bool)
+    tiled_image.threshold_tiled(filtered_data, binary_image, slabs, threshold_value, n_workers=n_workers)
 
-    return "\n".join(log)
+    intensity_sum, bone_volume = sum(
+        tiled_image.map_tiles(_bone_sums_tile, slabs, image_data, binary_image, n_workers=n_workers)
+    )
+    bmd = intensity_sum / bone_volume if bone_volume else np.nan
+    thickness_sum, _ = tiled_image.distance_sum_tiled(binary_image, slabs, n_workers=n_workers)
+    separation_sum, background_volume = tiled_image.distance_sum_tiled(
+        binary_image, slabs, invert=True, n_workers=n_workers
+    )
+    bone_distance = thickness_sum / bone_volume if bone_volume else np.nan
+    background_distance = separation_sum / background_volume if background_volume else np.nan
+    middle_slice = binary_image[binary_image.shape[0] // 2]
+    return threshold_value, middle_slice, bmd, int(bone_volume), bone_distance, background_distance
 
 
-def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", threshold_value=None):
+def analyze_bone_microct_morphometry(
+    input_file_path, output_dir="./results", threshold_value=None, tiled=None, n_workers=None
+):
     """Analyze bone microarchitecture parameters from 3D micro-CT images.
 
     Performs quantitative analysis of bone microstructure to calculate bone mineral density (BMD),
@@ -908,6 +1094,11 @@ def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", th
         Directory to save output files, default is "./results"
     threshold_value : float, optional
         Threshold value for bone segmentation. If None, Otsu's method will be used
+    tiled : bool, optional
+        Process the volume in z-slabs within ``BIOMNI_TILE_MEMORY_MB``, with the same results.
+        None (default) does so for volumes larger than ``BIOMNI_TILED_IMAGE_MB`` once decoded
+    n_workers : int, optional
+        Worker processes for tiled processing (default: available cores)
 
     Returns
     -------
@@ -923,6 +1114,8 @@ def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", th
     from scipy import ndimage
     from skimage import filters, io
 
+    from biomni.tool.tiled_image import Workspace, use_tiles
+
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
@@ -935,46 +1128,62 @@ def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", th
 
     # Step 1: Load the micro-CT data
     log.append("\n## 1. Data Loading")
+    workspace = Workspace() if use_tiles(input_file_path, tiled) else None
     try:
         log.append(f"Loading 3D micro-CT data from {input_file_path}")
-        # Load the 3D image data
-        image_data = io.imread(input_file_path)
+        # Load the 3D image data (lazily for tiled processing; a 2D image is processed whole)
+        image_data = io.imread(input_file_path) if workspace is None else workspace.open(input_file_path)
         if image_data.ndim < 3:
             log.append("Warning: Input appears to be 2D. Converting to 3D.")
-            image_data = np.expand_dims(image_data, axis=0)
+            image_data = np.expand_dims(image_data[:], axis=0)
 
         log.append(f"Data loaded successfully. Dimensions: {image_data.shape}")
-        voxel_count = image_data.size
+        voxel_count = int(np.prod(image_data.shape))
         log.append(f"Total voxels: {voxel_count}")
     except Exception as e:
+        if workspace is not None:
+            workspace.close()
         error_msg = f"Error loading data: {str(e)}"
         log.append(error_msg)
         return "\n".join(log)
 
-    # Step 2: Preprocess the data
-    log.append("\n## 2. Preprocessing")
-    log.append("Applying median filter to reduce noise")
-    filtered_data = ndimage.median_filter(image_data, size=2)
-
-    # Step 3: Segmentation of bone tissue
-    log.append("\n## 3. Bone Segmentation")
-    if threshold_value is None:
-        log.append("Calculating optimal threshold using Otsu's method")
-        threshold_value = filters.threshold_otsu(filtered_data)
-
-    log.append(f"Segmenting bone using threshold value: {threshold_value}")
-    binary_image = filtered_data > threshold_value
+    if workspace is not None and isinstance(image_data, np.ndarray):
+        # A 2D image was read whole
+        workspace.close()
+        workspace = None
+    if workspace is not None:
+        with workspace:
+            threshold_value, segmentation_slice, bmd, bone_volume, bone_distance, background_distance = (
+                _bone_morphometry_tiled(image_data, threshold_value, workspace, log, n_workers)
+            )
+    else:
+        # Step 2: Preprocess the data
+        log.append("\n## 2. Preprocessing")
+        log.append("Applying median filter to reduce noise")
+        filtered_data = ndimage.median_filter(image_data, size=2)
+
+        # Step 3: Segmentation of bone tissue
+        log.append("\n## 3. Bone Segmentation")
+        if threshold_value is None:
+            log.append("Calculating optimal threshold using Otsu's method")
+            threshold_value = filters.threshold_otsu(filtered_data)
+
+        log.append(f"Segmenting bone using threshold value: {threshold_value}")
+        binary_image = filtered_data > threshold_value
+        segmentation_slice = binary_image[binary_image.shape[0] // 2]
+        bmd = np.mean(image_data[binary_image])
+        bone_volume = np.sum(binary_image)
+        bone_distance = np.mean(ndimage.distance_transform_edt(binary_image)[binary_image])
+        background_distance = np.mean(ndimage.distance_transform_edt(~binary_image)[~binary_image])
 
     # Step 4: Calculate bone morphometry parameters
     log.append("\n## 4. Morphometry Analysis")
 
     # 4.1 Calculate BMD (simplified as mean intensity in bone regions)
-    bmd = np.mean(image_data[binary_image])
     log.append(f"Bone Mineral Density (BMD): {bmd:.2f} arbitrary units")
 
     # 4.2 Calculate BV (bone volume)
-    bone_volume = np.sum(binary_image)
-    total_volume = binary_image.size
+    total_volume = voxel_count
     bv_tv_ratio = bone_volume / total_volume
     log.append(f"Bone Volume (BV): {bone_volume} voxels")
     log.append(f"BV/TV Ratio: {bv_tv_ratio:.4f}")
@@ -982,14 +1191,12 @@ def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", th
     # 4.3 Calculate trabecular thickness (Tb.Th)
     # Using distance transform method
     log.append("Calculating trabecular thickness (Tb.Th)")
-    distance_map = ndimage.distance_transform_edt(binary_image)
-    tb_th_mean = np.mean(distance_map[binary_image]) * 2  # Multiply by 2 for diameter
+    tb_th_mean = bone_distance * 2  # Multiply by 2 for diameter
     log.append(f"Trabecular Thickness (Tb.Th): {tb_th_mean:.2f} voxels")
 
     # 4.4 Calculate trabecular separation (Tb.S)
     log.append("Calculating trabecular separation (Tb.S)")
-    distance_map_inv = ndimage.distance_transform_edt(~binary_image)
-    tb_s_mean = np.mean(distance_map_inv[~binary_image])
+    tb_s_mean = background_distance
     log.append(f"Trabecular Separation (Tb.S): {tb_s_mean:.2f} voxels")
 
     # 4.5 Calculate trabecular number (Tb.N)
@@ -1002,9 +1209,8 @@ def analyze_bone_microct_morphometry(input_file_path, output_dir="./results", th
     log.append("\n## 5. Saving Results")
 
     # Save binary segmentation as a sample slice
-    middle_slice = binary_image.shape[0] // 2
     segmentation_file = os.path.join(output_dir, "bone_segmentation_slice.tif")
-    io.imsave(segmentation_file, binary_image[middle_slice].astype(np.uint8) * 255)
+    io.imsave(segmentation_file, segmentation_slice.astype(np.uint8) * 255)
     log.append(f"Sample segmentation slice saved to: {segmentation_file}")
 
     # Save numerical results as JSON
@@ -1,14 +1,14 @@
 import os
-import pickle
 import re
 import subprocess
 import sys
 from datetime import datetime
-from difflib import get_close_matches
 
 import numpy as np
 import pandas as pd
 
+from biomni.tool.fuzzy_match import get_matcher
+
 
 def run_diffdock_with_smiles(pdb_path, smiles_string, local_output_dir, gpu_device=0, use_gpu=True):
     try:
@@ -93,8 +93,18 @@ def run_diffdock_with_smiles(pdb_path, smiles_string, local_output_dir, gpu_devi
         return f"An error occurred: {e}"
 
 
-def docking_autodock_vina(smiles_list, receptor_pdb_file, box_center, box_size, ncpu=1):
-    from tdc import Oracle
+def docking_autodock_vina(
+    smiles_list,
+    receptor_pdb_file,
+    box_center,
+    box_size,
+    ncpu=1,
+    n_workers=None,
+    batch_size=None,
+    checkpoint_file=None,
+    top_k=10,
+):
+    from biomni.tool.virtual_screening import VinaScorer, VirtualScreen
 
     log = []
 
@@ -104,29 +114,33 @@ def docking_autodock_vina(smiles_list, receptor_pdb_file, box_center, box_size,
     log.append(f"Box Center: {box_center}")
     log.append(f"Box Size: {box_size}")
 
-    # Initialize the Oracle object
-    oracle = Oracle(
-        name="pyscreener",
-        receptor_pdb_file=receptor_pdb_file,
-        box_center=box_center,
-        box_size=box_size,
-        ncpu=ncpu,
+    # The oracle (and its prepared receptor) is built once per process and target
+    screen = VirtualScreen(
+        VinaScorer(receptor_pdb_file, box_center, box_size, ncpu=ncpu),
+        n_workers=n_workers,
+        batch_size=batch_size,
+        checkpoint_path=checkpoint_file,
+        top_k=top_k,
     )
-    log.append("Oracle initialized successfully.")
+    log.append(f"Oracle initialized successfully ({screen.n_workers} worker(s), batches of {screen.batch_size}).")
 
     # Log the list of SMILES strings
     log.append(f"\nStep 2: Processing SMILES strings: {smiles_list}")
 
     # Get the docking scores
-    docking_scores = oracle(smiles_list)
+    results_dict = screen.run(smiles_list)
+    docking_scores = list(results_dict.values())
     log.append(f"Docking scores calculated: {docking_scores}")
 
-    # Create a dictionary mapping SMILES to their docking scores
-    results_dict = dict(zip(smiles_list, docking_scores, strict=False))
-
     # Log the result mapping
     log.append("\nStep 3: Mapping SMILES to docking scores:")
     log.append(f"Results: {results_dict}")
+    if checkpoint_file:
+        log.append(f"Scores checkpointed to {checkpoint_file}")
+
+    log.append(f"\nStep 4: Top {top_k} hits (lowest docking score first):")
+    for rank, (smiles, score) in enumerate(screen.top_hits(), 1):
+        log.append(f"{rank}. {smiles}: {score:.2f}")
 
     # Convert the log to a string and return it
     research_log = "\n".join(log)
@@ -180,6 +194,15 @@ def run_autosite(pdb_file, output_dir, spacing=1.0):
     return research_log
 
 
+def _format_txgnn_summary(matched_disease, top_k_drugs, k):
+    summary = f"TxGNN Drug Repurposing Predictions for '{matched_disease}':\n"
+    summary += f"Top {k} predicted drugs and their corresponding prediction scores (post-sigmoid transformation):\n"
+
+    for i, (_drug_id, drug_name, score) in enumerate(top_k_drugs, 1):
+        summary += f"{i}. {drug_name} - Prediction Score: {score:.4f}\n"
+    return summary
+
+
 # Function to get TxGNN predictions and return a summarized string output
 def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name, data_lake_path, k=5):
     """This function computes TxGNN model predictions for drug repurposing. It takes in the paths to the data,
@@ -194,182 +217,159 @@ def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name, data_lake_p
     - str: A summary of the steps and the top K drug predictions with their scores.
 
     """
+    from biomni.tool.txgnn_index import get_txgnn_index
 
-    # Sigmoid function to convert raw prediction scores
-    def sigmoid(x):
-        return 1 / (1 + np.exp(-x))
-
-    # Step 1: Load the mappings and prediction data from the provided paths
-    name_mapping_path = data_lake_path + "/txgnn_name_mapping.pkl"
-    result_path = data_lake_path + "/txgnn_prediction.pkl"
-
-    with open(name_mapping_path, "rb") as f:
-        mapping = pickle.load(f)
-
-    with open(result_path, "rb") as f:
-        result = pickle.load(f)
+    # Step 1: Load the disease x drug score matrix (converted once, memory-mapped and shared per process)
+    index = get_txgnn_index(data_lake_path)
 
     # Step 2: Fuzzy match the disease name to find the closest match
-    possible_diseases = result.keys()
-    matched_disease = get_close_matches(disease_name, possible_diseases, n=1, cutoff=0.6)
+    matched_disease = index.match_disease(disease_name, cutoff=0.6)
 
     if not matched_disease:
         return f"Error: No matching disease found for '{disease_name}'. Please try a different name."
 
-    matched_disease = matched_disease[0]
+    # Step 3: Select the top k drugs with a partial sort and apply the sigmoid to their raw scores
+    top_k_drugs = index.top_k(matched_disease, k)
 
-    # Step 3: Retrieve the prediction scores for the matched disease
-    disease_predictions = result[matched_disease]
+    # Step 4: Create a human and LLM-friendly summary string
+    summary = _format_txgnn_summary(matched_disease, top_k_drugs, k)
 
-    # Step 4: Apply the sigmoid function to the raw prediction scores
-    sigmoid_predictions = {drug_id: sigmoid(score) for drug_id, score in disease_predictions.items()}
+    summary += "\nProcess Summary:\n"
+    summary += f"- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
+    summary += "- Sigmoid function was applied to raw prediction scores to convert them into probabilities.\n"
+    summary += f"- The top {k} drugs were selected based on their prediction scores.\n"
 
-    # Step 5: Sort the drugs by prediction score in descending order
-    top_k_drugs = sorted(sigmoid_predictions.items(), key=lambda x: x[1], reverse=True)[:k]
+    return summary
 
-    # Step 6: Map drug IDs to their names and format the results
-    top_k_drug_names = [(mapping["id2name_drug"].get(drug_id, "Unknown Drug"), score) for drug_id, score in top_k_drugs]
 
-    # Step 7: Create a human and LLM-friendly summary string
-    summary = f"TxGNN Drug Repurposing Predictions for '{matched_disease}':\n"
-    summary += f"Top {k} predicted drugs and their corresponding prediction scores (post-sigmoid transformation):\n"
+def retrieve_topk_repurposing_drugs_for_diseases_txgnn(disease_names, data_lake_path, k=5):
+    """Rank TxGNN drug repurposing predictions for several diseases in one call.
 
-    for i, (drug_name, score) in enumerate(top_k_drug_names, 1):
-        summary += f"{i}. {drug_name} - Prediction Score: {score:.4f}\n"
+    Args:
+    - disease_names (list of str): Disease names; each is fuzzy matched like in
+      retrieve_topk_repurposing_drugs_from_disease_txgnn.
+    - data_lake_path (str): The path to the data lake containing the TxGNN predictions.
+    - k (int, optional): The number of top drug predictions per disease. Defaults to 5.
+
+    Returns:
+    - str: The top K drug predictions with their scores for every matched disease.
+
+    """
+    from biomni.tool.txgnn_index import get_txgnn_index
+
+    index = get_txgnn_index(data_lake_path)
+
+    matched = {}
+    unmatched = []
+    for disease_name in disease_names:
+        matched_disease = index.match_disease(disease_name, cutoff=0.6)
+        if matched_disease:
+            matched[disease_name] = matched_disease
+        else:
+            unmatched.append(disease_name)
+
+    # One partial sort over the rows of all matched diseases
+    diseases = list(dict.fromkeys(matched.values()))
+    rankings = dict(zip(diseases, index.top_k_batch(diseases, k), strict=True))
+
+    summary = f"TxGNN Drug Repurposing Predictions for {len(disease_names)} diseases\n\n"
+    for disease_name, matched_disease in matched.items():
+        if disease_name != matched_disease:
+            summary += f"Input '{disease_name}' was fuzzy matched to '{matched_disease}'.\n"
+        summary += _format_txgnn_summary(matched_disease, rankings[matched_disease], k) + "\n"
+    for disease_name in unmatched:
+        summary += f"Error: No matching disease found for '{disease_name}'. Please try a different name.\n"
 
     summary += "\nProcess Summary:\n"
-    summary += "- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
     summary += "- Sigmoid function was applied to raw prediction scores to convert them into probabilities.\n"
-    summary += f"- The top {k} drugs were selected based on their prediction scores.\n"
+    summary += f"- The top {k} drugs per disease were selected based on their prediction scores.\n"
 
     return summary
 
 
 # ADMET prediction function with research log format
-def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
+def predict_admet_properties(
+    smiles_list, ADMET_model_type="MPNN", output_file=None, return_table=False, batch_size=256, max_logged=1000
+):
+    """Predict ADMET properties of compounds with the pretrained DeepPurpose models.
+
+    Models stay loaded between calls; each SMILES is featurized once and scored by all 16
+    models in mini-batches.
+
+    Args:
+        smiles_list: SMILES strings (any iterable; consumed in chunks when streaming to ``output_file``)
+        ADMET_model_type: "MPNN", "CNN" or "Morgan"
+        output_file: Optional CSV path; predictions are appended chunk by chunk
+        return_table: Also return the predictions as a DataFrame (``(log, table)``)
+        batch_size: Compounds per forward pass
+        max_logged: Compounds written to the research log; the rest are only in the table/CSV
+
+    """
     try:
-        from DeepPurpose import CompoundPred, utils
+        import DeepPurpose  # noqa: F401
     except Exception:
         subprocess.run([sys.executable, "-m", "pip", "install", "DeepPurpose"], check=False)
-        from DeepPurpose import CompoundPred, utils
 
-    # Define available model types
-    available_model_types = ["MPNN", "CNN", "Morgan"]
+    from biomni.tool.admet_models import (
+        ADMET_MODEL_TYPES,
+        ADMET_TASKS,
+        format_admet_log,
+        get_admet_models,
+        iter_admet_predictions,
+    )
 
     # Check if the provided model type is valid
-    if ADMET_model_type not in available_model_types:
-        return f"Error: Invalid ADMET model type '{ADMET_model_type}'. Available options are: {', '.join(available_model_types)}."
-
-    # Load pretrained ADMET models only once
-    model_ADMETs = {}
-    tasks = [
-        "AqSolDB",
-        "Caco2",
-        "HIA",
-        "Pgp_inhibitor",
-        "Bioavailability",
-        "BBB_MolNet",
-        "PPBR",
-        "CYP2C19",
-        "CYP2D6",
-        "CYP3A4",
-        "CYP1A2",
-        "CYP2C9",
-        "ClinTox",
-        "Lipo_AZ",
-        "Half_life_eDrug3D",
-        "Clearance_eDrug3D",
-    ]
+    if ADMET_model_type not in ADMET_MODEL_TYPES:
+        return f"Error: Invalid ADMET model type '{ADMET_model_type}'. Available options are: {', '.join(ADMET_MODEL_TYPES)}."
 
-    for task in tasks:
-        try:
-            model_ADMETs[task + "_" + ADMET_model_type + "_model"] = CompoundPred.model_pretrained(
-                model=task.lower() + "_" + ADMET_model_type.lower() + "_model"
-            )
-        except Exception as e:
-            return f"Error downloading model {task}_{ADMET_model_type}_model: {str(e)}. Please check network connection or try again later."
-
-    # Helper function for ADMET prediction
-    def ADMET_pred(drug, task, unit):
-        model = model_ADMETs[task + "_" + ADMET_model_type + "_model"]
-        X_pred = utils.data_process(
-            X_drug=[drug],
-            y=[0],
-            drug_encoding=ADMET_model_type,
-            split_method="no_split",
-        )
-        y_pred = model.predict(X_pred)[0]
-
-        if unit == "%":
-            y_pred = y_pred * 100
-
-        return f"{y_pred:.2f} " + unit
+    # Pretrained models are loaded once per process
+    try:
+        models = get_admet_models(ADMET_model_type)
+    except RuntimeError as e:
+        return f"{e}. Please check network connection or try again later."
 
     # Initialize research log string
     research_log = "Research Log for ADMET Predictions:\n"
     research_log += "-------------------------------------\n"
 
-    # Process each SMILES string in the list
-    for smiles in smiles_list:
-        research_log += f"\nCompound SMILES: {smiles}\n"
-        research_log += "Predicted ADMET properties:\n"
-
-        # Physiochemical properties
-        solubility = ADMET_pred(smiles, "AqSolDB", "log mol/L")
-        lipophilicity = ADMET_pred(smiles, "Lipo_AZ", "(log-ratio)")
-        research_log += f"- Solubility: {solubility}\n"
-        research_log += f"- Lipophilicity: {lipophilicity}\n"
-
-        # Absorption
-        caco2 = ADMET_pred(smiles, "Caco2", "cm/s")
-        hia = ADMET_pred(smiles, "HIA", "%")
-        pgp = ADMET_pred(smiles, "Pgp_inhibitor", "%")
-        bioavail = ADMET_pred(smiles, "Bioavailability", "%")
-        research_log += f"- Absorption (Caco-2 permeability): {caco2}\n"
-        research_log += f"- Absorption (HIA): {hia}\n"
-        research_log += f"- Absorption (Pgp Inhibitor): {pgp}\n"
-        research_log += f"- Absorption (Bioavailability): {bioavail}\n"
-
-        # Distribution
-        bbb = ADMET_pred(smiles, "BBB_MolNet", "%")
-        ppbr = ADMET_pred(smiles, "PPBR", "%")
-        research_log += f"- Distribution (BBB permeation): {bbb}\n"
-        research_log += f"- Distribution (PPBR): {ppbr}\n"
-
-        # Metabolism
-        cyp2c19 = ADMET_pred(smiles, "CYP2C19", "%")
-        cyp2d6 = ADMET_pred(smiles, "CYP2D6", "%")
-        cyp3a4 = ADMET_pred(smiles, "CYP3A4", "%")
-        cyp1a2 = ADMET_pred(smiles, "CYP1A2", "%")
-        cyp2c9 = ADMET_pred(smiles, "CYP2C9", "%")
-        research_log += f"- Metabolism (CYP2C19): {cyp2c19}\n"
-        research_log += f"- Metabolism (CYP2D6): {cyp2d6}\n"
-        research_log += f"- Metabolism (CYP3A4): {cyp3a4}\n"
-        research_log += f"- Metabolism (CYP1A2): {cyp1a2}\n"
-        research_log += f"- Metabolism (CYP2C9): {cyp2c9}\n"
-
-        # Excretion
-        half_life = ADMET_pred(smiles, "Half_life_eDrug3D", "h")
-        clearance = ADMET_pred(smiles, "Clearance_eDrug3D", "mL/min/kg")
-        research_log += f"- Excretion (Half-life): {half_life}\n"
-        research_log += f"- Excretion (Clearance): {clearance}\n"
-
-        # Clinical Toxicity
-        clinical_toxicity = ADMET_pred(smiles, "ClinTox", "%")
-        research_log += f"- Clinical Toxicity: {clinical_toxicity}\n"
-
-        research_log += "-------------------------------------\n"
-
+    tables = []
+    n_compounds = 0
+    for i, table in enumerate(iter_admet_predictions(smiles_list, ADMET_model_type, batch_size, models=models)):
+        if n_compounds < max_logged:
+            research_log += format_admet_log(table.head(max_logged - n_compounds))
+        n_compounds += len(table)
+        if output_file:
+            table.to_csv(output_file, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        if return_table:
+            tables.append(table)
+
+    if n_compounds > max_logged:
+        research_log += f"\n... {n_compounds - max_logged} more compounds not shown in this log\n"
+    if output_file:
+        research_log += f"\nPredictions for {n_compounds} compounds saved to {output_file}\n"
+
+    if return_table:
+        table = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=["SMILES", *ADMET_TASKS])
+        return research_log, table
     return research_log
 
 
 # Binding Affinity prediction function with model_type validation
-def predict_binding_affinity_protein_1d_sequence(smiles_list, amino_acid_sequence, affinity_model_type="MPNN-CNN"):
+def predict_binding_affinity_protein_1d_sequence(
+    smiles_list,
+    amino_acid_sequence,
+    affinity_model_type="MPNN-CNN",
+    n_workers=None,
+    batch_size=None,
+    checkpoint_file=None,
+    top_k=None,
+):
     try:
-        from DeepPurpose import DTI, utils
+        import DeepPurpose  # noqa: F401
     except Exception:
         subprocess.run([sys.executable, "-m", "pip", "install", "DeepPurpose"], check=False)
-        from DeepPurpose import DTI, utils
+
+    from biomni.tool.virtual_screening import AffinityScorer, VirtualScreen, get_prepared_scorer
 
     # Define available model types for Binding Affinity
     available_affinity_model_types = [
@@ -384,36 +384,35 @@ def predict_binding_affinity_protein_1d_sequence(smiles_list, amino_acid_sequenc
     if affinity_model_type not in available_affinity_model_types:
         return f"Error: Invalid affinity model type '{affinity_model_type}'. Available options are: {', '.join(available_affinity_model_types)}."
 
-    # Load the pre-trained affinity model
+    # Load the pre-trained affinity model and encode the protein once per process
+    scorer = AffinityScorer(amino_acid_sequence, affinity_model_type)
     try:
-        model_DTI = DTI.model_pretrained(model=affinity_model_type.replace("-", "_") + "_BindingDB")
+        get_prepared_scorer(scorer)
     except Exception as e:
         return f"Error downloading model {affinity_model_type.replace('-', '_')}_BindingDB: {str(e)}. Please check network connection or try again later."
 
+    screen = VirtualScreen(
+        scorer, n_workers=n_workers, batch_size=batch_size, checkpoint_path=checkpoint_file, top_k=top_k or 0
+    )
+    affinities = screen.run(smiles_list)
+
     # Initialize research log string
     research_log = "Research Log for Binding Affinity Predictions:\n"
     research_log += "-------------------------------------\n"
 
-    # Process each SMILES string in the list
     for smiles in smiles_list:
         research_log += f"\nCompound SMILES: {smiles}\n"
         research_log += f"Amino Acid Sequence: {amino_acid_sequence}\n"
-
-        # Predict binding affinity
-        X_pred = utils.data_process(
-            X_drug=[smiles],
-            X_target=[amino_acid_sequence],
-            y=[0],
-            drug_encoding=affinity_model_type.split("-")[0],
-            target_encoding=affinity_model_type.split("-")[1],
-            split_method="no_split",
-        )
-        y_pred = model_DTI.predict(X_pred)[0]
-        y_pred_nM = 10 ** (-y_pred) / 1e-9
-
-        research_log += f"Predicted Binding Affinity: {y_pred_nM:.2f} nM\n"
+        research_log += f"Predicted Binding Affinity: {affinities[smiles]:.2f} nM\n"
         research_log += "-------------------------------------\n"
 
+    if checkpoint_file:
+        research_log += f"\nPredictions checkpointed to {checkpoint_file}\n"
+    if top_k:
+        research_log += f"\nTop {top_k} compounds (strongest predicted binding first):\n"
+        for rank, (smiles, affinity) in enumerate(screen.top_hits(), 1):
+            research_log += f"{rank}. {smiles}: {affinity:.2f} nM\n"
+
     return research_log
 
 
@@ -1975,277 +1974,29 @@ def analyze_western_blot(
 
 def _load_ddinter_data(data_lake_path):
     """
-    Load DDInter datasets from pickle files, processing if needed.
+    Load the DDInter interaction index, compiling it from the CSV files if needed.
 
     Parameters
     ----------
     data_lake_path : str
-        Path to data lake directory containing DDInter pickle files
+        Path to data lake directory containing the raw DDInter CSV files
 
     Returns
     -------
     tuple
-        (drug_info, interaction_matrix, name_mapping) dictionaries
-    """
-    import os
-    import pickle
-
-    # Define schema directory (following established pattern)
-    schema_dir = os.path.join(os.path.dirname(__file__), "schema_db")
-
-    # Define paths to DDInter pickle files
-    drug_info_path = os.path.join(schema_dir, "ddinter_drugs.pkl")
-    interaction_path = os.path.join(schema_dir, "ddinter_interactions.pkl")
-    mapping_path = os.path.join(schema_dir, "ddinter_name_mapping.pkl")
-
-    # Check if processing is needed (lazy loading pattern)
-    pkl_files = [drug_info_path, interaction_path, mapping_path]
-    if not all(os.path.exists(f) for f in pkl_files):
-        _process_ddinter_data_inline(data_lake_path, schema_dir)
-
-    # Load data
-    try:
-        with open(drug_info_path, "rb") as f:
-            drug_info = pickle.load(f)
-
-        with open(interaction_path, "rb") as f:
-            interaction_matrix = pickle.load(f)
-
-        with open(mapping_path, "rb") as f:
-            name_mapping = pickle.load(f)
-
-        return drug_info, interaction_matrix, name_mapping
-
-    except Exception as e:
-        raise FileNotFoundError(f"Error loading DDInter data: {e}") from e
-
-
-def _process_ddinter_data_inline(data_lake_path, output_dir):
+        (drug_info, interaction_matrix, name_mapping) mappings backed by the memory-mapped index
     """
-    Process DDInter CSV files into standardized pickle files.
+    from biomni.tool.ddinter_index import DrugInfoView, InteractionMatrixView
 
-    This function processes raw DDInter 2.0 CSV files and creates standardized
-    data structures for use in Biomni drug-drug interaction analysis.
-
-    Parameters
-    ----------
-    data_lake_path : str
-        Path to data lake directory containing raw DDInter CSV files
-    output_dir : str
-        Directory to save processed pickle files
-    """
-    import os
-    import pickle
-    from collections import defaultdict
-    from pathlib import Path
-
-    import pandas as pd
-
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
-
-    # Define CSV files to process
-    csv_files = [
-        "ddinter_alimentary_tract_metabolism.csv",
-        "ddinter_antineoplastic.csv",
-        "ddinter_antiparasitic.csv",
-        "ddinter_blood_organs.csv",
-        "ddinter_dermatological.csv",
-        "ddinter_hormonal.csv",
-        "ddinter_respiratory.csv",
-        "ddinter_various.csv",
-    ]
+    index = _get_ddinter_index(data_lake_path)
+    return DrugInfoView(index), InteractionMatrixView(index), index.name_mapping
 
-    # Load and combine all CSV files
-    dataframes = []
-    for csv_file in csv_files:
-        file_path = os.path.join(data_lake_path, csv_file)
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            # Add source category
-            category = csv_file.replace("ddinter_", "").replace(".csv", "")
-            df["category"] = category
-            dataframes.append(df)
 
-    if not dataframes:
-        raise FileNotFoundError("No DDInter CSV files found in data lake")
+def _get_ddinter_index(data_lake_path):
+    """Process-wide compiled DDInter index for ``data_lake_path`` (see ``biomni.tool.ddinter_index``)."""
+    from biomni.tool.ddinter_index import get_ddinter_index
 
-    # Process data
-    drug_info = _build_drug_registry_inline(dataframes)
-    interaction_matrix = _create_interaction_matrix_inline(dataframes)
-    name_mapping = _create_name_mapping_inline(drug_info)
-
-    # Save processed data
-    with open(os.path.join(output_dir, "ddinter_drugs.pkl"), "wb") as f:
-        pickle.dump(drug_info, f)
-
-    with open(os.path.join(output_dir, "ddinter_interactions.pkl"), "wb") as f:
-        pickle.dump(interaction_matrix, f)
-
-    with open(os.path.join(output_dir, "ddinter_name_mapping.pkl"), "wb") as f:
-        pickle.dump(name_mapping, f)
-
-    # Generate and save statistics
-    stats = _generate_ddinter_statistics_inline(drug_info, interaction_matrix)
-    with open(os.path.join(output_dir, "ddinter_statistics.pkl"), "wb") as f:
-        pickle.dump(stats, f)
-
-
-def _standardize_drug_name_processing(drug_name):
-    """Standardize drug names for consistent matching during processing."""
-    import pandas as pd
-
-    if pd.isna(drug_name):
-        return ""
-
-    # Convert to lowercase and strip whitespace
-    standardized = str(drug_name).strip().lower()
-
-    # Remove common suffixes and prefixes
-    standardized = standardized.replace(" hydrochloride", "")
-    standardized = standardized.replace(" sulfate", "")
-    standardized = standardized.replace(" sodium", "")
-    standardized = standardized.replace(" potassium", "")
-    standardized = standardized.replace(" calcium", "")
-    standardized = standardized.replace(" magnesium", "")
-
-    return standardized
-
-
-def _build_drug_registry_inline(dataframes):
-    """Build comprehensive drug registry from all interactions."""
-    import pandas as pd
-
-    drug_registry = {}
-
-    for df in dataframes:
-        for _, row in df.iterrows():
-            drug_a_id = row["DDInterID_A"]
-            drug_a_name = row["Drug_A"]
-            drug_b_id = row["DDInterID_B"]
-            drug_b_name = row["Drug_B"]
-
-            # Add Drug A
-            if drug_a_id not in drug_registry:
-                drug_registry[drug_a_id] = {
-                    "name": drug_a_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_a_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_a_id]["categories"].add(row["category"])
-
-            # Add Drug B
-            if drug_b_id not in drug_registry:
-                drug_registry[drug_b_id] = {
-                    "name": drug_b_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_b_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_b_id]["categories"].add(row["category"])
-
-            # Record interactions
-            drug_registry[drug_a_id]["interactions"].add(drug_b_id)
-            drug_registry[drug_b_id]["interactions"].add(drug_a_id)
-
-    # Convert sets to lists for pickle serialization
-    for drug_id in drug_registry:
-        drug_registry[drug_id]["categories"] = list(drug_registry[drug_id]["categories"])
-        drug_registry[drug_id]["interactions"] = list(drug_registry[drug_id]["interactions"])
-
-    return drug_registry
-
-
-def _create_interaction_matrix_inline(dataframes):
-    """Create interaction matrix for fast lookups using standardized drug names."""
-    from collections import defaultdict
-
-    import pandas as pd
-
-    combined_df = pd.concat(dataframes, ignore_index=True)
-    interaction_matrix = defaultdict(lambda: defaultdict(list))
-
-    # Create bidirectional interaction matrix using standardized names
-    for _, row in combined_df.iterrows():
-        drug_a_std = _standardize_drug_name_processing(row["Drug_A"])
-        drug_b_std = _standardize_drug_name_processing(row["Drug_B"])
-        level = row["Level"]
-        category = row["category"]
-
-        interaction_data = {
-            "level": level,
-            "category": category,
-            "drug_a_id": row["DDInterID_A"],
-            "drug_b_id": row["DDInterID_B"],
-            "drug_a_name": row["Drug_A"],
-            "drug_b_name": row["Drug_B"],
-        }
-
-        # Add both directions using standardized names as keys
-        interaction_matrix[drug_a_std][drug_b_std].append(interaction_data)
-        interaction_matrix[drug_b_std][drug_a_std].append(interaction_data)
-
-    # Convert to regular dict for pickle
-    interaction_matrix = dict(interaction_matrix)
-    for drug in interaction_matrix:
-        interaction_matrix[drug] = dict(interaction_matrix[drug])
-
-    return interaction_matrix
-
-
-def _create_name_mapping_inline(drug_info):
-    """Create drug name to ID mapping for fuzzy matching."""
-    name_mapping = {}
-
-    for drug_id, drug_data in drug_info.items():
-        original_name = drug_data["name"]
-        standardized_name = drug_data["standardized_name"]
-
-        # Map both original and standardized names
-        name_mapping[original_name.lower()] = drug_id
-        name_mapping[standardized_name] = drug_id
-
-    return name_mapping
-
-
-def _generate_ddinter_statistics_inline(drug_info, interaction_matrix):
-    """Generate statistics about the processed data."""
-    from collections import defaultdict
-
-    stats = {
-        "total_drugs": len(drug_info),
-        "total_interactions": 0,
-        "interaction_levels": defaultdict(int),
-        "drug_categories": defaultdict(int),
-        "most_connected_drugs": [],
-    }
-
-    # Count interactions and levels
-    for drug_a in interaction_matrix:
-        for drug_b in interaction_matrix[drug_a]:
-            interactions = interaction_matrix[drug_a][drug_b]
-            stats["total_interactions"] += len(interactions)
-
-            for interaction in interactions:
-                stats["interaction_levels"][interaction["level"]] += 1
-
-    # Count drug categories
-    for drug_data in drug_info.values():
-        for category in drug_data["categories"]:
-            stats["drug_categories"][category] += 1
-
-    # Find most connected drugs
-    connection_counts = []
-    for drug_id, drug_data in drug_info.items():
-        connection_counts.append(
-            {"drug_id": drug_id, "name": drug_data["name"], "connections": len(drug_data["interactions"])}
-        )
-
-    connection_counts.sort(key=lambda x: x["connections"], reverse=True)
-    stats["most_connected_drugs"] = connection_counts[:10]
-
-    return stats
+    return get_ddinter_index(data_lake_path)
 
 
 def _standardize_drug_name(drug_name, name_mapping):
@@ -2264,18 +2015,12 @@ def _standardize_drug_name(drug_name, name_mapping):
     str or None
         Standardized drug name or None if not found
     """
-    from difflib import get_close_matches
-
     # Direct match
     if drug_name.lower() in name_mapping:
         return drug_name.lower()
 
-    # Fuzzy match
-    matches = get_close_matches(drug_name.lower(), name_mapping.keys(), n=1, cutoff=0.8)
-    if matches:
-        return matches[0]
-
-    return None
+    # Fuzzy match against a trigram index built once per name mapping
+    return get_matcher(name_mapping).match(drug_name.lower(), cutoff=0.8)
 
 
 def _format_interaction_result(interaction_data, drug_name_a, drug_name_b, include_mechanisms=True):
@@ -2355,8 +2100,9 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        index = _get_ddinter_index(data_lake_path)
+        name_mapping = index.name_mapping
+        log += f"Successfully loaded DDInter database with {index.num_drugs} drugs\n\n"
 
         # Standardize drug names
         standardized_names = []
@@ -2379,36 +2125,10 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
             log += "Error: No valid drugs found in DDInter database\n"
             return log
 
-        # Query interactions
-        interactions_found = []
-
-        for i, drug_a in enumerate(standardized_names):
-            for j, drug_b in enumerate(standardized_names):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    # Apply filters
-                    filtered_interactions = interactions
-
-                    if severity_levels:
-                        filtered_interactions = [
-                            int_data for int_data in filtered_interactions if int_data.get("level") in severity_levels
-                        ]
-
-                    if interaction_types:
-                        filtered_interactions = [
-                            int_data
-                            for int_data in filtered_interactions
-                            if int_data.get("category") in interaction_types
-                        ]
-
-                    if filtered_interactions:
-                        interactions_found.append(
-                            {"drug_a": drug_a, "drug_b": drug_b, "interactions": filtered_interactions}
-                        )
+        # Query all pairs of the medication list at once
+        interactions_found = index.query_pairs(
+            standardized_names, severity_levels=severity_levels, categories=interaction_types
+        )
 
         # Format results
         log += "Interaction Analysis Results:\n"
@@ -2483,7 +2203,8 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        index = _get_ddinter_index(data_lake_path)
+        name_mapping = index.name_mapping
         log += "Successfully loaded DDInter database\n\n"
 
         # Standardize drug names
@@ -2508,29 +2229,20 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
             return log
 
         # Analyze all pairwise interactions
-        interactions_found = []
+        interactions_found = index.query_pairs(standardized_drugs)
         major_interactions = 0
         moderate_interactions = 0
         minor_interactions = 0
 
-        for i, drug_a in enumerate(standardized_drugs):
-            for j, drug_b in enumerate(standardized_drugs):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    for interaction in interactions:
-                        level = interaction.get("level", "Unknown")
-                        if level == "Major":
-                            major_interactions += 1
-                        elif level == "Moderate":
-                            moderate_interactions += 1
-                        elif level == "Minor":
-                            minor_interactions += 1
-
-                    interactions_found.append({"drug_a": drug_a, "drug_b": drug_b, "interactions": interactions})
+        for pair in interactions_found:
+            for interaction in pair["interactions"]:
+                level = interaction.get("level", "Unknown")
+                if level == "Major":
+                    major_interactions += 1
+                elif level == "Moderate":
+                    moderate_interactions += 1
+                elif level == "Minor":
+                    minor_interactions += 1
 
         # Overall safety assessment
         log += "Overall Safety Assessment:\n"
@@ -2804,8 +2516,9 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        index = _get_ddinter_index(data_lake_path)
+        name_mapping = index.name_mapping
+        log += f"Successfully loaded DDInter database with {index.num_drugs} drugs\n\n"
 
         # Standardize target drug name
         std_target = _standardize_drug_name(target_drug, name_mapping)
@@ -2831,67 +2544,41 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
             log += "\n"
 
         # Get target drug information
-        target_id = name_mapping[std_target]
-        target_info = drug_info.get(target_id, {})
-        target_categories = target_info.get("categories", [])
+        target = index.drug_index(name_mapping[std_target])
+        target_info = index.drug_record(target)
+        target_categories = target_info["categories"]
 
         log += "Target Drug Profile:\n"
         log += f"- Drug: {target_drug}\n"
         log += f"- Categories: {', '.join(target_categories)}\n"
         log += f"- Total interactions: {len(target_info.get('interactions', []))}\n\n"
 
-        # Find alternative drugs
-        alternatives = []
-
-        for drug_id, drug_data in drug_info.items():
-            drug_name = drug_data["name"]
-            drug_categories = drug_data.get("categories", [])
-
-            # Skip the target drug itself
-            if drug_id == target_id:
-                continue
-
-            # Apply therapeutic class filter
-            if therapeutic_class:
-                if not any(therapeutic_class.lower() in cat.lower() for cat in drug_categories):
-                    continue
-            else:
-                # Look for drugs in similar categories as target
-                if not any(cat in target_categories for cat in drug_categories):
-                    continue
-
-            # Check if this drug interacts with any contraindicated drugs
-            has_contraindicated_interactions = False
-            interaction_count = 0
-            major_interactions = 0
-
-            std_drug_name = drug_data["standardized_name"]
-
-            for contraindicated in std_contraindicated:
-                if std_drug_name in interaction_matrix and contraindicated in interaction_matrix[std_drug_name]:
-                    interactions = interaction_matrix[std_drug_name][contraindicated]
-                    interaction_count += len(interactions)
-
-                    # Check for major interactions
-                    for interaction in interactions:
-                        if interaction.get("level") == "Major":
-                            major_interactions += 1
-                            has_contraindicated_interactions = True
-                            break
+        # Candidate drugs by category bitmask
+        if therapeutic_class:
+            class_mask = sum(
+                1 << i for i, cat in enumerate(index.categories) if therapeutic_class.lower() in cat.lower()
+            )
+        else:
+            # Look for drugs in similar categories as target
+            class_mask = int(index.drug_categories[target])
+        candidates = np.flatnonzero(np.asarray(index.drug_categories) & np.uint32(class_mask))
+        candidates = candidates[candidates != target]
 
-                    if has_contraindicated_interactions:
-                        break
+        # Interactions of every drug with the contraindicated drugs, in one pass over their adjacency
+        interaction_counts, has_major = index.contraindication_counts(std_contraindicated, level="Major")
+        degrees = index.interaction_degrees()
 
-            # Add to alternatives if no major contraindicated interactions
-            if not has_contraindicated_interactions:
-                alternatives.append(
-                    {
-                        "name": drug_name,
-                        "categories": drug_categories,
-                        "interaction_count": interaction_count,
-                        "total_interactions": len(drug_data.get("interactions", [])),
-                    }
-                )
+        # Keep drugs without major contraindicated interactions
+        alternatives = [
+            {
+                "name": index.drug_names[drug],
+                "categories": index.drug_categories_of(drug),
+                "interaction_count": int(interaction_counts[drug]),
+                "total_interactions": int(degrees[drug]),
+            }
+            for drug in candidates
+            if not has_major[drug]
+        ]
 
         # Sort alternatives by interaction count (fewer is better)
         alternatives.sort(key=lambda x: x["interaction_count"])
@@ -0,0 +1,205 @@
+"""Vectorized search for primer binding sites with up to k mismatches.
+
+``align_sequences`` used to compare a primer with every window of the target in a Python loop
+over bases. Here sequences are code-point arrays and every window of a template is scored at once:
+
+- short templates: mismatch counts for a group of equally long primers are accumulated as a
+  ``(primers, windows)`` array with one comparison per primer base;
+- long templates: a site with at most ``k`` mismatches matches at least one of ``k + 1``
+  disjoint pieces of the primer exactly (pigeonhole). The first bases of each piece are looked
+  up in a sorted index of the template's q-grams and only those candidate windows are verified.
+
+Characters are compared as-is (upper-cased), so ``N`` matches ``N`` only, exactly like the
+original per-base comparison. Circular templates also report sites spanning the origin.
+"""
+
+import numpy as np
+
+DEFAULT_SEED_LENGTH = 12
+MIN_SEED_LENGTH = 8
+SEED_INDEX_MIN_LENGTH = 50_000
+MAX_BLOCK_CELLS = 1 << 24
+
+_COMPLEMENT = str.maketrans("ATCG", "TAGC")
+
+
+def reverse_complement(seq: str) -> str:
+    """Reverse complement of an upper-case sequence; non-ACGT characters are kept as they are."""
+    return seq.translate(_COMPLEMENT)[::-1]
+
+
+def _codes(seq: str) -> np.ndarray:
+    return np.frombuffer(seq.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _seed_symbols(codes: np.ndarray) -> np.ndarray:
+    """3-bit symbols for seed hashing; only exact matches matter, so collisions just add candidates."""
+    symbols = (codes % 4 + 4).astype(np.uint64)
+    for code, base in enumerate("ACGT"):
+        symbols[codes == ord(base)] = code
+    return symbols
+
+
+class Template:
+    """A target sequence prepared for primer searches.
+
+    Args:
+        sequence: Target DNA sequence (case-insensitive)
+        circular: Also report sites that wrap around the end of the sequence
+        seed_length: Length of the q-grams indexed for long templates
+
+    """
+
+    def __init__(self, sequence: str, circular: bool = False, seed_length: int = DEFAULT_SEED_LENGTH):
+        self.sequence = sequence.upper()
+        self.circular = circular
+        self.seed_length = seed_length
+        self.codes = _codes(self.sequence)
+        self._seed_index = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _extended(self, primer_length: int) -> tuple[np.ndarray, int]:
+        """Codes covering every window of ``primer_length`` and the number of windows."""
+        n = len(self.codes)
+        if self.circular and n:
+            reps = -(-(n + primer_length - 1) // n)
+            return np.tile(self.codes, reps)[: n + primer_length - 1], n
+        return self.codes, max(n - primer_length + 1, 0)
+
+    def _seeds(self, q: int) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted hashes of every q-gram on the (extended) template and their start positions."""
+        if q not in self._seed_index:
+            n = len(self.codes)
+            # Circular seeds may start anywhere in the sequence and run over the origin
+            extended = np.tile(self.codes, 2)[: n + q - 1] if self.circular else self.codes
+            starts = len(extended) - q + 1
+            symbols = _seed_symbols(extended)
+            hashes = np.zeros(max(starts, 0), dtype=np.uint64)
+            for j in range(q):
+                hashes = (hashes << np.uint64(3)) | symbols[j : j + starts]
+            order = np.argsort(hashes, kind="stable")
+            self._seed_index[q] = (hashes[order], order)
+        return self._seed_index[q]
+
+    def _use_seeds(self, primer_length: int, max_mismatches: int) -> bool:
+        return len(self.codes) >= SEED_INDEX_MIN_LENGTH and primer_length // (max_mismatches + 1) >= MIN_SEED_LENGTH
+
+    def mismatch_counts(self, primers: list[str]) -> np.ndarray:
+        """Mismatches of equally long primers at every window: shape ``(len(primers), windows)``."""
+        m = len(primers[0])
+        extended, windows = self._extended(m)
+        primer_codes = np.stack([_codes(primer) for primer in primers])
+        counts = np.zeros((len(primers), windows), dtype=np.int32)
+        if windows == 0:
+            return counts
+        for j in range(m):
+            counts += extended[j : j + windows][None, :] != primer_codes[:, j : j + 1]
+        return counts
+
+    def seeded_positions(self, primer: str, max_mismatches: int) -> np.ndarray:
+        """Sorted window starts with at most ``max_mismatches`` mismatches, found from exact seeds."""
+        m = len(primer)
+        extended, windows = self._extended(m)
+        primer_codes = _codes(primer)
+        piece_starts = [m * p // (max_mismatches + 1) for p in range(max_mismatches + 1)]
+        q = min(self.seed_length, m // (max_mismatches + 1))
+        hashes, positions = self._seeds(q)
+
+        primer_symbols = _seed_symbols(primer_codes)
+        candidates = []
+        for offset in piece_starts:
+            seed = np.uint64(0)
+            for symbol in primer_symbols[offset : offset + q]:
+                seed = (seed << np.uint64(3)) | symbol
+            lo, hi = np.searchsorted(hashes, seed, "left"), np.searchsorted(hashes, seed, "right")
+            candidates.append(positions[lo:hi] - offset)
+        starts = np.concatenate(candidates)
+        if self.circular:
+            starts %= len(self.codes)
+        starts = np.unique(starts[(starts >= 0) & (starts < windows)])
+        if not len(starts):
+            return starts
+        counts = (extended[starts[:, None] + np.arange(m)] != primer_codes).sum(axis=1)
+        return starts[counts <= max_mismatches]
+
+    def find(self, primers: list[str], max_mismatches: int = 1) -> list[np.ndarray]:
+        """Window starts of every primer with at most ``max_mismatches`` mismatches, sorted.
+
+        Empty primers, and primers longer than a linear template, have no sites.
+        """
+        hits = [np.zeros(0, dtype=np.int64) for _ in primers]
+        by_length = {}
+        for i, primer in enumerate(primers):
+            if not primer or len(primer) > len(self.codes) and not self.circular:
+                continue
+            if self._use_seeds(len(primer), max_mismatches):
+                hits[i] = self.seeded_positions(primer, max_mismatches)
+            else:
+                by_length.setdefault(len(primer), []).append(i)
+        for m, group in by_length.items():
+            windows = self._extended(m)[1]
+            block = max(1, MAX_BLOCK_CELLS // max(windows, 1))
+            for chunk in range(0, len(group), block):
+                members = group[chunk : chunk + block]
+                counts = self.mismatch_counts([primers[i] for i in members])
+                for i, row in zip(members, counts, strict=True):
+                    hits[i] = np.flatnonzero(row <= max_mismatches)
+        return hits
+
+    def mismatches(self, primer: str, position: int) -> list[tuple[int, str, str]]:
+        """``(primer position, expected base, found base)`` for every mismatch of a site."""
+        window = self.window(position, len(primer))
+        return [
+            (j, expected, found)
+            for j, (expected, found) in enumerate(zip(primer, window, strict=True))
+            if expected != found
+        ]
+
+    def window(self, position: int, length: int) -> str:
+        if self.circular and position + length > len(self.sequence):
+            sequence = self.sequence * (-(-(position + length) // len(self.sequence)))
+            return sequence[position : position + length]
+        return self.sequence[position : position + length]
+
+
+def search_primers(templates, primers, max_mismatches: int = 1, circular: bool = False) -> list[list[dict]]:
+    """Binding sites of many primers on many templates, on both strands.
+
+    Args:
+        templates: Target sequence or list of target sequences (or prepared ``Template`` objects)
+        primers: Primer sequence or list of primer sequences
+        max_mismatches: Maximum number of mismatching bases per site
+        circular: Treat string templates as circular
+
+    Returns:
+        ``results[t][p]`` is ``{"sequence", "alignments"}`` for template ``t`` and primer ``p``, with
+        the alignments of the primer (``strand "+"``) and of its reverse complement (``"-"``),
+        each in position order, as ``align_sequences`` reports them
+
+    """
+    templates = [templates] if isinstance(templates, str | Template) else list(templates)
+    primers = [primers] if isinstance(primers, str) else list(primers)
+    primers = [primer.upper() for primer in primers]
+    oriented = primers + [reverse_complement(primer) for primer in primers]
+
+    results = []
+    for template in templates:
+        if not isinstance(template, Template):
+            template = Template(template, circular=circular)
+        hits = template.find(oriented, max_mismatches)
+        template_results = []
+        for i, primer in enumerate(primers):
+            alignments = []
+            for strand, query, positions in (
+                ("+", primer, hits[i]),
+                ("-", oriented[len(primers) + i], hits[len(primers) + i]),
+            ):
+                alignments += [
+                    {"position": position, "strand": strand, "mismatches": template.mismatches(query, position)}
+                    for position in positions.tolist()
+                ]
+            template_results.append({"sequence": primer, "alignments": alignments})
+        results.append(template_results)
+    return results
@@ -0,0 +1,424 @@
+"""Process-isolated Python REPL workers.
+
+Each agent session gets its own worker process holding that session's namespace, so
+concurrent sessions neither share variables nor contend for the GIL. Timeouts are
+enforced with SIGKILL (the worker is respawned afterwards), memory can be capped per
+worker, and idle workers are pre-warmed with the heavy scientific imports.
+"""
+
+import atexit
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from io import StringIO
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by every worker before it is handed to a session
+DEFAULT_WARM_IMPORTS = ("numpy", "pandas", "scanpy")
+
+
+def _apply_memory_limit(memory_limit_mb):
+    """Cap the address space of the current process (POSIX only)."""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Warning: Could not apply worker memory limit: {e}")
+
+
+def _worker_main(conn, warm_imports, memory_limit_mb):
+    """Entry point of a REPL worker process.
+
+    Messages are ``(op, payload)`` tuples; every message gets exactly one
+    ``(status, result)`` reply.
+    """
+    # Warm start: pay the import cost before any session is bound to this worker
+    for module_name in warm_imports:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+    # Resident models named in BIOMNI_PRELOAD_MODELS are loaded here too, as comma-separated
+    # model_pool names; per-device models are "name/device" ("chatnt/0"), and a bare "chatnt" is
+    # the CPU pipeline that query_chatnt uses by default
+    if os.getenv("BIOMNI_PRELOAD_MODELS"):
+        try:
+            from biomni.tool.model_pool import preload_from_env
+
+            preload_from_env()
+        except Exception as e:
+            print(f"Warning: Could not preload models: {e}")
+
+    _apply_memory_limit(memory_limit_mb)
+
+    namespace = {"__name__": "__main__"}
+
+    while True:
+        try:
+            op, payload = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+
+        if op == "exec":
+            code, cwd = payload
+            if cwd and os.path.isdir(cwd) and os.getcwd() != cwd:
+                os.chdir(cwd)
+            old_stdout = sys.stdout
+            sys.stdout = mystdout = StringIO()
+            try:
+                exec(code, namespace)
+                output = mystdout.getvalue()
+            except MemoryError:
+                output = mystdout.getvalue() + "Error: MemoryError - the worker memory limit was exceeded"
+            except BaseException as e:
+                output = mystdout.getvalue() + f"Error: {str(e)}"
+            finally:
+                sys.stdout = old_stdout
+            conn.send(("ok", output))
+        elif op == "inject":
+            injected = []
+            for name, blob in payload.items():
+                try:
+                    namespace[name] = pickle.loads(blob)
+                    injected.append(name)
+                except Exception:
+                    pass
+            conn.send(("ok", injected))
+        elif op == "reset":
+            namespace = {"__name__": "__main__"}
+            conn.send(("ok", None))
+        elif op == "ping":
+            conn.send(("ok", os.getpid()))
+        elif op == "close":
+            conn.send(("ok", None))
+            break
+        else:
+            conn.send(("error", f"Unknown operation: {op}"))
+
+    conn.close()
+
+
+class ReplWorker:
+    """Handle to one REPL worker process."""
+
+    def __init__(self, ctx, warm_imports, memory_limit_mb):
+        self.parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, tuple(warm_imports), memory_limit_mb),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.lock = threading.Lock()
+        self.session_id = None
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.executions = 0
+        self.injected = {}
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def request(self, op, payload=None, timeout=None):
+        """Send one request and wait for its reply.
+
+        Returns:
+            ``(status, result)`` where status is ``"ok"``, ``"error"``, ``"timeout"`` or ``"dead"``.
+            On ``"timeout"`` and ``"dead"`` the worker has been killed and must be replaced.
+        """
+        with self.lock:
+            self.last_used = time.time()
+            try:
+                self.parent_conn.send((op, payload))
+                if not self.parent_conn.poll(timeout):
+                    self.kill()
+                    return "timeout", None
+                return self.parent_conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                # The worker died mid-request (e.g. killed by the OOM killer)
+                self.kill()
+                return "dead", None
+
+    def kill(self):
+        """Hard-stop the worker with SIGKILL."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        try:
+            self.parent_conn.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """Ask the worker to exit, falling back to a hard kill."""
+        if self.process.is_alive():
+            try:
+                with self.lock:
+                    self.parent_conn.send(("close", None))
+                    if self.parent_conn.poll(2):
+                        self.parent_conn.recv()
+            except (EOFError, OSError):
+                pass
+        self.process.join(timeout=2)
+        self.kill()
+
+
+class ReplWorkerPool:
+    """Pool of pre-warmed REPL worker processes, one per session.
+
+    Args:
+        max_workers: Maximum number of live workers (sessions). Defaults to the CPU count.
+            When exceeded, the least recently used idle session is evicted.
+        warm_workers: Number of unbound, pre-warmed workers kept ready for new sessions.
+        memory_limit_mb: Optional per-worker address space limit in MB.
+        warm_imports: Modules imported in each worker before it is handed out.
+        start_method: multiprocessing start method. ``"spawn"`` is safe in threaded servers.
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        warm_workers: int = 1,
+        memory_limit_mb: int | None = None,
+        warm_imports=DEFAULT_WARM_IMPORTS,
+        start_method: str = "spawn",
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.warm_workers = max(0, min(warm_workers, self.max_workers))
+        self.memory_limit_mb = memory_limit_mb
+        self.warm_imports = tuple(warm_imports or ())
+        self._ctx = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._sessions = OrderedDict()
+        self._spawning = 0  # workers being started outside the lock
+        self._closed = False
+        self.stats = {"spawned": 0, "timeouts": 0, "crashes": 0, "evictions": 0, "executions": 0}
+        self._replenish()
+
+    def _spawn(self):
+        """Start a worker without holding the pool lock (a spawn can take a while)."""
+        try:
+            worker = ReplWorker(self._ctx, self.warm_imports, self.memory_limit_mb)
+        finally:
+            with self._lock:
+                self._spawning -= 1
+        with self._lock:
+            self.stats["spawned"] += 1
+        return worker
+
+    def _replenish(self):
+        """Top up the idle pool in the background so the caller never waits on a spawn."""
+
+        def _fill():
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                    live = len(self._idle) + len(self._sessions) + self._spawning
+                    if len(self._idle) + self._spawning >= self.warm_workers or live >= self.max_workers:
+                        return
+                    self._spawning += 1
+                worker = self._spawn()
+                with self._lock:
+                    closed = self._closed
+                    if not closed:
+                        self._idle.append(worker)
+                if closed:
+                    worker.close()
+                    return
+
+        threading.Thread(target=_fill, daemon=True).start()
+
+    def _acquire(self, session_id):
+        """Return the worker bound to ``session_id``, binding a new one if needed."""
+        evicted = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ReplWorkerPool has been shut down")
+            worker = self._sessions.get(session_id)
+            if worker is not None and worker.is_alive():
+                self._sessions.move_to_end(session_id)
+                return worker
+            self._sessions.pop(session_id, None)
+
+            if len(self._sessions) >= self.max_workers:
+                for sid, candidate in self._sessions.items():
+                    if not candidate.lock.locked():
+                        evicted = self._sessions.pop(sid)
+                        self.stats["evictions"] += 1
+                        print(f"Warning: REPL pool full, evicting idle session '{sid}'")
+                        break
+                else:
+                    raise RuntimeError(f"All {self.max_workers} REPL workers are busy")
+
+            worker = None
+            while self._idle:
+                candidate = self._idle.pop(0)
+                if candidate.is_alive():
+                    worker = candidate
+                    break
+                candidate.kill()
+            if worker is not None:
+                worker.session_id = session_id
+                self._sessions[session_id] = worker
+            else:
+                self._spawning += 1
+
+        if evicted is not None:
+            evicted.close()
+        if worker is None:
+            # No warm worker: start one cold, without blocking other sessions
+            worker = self._spawn()
+            with self._lock:
+                bound = self._sessions.get(session_id)
+                if self._closed or (bound is not None and bound.is_alive()):
+                    # Shut down meanwhile, or another call bound this session first
+                    spare, worker = worker, bound
+                else:
+                    spare = None
+                    worker.session_id = session_id
+                    self._sessions[session_id] = worker
+            if spare is not None:
+                spare.close()
+            if worker is None:
+                raise RuntimeError("ReplWorkerPool has been shut down")
+        self._replenish()
+        return worker
+
+    def _discard(self, session_id, worker):
+        with self._lock:
+            if self._sessions.get(session_id) is worker:
+                del self._sessions[session_id]
+        worker.kill()
+        self._replenish()
+
+    def execute(self, session_id: str, code: str, timeout: float = 600, cwd: str | None = None) -> str:
+        """Run ``code`` in the session's worker and return its captured stdout.
+
+        On timeout the worker is killed with SIGKILL and the session starts from a fresh
+        namespace on its next call.
+        """
+        worker = self._acquire(session_id)
+        status, result = worker.request("exec", (code, cwd or os.getcwd()), timeout=timeout)
+        self.stats["executions"] += 1
+        worker.executions += 1
+
+        if status == "ok":
+            return result
+        if status == "timeout":
+            self.stats["timeouts"] += 1
+            self._discard(session_id, worker)
+            return (
+                f"ERROR: Code execution timed out after {timeout} seconds. The worker process was terminated "
+                "and all variables from previous steps were lost. Please try with simpler inputs or break your "
+                "task into smaller steps."
+            )
+        if status == "dead":
+            self.stats["crashes"] += 1
+            self._discard(session_id, worker)
+            return (
+                "Error: The Python worker process crashed (possibly out of memory). "
+                "All variables from previous steps were lost."
+            )
+        return f"Error in execution: {result}"
+
+    def inject(self, session_id: str, objects: dict) -> list:
+        """Copy picklable objects (e.g. custom tool functions) into the session namespace.
+
+        Returns:
+            The names that were injected. Objects that cannot be pickled are skipped.
+        """
+        worker = self._acquire(session_id)
+        payload = {}
+        for name, obj in objects.items():
+            # Skip objects this worker already holds; a respawned worker starts empty again
+            if worker.injected.get(name) == id(obj):
+                continue
+            try:
+                payload[name] = pickle.dumps(obj)
+            except Exception as e:
+                print(f"Warning: Could not send '{name}' to the REPL worker: {e}")
+        if not payload:
+            return []
+        status, result = worker.request("inject", payload, timeout=60)
+        if status in ("timeout", "dead"):
+            self._discard(session_id, worker)
+            return []
+        if status != "ok":
+            return []
+        for name in result:
+            worker.injected[name] = id(objects[name])
+        return result
+
+    def reset(self, session_id: str):
+        """Clear the namespace of a session without restarting its worker."""
+        with self._lock:
+            worker = self._sessions.get(session_id)
+        if worker is not None:
+            worker.request("reset", timeout=30)
+            worker.injected.clear()
+
+    def release(self, session_id: str):
+        """Terminate the worker bound to a session."""
+        with self._lock:
+            worker = self._sessions.pop(session_id, None)
+        if worker is not None:
+            worker.close()
+            self._replenish()
+
+    def sessions(self) -> list:
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "idle_workers": len(self._idle),
+                "active_sessions": len(self._sessions),
+                "max_workers": self.max_workers,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = self._idle + list(self._sessions.values())
+            self._idle = []
+            self._sessions.clear()
+        for worker in workers:
+            worker.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_repl_pool(**kwargs) -> ReplWorkerPool:
+    """Return the process-wide REPL worker pool, creating it on first use.
+
+    Keyword arguments are only honoured by the call that creates the pool.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ReplWorkerPool(**kwargs)
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
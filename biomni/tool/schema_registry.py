@@ -0,0 +1,140 @@
+"""In-memory registry of the API schemas in ``schema_db``.
+
+Each database tool used to ``pickle.load`` its schema on every call and ``_query_llm_for_api``
+re-serialized it with ``json.dumps(indent=2)``. The registry loads every schema once, keeps the
+object together with its pre-rendered JSON text, and reloads a file only when its mtime or size
+changes.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schema_db")
+
+
+class _Entry:
+    __slots__ = ("signature", "schema", "_text")
+
+    def __init__(self, signature, schema):
+        self.signature = signature
+        self.schema = schema
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.schema, indent=2)
+        return self._text
+
+
+class SchemaRegistry:
+    """Load ``<schema_dir>/<name>.pkl`` once and serve the object and its JSON text from memory.
+
+    Args:
+        schema_dir: Directory containing the pickled schemas
+
+    """
+
+    def __init__(self, schema_dir: str = SCHEMA_DIR, max_prompts: int = 256):
+        self.schema_dir = schema_dir
+        self.max_prompts = max_prompts
+        self._entries = {}
+        self._texts_by_id = {}  # id(schema object) -> entry, so rendering needs no name
+        self._prompts = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.schema_dir, f"{name}.pkl")
+
+    def _entry(self, name: str) -> _Entry:
+        path = self.path(name)
+        stat = os.stat(path)  # raises FileNotFoundError like the open() it replaces
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(name)
+        if entry is not None and entry.signature == signature:
+            return entry
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.signature == signature:
+                return entry
+            with open(path, "rb") as f:
+                schema = pickle.load(f)
+            if entry is not None:
+                self._texts_by_id.pop(id(entry.schema), None)
+            entry = _Entry(signature, schema)
+            self._entries[name] = entry
+            self._texts_by_id[id(schema)] = entry
+            self.loads += 1
+            return entry
+
+    def get(self, name: str, required: bool = True):
+        """Return the schema object for ``name``.
+
+        Args:
+            name: Schema file name without ``.pkl`` (e.g. "uniprot")
+            required: If False, return None when the file does not exist instead of raising
+
+        """
+        try:
+            return self._entry(name).schema
+        except FileNotFoundError:
+            if required:
+                raise
+            return None
+
+    def render(self, schema) -> str:
+        """JSON text of a schema; pre-rendered and cached for schemas served by the registry."""
+        entry = self._texts_by_id.get(id(schema))
+        if entry is not None and entry.schema is schema:
+            return entry.text
+        return json.dumps(schema, indent=2)
+
+    def system_prompt(self, system_template: str, schema) -> tuple[str, str]:
+        """Format ``system_template`` with the schema text; returns ``(prompt, fingerprint)``.
+
+        Prompts for registry schemas are cached, so repeated calls cost a dict lookup.
+        """
+        if schema is None:
+            return system_template, hashlib.sha1(system_template.encode("utf-8")).hexdigest()[:16]
+        entry = self._texts_by_id.get(id(schema))
+        cacheable = entry is not None and entry.schema is schema
+        key = (system_template, id(schema))
+        if cacheable:
+            with self._lock:
+                cached = self._prompts.get(key)
+                if cached is not None and cached[0] is schema:
+                    self._prompts.move_to_end(key)
+                    return cached[1], cached[2]
+        prompt = system_template.format(schema=self.render(schema))
+        fingerprint = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+        if cacheable:
+            with self._lock:
+                self._prompts[key] = (schema, prompt, fingerprint)
+                while len(self._prompts) > self.max_prompts:
+                    self._prompts.popitem(last=False)
+        return prompt, fingerprint
+
+    def preload(self, names=None):
+        """Load (and render) the given schemas, or every schema in the directory."""
+        if names is None:
+            names = sorted(f[:-4] for f in os.listdir(self.schema_dir) if f.endswith(".pkl"))
+        for name in names:
+            _ = self._entry(name).text  # render the JSON text eagerly
+        return names
+
+
+_registry = SchemaRegistry()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    return _registry
+
+
+def load_schema(name: str, required: bool = True):
+    """Schema object for ``schema_db/<name>.pkl`` from the shared registry."""
+    return _registry.get(name, required=required)
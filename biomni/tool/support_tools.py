@@ -23,7 +23,8 @@ def run_python_repl(command: str) -> str:
             exec(command, _persistent_namespace)
             output = mystdout.getvalue()
         except Exception as e:
-            output = f"Error: {str(e)}"
+            # Keep what the command printed before failing
+            output = mystdout.getvalue() + f"Error: {str(e)}"
         finally:
             sys.stdout = old_stdout
         return output
@@ -32,6 +33,17 @@ def run_python_repl(command: str) -> str:
     return execute_in_repl(command)
 
 
+def run_python_repl_isolated(command: str, session_id: str = "default", timeout: int = 600) -> str:
+    """Executes the provided Python command in the session's dedicated worker process.
+    Variables persist across executions of the same session but are never shared between sessions.
+    A command running past the timeout is hard-killed and the session restarts from an empty namespace.
+    """
+    from biomni.tool.repl_pool import get_repl_pool
+
+    command = command.strip("```").strip()
+    return get_repl_pool().execute(session_id, command, timeout=timeout)
+
+
 def read_function_source_code(function_name: str) -> str:
     """Read the source code of a function from any module path.
 
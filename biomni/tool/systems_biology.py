@@ -1,7 +1,17 @@
+def load_chatnt(device=-1):
+    """Load the ChatNT ``transformers`` pipeline on ``device`` (-1 for CPU)."""
+    from transformers import pipeline
+
+    return pipeline(model="InstaDeepAI/ChatNT", trust_remote_code=True, device=int(device))
+
+
 def query_chatnt(question, sequence, device=-1):
     """
     Call ChatNT to answer a question about a DNA sequence.
 
+    The pipeline is loaded once per process and kept in the shared model pool
+    (see ``biomni.tool.model_pool``), so only the first call pays the loading cost.
+
     Parameters:
     -----------
     question : str
@@ -16,17 +26,15 @@ def query_chatnt(question, sequence, device=-1):
     str
         Answer to the question
     """
-    import torch
-    from transformers import pipeline
-
-    pipe = pipeline(model="InstaDeepAI/ChatNT", trust_remote_code=True, device=device)
+    from biomni.tool.model_pool import get_model_pool
 
     # Define custom inputs (note that the number of <DNA> token in the english sequence must be equal to len(dna_sequences))
     english_sequence = f"{question} <DNA> ?"
     dna_sequences = [sequence]
 
     # Generate sequence
-    generated_english_sequence = pipe(inputs={"english_sequence": english_sequence, "dna_sequences": dna_sequences})
+    with get_model_pool().acquire(f"chatnt/{int(device)}") as pipe:
+        generated_english_sequence = pipe(inputs={"english_sequence": english_sequence, "dna_sequences": dna_sequences})
 
     return generated_english_sequence
 
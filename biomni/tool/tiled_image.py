@@ -0,0 +1,1227 @@
+"""Tiled processing of images too large to load or process whole.
+
+The histology and microscopy tools read the whole image into memory and processed it in one
+thread, so whole-slide images and micro-CT volumes ran out of memory or took very long. This
+module lets them work tile by tile within a fixed memory budget:
+
+- ``LazyImage`` reads only the regions it is indexed with: uncompressed TIFF and ``.npy`` files
+  are memory-mapped, compressed or tiled TIFFs are read through ``zarr`` (when installed).
+  ``Workspace.open`` decodes any other format once and spills it to a scratch ``.npy`` file;
+- ``plan_tiles`` cuts an image into tiles sized so that the tiles in flight fit
+  ``BIOMNI_TILE_MEMORY_MB``. Each tile has a core, which it is responsible for, and a halo of
+  context pixels read around it;
+- ``map_tiles`` runs a function over the tiles on a process pool (workers read their own tiles,
+  so pixels are never pickled) and yields the results in tile order. The calls made while a
+  ``Workspace`` is open share one pool. Tiles run in the calling process inside daemonic
+  processes, which may not start children (e.g. REPL pool workers), and when the pool breaks
+  (e.g. a script without a ``__main__`` guard under the spawn start method);
+- whole-image steps are computed over tiles with the same results as ``skimage``: min/max,
+  histograms, percentiles and Otsu thresholds, CLAHE, gray-level co-occurrence matrices,
+  connected components (labels are merged across tile borders and numbered in raster order, as
+  ``skimage.measure.label`` does), small object and hole removal, hysteresis thresholding and
+  Euclidean distance maps;
+- pixel outputs (masks, label images, overlays) go to memory-mapped files made by
+  ``create_image``.
+
+Functions passed to ``map_tiles`` (and their arguments) must be picklable, e.g. module-level
+functions or ``functools.partial`` of them.
+"""
+
+import functools
+import itertools
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+import numpy as np
+
+DEFAULT_TILED_IMAGE_MB = 256
+DEFAULT_TILE_MEMORY_MB = 2048
+TIFF_SUFFIXES = (".tif", ".tiff", ".btf", ".svs")
+
+# Files opened by a worker process, reused across the tiles of one map_tiles call. Pools outlive
+# a call when a Workspace shares them, so every call gets a new generation and workers drop the
+# files of the previous one (a file re-created between calls is never read through a stale map)
+_worker_arrays = None
+_worker_generation = None
+_tile_generation = 0
+
+# Workspaces open in each thread; map_tiles uses the pool of the innermost one
+_open = threading.local()
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def tiled_image_threshold() -> int:
+    """Decoded size in bytes above which tools switch to tiles (``BIOMNI_TILED_IMAGE_MB``)."""
+    return int(float(os.getenv("BIOMNI_TILED_IMAGE_MB", DEFAULT_TILED_IMAGE_MB)) * 1024 * 1024)
+
+
+def tile_memory_budget() -> int:
+    """Bytes available to the tiles in flight (``BIOMNI_TILE_MEMORY_MB``)."""
+    return int(float(os.getenv("BIOMNI_TILE_MEMORY_MB", DEFAULT_TILE_MEMORY_MB)) * 1024 * 1024)
+
+
+def _open_array(path: str, mode: str):
+    """Memory map or ``zarr`` array of an image file; raises ValueError if it cannot be read lazily."""
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode=mode)
+    if not path.lower().endswith(TIFF_SUFFIXES):
+        raise ValueError(f"{path} cannot be read lazily")
+    import tifffile
+
+    try:
+        return tifffile.memmap(path, mode=mode)
+    except ValueError:
+        pass  # compressed, tiled or not contiguous
+    if mode != "r":
+        raise ValueError(f"{path} is not memory-mappable")
+    try:
+        import zarr
+    except ImportError as e:
+        raise ValueError(f"{path} is compressed; install zarr to read it lazily") from e
+    array = zarr.open(tifffile.imread(path, aszarr=True), mode="r")
+    if isinstance(array, zarr.Group):
+        # Pyramidal files: the full-resolution level
+        array = array["0"]
+    return array
+
+
+class LazyImage:
+    """Array-like view of an image file; indexing reads (or writes) only the indexed region.
+
+    Instances pickle as their path, so worker processes reopen the file instead of receiving
+    its pixels.
+
+    Args:
+        path: ``.npy`` or TIFF file
+        mode: ``"r"``, or ``"r+"`` to write through a memory map
+
+    Raises:
+        ValueError: If the file cannot be read lazily
+
+    """
+
+    def __init__(self, path, mode: str = "r"):
+        self.path = os.path.abspath(str(path))
+        self.mode = mode
+        key = (self.path, mode)
+        if _worker_arrays is not None and key in _worker_arrays:
+            self._array = _worker_arrays[key]
+        else:
+            self._array = _open_array(self.path, mode)
+            if _worker_arrays is not None:
+                _worker_arrays[key] = self._array
+
+    def __getstate__(self):
+        return {"path": self.path, "mode": self.mode, "generation": _tile_generation}
+
+    def __setstate__(self, state):
+        global _worker_generation
+        if _worker_arrays is not None and state.get("generation") != _worker_generation:
+            _worker_arrays.clear()
+            _worker_generation = state.get("generation")
+        self.__init__(state["path"], state["mode"])
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(self._array.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self._array.dtype)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return math.prod(self.shape) * self.dtype.itemsize
+
+    def __getitem__(self, key) -> np.ndarray:
+        return np.asarray(self._array[key])
+
+    def __setitem__(self, key, value):
+        self._array[key] = value
+
+    def flush(self):
+        flush = getattr(self._array, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def create_image(path, shape, dtype) -> LazyImage:
+    """Create a writable memory-mapped image: a TIFF if ``path`` ends in .tif/.tiff, else ``.npy``."""
+    path = str(path)
+    shape = tuple(int(s) for s in shape)
+    if path.lower().endswith((".tif", ".tiff")):
+        import tifffile
+
+        photometric = "rgb" if len(shape) == 3 and shape[-1] in (3, 4) else "minisblack"
+        array = tifffile.memmap(path, shape=shape, dtype=dtype, photometric=photometric)
+    else:
+        array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    array.flush()
+    del array
+    return LazyImage(path, mode="r+")
+
+
+def image_nbytes(path) -> int | None:
+    """Decoded size of an image file read from its header, or None if unknown."""
+    try:
+        return LazyImage(path).nbytes
+    except (ValueError, OSError):
+        pass
+    try:
+        from PIL import Image
+
+        with Image.open(path) as image:
+            width, height = image.size
+            bytes_per_band = {"I": 4, "F": 4}.get(image.mode, 2 if image.mode.startswith("I;16") else 1)
+            return width * height * len(image.getbands()) * bytes_per_band
+    except Exception:
+        return None
+
+
+def use_tiles(path, tiled: bool | None = None) -> bool:
+    """Whether to process ``path`` tile by tile: ``tiled`` if given, else when the decoded image
+    is larger than ``BIOMNI_TILED_IMAGE_MB``."""
+    if tiled is not None:
+        return bool(tiled)
+    size = image_nbytes(path)
+    return size is not None and size > tiled_image_threshold()
+
+
+class Workspace:
+    """Scratch directory for the intermediate images of one tiled analysis, deleted on exit.
+
+    Until it is closed, ``map_tiles`` calls made in the same thread share one worker pool.
+
+    Args:
+        directory: Where to create it; defaults to ``BIOMNI_TILE_SCRATCH_DIR`` or the system
+            temporary directory
+
+    """
+
+    def __init__(self, directory: str | None = None):
+        self.path = tempfile.mkdtemp(prefix="biomni-tiles-", dir=directory or os.getenv("BIOMNI_TILE_SCRATCH_DIR"))
+        self._count = 0
+        self._executors = {}
+        self._pool_failed = False
+        self._registry = _open_workspaces()
+        self._registry.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self in self._registry:
+            self._registry.remove(self)
+        for executor in self._executors.values():
+            executor.shutdown(cancel_futures=True)
+        self._executors.clear()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _executor(self, n_workers: int):
+        """The shared pool of ``n_workers`` processes (None once a pool has failed to run)."""
+        if self._pool_failed:
+            return None
+        if n_workers not in self._executors:
+            self._executors[n_workers] = _new_executor(n_workers)
+        return self._executors[n_workers]
+
+    def _discard_executor(self, n_workers: int):
+        self._pool_failed = True
+        executor = self._executors.pop(n_workers, None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def open(self, path, reader=None) -> LazyImage:
+        """``path`` as a LazyImage; formats that cannot be read lazily are decoded once with
+        ``reader`` (default ``skimage.io.imread``) and spilled to the workspace.
+
+        Raises:
+            OSError: If the reader returns None
+
+        """
+        try:
+            return LazyImage(path)
+        except ValueError:
+            pass
+        if reader is None:
+            from skimage import io
+
+            reader = io.imread
+        pixels = reader(path)
+        if pixels is None:
+            raise OSError(f"Could not read image {path}")
+        image = self.create("input", pixels.shape, pixels.dtype)
+        image[...] = pixels
+        image.flush()
+        return image
+
+    def create(self, name: str, shape, dtype) -> LazyImage:
+        """A new writable scratch image."""
+        self._count += 1
+        return create_image(os.path.join(self.path, f"{self._count:03d}_{name}.npy"), shape, dtype)
+
+
+class Tile(NamedTuple):
+    """A block of an image. ``core`` is the part the tile is responsible for and ``region`` the
+    core plus the halo read around it, clipped to the image. Both index the leading axes."""
+
+    core: tuple
+    region: tuple
+
+    @property
+    def inner(self) -> tuple:
+        """``core`` in the coordinates of ``region``."""
+        return tuple(slice(c.start - r.start, c.stop - r.start) for c, r in zip(self.core, self.region, strict=True))
+
+    @property
+    def origin(self) -> tuple:
+        return tuple(r.start for r in self.region)
+
+    def with_halo(self, halo, shape) -> "Tile":
+        """The same core with a different halo."""
+        halo = (halo,) * len(self.core) if isinstance(halo, int) else tuple(halo)
+        region = tuple(
+            slice(max(c.start - h, 0), min(c.stop + h, n)) for c, h, n in zip(self.core, halo, shape, strict=False)
+        )
+        return Tile(self.core, region)
+
+
+def tile_grid(shape, tile_shape, halo=0) -> list[Tile]:
+    """Row-major grid of tiles covering the leading ``len(tile_shape)`` axes of ``shape``."""
+    tile_shape = tuple(int(t) for t in tile_shape)
+    starts = [range(0, size, step) for size, step in zip(shape, tile_shape, strict=False)]
+    tiles = []
+    for corner in itertools.product(*starts):
+        core = tuple(slice(s, min(s + t, n)) for s, t, n in zip(corner, tile_shape, shape, strict=False))
+        tiles.append(Tile(core, core).with_halo(halo, shape))
+    return tiles
+
+
+def plan_tiles(
+    shape, bytes_per_pixel: float, halo=0, axes: int = 2, n_workers: int | None = None, memory_budget=None
+) -> list[Tile]:
+    """Tiles over the leading ``axes`` axes, as large as the memory budget allows.
+
+    Args:
+        shape: Image shape
+        bytes_per_pixel: Working memory per pixel of a tile region (input and intermediates)
+        halo: Context pixels around each core
+        axes: Number of leading axes to tile (e.g. 1 for slabs of a volume)
+        n_workers: Worker processes; two tiles per worker are in flight
+        memory_budget: Bytes for all tiles in flight; defaults to ``BIOMNI_TILE_MEMORY_MB``
+
+    """
+    n_workers = n_workers or available_cores()
+    memory_budget = memory_budget or tile_memory_budget()
+    halo = max(halo) if isinstance(halo, tuple | list) else halo
+    trailing = math.prod(shape[axes:])
+    pixels = memory_budget / (2 * n_workers * bytes_per_pixel * trailing)
+    side = max(int(pixels ** (1 / axes)) - 2 * halo, halo, 1)
+    return tile_grid(shape, tuple(min(side, n) for n in shape[:axes]), halo)
+
+
+def _init_worker(threads: int):
+    global _worker_arrays
+    # Keep workers from oversubscribing the cores with their own BLAS/OpenMP threads
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    _worker_arrays = {}
+
+
+def _open_workspaces() -> list:
+    if not hasattr(_open, "workspaces"):
+        _open.workspaces = []
+    return _open.workspaces
+
+
+def _new_executor(n_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(max(1, available_cores() // n_workers),),
+    )
+
+
+def _pooled_results(executor, function, calls, args, in_flight: int):
+    pending = deque()
+    for call in calls:
+        try:
+            pending.append(executor.submit(function, *call, *args))
+        except OSError as e:
+            # Worker processes could not be started. The RuntimeError raised while a spawned
+            # child is still bootstrapping (no __main__ guard) is left to end that child, which
+            # the parent then sees as a broken pool
+            raise BrokenProcessPool(str(e)) from e
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def map_tiles(function, tiles, *args, tile_args=None, n_workers: int | None = None):
+    """Yield ``function(tile, *args)`` for every tile, in order, computed on a process pool.
+
+    Tiles run in this process inside daemonic processes and, with a warning, from the first
+    unfinished tile on when the pool breaks.
+
+    Args:
+        function: Picklable function of a tile and ``args``
+        tiles: Tiles to process
+        tile_args: Optional per-tile argument, passed after the tile
+        n_workers: Worker processes; None uses the available cores, 1 runs in this process
+
+    """
+    global _tile_generation
+    tiles = list(tiles)
+    calls = [(tile,) if tile_args is None else (tile, tile_args[i]) for i, tile in enumerate(tiles)]
+    pool_size = n_workers or available_cores()
+    n_workers = min(pool_size, len(tiles))
+    done = 0
+    if n_workers > 1 and not multiprocessing.current_process().daemon:
+        workspaces = _open_workspaces()
+        workspace = workspaces[-1] if workspaces else None
+        executor = _new_executor(pool_size) if workspace is None else workspace._executor(pool_size)
+        if executor is not None:
+            _tile_generation += 1
+            try:
+                for result in _pooled_results(executor, function, calls, args, 2 * n_workers):
+                    yield result
+                    done += 1
+            except BrokenProcessPool as e:
+                if workspace is not None:
+                    workspace._discard_executor(pool_size)
+                warnings.warn(
+                    f"Tile worker pool failed ({e}); running the remaining tiles in this process",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+            finally:
+                if workspace is None:
+                    executor.shutdown(cancel_futures=True)
+    for call in calls[done:]:
+        yield function(*call, *args)
+
+
+def run_tiles(function, tiles, *args, tile_args=None, n_workers: int | None = None):
+    """``map_tiles`` for functions called only for their side effects (writing outputs)."""
+    for _ in map_tiles(function, tiles, *args, tile_args=tile_args, n_workers=n_workers):
+        pass
+
+
+class ChannelsLast:
+    """Read-only view of a ``(channels, rows, cols)`` image as ``(rows, cols, channels)``, for
+    tiling multichannel stacks stored channel-first. Only the spatial axes can be indexed."""
+
+    def __init__(self, image):
+        self.image = image
+
+    @property
+    def shape(self) -> tuple:
+        return (*self.image.shape[1:], self.image.shape[0])
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self.image.dtype)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __getitem__(self, key) -> np.ndarray:
+        key = key if isinstance(key, tuple) else (key,)
+        return np.moveaxis(np.asarray(self.image[(slice(None), *key)]), 0, -1)
+
+
+def _take_channel(values, index):
+    return values[..., index]
+
+
+def channel(index: int):
+    """Picklable transform selecting one channel of a channels-last image."""
+    return functools.partial(_take_channel, index=index)
+
+
+def _values(image, tile: Tile, transform=None, region: bool = False) -> np.ndarray:
+    values = image[tile.region if region else tile.core]
+    return values if transform is None else transform(values)
+
+
+# Whole-image statistics
+
+
+def _min_max_tile(tile, image, transform):
+    values = _values(image, tile, transform)
+    return (values.min(), values.max(), values.size) if values.size else None
+
+
+def _min_max_count(image, tiles, transform, n_workers):
+    results = [r for r in map_tiles(_min_max_tile, tiles, image, transform, n_workers=n_workers) if r is not None]
+    return min(r[0] for r in results), max(r[1] for r in results), sum(r[2] for r in results)
+
+
+def tiled_min_max(image, tiles, transform=None, n_workers: int | None = None):
+    """Minimum and maximum of ``transform(image)``."""
+    return _min_max_count(image, tiles, transform, n_workers)[:2]
+
+
+def _histogram_tile(tile, image, transform, nbins, value_range):
+    values = _values(image, tile, transform).ravel()
+    if np.issubdtype(values.dtype, np.integer):
+        return np.bincount(values.astype(np.int64) - int(value_range[0]), minlength=nbins)
+    return np.histogram(values, bins=nbins, range=value_range)[0]
+
+
+def _sum(arrays):
+    total = None
+    for array in arrays:
+        total = array if total is None else total + array
+    return total
+
+
+def tiled_histogram(image, tiles, transform=None, nbins: int = 256, value_range=None, n_workers: int | None = None):
+    """``skimage.exposure.histogram(transform(image), nbins)``: one bin per value for integer
+    images, ``nbins`` bins between the minimum and maximum otherwise.
+
+    Returns:
+        Counts and bin centers
+
+    """
+    low, high = value_range if value_range is not None else tiled_min_max(image, tiles, transform, n_workers)
+    if np.issubdtype(np.asarray(low).dtype, np.integer):
+        low, high = int(low), int(high)
+        counts = _sum(
+            map_tiles(_histogram_tile, tiles, image, transform, high - low + 1, (low, high), n_workers=n_workers)
+        )
+        return counts, np.arange(low, high + 1)
+    counts = _sum(map_tiles(_histogram_tile, tiles, image, transform, nbins, (low, high), n_workers=n_workers))
+    edges = np.histogram_bin_edges(np.empty(0, dtype=np.asarray(low).dtype), bins=nbins, range=(low, high))
+    return counts, (edges[:-1] + edges[1:]) / 2.0
+
+
+def tiled_threshold_otsu(image, tiles, transform=None, nbins: int = 256, n_workers: int | None = None):
+    """``skimage.filters.threshold_otsu(transform(image), nbins)``."""
+    from skimage.filters import threshold_otsu
+
+    low, high = tiled_min_max(image, tiles, transform, n_workers)
+    if low == high:
+        return low
+    return threshold_otsu(hist=tiled_histogram(image, tiles, transform, nbins, (low, high), n_workers))
+
+
+def _rank_values_tile(tile, image, transform, intervals):
+    values = _values(image, tile, transform).ravel()
+    return [(int((values < low).sum()), np.sort(values[(values >= low) & (values <= high)])) for low, high in intervals]
+
+
+def tiled_percentile(image, tiles, q, transform=None, n_workers: int | None = None) -> np.ndarray:
+    """``numpy.percentile(transform(image), q)`` (linear interpolation).
+
+    The values around each requested rank are located with a fine histogram and then collected
+    exactly, so only a small fraction of the pixels is ever held at once.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    low, high, count_total = _min_max_count(image, tiles, transform, n_workers)
+    # numpy's "linear" method
+    virtual = (count_total - 1) * np.true_divide(q, 100)
+    previous = np.floor(virtual).astype(np.intp)
+    following = np.minimum(previous + 1, count_total - 1)
+    previous = np.minimum(previous, count_total - 1)
+    ranks = np.unique(np.concatenate([previous.ravel(), following.ravel()]))
+
+    nbins = 1 << 16
+    edges = np.histogram_bin_edges(np.empty(0, dtype=np.float64), bins=nbins, range=(float(low), float(high)))
+    counts = _sum(
+        map_tiles(
+            _histogram_tile, tiles, image, _as_float(transform), nbins, (float(low), float(high)), n_workers=n_workers
+        )
+    )
+    bins = np.searchsorted(np.cumsum(counts), ranks, side="right")
+    intervals = [(edges[b], edges[b + 1]) for b in bins]
+    results = list(map_tiles(_rank_values_tile, tiles, image, transform, intervals, n_workers=n_workers))
+    values = {}
+    for i, rank in enumerate(ranks):
+        below = sum(result[i][0] for result in results)
+        selected = np.sort(np.concatenate([result[i][1] for result in results]))
+        values[int(rank)] = selected[int(rank) - below]
+
+    a = np.array([values[int(r)] for r in previous.ravel()]).reshape(previous.shape)
+    b = np.array([values[int(r)] for r in following.ravel()]).reshape(previous.shape)
+    gamma = np.asarray(virtual - previous, dtype=virtual.dtype)
+    # numpy's _lerp
+    difference = np.subtract(b, a)
+    result = np.add(a, difference * gamma)
+    np.subtract(b, difference * (1 - gamma), out=result, where=gamma >= 0.5, casting="unsafe", dtype=result.dtype)
+    return result
+
+
+def float_dtype(dtype) -> np.dtype:
+    """Float dtype skimage computes ``dtype`` images in: float32 for float16/float32, else float64."""
+    return np.dtype(np.float32) if np.dtype(dtype) in (np.float16, np.float32) else np.dtype(np.float64)
+
+
+def _to_float(values, transform=None):
+    values = values if transform is None else transform(values)
+    return values.astype(np.float64, copy=False)
+
+
+def _as_float(transform):
+    return functools.partial(_to_float, transform=transform)
+
+
+# Pixel-wise and neighbourhood operations
+
+
+def _apply_tile(tile, source, out, function, halo):
+    values = source[tile.region if halo else tile.core]
+    result = function(values)
+    out[tile.core] = result[tile.inner] if halo else result
+
+
+def apply_tiled(function, source, out, tiles, n_workers: int | None = None):
+    """Write ``function(source)`` to ``out``, computed tile by tile.
+
+    ``function`` must be pixel-wise, or only look as far as the tiles' halo; it is applied to
+    each tile region and the core of its result is written.
+    """
+    halo = any(tile.region != tile.core for tile in tiles)
+    run_tiles(_apply_tile, tiles, source, out, function, halo, n_workers=n_workers)
+    out.flush()
+
+
+def _compare(values, threshold, above, transform=None):
+    values = values if transform is None else transform(values)
+    return values > threshold if above else values < threshold
+
+
+def threshold_tiled(image, out, tiles, threshold, above: bool = True, transform=None, n_workers: int | None = None):
+    """Write the mask ``transform(image) > threshold`` (``<`` if not ``above``) to ``out``."""
+    compare = functools.partial(_compare, threshold=threshold, above=above, transform=transform)
+    apply_tiled(compare, image, out, [Tile(tile.core, tile.core) for tile in tiles], n_workers)
+
+
+def _count_tile(tile, image, transform):
+    return int(np.count_nonzero(_values(image, tile, transform)))
+
+
+def count_nonzero_tiled(image, tiles, transform=None, n_workers: int | None = None) -> int:
+    return sum(map_tiles(_count_tile, tiles, image, transform, n_workers=n_workers))
+
+
+# Connected components
+
+
+class Components(NamedTuple):
+    """Connected components of a mask, labelled per tile and merged across tile borders.
+
+    Components are numbered from 1 in raster order of their first pixel, like
+    ``skimage.measure.label``. ``luts[i]`` maps the labels ``scipy.ndimage.label`` gives in the
+    core of ``tiles[i]`` to these numbers.
+    """
+
+    count: int
+    areas: np.ndarray
+    first_pixels: np.ndarray  # flat index of the first pixel of each component
+    bboxes: np.ndarray  # (min_row, min_col, max_row + 1, max_col + 1) of each component
+    luts: list
+    tiles: list
+    connectivity: int
+    invert: bool
+
+
+def _label_core(values, connectivity, invert):
+    from scipy import ndimage
+
+    mask = values.astype(bool, copy=False)
+    if invert:
+        mask = ~mask
+    structure = ndimage.generate_binary_structure(mask.ndim, connectivity)
+    return ndimage.label(mask, structure=structure)
+
+
+def _label_tile(tile, mask, connectivity, invert, width):
+    from scipy import ndimage
+
+    labels, n = _label_core(mask[tile.core], connectivity, invert)
+    row0, col0 = tile.core[0].start, tile.core[1].start
+    flat = labels.ravel()
+    nonzero = np.flatnonzero(flat)
+    _, first = np.unique(flat[nonzero], return_index=True)
+    first = nonzero[first]
+    first_rows, first_cols = np.divmod(first, labels.shape[1])
+    bboxes = np.array(
+        [(s[0].start, s[1].start, s[0].stop, s[1].stop) for s in ndimage.find_objects(labels)], dtype=np.int64
+    ).reshape(-1, 4)
+    bboxes += (row0, col0, row0, col0)
+    return {
+        "count": n,
+        "areas": np.bincount(flat, minlength=n + 1)[1:],
+        "first_pixels": (first_rows + row0) * width + first_cols + col0,
+        "bboxes": bboxes,
+        "edges": (labels[0].copy(), labels[-1].copy(), labels[:, 0].copy(), labels[:, -1].copy()),
+    }
+
+
+def _seam_pairs(before, after, connectivity):
+    """Pairs of component ids on either side of a seam that touch."""
+    pairs = []
+    shifts = (-1, 0, 1) if connectivity > 1 else (0,)
+    n = len(before)
+    for shift in shifts:
+        a = before[max(0, -shift) : n - max(0, shift)]
+        b = after[max(0, shift) : n - max(0, -shift)]
+        touching = (a >= 0) & (b >= 0)
+        pairs.append(np.stack([a[touching], b[touching]]))
+    return np.concatenate(pairs, axis=1)
+
+
+def label_tiled(mask, tiles, connectivity: int = 2, invert: bool = False, n_workers: int | None = None) -> Components:
+    """Connected components of a 2D mask (of ``~mask`` if ``invert``).
+
+    Args:
+        mask: 2D mask
+        tiles: Tiles; only their cores are used
+        connectivity: 1 for 4-connected, 2 for 8-connected components
+        invert: Label the background instead
+
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    height, width = mask.shape[:2]
+    results = list(map_tiles(_label_tile, tiles, mask, connectivity, invert, width, n_workers=n_workers))
+    offsets = np.cumsum([0] + [r["count"] for r in results])
+    total = int(offsets[-1])
+
+    def global_ids(i, labels):
+        return np.where(labels > 0, labels.astype(np.int64) + offsets[i] - 1, -1)
+
+    # Components touching across horizontal seams (full image width) and vertical seams
+    pairs = [np.zeros((2, 0), dtype=np.int64)]
+    for seam in sorted({t.core[0].start for t in tiles} - {0}):
+        above, below = np.full(width, -1, dtype=np.int64), np.full(width, -1, dtype=np.int64)
+        for i, tile in enumerate(tiles):
+            columns = tile.core[1]
+            if tile.core[0].stop == seam:
+                above[columns] = global_ids(i, results[i]["edges"][1])
+            elif tile.core[0].start == seam:
+                below[columns] = global_ids(i, results[i]["edges"][0])
+        pairs.append(_seam_pairs(above, below, connectivity))
+    for seam in sorted({t.core[1].start for t in tiles} - {0}):
+        left, right = np.full(height, -1, dtype=np.int64), np.full(height, -1, dtype=np.int64)
+        for i, tile in enumerate(tiles):
+            rows = tile.core[0]
+            if tile.core[1].stop == seam:
+                left[rows] = global_ids(i, results[i]["edges"][3])
+            elif tile.core[1].start == seam:
+                right[rows] = global_ids(i, results[i]["edges"][2])
+        pairs.append(_seam_pairs(left, right, connectivity))
+    pairs = np.concatenate(pairs, axis=1)
+
+    graph = coo_matrix((np.ones(pairs.shape[1]), (pairs[0], pairs[1])), shape=(total, total))
+    count, component = connected_components(graph, directed=False) if total else (0, np.zeros(0, dtype=np.int64))
+
+    areas = np.concatenate([r["areas"] for r in results]) if total else np.zeros(0, dtype=np.int64)
+    first_pixels = np.concatenate([r["first_pixels"] for r in results]) if total else np.zeros(0, dtype=np.int64)
+    bboxes = np.concatenate([r["bboxes"] for r in results]) if total else np.zeros((0, 4), dtype=np.int64)
+    component_areas = np.bincount(component, weights=areas, minlength=count).astype(np.int64)
+    component_first = np.full(count, np.iinfo(np.int64).max)
+    np.minimum.at(component_first, component, first_pixels)
+    component_bboxes = np.empty((count, 4), dtype=np.int64)
+    component_bboxes[:, :2] = np.iinfo(np.int64).max
+    component_bboxes[:, 2:] = -1
+    np.minimum.at(component_bboxes[:, 0], component, bboxes[:, 0])
+    np.minimum.at(component_bboxes[:, 1], component, bboxes[:, 1])
+    np.maximum.at(component_bboxes[:, 2], component, bboxes[:, 2])
+    np.maximum.at(component_bboxes[:, 3], component, bboxes[:, 3])
+
+    # Number components in raster order of their first pixel
+    order = np.argsort(component_first, kind="stable")
+    number = np.empty(count, dtype=np.int64)
+    number[order] = np.arange(1, count + 1)
+    luts = [np.concatenate([[0], number[component[offsets[i] : offsets[i + 1]]]]) for i in range(len(tiles))]
+    return Components(
+        count=count,
+        areas=component_areas[order],
+        first_pixels=component_first[order],
+        bboxes=component_bboxes[order],
+        luts=luts,
+        tiles=[Tile(t.core, t.core) for t in tiles],
+        connectivity=connectivity,
+        invert=invert,
+    )
+
+
+def _relabel_tile(tile, lut, mask, out, connectivity, invert):
+    labels, _ = _label_core(mask[tile.core], connectivity, invert)
+    out[tile.core] = lut[labels]
+
+
+def write_labels(components: Components, mask, out, n_workers: int | None = None):
+    """Write the label image of ``components`` (computed from ``mask``) to ``out``."""
+    luts = [lut.astype(out.dtype) for lut in components.luts]
+    run_tiles(
+        _relabel_tile,
+        components.tiles,
+        mask,
+        out,
+        components.connectivity,
+        components.invert,
+        tile_args=luts,
+        n_workers=n_workers,
+    )
+    out.flush()
+
+
+def _select_tile(tile, selected, mask, out, connectivity, invert):
+    values = mask[tile.core].astype(bool, copy=False)
+    labels, _ = _label_core(values, connectivity, invert)
+    out[tile.core] = values | selected[labels] if invert else selected[labels]
+
+
+def _select_components(components, selected, mask, out, n_workers):
+    selected = np.concatenate([[False], selected])
+    run_tiles(
+        _select_tile,
+        components.tiles,
+        mask,
+        out,
+        components.connectivity,
+        components.invert,
+        tile_args=[selected[lut] for lut in components.luts],
+        n_workers=n_workers,
+    )
+    out.flush()
+
+
+@functools.cache
+def _too_small(threshold: int):
+    """Whether scikit-image removes an object of ``threshold`` pixels given that size threshold.
+
+    Since 0.26 the positional size threshold of ``remove_small_objects``/``remove_small_holes``
+    is read as the inclusive ``max_size``; before, only strictly smaller objects were removed.
+    """
+    from skimage import morphology
+
+    probe = np.zeros((1, threshold + 2), dtype=bool)
+    probe[0, 1 : threshold + 1] = True
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return not morphology.remove_small_objects(probe, threshold).any()
+
+
+def _small(areas: np.ndarray, threshold: int) -> np.ndarray:
+    return areas <= threshold if _too_small(int(threshold)) else areas < threshold
+
+
+def remove_small_objects_tiled(mask, out, tiles, min_size: int, connectivity: int = 1, n_workers: int | None = None):
+    """``skimage.morphology.remove_small_objects(mask, min_size, connectivity)`` written to ``out``."""
+    components = label_tiled(mask, tiles, connectivity, n_workers=n_workers)
+    _select_components(components, ~_small(components.areas, min_size), mask, out, n_workers)
+
+
+def remove_small_holes_tiled(
+    mask, out, tiles, area_threshold: int, connectivity: int = 1, n_workers: int | None = None
+):
+    """``skimage.morphology.remove_small_holes(mask, area_threshold, connectivity)`` written to ``out``."""
+    components = label_tiled(mask, tiles, connectivity, invert=True, n_workers=n_workers)
+    _select_components(components, _small(components.areas, area_threshold), mask, out, n_workers)
+
+
+def _marked_tile(tile, lut, mask, markers, connectivity, invert):
+    labels, _ = _label_core(mask[tile.core], connectivity, invert)
+    return np.unique(lut[labels[markers[tile.core].astype(bool, copy=False)]])
+
+
+def hysteresis_tiled(weak, strong, out, tiles, connectivity: int = 2, n_workers: int | None = None):
+    """Components of the mask ``weak`` that contain a pixel of ``strong``, written to ``out``: the
+    edge tracing of ``skimage.feature.canny`` and ``skimage.filters.apply_hysteresis_threshold``."""
+    components = label_tiled(weak, tiles, connectivity, n_workers=n_workers)
+    selected = np.zeros(components.count + 1, dtype=bool)
+    marked = map_tiles(
+        _marked_tile,
+        components.tiles,
+        weak,
+        strong,
+        connectivity,
+        False,
+        tile_args=components.luts,
+        n_workers=n_workers,
+    )
+    for labels in marked:
+        selected[labels] = True
+    _select_components(components, selected[1:], weak, out, n_workers)
+
+
+def _region_sums_tile(tile, labels_image, count, intensity, transform):
+    labels = labels_image[tile.core].ravel()
+    rows, cols = np.indices([s.stop - s.start for s in tile.core[:2]])
+    sums = {
+        "area": np.bincount(labels, minlength=count + 1),
+        "row": np.bincount(labels, weights=(rows + tile.core[0].start).ravel(), minlength=count + 1),
+        "col": np.bincount(labels, weights=(cols + tile.core[1].start).ravel(), minlength=count + 1),
+    }
+    if intensity is not None:
+        values = _values(intensity, tile, transform).astype(np.float64, copy=False)
+        channels = values.reshape(labels.size, -1)
+        sums["intensity"] = np.stack(
+            [np.bincount(labels, weights=channel, minlength=count + 1) for channel in channels.T], axis=-1
+        ).reshape(count + 1, *values.shape[2:])
+    return sums
+
+
+def region_sums_tiled(labels, tiles, count: int, intensity=None, transform=None, n_workers: int | None = None) -> dict:
+    """Per-label area and sums of row, column (and ``transform(intensity)``) over a label image.
+
+    Returns:
+        Arrays indexed by label - 1: ``area``, ``row``, ``col`` and ``intensity`` (with the
+        trailing channel axis of multichannel intensity images)
+
+    """
+    core_tiles = [Tile(tile.core, tile.core) for tile in tiles]
+    results = map_tiles(_region_sums_tile, core_tiles, labels, count, intensity, transform, n_workers=n_workers)
+    totals = {}
+    for result in results:
+        for key, value in result.items():
+            totals[key] = value if key not in totals else totals[key] + value
+    return {key: value[1:] for key, value in totals.items()}
+
+
+def _measure_tile(tile, labels_to_measure, labels_image, measure, images):
+    if not len(labels_to_measure):
+        return []
+    return measure(labels_image[tile.region], labels_to_measure, tile.origin, *(image[tile.region] for image in images))
+
+
+def measure_regions_tiled(labels, components: Components, tiles, measure, *images, n_workers: int | None = None):
+    """Measure every labelled object on the whole object.
+
+    Each object is measured by the tile whose core holds its first pixel, if the tile region
+    (core and halo) contains the whole object; larger objects are measured on a crop of their
+    bounding box.
+
+    Args:
+        labels: Label image written by ``write_labels``
+        components: Its components
+        tiles: Tiles with a halo, usually as wide as the largest expected object
+        measure: Picklable ``measure(labels_region, object_labels, origin, *image_regions)``
+            returning one result per object label, in order
+        images: Images the measurement needs, read over the same regions
+
+    Returns:
+        Results of all objects, in label order
+
+    """
+    width = labels.shape[1]
+    first_rows, first_cols = np.divmod(components.first_pixels, width)
+    bboxes = components.bboxes
+    per_tile, remaining = [], np.ones(components.count, dtype=bool)
+    for tile in tiles:
+        rows, cols = tile.core[:2]
+        owned = (
+            (first_rows >= rows.start)
+            & (first_rows < rows.stop)
+            & (first_cols >= cols.start)
+            & (first_cols < cols.stop)
+        )
+        rows, cols = tile.region[:2]
+        inside = (bboxes[:, 0] >= rows.start) & (bboxes[:, 2] <= rows.stop)
+        inside &= (bboxes[:, 1] >= cols.start) & (bboxes[:, 3] <= cols.stop)
+        selected = np.flatnonzero(owned & inside)
+        remaining[selected] = False
+        per_tile.append(selected + 1)
+    results = {}
+    for selected, measured in zip(
+        per_tile,
+        map_tiles(_measure_tile, tiles, labels, measure, images, tile_args=per_tile, n_workers=n_workers),
+        strict=True,
+    ):
+        results.update(zip(selected.tolist(), measured, strict=True))
+    for label in np.flatnonzero(remaining) + 1:
+        row0, col0, row1, col1 = bboxes[label - 1]
+        crop = Tile((slice(row0, row1), slice(col0, col1)), (slice(row0, row1), slice(col0, col1)))
+        results[int(label)] = _measure_tile(crop, np.array([label]), labels, measure, images)[0]
+    return [results[label] for label in range(1, components.count + 1)]
+
+
+# Euclidean distance transform
+
+
+def _distance_sum_tile(tile, mask, invert, halo, shape):
+    from scipy import ndimage
+
+    while True:
+        region_tile = tile.with_halo(halo, shape)
+        values = mask[region_tile.region].astype(bool, copy=False)
+        if invert:
+            values = ~values
+        whole = all(r.start == 0 and r.stop == n for r, n in zip(region_tile.region, shape, strict=False))
+        if whole or not values.all():
+            distances = ndimage.distance_transform_edt(values)[region_tile.inner]
+            inside = values[region_tile.inner]
+            # A distance no larger than the halo cannot reach past the region, so it is exact
+            if whole or not inside.any() or distances[inside].max() <= halo:
+                return float(distances[inside].sum()), int(inside.sum())
+        halo *= 2
+
+
+def distance_sum_tiled(mask, tiles, invert: bool = False, halo: int = 16, n_workers: int | None = None):
+    """Sum and count of ``scipy.ndimage.distance_transform_edt(mask)`` over the mask (of ``~mask``
+    if ``invert``). Tiles whose distances exceed their halo are recomputed with a wider one, so
+    the result is exact.
+    """
+    shape = mask.shape
+    results = list(map_tiles(_distance_sum_tile, tiles, mask, invert, halo, shape, n_workers=n_workers))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+# Texture
+
+
+def _round_half_away(value: float) -> int:
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+def _glcm_tile(tile, image, transform, offsets, levels, shape):
+    values = _values(image, tile, transform, region=True)
+    counts = []
+    for row_offset, col_offset in offsets:
+        # Pairs whose first pixel is in the core and second pixel is in the image
+        rows = range(max(tile.core[0].start, -row_offset), min(tile.core[0].stop, shape[0] - row_offset))
+        cols = range(max(tile.core[1].start, -col_offset), min(tile.core[1].stop, shape[1] - col_offset))
+        if not len(rows) or not len(cols):
+            counts.append(np.zeros(levels * levels, dtype=np.int64))
+            continue
+        r0, c0 = rows.start - tile.region[0].start, cols.start - tile.region[1].start
+        first = values[r0 : r0 + len(rows), c0 : c0 + len(cols)].astype(np.int64)
+        second = values[r0 + row_offset : r0 + row_offset + len(rows), c0 + col_offset : c0 + col_offset + len(cols)]
+        valid = (first < levels) & (second < levels)
+        pairs = first[valid] * levels + second[valid]
+        counts.append(np.bincount(pairs, minlength=levels * levels))
+    return np.stack(counts)
+
+
+def tiled_graycomatrix(
+    image,
+    tiles,
+    distances,
+    angles,
+    levels: int = 256,
+    symmetric: bool = False,
+    normed: bool = False,
+    transform=None,
+    n_workers: int | None = None,
+) -> np.ndarray:
+    """``skimage.feature.graycomatrix(transform(image), ...)`` of a 2D integer image."""
+    offsets = [
+        (_round_half_away(math.sin(a) * d), _round_half_away(math.cos(a) * d)) for a in angles for d in distances
+    ]
+    halo = max(max(abs(r), abs(c)) for r, c in offsets)
+    tiles = [tile.with_halo(halo, image.shape) for tile in tiles]
+    counts = _sum(map_tiles(_glcm_tile, tiles, image, transform, offsets, levels, image.shape[:2], n_workers=n_workers))
+    # (angle, distance) pairs -> (levels, levels, distance, angle)
+    matrix = counts.reshape(len(angles), len(distances), levels, levels).transpose(2, 3, 1, 0)
+    if symmetric:
+        matrix = matrix + matrix.transpose(1, 0, 2, 3)
+    if normed:
+        matrix = matrix.astype(np.float64)
+        sums = matrix.sum(axis=(0, 1), keepdims=True)
+        sums[sums == 0] = 1
+        matrix /= sums
+    return matrix
+
+
+# CLAHE
+
+_CLAHE_GRAY_LEVELS = 2**14
+
+
+def _reflect_indices(size: int, start: int, stop: int, pad_start: int) -> np.ndarray:
+    """Source index of padded positions ``start:stop`` for ``numpy.pad(mode="reflect")``."""
+    positions = np.arange(start, stop) - pad_start
+    if size == 1:
+        return np.zeros_like(positions)
+    period = 2 * (size - 1)
+    positions = np.mod(positions, period)
+    return np.where(positions < size, positions, period - positions)
+
+
+def _clahe_scaled(values, transform, low, high):
+    """The image as ``equalize_adapthist`` bins it: uint16 scaled to 14 bits."""
+    from skimage.exposure import rescale_intensity
+    from skimage.util import img_as_uint
+
+    values = img_as_uint(values if transform is None else transform(values))
+    scaled = rescale_intensity(values, in_range=(low, high), out_range=(0, _CLAHE_GRAY_LEVELS - 1))
+    return np.round(scaled).astype(np.min_scalar_type(_CLAHE_GRAY_LEVELS))
+
+
+def _clahe_range_tile(tile, image, transform):
+    from skimage.util import img_as_uint
+
+    values = image[tile.core]
+    values = img_as_uint(values if transform is None else transform(values))
+    return values.min(), values.max()
+
+
+def _clahe_histogram_tile(tile, image, transform, low, high, geometry):
+    kernel, pads, hist_counts, nbins = geometry
+    binned = _clahe_scaled(image[tile.core], transform, low, high) // (1 + _CLAHE_GRAY_LEVELS // nbins)
+    selections = []
+    for axis, (k, pad, n) in enumerate(zip(kernel, pads, hist_counts, strict=True)):
+        # Padded positions of the histogram area whose source pixel falls in this tile
+        size = image.shape[axis]
+        sources = _reflect_indices(size, k // 2, k // 2 + n * k, pad)
+        core = tile.core[axis]
+        positions = np.flatnonzero((sources >= core.start) & (sources < core.stop))
+        selections.append((sources[positions] - core.start, positions // k))
+    (rows, row_blocks), (cols, col_blocks) = selections
+    block = (row_blocks[:, None] * hist_counts[1] + col_blocks[None, :]) * nbins
+    values = binned[np.ix_(rows, cols)].astype(np.int64) + block
+    return np.bincount(values.ravel(), minlength=hist_counts[0] * hist_counts[1] * nbins)
+
+
+def _clahe_tile(tile, image, out, transform, low, high, geometry, maps):
+    kernel, pads, _, nbins = geometry
+    binned = _clahe_scaled(image[tile.core], transform, low, high) // (1 + _CLAHE_GRAY_LEVELS // nbins)
+    weights, blocks = [], []
+    for axis, k in enumerate(kernel):
+        padded = np.arange(tile.core[axis].start, tile.core[axis].stop) + pads[axis]
+        coefficient = (padded % k) / k
+        weights.append((1 - coefficient, coefficient))
+        blocks.append(padded // k)
+    result = np.zeros(binned.shape, dtype=np.float32)
+    columns = maps.shape[1]
+    for edge_row, edge_col in itertools.product((0, 1), repeat=2):
+        index = (blocks[0][:, None] + edge_row) * columns + (blocks[1][None, :] + edge_col)
+        mapped = maps.reshape(-1, nbins)[index, binned]
+        coefficients = weights[1][edge_col][None, :] * weights[0][edge_row][:, None]
+        result += (mapped * coefficients).astype(result.dtype)
+    result = result.astype(np.min_scalar_type(_CLAHE_GRAY_LEVELS))
+    out[tile.core] = result
+    return result.min(), result.max()
+
+
+def _clip_histogram(hist, clip_limit: int) -> np.ndarray:
+    """Clip one tile histogram at ``clip_limit`` and redistribute the excess counts.
+
+    Same steps and rounding as ``skimage.exposure.equalize_adapthist``, so the mapping is identical.
+    """
+    excess_mask = hist > clip_limit
+    excess = hist[excess_mask]
+    n_excess = excess.sum() - excess.size * clip_limit
+    hist[excess_mask] = clip_limit
+
+    bin_incr = n_excess // hist.size
+    upper = clip_limit - bin_incr
+    low_mask = hist < upper
+    n_excess -= hist[low_mask].size * bin_incr
+    hist[low_mask] += bin_incr
+
+    mid_mask = (hist >= upper) & (hist < clip_limit)
+    mid = hist[mid_mask]
+    n_excess += mid.sum() - mid.size * clip_limit
+    hist[mid_mask] = clip_limit
+
+    # Spread what is left over the bins still under the limit, in strides
+    while n_excess > 0:
+        prev_n_excess = n_excess
+        for index in range(hist.size):
+            under_mask = hist < clip_limit
+            step_size = max(1, np.count_nonzero(under_mask) // n_excess)
+            under_mask = under_mask[index::step_size]
+            hist[index::step_size][under_mask] += 1
+            n_excess -= np.count_nonzero(under_mask)
+            if n_excess <= 0:
+                break
+        if prev_n_excess == n_excess:
+            break
+    return hist
+
+
+def _map_histogram(hist, min_val: int, max_val: int, n_pixels: int) -> np.ndarray:
+    """Equalizing lookup table of every clipped histogram (bins on the last axis)."""
+    out = np.cumsum(hist, axis=-1).astype(float)
+    out *= (max_val - min_val) / n_pixels
+    out += min_val
+    np.clip(out, a_min=None, a_max=max_val, out=out)
+    return out.astype(int)
+
+
+def _rescale_unit(values, low, high, dtype):
+    values = values.astype(dtype, copy=False)
+    if low == high:
+        return np.clip(values, 0, 1)
+    return ((np.clip(values, low, high) - low) / (high - low)).astype(dtype, copy=False)
+
+
+def tiled_equalize_adapthist(
+    image, out, tiles, transform=None, kernel_size=None, clip_limit: float = 0.01, nbins: int = 256, n_workers=None
+):
+    """``skimage.exposure.equalize_adapthist(transform(image))`` of a 2D image.
+
+    The equalized 14-bit levels are written to ``out`` (uint16, same shape). The float image
+    ``equalize_adapthist`` returns is ``rescale(out)``, pixel-wise.
+
+    Returns:
+        ``rescale``, a picklable transform
+
+    """
+    shape = image.shape[:2]
+    core_tiles = [Tile(tile.core, tile.core) for tile in tiles]
+    probe = image[tuple(slice(0, 1) for _ in shape)]
+    result_dtype = float_dtype((probe if transform is None else transform(probe)).dtype)
+
+    ranges = list(map_tiles(_clahe_range_tile, core_tiles, image, transform, n_workers=n_workers))
+    low, high = min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+    if kernel_size is None:
+        kernel = tuple(max(s // 8, 1) for s in shape)
+    elif isinstance(kernel_size, int | float):
+        kernel = (int(kernel_size),) * 2
+    else:
+        kernel = tuple(int(k) for k in kernel_size)
+    pads = tuple(k // 2 for k in kernel)
+    padded = tuple(s + k // 2 + (k - s % k) % k + math.ceil(k / 2) for s, k in zip(shape, kernel, strict=True))
+    hist_counts = tuple(int(p / k) - 1 for p, k in zip(padded, kernel, strict=True))
+    geometry = (kernel, pads, hist_counts, nbins)
+
+    hist = _sum(
+        map_tiles(_clahe_histogram_tile, core_tiles, image, transform, low, high, geometry, n_workers=n_workers)
+    )
+    hist = hist.reshape(hist_counts[0] * hist_counts[1], nbins)
+    kernel_elements = math.prod(kernel)
+    clim = int(np.clip(clip_limit * kernel_elements, 1, None)) if clip_limit > 0.0 else kernel_elements
+    hist = np.apply_along_axis(_clip_histogram, -1, hist, clip_limit=clim)
+    maps = _map_histogram(hist, 0, _CLAHE_GRAY_LEVELS - 1, kernel_elements)
+    maps = np.pad(maps.reshape(hist_counts[0], hist_counts[1], nbins), [[1, 1], [1, 1], [0, 0]], mode="edge")
+
+    ranges = list(
+        map_tiles(_clahe_tile, core_tiles, image, out, transform, low, high, geometry, maps, n_workers=n_workers)
+    )
+    out.flush()
+    result_low = result_dtype.type(min(r[0] for r in ranges))
+    result_high = result_dtype.type(max(r[1] for r in ranges))
+    return functools.partial(_rescale_unit, low=result_low, high=result_high, dtype=result_dtype)
@@ -41,6 +41,19 @@ description = [
                 "name": "threshold_method",
                 "type": "str",
             },
+            {
+                "default": None,
+                "description": "Process the image tile by tile within a fixed memory budget (BIOMNI_TILE_MEMORY_MB); "
+                "None does so for images larger than BIOMNI_TILED_IMAGE_MB once decoded",
+                "name": "tiled",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Worker processes for tiled processing (None uses the available cores)",
+                "name": "n_workers",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
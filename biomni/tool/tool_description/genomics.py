@@ -24,6 +24,18 @@ description = [
                 "name": "composition",
                 "type": "pd.DataFrame",
             },
+            {
+                "default": 16,
+                "description": "Maximum number of clusters annotated by concurrent LLM calls",
+                "name": "max_concurrency",
+                "type": "int",
+            },
+            {
+                "default": 3,
+                "description": "Extra attempts for a cluster whose answer is malformed or not in the cell ontology",
+                "name": "max_retries",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -442,7 +454,15 @@ description = [
                 "description": "Prefix for output files",
                 "name": "output_prefix",
                 "type": "str",
-            }
+            },
+            {
+                "default": "numpy",
+                "description": "Overlap engine: 'numpy' (in-memory, also "
+                "reports Jaccard) or 'pybedtools' (requires "
+                "the bedtools binary)",
+                "name": "backend",
+                "type": "str",
+            },
         ],
         "required_parameters": [
             {
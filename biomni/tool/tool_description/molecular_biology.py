@@ -107,10 +107,23 @@ description = [
     },
     {
         "description": "Align short sequences (primers) to a longer sequence, "
-        "allowing for one mismatch. Checks both forward and reverse "
-        "complement strands.",
+        "allowing for one mismatch by default. Checks both forward and "
+        "reverse complement strands.",
         "name": "align_sequences",
-        "optional_parameters": [],
+        "optional_parameters": [
+            {
+                "default": 1,
+                "description": "Maximum number of mismatching bases per alignment",
+                "name": "max_mismatches",
+                "type": "int",
+            },
+            {
+                "default": False,
+                "description": "Also report alignments spanning the end of a circular target sequence",
+                "name": "circular",
+                "type": "bool",
+            },
+        ],
         "required_parameters": [
             {
                 "default": None,
@@ -74,7 +74,20 @@ description = [
                 "description": "Directory to save output files",
                 "name": "output_dir",
                 "type": "str",
-            }
+            },
+            {
+                "default": None,
+                "description": "Process the image tile by tile within a fixed memory budget (BIOMNI_TILE_MEMORY_MB); "
+                "None does so for images larger than BIOMNI_TILED_IMAGE_MB once decoded",
+                "name": "tiled",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Worker processes for tiled processing (None uses the available cores)",
+                "name": "n_workers",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -166,6 +179,19 @@ description = [
                 "name": "output_dir",
                 "type": "str",
             },
+            {
+                "default": None,
+                "description": "Process the image tile by tile within a fixed memory budget (BIOMNI_TILE_MEMORY_MB); "
+                "None does so for images larger than BIOMNI_TILED_IMAGE_MB once decoded",
+                "name": "tiled",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Worker processes for tiled processing (None uses the available cores)",
+                "name": "n_workers",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -200,6 +226,19 @@ description = [
                 "name": "threshold_value",
                 "type": "float",
             },
+            {
+                "default": None,
+                "description": "Process the image tile by tile within a fixed memory budget (BIOMNI_TILE_MEMORY_MB); "
+                "None does so for images larger than BIOMNI_TILED_IMAGE_MB once decoded",
+                "name": "tiled",
+                "type": "bool",
+            },
+            {
+                "default": None,
+                "description": "Worker processes for tiled processing (None uses the available cores)",
+                "name": "n_workers",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
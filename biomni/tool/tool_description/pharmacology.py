@@ -50,7 +50,31 @@ description = [
                 "description": "Number of CPU cores to use for docking",
                 "name": "ncpu",
                 "type": "int",
-            }
+            },
+            {
+                "default": None,
+                "description": "Worker processes for scoring batches in parallel (default: available CPU cores)",
+                "name": "n_workers",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "Compounds per batch sent to a worker (default: 8)",
+                "name": "batch_size",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "JSONL file that finished scores are appended to; rerunning with the same file resumes an interrupted screen",
+                "name": "checkpoint_file",
+                "type": "str",
+            },
+            {
+                "default": 10,
+                "description": "Number of best-scoring compounds (lowest docking score) listed in the log",
+                "name": "top_k",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -134,6 +158,33 @@ description = [
             },
         ],
     },
+    {
+        "description": "Retrieves the top TxGNN drug repurposing predictions with "
+        "their scores for several diseases in one call.",
+        "name": "retrieve_topk_repurposing_drugs_for_diseases_txgnn",
+        "optional_parameters": [
+            {
+                "default": 5,
+                "description": "The number of top drug predictions to return per disease",
+                "name": "k",
+                "type": "int",
+            }
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Names of the diseases for which to retrieve drug predictions",
+                "name": "disease_names",
+                "type": "List[str]",
+            },
+            {
+                "default": None,
+                "description": "Path to the data lake",
+                "name": "data_lake_path",
+                "type": "str",
+            },
+        ],
+    },
     {
         "description": "Predicts ADMET (Absorption, Distribution, Metabolism, "
         "Excretion, Toxicity) properties for a list of compounds "
@@ -145,7 +196,31 @@ description = [
                 "description": "Type of model to use for ADMET prediction (options: 'MPNN', 'CNN', 'Morgan')",
                 "name": "ADMET_model_type",
                 "type": "str",
-            }
+            },
+            {
+                "default": None,
+                "description": "CSV file to which the predictions of all compounds are written chunk by chunk",
+                "name": "output_file",
+                "type": "str",
+            },
+            {
+                "default": False,
+                "description": "If True, return (research_log, DataFrame) with one row per compound and one column per property",
+                "name": "return_table",
+                "type": "bool",
+            },
+            {
+                "default": 256,
+                "description": "Number of compounds scored per forward pass",
+                "name": "batch_size",
+                "type": "int",
+            },
+            {
+                "default": 1000,
+                "description": "Maximum number of compounds written to the research log (the rest are only in the table/CSV)",
+                "name": "max_logged",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -170,7 +245,32 @@ description = [
                 "Daylight-AAC)",
                 "name": "affinity_model_type",
                 "type": "str",
-            }
+            },
+            {
+                "default": None,
+                "description": "Worker processes for scoring batches in parallel (default: 1, in-process). Each "
+                "worker loads its own copy of the model, so memory grows with the worker count",
+                "name": "n_workers",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "Compounds per batch sent to a worker (default: 256)",
+                "name": "batch_size",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "JSONL file that finished scores are appended to; rerunning with the same file resumes an interrupted screen",
+                "name": "checkpoint_file",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "If set, also list this many compounds with the strongest predicted binding",
+                "name": "top_k",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -1,30 +1,86 @@
+import gzip
+import json
 import pickle
 
 import pandas as pd
 
+# On-disk format written by save_registry (gzip-compressed JSON)
+REGISTRY_FORMAT = "biomni-tool-registry"
+REGISTRY_FORMAT_VERSION = 1
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 class ToolRegistry:
     def __init__(self, tools):
-        self.tools = []
+        # id -> tool (insertion ordered) and name -> ids; the first registered tool wins name lookups
+        self._tools_by_id = {}
+        self._ids_by_name = {}
         self.next_id = 0
 
+        # The document table is updated incrementally: new rows are buffered and appended,
+        # removed ids are dropped, both only when document_df is next read
+        self._document_df = pd.DataFrame([], columns=["docid", "document_content"])
+        self._pending_docs = []
+        self._removed_docids = set()
+        self._tools_list = None
+
         for j in tools.values():
             for tool in j:
                 self.register_tool(tool)
 
-        docs = []
-        for tool_id in range(len(self.tools)):
-            docs.append([int(tool_id), self.get_tool_by_id(int(tool_id))])
-        self.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-
         # self.langchain_tools = {}
         # for module, api_list in tools.items():
         #    self.langchain_tools.update({self.get_id_by_name(api['name']): api_schema_to_langchain_tool(api, mode = 'custom_tool', module_name = module) for api in api_list})
 
+    @property
+    def tools(self):
+        if self._tools_list is None:
+            self._tools_list = list(self._tools_by_id.values())
+        return self._tools_list
+
+    @property
+    def document_df(self):
+        if self._removed_docids:
+            self._pending_docs = [row for row in self._pending_docs if row[0] not in self._removed_docids]
+            keep = ~self._document_df["docid"].isin(self._removed_docids)
+            self._document_df = self._document_df[keep].reset_index(drop=True)
+            self._removed_docids = set()
+        if self._pending_docs:
+            new_docs = pd.DataFrame(self._pending_docs, columns=["docid", "document_content"])
+            if len(self._document_df) == 0:
+                self._document_df = new_docs
+            else:
+                self._document_df = pd.concat([self._document_df, new_docs], ignore_index=True)
+            self._pending_docs = []
+        return self._document_df
+
+    def __len__(self):
+        return len(self._tools_by_id)
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    def _index_tool(self, tool):
+        self._tools_by_id[tool["id"]] = tool
+        self._ids_by_name.setdefault(tool["name"], []).append(tool["id"])
+        self._pending_docs.append([int(tool["id"]), tool])
+        self._tools_list = None
+
+    def _unindex_tool(self, tool_id):
+        tool = self._tools_by_id.pop(tool_id)
+        ids = self._ids_by_name.get(tool["name"], [])
+        if tool_id in ids:
+            ids.remove(tool_id)
+        if not ids:
+            self._ids_by_name.pop(tool["name"], None)
+        self._removed_docids.add(tool_id)
+        self._tools_list = None
+        return tool
+
     def register_tool(self, tool):
         if self.validate_tool(tool):
             tool["id"] = self.next_id
-            self.tools.append(tool)
+            self._index_tool(tool)
             self.next_id += 1
         else:
             raise ValueError("Invalid tool format")
@@ -34,56 +90,93 @@ class ToolRegistry:
         return all(key in tool for key in required_keys)
 
     def get_tool_by_name(self, name):
-        for tool in self.tools:
-            if tool["name"] == name:
-                return tool
-        return None
+        ids = self._ids_by_name.get(name)
+        return self._tools_by_id[ids[0]] if ids else None
 
     def get_tool_by_id(self, tool_id):
-        for tool in self.tools:
-            if tool["id"] == tool_id:
-                return tool
-        return None
+        return self._tools_by_id.get(tool_id)
 
     def get_id_by_name(self, name):
-        for tool in self.tools:
-            if tool["name"] == name:
-                return tool["id"]
-        return None
+        ids = self._ids_by_name.get(name)
+        return ids[0] if ids else None
 
     def get_name_by_id(self, tool_id):
-        for tool in self.tools:
-            if tool["id"] == tool_id:
-                return tool["name"]
-        return None
+        tool = self._tools_by_id.get(tool_id)
+        return tool["name"] if tool else None
 
     def list_tools(self):
-        return [{"name": tool["name"], "id": tool["id"]} for tool in self.tools]
+        return [{"name": tool["name"], "id": tool["id"]} for tool in self._tools_by_id.values()]
 
     def remove_tool_by_id(self, tool_id):
         # Remove the tool with the given id
-        tool = self.get_tool_by_id(tool_id)
-        if tool:
-            self.tools = [t for t in self.tools if t["id"] != tool_id]
+        if tool_id in self._tools_by_id:
+            self._unindex_tool(tool_id)
             return True
         return False
 
     def remove_tool_by_name(self, name):
-        # Remove the tool with the given name
-        tool = self.get_tool_by_name(name)
-        if tool:
-            self.tools = [t for t in self.tools if t["name"] != name]
-            return True
-        return False
+        # Remove all tools with the given name
+        ids = list(self._ids_by_name.get(name, []))
+        for tool_id in ids:
+            self._unindex_tool(tool_id)
+        return bool(ids)
+
+    @staticmethod
+    def _serializable_tool(tool):
+        """Drop fields that cannot be stored as JSON (e.g. the wrapper callables of MCP tools)."""
+        serializable = {}
+        for key, value in tool.items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            serializable[key] = value
+        return serializable
 
     def save_registry(self, filename):
-        with open(filename, "wb") as file:
-            pickle.dump(self, file)
+        payload = {
+            "format": REGISTRY_FORMAT,
+            "version": REGISTRY_FORMAT_VERSION,
+            "next_id": self.next_id,
+            "tools": [self._serializable_tool(tool) for tool in self._tools_by_id.values()],
+        }
+        with gzip.open(filename, "wt", encoding="utf-8") as file:
+            json.dump(payload, file, separators=(",", ":"))
 
     # def get_langchain_tool_by_id(self, id):
     #     return self.langchain_tools[id]
 
+    @classmethod
+    def _from_tools(cls, tools, next_id=None):
+        """Rebuild a registry from tools that already carry their ids."""
+        registry = cls({})
+        for tool in tools:
+            registry._index_tool(tool)
+        registry.next_id = next_id if next_id is not None else max(registry._tools_by_id, default=-1) + 1
+        return registry
+
     @staticmethod
     def load_registry(filename):
         with open(filename, "rb") as file:
-            return pickle.load(file)
+            magic = file.read(2)
+
+        if magic != _GZIP_MAGIC:
+            # Legacy format: a pickled ToolRegistry whose tools were stored in a plain list
+            with open(filename, "rb") as file:
+                legacy = pickle.load(file)
+            if not isinstance(legacy, ToolRegistry):
+                raise ValueError(f"{filename} is not a tool registry file")
+            if "_tools_by_id" in legacy.__dict__:
+                return legacy
+            return ToolRegistry._from_tools(legacy.__dict__.get("tools", []), legacy.__dict__.get("next_id"))
+
+        with gzip.open(filename, "rt", encoding="utf-8") as file:
+            payload = json.load(file)
+        if payload.get("format") != REGISTRY_FORMAT:
+            raise ValueError(f"{filename} is not a tool registry file")
+        if payload.get("version", 0) > REGISTRY_FORMAT_VERSION:
+            raise ValueError(
+                f"Tool registry format version {payload.get('version')} is newer than the supported "
+                f"version {REGISTRY_FORMAT_VERSION}"
+            )
+        return ToolRegistry._from_tools(payload["tools"], payload.get("next_id"))
@@ -0,0 +1,201 @@
+"""Dense, memory-mapped cache of the TxGNN drug repurposing predictions.
+
+``txgnn_prediction.pkl`` maps each disease to a ``{drug_id: raw score}`` dict. It is converted
+once into a disease x drug float32 matrix (``scores.npy``, missing pairs as -inf) plus a
+``meta.json`` with the disease names, drug ids and drug names, under
+``$BIOMNI_CACHE_DIR/txgnn/<signature>/``. The signature covers the size and mtime of both
+pickles. ``get_txgnn_index`` keeps one memory-mapped index per data lake per process; top-k
+queries use ``argpartition`` and apply the sigmoid only to the selected scores.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+INDEX_VERSION = 1
+PREDICTION_FILE = "txgnn_prediction.pkl"
+NAME_MAPPING_FILE = "txgnn_name_mapping.pkl"
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def _cache_root() -> str:
+    cache_dir = os.getenv("BIOMNI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "biomni"))
+    return os.path.join(cache_dir, "txgnn")
+
+
+def source_signature(data_lake_path: str) -> str:
+    """Hash of the sizes and mtimes of the two TxGNN pickles.
+
+    Raises:
+        FileNotFoundError: If either pickle is missing
+
+    """
+    parts = [f"v{INDEX_VERSION}", os.path.abspath(data_lake_path)]
+    for file_name in (PREDICTION_FILE, NAME_MAPPING_FILE):
+        stat = os.stat(os.path.join(data_lake_path, file_name))
+        parts.append(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def build_txgnn_index(data_lake_path: str, output_dir: str) -> str:
+    """Convert the TxGNN pickles in ``data_lake_path`` into ``scores.npy`` and ``meta.json``."""
+    with open(os.path.join(data_lake_path, PREDICTION_FILE), "rb") as f:
+        predictions = pickle.load(f)
+    with open(os.path.join(data_lake_path, NAME_MAPPING_FILE), "rb") as f:
+        mapping = pickle.load(f)
+
+    diseases = list(predictions)
+    drug_ids, drug_columns = [], {}
+    for disease_predictions in predictions.values():
+        for drug_id in disease_predictions:
+            if drug_id not in drug_columns:
+                drug_columns[drug_id] = len(drug_ids)
+                drug_ids.append(drug_id)
+
+    os.makedirs(output_dir, exist_ok=True)
+    scores = np.lib.format.open_memmap(
+        os.path.join(output_dir, "scores.npy"), mode="w+", dtype=np.float32, shape=(len(diseases), len(drug_ids))
+    )
+    scores[:] = -np.inf
+    for row, disease_predictions in enumerate(predictions.values()):
+        values = np.fromiter(disease_predictions.values(), dtype=np.float32, count=len(disease_predictions))
+        if list(disease_predictions) == drug_ids:
+            scores[row] = values
+        else:
+            columns = np.fromiter(map(drug_columns.__getitem__, disease_predictions), dtype=np.int64)
+            scores[row, columns] = values
+    scores.flush()
+    del scores
+
+    id2name = mapping.get("id2name_drug", {})
+    meta = {
+        "version": INDEX_VERSION,
+        "diseases": [str(disease) for disease in diseases],
+        "drug_ids": [str(drug_id) for drug_id in drug_ids],
+        "drug_names": [str(id2name.get(drug_id, "Unknown Drug")) for drug_id in drug_ids],
+    }
+    # meta.json is written last and marks the index as complete
+    with open(os.path.join(output_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return output_dir
+
+
+class TxGNNIndex:
+    """Disease x drug TxGNN score matrix with top-k queries."""
+
+    def __init__(self, index_dir: str, signature: str | None = None):
+        self.index_dir = index_dir
+        self.signature = signature
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        self.scores = np.load(os.path.join(index_dir, "scores.npy"), mmap_mode="r")
+        self.diseases = meta["diseases"]
+        self.drug_ids = meta["drug_ids"]
+        self.drug_names = meta["drug_names"]
+        self._disease_rows = {disease: i for i, disease in enumerate(self.diseases)}
+
+    def disease_row(self, disease: str) -> int | None:
+        return self._disease_rows.get(disease)
+
+    def match_disease(self, disease_name: str, cutoff: float = 0.6) -> str | None:
+        """Closest disease name, scored like ``difflib.get_close_matches``."""
+        if disease_name in self._disease_rows:
+            return disease_name
+        from biomni.tool.fuzzy_match import get_matcher
+
+        matcher = get_matcher(self.diseases, key=("txgnn_diseases", self.index_dir))
+        return matcher.match(disease_name, cutoff=cutoff)
+
+    def top_k_rows(self, rows, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k drug columns and sigmoid scores for several disease rows at once.
+
+        Returns:
+            ``(columns, scores)`` arrays of shape ``(len(rows), min(k, n_drugs))``, best first.
+            Ties keep column order (first appearance in the prediction file); positions beyond
+            the drugs a disease has predictions for hold column -1 and score 0.
+
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        k = max(0, min(k, self.scores.shape[1]))
+        block = np.asarray(self.scores[rows])
+        if k == 0 or len(rows) == 0:
+            return np.empty((len(rows), k), dtype=np.int64), np.empty((len(rows), k), dtype=np.float32)
+        if k < block.shape[1]:
+            candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            kth = np.take_along_axis(block, candidates, axis=1).min(axis=1)
+            columns = np.empty((len(rows), k), dtype=np.int64)
+            for i, (row_scores, threshold) in enumerate(zip(block, kth, strict=True)):
+                # argpartition breaks ties arbitrarily; rank every column tied with the k-th score
+                selected = np.flatnonzero(row_scores >= threshold)
+                columns[i] = selected[np.lexsort((selected, -row_scores[selected]))][:k]
+        else:
+            columns = np.argsort(-block, axis=1, kind="stable")
+        raw = np.take_along_axis(block, columns, axis=1)
+        missing = np.isneginf(raw)
+        columns[missing] = -1
+        return columns, np.where(missing, 0, sigmoid(raw)).astype(np.float32)
+
+    def top_k(self, disease: str, k: int = 5) -> list[tuple[str, str, float]]:
+        """``(drug_id, drug_name, score)`` of the k best drugs for an exact disease name."""
+        return self.top_k_batch([disease], k)[0]
+
+    def top_k_batch(self, diseases, k: int = 5) -> list[list[tuple[str, str, float]]]:
+        """``top_k`` for many exact disease names with one partial sort over their rows."""
+        columns, scores = self.top_k_rows([self._disease_rows[disease] for disease in diseases], k)
+        return [
+            [
+                (self.drug_ids[c], self.drug_names[c], float(s))
+                for c, s in zip(row_columns, row_scores, strict=True)
+                if c >= 0
+            ]
+            for row_columns, row_scores in zip(columns, scores, strict=True)
+        ]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_txgnn_index(data_lake_path: str, cache_dir: str | None = None) -> TxGNNIndex:
+    """Process-wide TxGNN index for the pickles in ``data_lake_path``, building it if needed.
+
+    Args:
+        data_lake_path: Directory containing ``txgnn_prediction.pkl`` and ``txgnn_name_mapping.pkl``
+        cache_dir: Where converted matrices are kept; defaults to ``$BIOMNI_CACHE_DIR/txgnn``
+
+    """
+    signature = source_signature(data_lake_path)
+    cache_dir = cache_dir or _cache_root()
+    key = (os.path.abspath(cache_dir), signature)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index_dir = os.path.join(cache_dir, signature)
+            if not os.path.exists(os.path.join(index_dir, "meta.json")):
+                os.makedirs(cache_dir, exist_ok=True)
+                staging = tempfile.mkdtemp(prefix=f".{signature}-", dir=cache_dir)
+                try:
+                    build_txgnn_index(data_lake_path, staging)
+                    try:
+                        os.rename(staging, index_dir)
+                    except OSError:
+                        # Another process finished the same build first
+                        if not os.path.exists(os.path.join(index_dir, "meta.json")):
+                            raise
+                finally:
+                    shutil.rmtree(staging, ignore_errors=True)
+            index = TxGNNIndex(index_dir, signature)
+            _indexes[key] = index
+    return index
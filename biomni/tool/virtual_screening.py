@@ -0,0 +1,303 @@
+"""Batched, resumable virtual screening of compound libraries against one target.
+
+``docking_autodock_vina`` and ``predict_binding_affinity_protein_1d_sequence`` used to build the
+docking oracle or load the affinity model (and encode the protein) on every call, then score the
+whole list in one process. Here a scorer describes the target once:
+
+- ``prepare()`` builds the expensive state (the TDC ``pyscreener`` oracle with its prepared
+  receptor, or the DeepPurpose model plus the encoded protein) once per process; in the calling
+  process it is cached by ``scorer.key`` so repeated calls for the same target reuse it;
+- ``VirtualScreen`` cuts the SMILES into batches and fans them out over a process pool (each
+  worker prepares the scorer once, in its initializer). Docking uses the available cores by
+  default; affinity scoring runs in the calling process by default, because every worker holds
+  its own copy of the DeepPurpose model next to the one cached in the caller. Inside a daemonic
+  process, which may not have children, every screen runs in the calling process;
+- every finished batch is appended to a JSONL checkpoint, so an interrupted screen resumes
+  with only the missing compounds, and the current top-k hits are yielded (and optionally
+  rewritten to a TSV file) as batches complete.
+
+Lower scores rank first for both scorers (Vina kcal/mol, affinity in nM). Compounds that fail to
+score get NaN and are never ranked.
+"""
+
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+DEFAULT_TOP_K = 10
+
+_prepared = {}
+_prepared_lock = threading.Lock()
+_worker_score = None
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity where the OS reports it)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class VinaScorer:
+    """AutoDock Vina docking through the TDC ``pyscreener`` oracle.
+
+    Args:
+        receptor_pdb_file: Receptor structure
+        box_center: Docking box center ``[x, y, z]``
+        box_size: Docking box size ``[x, y, z]``
+        ncpu: CPUs used by one oracle (per worker)
+
+    """
+
+    default_batch_size = 8
+    default_workers = None  # the available cores
+
+    def __init__(self, receptor_pdb_file: str, box_center, box_size, ncpu: int = 1):
+        self.receptor_pdb_file = os.path.abspath(receptor_pdb_file)
+        self.box_center = [float(x) for x in box_center]
+        self.box_size = [float(x) for x in box_size]
+        self.ncpu = ncpu
+
+    @property
+    def key(self) -> str:
+        return json.dumps(["vina", self.receptor_pdb_file, self.box_center, self.box_size, self.ncpu])
+
+    def prepare(self):
+        from tdc import Oracle
+
+        oracle = Oracle(
+            name="pyscreener",
+            receptor_pdb_file=self.receptor_pdb_file,
+            box_center=self.box_center,
+            box_size=self.box_size,
+            ncpu=self.ncpu,
+        )
+        return lambda smiles: list(oracle(list(smiles)))
+
+
+class AffinityScorer:
+    """DeepPurpose drug-target affinity in nM for one protein sequence.
+
+    Args:
+        amino_acid_sequence: Target protein sequence
+        model_type: Pretrained BindingDB model, e.g. ``"MPNN-CNN"``
+
+    """
+
+    default_batch_size = 256
+    # Each worker loads its own model (hundreds of MB for MPNN-CNN); the batched model is fast
+    # enough that scoring in the calling process, next to its cached copy, is the default
+    default_workers = 1
+
+    def __init__(self, amino_acid_sequence: str, model_type: str = "MPNN-CNN"):
+        self.amino_acid_sequence = amino_acid_sequence
+        self.model_type = model_type
+
+    @property
+    def key(self) -> str:
+        return json.dumps(["affinity", self.model_type, self.amino_acid_sequence])
+
+    def prepare(self):
+        import contextlib
+        import io
+
+        import pandas as pd
+        from DeepPurpose import DTI, utils
+
+        drug_encoding, target_encoding = self.model_type.split("-")
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = DTI.model_pretrained(model=self.model_type.replace("-", "_") + "_BindingDB")
+            # The protein is encoded once and attached to every batch of compounds
+            target = pd.DataFrame({"Target Sequence": [self.amino_acid_sequence]})
+            target = utils.encode_protein(target, target_encoding)
+        encoded_target = target["target_encoding"].iloc[0]
+        if drug_encoding == "MPNN":
+            # DeepPurpose's MPNN encoder mixes padded bonds between molecules of a batch
+            model.config["batch_size"] = 1
+
+        def score(smiles):
+            smiles = list(smiles)
+            data = pd.DataFrame({"SMILES": smiles, "Target Sequence": self.amino_acid_sequence, "Label": 0.0})
+            with contextlib.redirect_stdout(io.StringIO()):
+                data = utils.encode_drug(data, drug_encoding)
+                data["target_encoding"] = [encoded_target] * len(data)
+                predictions = model.predict(data)
+            return [10 ** (-float(y)) / 1e-9 for y in predictions]
+
+        return score
+
+
+def get_prepared_scorer(scorer):
+    """Prepared scoring function for ``scorer``, built once per process and target."""
+    with _prepared_lock:
+        if scorer.key not in _prepared:
+            _prepared[scorer.key] = scorer.prepare()
+        return _prepared[scorer.key]
+
+
+def _init_worker(scorer, threads: int):
+    global _worker_score
+    # Keep workers from oversubscribing the cores with their own BLAS/OpenMP threads
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    _worker_score = scorer.prepare()
+
+
+def _score_in_worker(batch: list[str]) -> list:
+    return _worker_score(batch)
+
+
+def _as_score(value) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value
+
+
+class VirtualScreen:
+    """Scores a compound library against one prepared target.
+
+    Args:
+        scorer: ``VinaScorer`` or ``AffinityScorer`` (any object with ``key`` and ``prepare()``)
+        n_workers: Worker processes; None uses the scorer's ``default_workers`` (the available
+            cores if that is None). With one worker (or a single batch) compounds are scored in
+            the calling process. Every worker prepares its own copy of the scorer, so memory grows
+            with ``n_workers`` on top of any copy already cached in the calling process
+        batch_size: Compounds per task sent to a worker; None uses the scorer's default
+        checkpoint_path: JSONL file that finished scores are appended to and resumed from
+        top_k: Number of best hits tracked
+        hits_path: Optional TSV rewritten with the current top-k hits after every batch
+
+    """
+
+    def __init__(
+        self,
+        scorer,
+        n_workers: int | None = None,
+        batch_size: int | None = None,
+        checkpoint_path: str | None = None,
+        top_k: int = DEFAULT_TOP_K,
+        hits_path: str | None = None,
+    ):
+        self.scorer = scorer
+        self.n_workers = n_workers or getattr(scorer, "default_workers", None) or available_cores()
+        self.batch_size = batch_size or scorer.default_batch_size
+        self.checkpoint_path = checkpoint_path
+        self.top_k = top_k
+        self.hits_path = hits_path
+        self.scores = {}
+
+    def load_checkpoint(self) -> dict:
+        """Scores already in the checkpoint; raises ValueError if it belongs to another target."""
+        scores = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return scores
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+                if "scorer" in record:
+                    if record["scorer"] != self.scorer.key:
+                        raise ValueError(f"Checkpoint {self.checkpoint_path} was written for a different target")
+                    continue
+                scores[record["smiles"]] = _as_score(record["score"])
+        return scores
+
+    def _checkpoint(self, batch: list[str], scores: list[float]):
+        if not self.checkpoint_path:
+            return
+        new_file = not os.path.exists(self.checkpoint_path) or os.path.getsize(self.checkpoint_path) == 0
+        with open(self.checkpoint_path, "a") as f:
+            if new_file:
+                f.write(json.dumps({"scorer": self.scorer.key}) + "\n")
+            for smiles, score in zip(batch, scores, strict=True):
+                f.write(json.dumps({"smiles": smiles, "score": None if math.isnan(score) else score}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def top_hits(self) -> list[tuple[str, float]]:
+        """Best ``top_k`` ``(smiles, score)`` pairs so far, best first."""
+        ranked = ((score, smiles) for smiles, score in self.scores.items() if not math.isnan(score))
+        return [(smiles, score) for score, smiles in heapq.nsmallest(self.top_k, ranked)]
+
+    def _write_hits(self, hits: list[tuple[str, float]]):
+        if not self.hits_path:
+            return
+        tmp_path = f"{self.hits_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("rank\tsmiles\tscore\n")
+            f.writelines(f"{rank}\t{smiles}\t{score}\n" for rank, (smiles, score) in enumerate(hits, 1))
+        os.replace(tmp_path, self.hits_path)
+
+    def _finish(self, batch: list[str], raw_scores) -> tuple[list[str], list[float], list[tuple[str, float]]]:
+        scores = [_as_score(score) for score in raw_scores]
+        if len(scores) != len(batch):
+            raise RuntimeError(f"Scorer returned {len(scores)} scores for {len(batch)} compounds")
+        self.scores.update(zip(batch, scores, strict=True))
+        self._checkpoint(batch, scores)
+        hits = self.top_hits()
+        self._write_hits(hits)
+        return batch, scores, hits
+
+    def iter_results(self, smiles):
+        """Score ``smiles``, yielding ``(batch, scores, top_hits)`` as each batch completes.
+
+        Compounds already in the checkpoint (and repeated SMILES) are scored only once.
+        """
+        self.scores = self.load_checkpoint()
+        pending = [s for s in dict.fromkeys(smiles) if s not in self.scores]
+        batches = [pending[i : i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if self.scores:
+            hits = self.top_hits()
+            self._write_hits(hits)
+            yield [], [], hits
+        if not batches:
+            return
+
+        n_workers = min(self.n_workers, len(batches))
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes (e.g. REPL pool workers) are not allowed to start children
+            n_workers = 1
+        if n_workers == 1:
+            score = get_prepared_scorer(self.scorer)
+            for batch in batches:
+                yield self._finish(batch, score(batch))
+            return
+
+        threads = max(1, available_cores() // n_workers)
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.scorer, threads),
+        ) as executor:
+            # A bounded number of batches in flight keeps memory flat for large libraries
+            queued = iter(batches)
+            in_flight = {}
+            for batch in queued:
+                in_flight[executor.submit(_score_in_worker, batch)] = batch
+                if len(in_flight) >= 2 * n_workers:
+                    break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    yield self._finish(batch, future.result())
+                    next_batch = next(queued, None)
+                    if next_batch is not None:
+                        in_flight[executor.submit(_score_in_worker, next_batch)] = next_batch
+
+    def run(self, smiles) -> dict[str, float]:
+        """Score ``smiles`` and return ``{smiles: score}`` in input order."""
+        smiles = list(smiles)
+        for _ in self.iter_results(smiles):
+            pass
+        return {s: self.scores[s] for s in dict.fromkeys(smiles)}
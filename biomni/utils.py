@@ -1130,23 +1130,35 @@ def download_and_unzip(url: str, dest_dir: str) -> str:
 
 
 def check_and_download_s3_files(
-    s3_bucket_url: str, local_data_lake_path: str, expected_files: list[str], folder: str = "data_lake"
+    s3_bucket_url: str,
+    local_data_lake_path: str,
+    expected_files: list[str],
+    folder: str = "data_lake",
+    max_workers: int = 8,
+    manifest: dict | None = None,
 ) -> dict[str, bool]:
     """Check for missing files in the local data lake and download them from S3 bucket.
 
+    Downloads run concurrently, resume from ``.part`` files after an interruption and are
+    verified against the server's size/ETag before being atomically moved into place.
+
     Args:
         s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com")
         local_data_lake_path: Local path to the data lake directory
         expected_files: List of expected file names in the data lake
         folder: S3 folder name ("data_lake" or "benchmark")
+        max_workers: Number of concurrent downloads
+        manifest: Optional mapping of file name to {"size": int, "md5": str} to verify against
 
     Returns:
         Dictionary mapping file names to download success status
     """
+    from biomni.download import DownloadError, DownloadManifest, ParallelDownloader
 
     os.makedirs(local_data_lake_path, exist_ok=True)
     download_results = {}
-    
+    manifest = manifest or {}
+
     # Log the operation if debug mode is enabled
     if DEBUG_MODE:
         logger.debug(f"Checking and downloading S3 files from {s3_bucket_url}")
@@ -1154,127 +1166,86 @@ def check_and_download_s3_files(
         logger.debug(f"Folder: {folder}")
         logger.debug(f"Expected files: {len(expected_files)} files")
 
-    def download_with_progress(url: str, file_path: str, desc: str) -> bool:
-        """Download file with progress bar."""
+    downloader = ParallelDownloader(max_workers=max_workers)
+
+    # Handle benchmark folder (download as zip)
+    if folder == "benchmark":
+        print(f"Downloading entire {folder} folder structure...")
+
+        if DEBUG_MODE:
+            logger.debug("Downloading benchmark folder as zip file")
+
+        s3_zip_url = urljoin(s3_bucket_url + "/", folder + ".zip")
+        # Keep the archive next to its destination so an interrupted download can resume
+        zip_path = os.path.join(local_data_lake_path, folder + ".zip")
+
         try:
+            downloader.download(s3_zip_url, zip_path, expected=manifest.get(folder + ".zip"))
+        except DownloadError as e:
+            error_msg = f"✗ Failed to download {folder}.zip: {e}"
+            print(error_msg)
             if DEBUG_MODE:
-                logger.debug(f"Starting download: {url}")
-                logger.debug(f"Destination: {file_path}")
-            
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+                logger.error(error_msg)
+            return dict.fromkeys(expected_files, False)
 
-            total_size = int(response.headers.get("content-length", 0))
-            
-            if DEBUG_MODE:
-                logger.debug(f"Download started. Total size: {total_size} bytes")
+        print(f"Extracting {folder}.zip...")
+
+        if DEBUG_MODE:
+            logger.debug(f"Extracting zip file: {zip_path}")
+
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                zip_ref.extractall(local_data_lake_path)
+            print(f"✓ Successfully downloaded and extracted {folder} folder")
 
-            with open(file_path, "wb") as f:
-                if total_size > 0:
-                    with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            
             if DEBUG_MODE:
-                logger.debug(f"Download completed successfully: {file_path}")
-            
-            return True
+                logger.debug(f"Successfully extracted {folder} folder")
+
+            download_results = dict.fromkeys(expected_files, True)
         except Exception as e:
-            error_msg = f"✗ Failed to download {desc}: {e}"
+            error_msg = f"✗ Error extracting {folder}.zip: {e}"
             print(error_msg)
-            
+
             # Log the error if debug mode is enabled
             if DEBUG_MODE:
                 logger.error(error_msg)
-            
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
-            return False
-
-    def cleanup_file(file_path: str):
-        """Clean up file if it exists."""
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                if DEBUG_MODE:
-                    logger.debug(f"Cleaned up temporary file: {file_path}")
-            except OSError:
-                pass
 
-    # Handle benchmark folder (download as zip)
-    if folder == "benchmark":
-        print(f"Downloading entire {folder} folder structure...")
-        
-        if DEBUG_MODE:
-            logger.debug(f"Downloading benchmark folder as zip file")
-        
-        s3_zip_url = urljoin(s3_bucket_url + "/", folder + ".zip")
-
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_zip:
-            tmp_zip_path = tmp_zip.name
-
-            if download_with_progress(s3_zip_url, tmp_zip_path, f"{folder}.zip"):
-                print(f"Extracting {folder}.zip...")
-                
-                if DEBUG_MODE:
-                    logger.debug(f"Extracting zip file: {tmp_zip_path}")
-                
-                try:
-                    with zipfile.ZipFile(tmp_zip_path, "r") as zip_ref:
-                        zip_ref.extractall(local_data_lake_path)
-                    print(f"✓ Successfully downloaded and extracted {folder} folder")
-                    
-                    if DEBUG_MODE:
-                        logger.debug(f"Successfully extracted {folder} folder")
-                    
-                    download_results = dict.fromkeys(expected_files, True)
-                except Exception as e:
-                    error_msg = f"✗ Error extracting {folder}.zip: {e}"
-                    print(error_msg)
-                    
-                    # Log the error if debug mode is enabled
-                    if DEBUG_MODE:
-                        logger.error(error_msg)
-                    
-                    download_results = dict.fromkeys(expected_files, False)
-                finally:
-                    cleanup_file(tmp_zip_path)
-            else:
-                download_results = dict.fromkeys(expected_files, False)
+            download_results = dict.fromkeys(expected_files, False)
+        finally:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
 
         return download_results
 
     # Handle data_lake folder (download individual files)
-    for filename in expected_files:
-        local_file_path = os.path.join(local_data_lake_path, filename)
+    local_manifest = DownloadManifest(local_data_lake_path)
+    tasks = [
+        (
+            filename,
+            urljoin(s3_bucket_url + "/" + folder + "/", filename),
+            os.path.join(local_data_lake_path, filename),
+            manifest.get(filename),
+        )
+        for filename in expected_files
+    ]
 
-        if os.path.exists(local_file_path):
+    pending = downloader.find_incomplete(tasks, local_manifest)
+    pending_names = {task[0] for task in pending}
+    for filename in expected_files:
+        if filename not in pending_names:
             download_results[filename] = True
-            
             if DEBUG_MODE:
-                logger.debug(f"File already exists: {local_file_path}")
-            
-            continue
+                logger.debug(f"File already exists: {os.path.join(local_data_lake_path, filename)}")
 
-        s3_file_url = urljoin(s3_bucket_url + "/" + folder + "/", filename)
-        print(f"Downloading {filename} from {folder}...")
+    if pending:
+        print(f"Downloading {len(pending)} file(s) from {folder} with {max_workers} workers...")
+        download_results.update(downloader.download_many(pending, manifest=local_manifest, desc=folder))
+        succeeded = sum(download_results[name] for name in pending_names)
+        print(f"✓ Successfully downloaded {succeeded}/{len(pending)} file(s)")
 
-        if download_with_progress(s3_file_url, local_file_path, filename):
-            print(f"✓ Successfully downloaded: {filename}")
-            download_results[filename] = True
-        else:
-            download_results[filename] = False
+    download_results = {filename: download_results[filename] for filename in expected_files}
 
     if DEBUG_MODE:
         logger.debug(f"S3 file download process completed. Results: {download_results}")
-    
+
     return download_results
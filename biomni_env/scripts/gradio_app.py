@@ -54,7 +54,7 @@ class SessionManager:
                 session = self.sessions[session_id]
                 if session['agent']:
                     try:
-                        session['agent'].stop()
+                        session['agent'].close()
                     except:
                         pass
                 del self.sessions[session_id]
@@ -736,6 +736,8 @@ def create_agent(llm_model: str, source: str, base_url: Optional[str], api_key:
             "path": effective_data_path,
             "llm": llm_model,
             "verbose": verbose,
+            "session_id": session_id,
+            "fast_start": True,  # Data lake provisioning and tool loading continue in the background
         }
         
         # Add source if specified
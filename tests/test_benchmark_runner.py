@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from biomni.task.benchmark_runner import BenchmarkRunner, WorkerInitError, parse_choice, prompt_choices
+
+HLE_PROMPT = """Question: Which amino acid is encoded by the codon AUG?
+
+Answer Choices:
+A. Leucine
+B. Methionine
+C. Valine
+D. Tryptophan"""
+
+
+class _Task:
+    """Two-item multiple-choice task in the shape of ``humanity_last_exam``."""
+
+    def __init__(self):
+        self.query = np.array([HLE_PROMPT, HLE_PROMPT])
+        self.answer = np.array(["B", "B"])
+        self.refrain_label = np.full(len(self.answer), "")
+
+    def get_example(self, index):
+        return {"prompt": self.query[index], "answer": self.answer[index]}
+
+    def evaluate(self, response):
+        response = np.array(response)
+        return {"accuracy": np.mean(response == self.answer)}
+
+    def output_class(self):
+        return None
+
+
+def _failing_agent():
+    raise OSError("data lake not found at ./data")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("[ANSWER]B[/ANSWER]", "B"),
+        ("<solution>(C)</solution>", "C"),
+        ("AUG is the start codon, so the answer is (B).", "B"),
+        ("After checking the codon table.\n\n**Answer:** B. Methionine", "B"),
+        ("Final answer: D", "D"),
+        ("A codon table lookup shows AUG codes for methionine, which is option B", "B"),
+        ("AUG encodes methionine.\nB) Methionine", "B"),
+        ("A search of the codon table suggests methionine.", None),
+        ("I could not determine the amino acid with DNA or RNA tools.", None),
+    ],
+)
+def test_parse_choice_hle_free_text(text, expected):
+    assert parse_choice(text, prompt_choices(HLE_PROMPT)) == expected
+
+
+def test_parse_choice_ignores_letters_outside_the_options():
+    assert parse_choice("Based on the X chromosome data, the answer is E.", ["A", "B", "C", "D"]) is None
+
+
+def test_prompt_choices():
+    assert prompt_choices(HLE_PROMPT) == ["A", "B", "C", "D"]
+
+
+def test_mock_run_scores_every_item():
+    report = BenchmarkRunner(_Task(), isolation="thread", max_workers=2, mock=True, show_progress=False).run()
+    assert report["items"] == 2
+    assert report["errors"] == 0
+    assert report["unparsed"] == 0
+
+
+def test_worker_init_failure_reports_cause():
+    runner = BenchmarkRunner(_Task(), agent_factory=_failing_agent, max_workers=1, show_progress=False)
+    with pytest.raises(WorkerInitError, match="data lake not found"):
+        runner.run()
@@ -0,0 +1,128 @@
+"""ParallelDownloader against a local HTTP server that supports HEAD and Range requests."""
+
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from biomni.download import DownloadError, DownloadManifest, ParallelDownloader
+
+CONTENT = bytes(range(256)) * 400  # 100 KiB
+
+
+class _Handler(BaseHTTPRequestHandler):
+    files = {"/data.bin": CONTENT}
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _headers(self, body, status=200, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", f'"{hashlib.md5(self.files[self.path]).hexdigest()}"')
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", self.path, dict(self.headers)))
+        if self.path not in self.files:
+            self.send_error(404)
+            return
+        self._headers(self.files[self.path])
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path, dict(self.headers)))
+        if self.path not in self.files:
+            self.send_error(404)
+            return
+        body = self.files[self.path]
+        range_header = self.headers.get("Range")
+        if range_header:
+            start = int(range_header.removeprefix("bytes=").split("-")[0])
+            if start >= len(body):
+                self.send_error(416)
+                return
+            content_range = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            self._headers(body[start:], 206, {"Content-Range": content_range})
+            self.wfile.write(body[start:])
+        else:
+            self._headers(body)
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.requests = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def downloader():
+    return ParallelDownloader(max_workers=2, max_retries=2, show_progress=False)
+
+
+def test_resumes_part_file_with_range(server, downloader, tmp_path):
+    dest = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(CONTENT[:30000])
+    entry = downloader.download(f"{server}/data.bin", str(dest))
+    assert dest.read_bytes() == CONTENT
+    assert not (tmp_path / "data.bin.part").exists()
+    assert entry["md5"] == hashlib.md5(CONTENT).hexdigest()
+    gets = [headers for method, _, headers in _Handler.requests if method == "GET"]
+    assert gets[-1]["Range"] == "bytes=30000-"
+
+
+def test_part_is_renamed_only_after_verification(server, downloader, tmp_path):
+    dest = tmp_path / "data.bin"
+    with pytest.raises(DownloadError, match="checksum mismatch"):
+        downloader.download(f"{server}/data.bin", str(dest), expected={"md5": "0" * 32})
+    assert not dest.exists()
+    downloader.download(f"{server}/data.bin", str(dest))
+    assert dest.read_bytes() == CONTENT
+    assert sorted(os.listdir(tmp_path)) == ["data.bin"]
+
+
+def test_restarts_when_part_size_does_not_match(server, downloader, tmp_path):
+    dest = tmp_path / "data.bin"
+    # A stale part file longer than the remote file fails verification and is fetched from scratch
+    (tmp_path / "data.bin.part").write_bytes(b"x" * (len(CONTENT) + 10))
+    downloader.download(f"{server}/data.bin", str(dest))
+    assert dest.read_bytes() == CONTENT
+    assert not (tmp_path / "data.bin.part").exists()
+
+
+def test_find_incomplete_resumes_truncated_file(server, downloader, tmp_path):
+    dest = tmp_path / "data.bin"
+    dest.write_bytes(CONTENT[:5000])
+    manifest = DownloadManifest(str(tmp_path))
+    tasks = [("data.bin", f"{server}/data.bin", str(dest), None)]
+    pending = downloader.find_incomplete(tasks, manifest)
+    assert pending == tasks
+    assert (tmp_path / "data.bin.part").stat().st_size == 5000
+    assert downloader.download_many(pending, manifest) == {"data.bin": True}
+    assert dest.read_bytes() == CONTENT
+    assert manifest.is_complete("data.bin", str(dest))
+    assert downloader.find_incomplete(tasks, manifest) == []
+
+
+def test_find_incomplete_rechecks_file_the_server_does_not_have(server, downloader, tmp_path):
+    dest = tmp_path / "missing.bin"
+    dest.write_bytes(b"truncated")
+    tasks = [("missing.bin", f"{server}/missing.bin", str(dest), None)]
+    assert downloader.find_incomplete(tasks, DownloadManifest(str(tmp_path))) == tasks
+
+
+def test_find_incomplete_keeps_file_when_server_is_unreachable(downloader, tmp_path):
+    dest = tmp_path / "data.bin"
+    dest.write_bytes(b"offline copy")
+    tasks = [("data.bin", "http://127.0.0.1:9/data.bin", str(dest), None)]
+    assert downloader.find_incomplete(tasks, DownloadManifest(str(tmp_path))) == []
+    assert dest.read_bytes() == b"offline copy"
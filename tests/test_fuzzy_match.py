@@ -0,0 +1,48 @@
+import difflib
+import random
+
+import pytest
+from biomni.tool.fuzzy_match import FuzzyMatcher
+
+SYLLABLES = "ab al an ba ci co da di fe ga in ka lo ma mi na ne ol pa pi pro ra ri sa ta ti tri um va xi zo mab nib pril".split()
+
+
+def _vocabulary(rng, size):
+    names = []
+    for _ in range(size):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            name += " " + rng.choice(["hydrochloride", "sodium", "acetate"])
+        names.append(name)
+    return list(dict.fromkeys(names))
+
+
+def _mutate(rng, word):
+    chars = list(word)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice("abcdilmnoprstz")
+        elif op < 0.7 and len(chars) > 1:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice("abcdilmnoprstz"))
+    return "".join(chars)
+
+
+@pytest.mark.parametrize("cutoff", [0.6, 0.8])
+def test_matches_difflib(cutoff):
+    rng = random.Random(0)
+    vocabulary = _vocabulary(rng, 3000)
+    matcher = FuzzyMatcher(vocabulary)
+    queries = [_mutate(rng, rng.choice(vocabulary)) for _ in range(100)] + _vocabulary(rng, 50)
+    queries += [vocabulary[0], "Pro-Ma", "zz", ""]
+    for query in queries:
+        assert matcher.get_close_matches(query, 3, cutoff) == difflib.get_close_matches(query, vocabulary, 3, cutoff)
+
+
+def test_synonyms_return_canonical_name():
+    matcher = FuzzyMatcher(["acetaminophen", "ibuprofen"], synonyms={"paracetamol": "acetaminophen"})
+    assert matcher.match("paracetamoll") == "acetaminophen"
+    assert matcher.extract("ibuprofen", limit=1) == [("ibuprofen", 1.0)]
@@ -0,0 +1,176 @@
+"""Tiled algorithms against skimage on the whole image, on a grid of small tiles whose seams cut
+through objects and holes."""
+
+import functools
+import multiprocessing
+import os
+import warnings
+
+import numpy as np
+import pytest
+from biomni.tool import tiled_image
+from scipy import ndimage
+from skimage import color, exposure, filters, measure, morphology
+from skimage.feature import graycomatrix
+
+SHAPE = (151, 211)
+TILE_SHAPE = (40, 57)
+
+
+@pytest.fixture(scope="module")
+def rgb():
+    rng = np.random.default_rng(1)
+    noise = ndimage.gaussian_filter(rng.random((*SHAPE, 3)), (3, 3, 0))
+    return (noise * 255 * 1.8 - 60).clip(0, 255).astype(np.uint8)
+
+
+@pytest.fixture(scope="module")
+def image(rgb, tmp_path_factory):
+    path = tmp_path_factory.mktemp("tiled") / "rgb.npy"
+    np.save(path, rgb)
+    return tiled_image.LazyImage(str(path))
+
+
+@pytest.fixture(scope="module")
+def tiles():
+    return tiled_image.tile_grid(SHAPE, TILE_SHAPE)
+
+
+@pytest.fixture
+def workspace():
+    with tiled_image.Workspace() as workspace:
+        yield workspace
+
+
+def _mask(workspace, values):
+    mask = workspace.create("mask", values.shape, bool)
+    mask[:] = values
+    mask.flush()
+    return mask
+
+
+def test_otsu_and_histogram(rgb, image, tiles):
+    gray = color.rgb2gray(rgb)
+    assert tiled_image.tiled_threshold_otsu(image, tiles, color.rgb2gray, n_workers=1) == filters.threshold_otsu(gray)
+    blue = functools.partial(np.take, indices=2, axis=-1)
+    assert tiled_image.tiled_threshold_otsu(image, tiles, blue, n_workers=1) == filters.threshold_otsu(rgb[..., 2])
+    counts, centers = tiled_image.tiled_histogram(image, tiles, color.rgb2gray, n_workers=1)
+    expected_counts, expected_centers = exposure.histogram(gray)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_array_equal(centers, expected_centers)
+
+
+def test_percentile(rgb, image, tiles):
+    q = (0, 2, 50, 98, 100)
+    gray = tiled_image.tiled_percentile(image, tiles, q, color.rgb2gray, n_workers=1)
+    np.testing.assert_array_equal(gray, np.percentile(color.rgb2gray(rgb), q))
+    green = tiled_image.tiled_percentile(image, tiles, q, functools.partial(np.take, indices=1, axis=-1), n_workers=1)
+    np.testing.assert_array_equal(green, np.percentile(rgb[..., 1], q))
+
+
+@pytest.mark.parametrize("connectivity", [1, 2])
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_labels_merge_across_seams(rgb, tiles, workspace, connectivity, n_workers):
+    values = rgb[..., 0] > 100
+    mask = _mask(workspace, values)
+    components = tiled_image.label_tiled(mask, tiles, connectivity, n_workers=n_workers)
+    labels = workspace.create("labels", SHAPE, np.int32)
+    tiled_image.write_labels(components, mask, labels, n_workers=n_workers)
+    expected = measure.label(values, connectivity=connectivity)
+    assert components.count == expected.max()
+    np.testing.assert_array_equal(labels[:], expected)
+
+
+def test_remove_small_objects_and_holes(rgb, tiles, workspace):
+    values = rgb[..., 0] > 100
+    mask = _mask(workspace, values)
+    objects = workspace.create("objects", SHAPE, bool)
+    tiled_image.remove_small_objects_tiled(mask, objects, tiles, 50, n_workers=1)
+    holes = workspace.create("holes", SHAPE, bool)
+    tiled_image.remove_small_holes_tiled(objects, holes, tiles, 50, n_workers=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected_objects = morphology.remove_small_objects(values, min_size=50)
+        expected_holes = morphology.remove_small_holes(expected_objects, area_threshold=50)
+    np.testing.assert_array_equal(objects[:], expected_objects)
+    np.testing.assert_array_equal(holes[:], expected_holes)
+
+
+def test_hysteresis(rgb, tiles, workspace):
+    values = rgb[..., 1]
+    weak = workspace.create("weak", SHAPE, bool)
+    weak[:] = values > 90
+    strong = workspace.create("strong", SHAPE, bool)
+    strong[:] = values > 160
+    out = workspace.create("out", SHAPE, bool)
+    tiled_image.hysteresis_tiled(weak, strong, out, tiles, connectivity=1, n_workers=1)
+    np.testing.assert_array_equal(out[:], filters.apply_hysteresis_threshold(values, 90, 160))
+
+
+def test_graycomatrix(rgb, image, tiles):
+    angles = [0, np.pi / 4, np.pi / 2, 3 * np.pi / 4]
+    red = functools.partial(np.take, indices=0, axis=-1)
+    matrix = tiled_image.tiled_graycomatrix(
+        image, tiles, [1, 3], angles, symmetric=True, normed=True, transform=red, n_workers=1
+    )
+    expected = graycomatrix(rgb[..., 0], [1, 3], angles, levels=256, symmetric=True, normed=True)
+    np.testing.assert_array_equal(matrix, expected)
+
+
+@pytest.mark.parametrize("clip_limit", [0.01, 0.0])
+def test_equalize_adapthist(rgb, image, tiles, workspace, clip_limit):
+    out = workspace.create("clahe", SHAPE, np.uint16)
+    rescale = tiled_image.tiled_equalize_adapthist(
+        image, out, tiles, color.rgb2gray, clip_limit=clip_limit, n_workers=1
+    )
+    expected = exposure.equalize_adapthist(color.rgb2gray(rgb), clip_limit=clip_limit)
+    result = rescale(out[:])
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("dtype", [np.bool_, np.uint8, np.int32, np.float16, np.float32, np.float64])
+def test_float_dtype(dtype):
+    assert tiled_image.float_dtype(dtype) == exposure.equalize_hist(np.array([[0, 1], [1, 0]], dtype=dtype)).dtype
+
+
+def _otsu_in_process(path, results):
+    image = tiled_image.LazyImage(path)
+    tiles = tiled_image.tile_grid(SHAPE, TILE_SHAPE)
+    results.put(tiled_image.tiled_threshold_otsu(image, tiles, color.rgb2gray, n_workers=2))
+
+
+def test_tiles_run_in_daemonic_process(rgb, image):
+    # Daemonic processes (like REPL pool workers) may not start a pool of their own
+    results = multiprocessing.get_context("spawn").Queue()
+    process = multiprocessing.get_context("spawn").Process(
+        target=_otsu_in_process, args=(image.path, results), daemon=True
+    )
+    process.start()
+    threshold = results.get(timeout=60)
+    process.join(timeout=30)
+    assert process.exitcode == 0
+    assert threshold == filters.threshold_otsu(color.rgb2gray(rgb))
+
+
+def _crash_in_worker(tile):
+    if tiled_image._worker_arrays is not None:
+        os._exit(1)
+    return tile.core
+
+
+def _worker_pid(tile):
+    return os.getpid()
+
+
+def test_broken_pool_falls_back_to_this_process(tiles):
+    with pytest.warns(RuntimeWarning, match="Tile worker pool failed"):
+        cores = list(tiled_image.map_tiles(_crash_in_worker, tiles, n_workers=2))
+    assert cores == [tile.core for tile in tiles]
+
+
+def test_workspace_shares_one_pool(tiles, workspace):
+    first = set(tiled_image.map_tiles(_worker_pid, tiles, n_workers=2))
+    second = set(tiled_image.map_tiles(_worker_pid, tiles, n_workers=2))
+    assert os.getpid() not in first
+    assert len(first | second) <= 2